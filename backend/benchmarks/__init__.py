@@ -0,0 +1 @@
+# Benchmark and load-test tooling (runs against the in-memory Supabase stand-in)
@@ -0,0 +1,127 @@
+"""
+Per-endpoint Supabase query budgets.
+
+Calls each endpoint once against the in-memory stand-in and fails when it
+issues more round trips than its budget or repeats the same table/filter
+lookup (N+1). Lower a budget when an endpoint gets cheaper; raising one
+should be a deliberate, reviewed change.
+
+Usage (from backend/):
+    python -m benchmarks.check_query_budgets
+"""
+
+import os
+import sys
+
+# Must be configured before the app is imported
+os.environ["QUERY_DEBUG_HEADERS"] = "true"
+
+from benchmarks.run_benchmarks import BenchContext, SCENARIOS, _get  # noqa: E402
+from benchmarks.fixtures import build_fixtures  # noqa: E402
+from utils_others.query_stats import assert_endpoint_queries  # noqa: E402
+
+_search = _get("/api/v1/recruiter/candidates/search?q=python+aws", "recruiter")
+
+
+def _candidate_search(ctx, client):
+    _search(ctx, client)  # the first search builds the in-process index
+    return _search(ctx, client)
+
+
+_recommended = _get("/api/v1/dashboard/recommended-jobs", "candidate")
+
+
+def _recommended_jobs(ctx, client):
+    from services.recommendation_service import recommendation_worker
+
+    _recommended(ctx, client)  # first visit queues the computation
+    recommendation_worker.drain()
+    return _recommended(ctx, client)
+
+
+_funnel = _get("/api/v1/recruiter/funnel", "recruiter")
+
+
+def _recruiter_funnel(ctx, client):
+    from services.funnel_service import funnel_worker
+
+    _funnel(ctx, client)  # first visit queues the computation
+    funnel_worker.drain()
+    return _funnel(ctx, client)
+
+
+_dashboard = _get("/api/v1/dashboard/", "recruiter")
+
+
+def _recruiter_dashboard_funnel(ctx, client):
+    from services.funnel_service import funnel_worker
+
+    _dashboard(ctx, client)  # first visit queues the funnels
+    funnel_worker.drain()
+    res = _dashboard(ctx, client)
+    funnel = res.json()["data"]["funnel"]
+    if funnel["pending"] or not funnel["jobs"]:
+        raise AssertionError(f"dashboard served no stored funnels ({len(funnel['pending'])} pending)")
+    return res
+
+
+def _apply(ctx, client):
+    applied = client.get("/api/v1/applicant/applied-jobs", headers=ctx.headers("candidate")).json()["data"]["job_ids"]
+    job_id = next(j["id"] for j in ctx.db.tables["jobs"] if j.get("status") == "active" and j["id"] not in applied)
+    return client.post("/api/v1/applicant/apply", headers=ctx.headers("candidate"), json={"job_id": job_id})
+
+
+ENDPOINTS = {
+    **SCENARIOS,
+    "applicant_applications": _get("/api/v1/applicant/applications", "candidate"),
+    "video_responses": _get("/api/v1/video/application/{ctx.application_id}", "recruiter"),
+    "candidate_search": _candidate_search,
+    "recommended_jobs": _recommended_jobs,
+    "applied_jobs": _get("/api/v1/applicant/applied-jobs", "candidate"),
+    "apply": _apply,
+    "unread_count": _get("/api/v1/notification/unread-count", "candidate"),
+    "recruiter_funnel": _recruiter_funnel,
+    "recruiter_dashboard_funnel": _recruiter_dashboard_funnel,
+}
+
+QUERY_BUDGETS = {
+    "dashboard_summary": 3,  # recruiter: jobs + applications + stored funnels (role lookup is auth)
+    "dashboard_summary_candidate": 2,  # applications + their jobs
+    "dashboard_jobs": 3,  # +1 for the applied-jobs set on a cold cache
+    "recruiter_applications": 1,
+    "recruiter_application_detail": 6,
+    "applicant_profile": 5,
+    "video_upload": 1,
+    "applicant_applications": 3,
+    "video_responses": 1,
+    "candidate_search": 3,
+    "recommended_jobs": 3,
+    "applied_jobs": 1,
+    "apply": 1,
+    "unread_count": 1,  # cold counter; cached reads are free
+    "recruiter_funnel": 2,  # jobs + stored funnels; nothing is computed on read
+    "recruiter_dashboard_funnel": 3,  # dashboard_summary once every funnel is stored
+}
+
+
+def main() -> int:
+    ctx = BenchContext(0, build_fixtures())
+    client = ctx.client()
+    failures = 0
+
+    for name, budget in QUERY_BUDGETS.items():
+        try:
+            res = ENDPOINTS[name](ctx, client)
+            if res.status_code >= 400:
+                raise AssertionError(f"HTTP {res.status_code}")
+            used = assert_endpoint_queries(res, budget)
+            print(f"✅ {name:32} {used}/{budget} queries  {res.headers.get('X-DB-Tables', '')}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {name:32} {e}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
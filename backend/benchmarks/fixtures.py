@@ -0,0 +1,138 @@
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from models.recruiter_models import APPLICATION_STATUSES
+
+SKILLS = [
+    "python", "javascript", "typescript", "react", "node.js", "sql", "postgresql",
+    "aws", "docker", "kubernetes", "java", "spring", "go", "rust", "figma",
+    "machine learning", "pandas", "django", "fastapi", "excel", "communication",
+]
+TITLES = [
+    "Backend Engineer", "Frontend Developer", "Data Analyst", "DevOps Engineer",
+    "Product Designer", "Full Stack Developer", "QA Engineer", "ML Engineer",
+]
+CITIES = ["Bengaluru", "Pune", "Hyderabad", "Chennai", "Mumbai", "Remote"]
+# Only values of the application_status enum, so the data could live in Postgres
+STATUSES = list(APPLICATION_STATUSES)
+
+BENCH_PASSWORD = "bench-password"
+# Must pass EmailStr validation on /auth/login (reserved TLDs like .local are rejected)
+BENCH_EMAIL_DOMAIN = "bench.skreenit.com"
+
+
+def bench_email(role: str, index: int) -> str:
+    return f"{role}{index}@{BENCH_EMAIL_DOMAIN}"
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _ts(base: datetime, rng: random.Random, days: int = 90) -> str:
+    return (base - timedelta(seconds=rng.randint(0, days * 86400))).isoformat()
+
+
+def build_fixtures(
+    recruiters: int = 5,
+    jobs_per_recruiter: int = 20,
+    candidates: int = 200,
+    applications_per_job: int = 25,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """
+    Deterministic dataset for the in-memory Supabase stand-in.
+    Returns the fixture document accepted by FakeSupabaseClient.load_fixtures().
+    """
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    auth_users: List[Dict[str, Any]] = []
+    tables: Dict[str, List[Dict[str, Any]]] = {
+        "users": [], "companies": [], "recruiter_profiles": [], "jobs": [], "job_skills": [],
+        "interview_questions": [], "candidate_profiles": [], "candidate_skills": [],
+        "candidate_experience": [], "candidate_education": [], "job_applications": [],
+    }
+
+    recruiter_ids, candidate_ids = [], []
+    for i in range(recruiters):
+        uid = _uuid(rng)
+        recruiter_ids.append(uid)
+        name = f"Recruiter {i}"
+        auth_users.append({
+            "id": uid, "email": bench_email("recruiter", i), "password": BENCH_PASSWORD,
+            "user_metadata": {"role": "recruiter", "full_name": name, "onboarded": True},
+        })
+        tables["users"].append({"id": uid, "email": bench_email("recruiter", i), "full_name": name, "role": "recruiter"})
+        company_id = _uuid(rng)
+        tables["companies"].append({"id": company_id, "name": f"Company {i}", "created_by": uid})
+        tables["recruiter_profiles"].append({"user_id": uid, "company_name": f"Company {i}", "contact_name": name})
+
+        for j in range(jobs_per_recruiter):
+            job_id = _uuid(rng)
+            title = rng.choice(TITLES)
+            skills = rng.sample(SKILLS, 5)
+            tables["jobs"].append({
+                "id": job_id,
+                "title": title,
+                "description": f"{title} working with {', '.join(skills)}.",
+                "requirements": f"Experience with {skills[0]} and {skills[1]}",
+                "location": rng.choice(CITIES),
+                "job_type": rng.choice(["full-time", "contract", "internship"]),
+                "status": "active" if rng.random() < 0.8 else "closed",
+                "company_id": company_id,
+                "created_by": uid,
+                "created_at": _ts(now, rng),
+            })
+            for n, skill in enumerate(skills):
+                tables["job_skills"].append({"job_id": job_id, "skill_name": skill, "is_required": n < 2})
+            for order in range(1, 4):
+                tables["interview_questions"].append({
+                    "job_id": job_id, "question_text": f"Question {order} for {title}", "question_order": order,
+                })
+
+    for i in range(candidates):
+        uid = _uuid(rng)
+        candidate_ids.append(uid)
+        name = f"Candidate {i}"
+        auth_users.append({
+            "id": uid, "email": bench_email("candidate", i), "password": BENCH_PASSWORD,
+            "user_metadata": {"role": "candidate", "full_name": name, "onboarded": True},
+        })
+        tables["users"].append({"id": uid, "email": bench_email("candidate", i), "full_name": name, "location": rng.choice(CITIES)})
+        profile_id = _uuid(rng)
+        title = rng.choice(TITLES)
+        tables["candidate_profiles"].append({
+            "id": profile_id, "user_id": uid, "title": title,
+            "bio": f"{title} with {rng.randint(1, 12)} years of experience.",
+            "resume_url": f"{uid}/resume.pdf",
+        })
+        for skill in rng.sample(SKILLS, 6):
+            tables["candidate_skills"].append({"candidate_id": profile_id, "skill_name": skill})
+        tables["candidate_experience"].append({
+            "candidate_id": profile_id, "company_name": f"Prev Co {i % 17}", "position": title,
+            "description": f"Built systems using {rng.choice(SKILLS)}",
+        })
+        tables["candidate_education"].append({
+            "candidate_id": profile_id, "institution": f"University {i % 11}", "degree": "B.Tech",
+        })
+
+    for job in tables["jobs"]:
+        for cand in rng.sample(candidate_ids, min(applications_per_job, len(candidate_ids))):
+            tables["job_applications"].append({
+                "id": _uuid(rng),
+                "job_id": job["id"],
+                "candidate_id": cand,
+                "status": rng.choice(STATUSES),
+                "ai_score": rng.randint(20, 98),
+                "applied_at": _ts(now, rng),
+            })
+
+    return {
+        "auth_users": auth_users,
+        "tables": tables,
+        "storage": {"resumes": {f"{c}/resume.pdf": "%PDF-1.4 bench" for c in candidate_ids}},
+        "meta": {"recruiter_ids": recruiter_ids, "candidate_ids": candidate_ids},
+    }
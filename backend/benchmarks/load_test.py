@@ -0,0 +1,420 @@
+"""
+Load generator with a realistic recruiter/candidate traffic mix.
+
+Scenarios mirror the frontend flows in dashboard/js:
+    recruiter-dashboard.js  -> profile, jobs, applications, application review
+    candidate-dashboard.js  -> applications, job board, profile
+    interview-room.js       -> interview setup, saving answers, finishing
+plus logins, job browsing and applying.
+
+By default a uvicorn server is started locally with the in-memory Supabase
+stand-in (SUPABASE_BACKEND=memory) seeded from benchmarks.fixtures, so the
+numbers are capacity per worker with the data layer stubbed out.
+
+Usage (from backend/):
+    python -m benchmarks.load_test --rps 50 --duration 30
+    python -m benchmarks.load_test --rps 25 50 100 200 --duration 20   # step test
+    python -m benchmarks.load_test --target http://localhost:8000 --rps 20
+
+Each worker process keeps its own in-memory data, so use --workers 1 when
+write-then-read flows (apply -> interview) must see their own writes.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.fixtures import build_fixtures, bench_email, BENCH_PASSWORD  # noqa: E402
+from benchmarks.run_benchmarks import percentile  # noqa: E402
+
+API = "/api/v1"
+JWT_SECRET = "loadtest-jwt-secret-loadtest-jwt-secret"
+SEARCH_TERMS = ["engineer", "python", "data", "remote", "react", "devops"]
+
+
+# ---------------------------------------------------------
+# SERVER
+# ---------------------------------------------------------
+def start_server(port: int, workers: int, latency_ms: float, fixtures_path: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "SUPABASE_BACKEND": "memory",
+        "SUPABASE_FAKE_FIXTURES": fixtures_path,
+        "SUPABASE_FAKE_LATENCY_MS": str(latency_ms),
+        "SUPABASE_JWT_SECRET": JWT_SECRET,
+        "LOG_LEVEL": env.get("LOG_LEVEL", "WARNING"),
+        "ENVIRONMENT": "loadtest",
+    })
+    cmd = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+    ]
+    return subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL)
+
+
+def wait_until_ready(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"Server at {base_url} did not become ready within {timeout}s")
+
+
+# ---------------------------------------------------------
+# METRICS / PACING
+# ---------------------------------------------------------
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.scenarios: Dict[str, int] = defaultdict(int)
+        self.scenario_failures: Dict[str, int] = defaultdict(int)
+
+    def record(self, label: str, elapsed_ms: float, ok: bool) -> None:
+        self.latencies[label].append(elapsed_ms)
+        if not ok:
+            self.errors[label] += 1
+
+    @property
+    def total_requests(self) -> int:
+        return sum(len(v) for v in self.latencies.values())
+
+
+class Pacer:
+    """Hands out request slots at a fixed rate (open model, shared by all users)."""
+
+    def __init__(self, rps: float):
+        self.interval = 1.0 / rps
+        self.next_slot = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# ---------------------------------------------------------
+# VIRTUAL USERS
+# ---------------------------------------------------------
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, pacer: Pacer, stats: Stats, email: str, role: str):
+        self.client = client
+        self.pacer = pacer
+        self.stats = stats
+        self.email = email
+        self.role = role
+        self.user_id: Optional[str] = None
+        self.token: Optional[str] = None
+
+    async def call(self, method: str, path: str, label: str, **kwargs) -> Optional[Any]:
+        await self.pacer.wait()
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        start = time.perf_counter()
+        try:
+            res = await self.client.request(method, f"{API}{path}", headers=headers, **kwargs)
+            ok = res.status_code < 400
+        except httpx.HTTPError:
+            res, ok = None, False
+        self.stats.record(label, (time.perf_counter() - start) * 1000, ok)
+        if not ok:
+            return None
+        try:
+            return res.json()
+        except ValueError:
+            return None
+
+    async def login(self) -> bool:
+        self.token = None
+        body = await self.call(
+            "POST", "/auth/login", "POST /auth/login",
+            json={"email": self.email, "password": BENCH_PASSWORD},
+        )
+        if not body:
+            return False
+        data = body.get("data") or {}
+        self.token = data.get("access_token")
+        self.user_id = (data.get("user") or {}).get("id")
+        return bool(self.token)
+
+    async def ensure_login(self) -> bool:
+        return bool(self.token) or await self.login()
+
+
+def _data(body: Any) -> Any:
+    # Most endpoints wrap results in {"ok": True, "data": ...}; a few return the list directly
+    if isinstance(body, dict):
+        return body.get("data") or []
+    return body or []
+
+
+# recruiter-dashboard.js: loadRecruiterProfile + loadDashboardData
+async def recruiter_dashboard(user: VirtualUser) -> bool:
+    profile = await user.call("GET", "/recruiter/profile", "GET /recruiter/profile")
+    jobs = await user.call("GET", f"/recruiter/jobs?user_id={user.user_id}", "GET /recruiter/jobs")
+    apps = await user.call("GET", "/recruiter/applications", "GET /recruiter/applications")
+    return None not in (profile, jobs, apps)
+
+
+# recruiter-dashboard.js: open an application, watch answers, move it along
+async def recruiter_review(user: VirtualUser) -> bool:
+    apps = _data(await user.call("GET", "/recruiter/applications", "GET /recruiter/applications"))
+    if not apps:
+        return False
+    app_id = random.choice(apps)["id"]
+    detail = await user.call("GET", f"/recruiter/applications/{app_id}", "GET /recruiter/applications/{id}")
+    videos = await user.call("GET", f"/video/application/{app_id}", "GET /video/application/{id}")
+    status = await user.call(
+        "POST", f"/recruiter/applications/{app_id}/status", "POST /recruiter/applications/{id}/status",
+        json={"status": random.choice(["under_review", "interview_scheduled"])},
+    )
+    return None not in (detail, videos, status)
+
+
+# candidate-dashboard.js: loadApplications + loadJobs + profile tab
+async def candidate_dashboard(user: VirtualUser) -> bool:
+    apps = await user.call("GET", "/applicant/applications", "GET /applicant/applications")
+    jobs = await user.call("GET", "/dashboard/jobs", "GET /dashboard/jobs")
+    profile = await user.call("GET", "/applicant/profile", "GET /applicant/profile")
+    return None not in (apps, jobs, profile)
+
+
+# candidate-dashboard.js search box + job-details.js
+async def browse_jobs(user: VirtualUser) -> bool:
+    query = random.choice(SEARCH_TERMS)
+    jobs = _data(await user.call("GET", f"/dashboard/jobs?q={query}", "GET /dashboard/jobs?q"))
+    if not jobs:
+        jobs = _data(await user.call("GET", "/dashboard/jobs", "GET /dashboard/jobs"))
+    if not jobs:
+        return False
+    job_id = random.choice(jobs)["id"]
+    detail = await user.call("GET", f"/dashboard/jobs/{job_id}", "GET /dashboard/jobs/{id}")
+    applied = await user.call("GET", f"/applicant/check-status?job_id={job_id}", "GET /applicant/check-status")
+    return None not in (detail, applied)
+
+
+async def _apply(user: VirtualUser) -> Optional[str]:
+    jobs = _data(await user.call("GET", "/dashboard/jobs", "GET /dashboard/jobs"))
+    if not jobs:
+        return None
+    job_id = random.choice(jobs)["id"]
+    body = await user.call("POST", "/applicant/apply", "POST /applicant/apply", json={"job_id": job_id})
+    data = (body or {}).get("data")
+    if isinstance(data, list):
+        data = data[0] if data else None
+    return (data or {}).get("id")
+
+
+# job-details.js apply()
+async def apply_job(user: VirtualUser) -> bool:
+    return await _apply(user) is not None
+
+
+# interview-room.js: setup, save each recorded answer, finish
+async def interview(user: VirtualUser) -> bool:
+    apps = _data(await user.call("GET", "/applicant/applications", "GET /applicant/applications"))
+    app_id = apps[0]["id"] if apps else await _apply(user)
+    if not app_id:
+        return False
+    setup = await user.call("GET", f"/applicant/applications/{app_id}/interview", "GET /applicant/applications/{id}/interview")
+    if setup is None:
+        return False
+    for n in range(1, 4):
+        saved = await user.call(
+            "POST", f"/applicant/applications/{app_id}/response", "POST /applicant/applications/{id}/response",
+            json={"question": f"Question {n}", "video_path": f"{user.user_id}/{app_id}/q{n}.webm"},
+        )
+        if saved is None:
+            return False
+    done = await user.call(
+        "POST", f"/applicant/applications/{app_id}/finish-interview", "POST /applicant/applications/{id}/finish-interview",
+        json={},
+    )
+    return done is not None
+
+
+async def relogin(user: VirtualUser) -> bool:
+    return await user.login()
+
+
+# (name, role, weight, scenario)
+SCENARIOS: List[Tuple[str, str, int, Callable]] = [
+    ("recruiter_dashboard", "recruiter", 20, recruiter_dashboard),
+    ("recruiter_review", "recruiter", 10, recruiter_review),
+    ("candidate_dashboard", "candidate", 30, candidate_dashboard),
+    ("browse_jobs", "candidate", 20, browse_jobs),
+    ("apply_job", "candidate", 8, apply_job),
+    ("interview", "candidate", 7, interview),
+    ("login", "any", 5, relogin),
+]
+
+
+async def user_loop(user: VirtualUser, deadline: float, stats: Stats, rng: random.Random) -> None:
+    options = [s for s in SCENARIOS if s[1] in (user.role, "any")]
+    weights = [s[2] for s in options]
+    while time.monotonic() < deadline:
+        if not await user.ensure_login():
+            stats.scenario_failures["login"] += 1
+            await asyncio.sleep(0.5)
+            continue
+        name, _, _, scenario = rng.choices(options, weights)[0]
+        stats.scenarios[name] += 1
+        if not await scenario(user):
+            stats.scenario_failures[name] += 1
+
+
+# ---------------------------------------------------------
+# STAGES
+# ---------------------------------------------------------
+async def run_stage(base_url: str, rps: float, duration: float, users: int, recruiters: int, candidates: int, seed: int) -> Tuple[Stats, float]:
+    stats = Stats()
+    pacer = Pacer(rps)
+    rng = random.Random(seed)
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+        vusers = []
+        for i in range(users):
+            # Roughly one recruiter for every three candidates, as in production traffic
+            if i % 4 == 0:
+                email, role = bench_email("recruiter", (i // 4) % recruiters), "recruiter"
+            else:
+                email, role = bench_email("candidate", i % candidates), "candidate"
+            vusers.append(VirtualUser(client, pacer, stats, email, role))
+
+        start = time.monotonic()
+        deadline = start + duration
+        await asyncio.gather(*(user_loop(u, deadline, stats, random.Random(rng.random())) for u in vusers))
+        elapsed = time.monotonic() - start
+
+    return stats, elapsed
+
+
+def summarize(stats: Stats, rps: float, elapsed: float, workers: int) -> Dict[str, Any]:
+    all_latencies = [v for values in stats.latencies.values() for v in values]
+    total = stats.total_requests
+    errors = sum(stats.errors.values())
+    achieved = total / elapsed if elapsed else 0.0
+    return {
+        "target_rps": rps,
+        "achieved_rps": round(achieved, 2),
+        "achieved_rps_per_worker": round(achieved / workers, 2),
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "p50_ms": round(percentile(all_latencies, 50), 2),
+        "p95_ms": round(percentile(all_latencies, 95), 2),
+        "p99_ms": round(percentile(all_latencies, 99), 2),
+        "endpoints": {
+            label: {
+                "requests": len(values),
+                "errors": stats.errors.get(label, 0),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+            }
+            for label, values in sorted(stats.latencies.items())
+        },
+        "scenarios": {
+            name: {"runs": count, "failures": stats.scenario_failures.get(name, 0)}
+            for name, count in sorted(stats.scenarios.items())
+        },
+    }
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    print(
+        f"\n=== target {summary['target_rps']} rps -> achieved {summary['achieved_rps']} rps "
+        f"({summary['achieved_rps_per_worker']}/worker), {summary['requests']} requests, "
+        f"error rate {summary['error_rate']:.2%}, p50 {summary['p50_ms']}ms p95 {summary['p95_ms']}ms p99 {summary['p99_ms']}ms"
+    )
+    print(f"{'endpoint':52} {'reqs':>6} {'errs':>5} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for label, e in summary["endpoints"].items():
+        print(f"{label:52} {e['requests']:>6} {e['errors']:>5} {e['p50_ms']:>8.1f} {e['p95_ms']:>8.1f} {e['p99_ms']:>8.1f}")
+    print("scenarios: " + ", ".join(f"{k}={v['runs']} ({v['failures']} failed)" for k, v in summary["scenarios"].items()))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Skreenit load test")
+    parser.add_argument("--rps", type=float, nargs="+", default=[50.0], help="Target request rate; several values run a step test")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per stage")
+    parser.add_argument("--users", type=int, default=40, help="Concurrent virtual users")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the local server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Injected latency per Supabase round trip")
+    parser.add_argument("--target", help="Use an already running server instead of starting one")
+    parser.add_argument("--recruiters", type=int, default=5)
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Exit 1 when any stage exceeds this")
+    parser.add_argument("--json", dest="json_out", help="Write stage summaries to this file")
+    args = parser.parse_args(argv)
+
+    server = None
+    fixtures_file = None
+    base_url = args.target
+    if not base_url:
+        fixtures = build_fixtures(recruiters=args.recruiters, candidates=args.candidates)
+        fixtures_file = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        json.dump(fixtures, fixtures_file)
+        fixtures_file.close()
+        server = start_server(args.port, args.workers, args.latency_ms, fixtures_file.name)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    summaries = []
+    try:
+        wait_until_ready(base_url)
+        for stage, rps in enumerate(args.rps):
+            stats, elapsed = asyncio.run(run_stage(
+                base_url, rps, args.duration, args.users, args.recruiters, args.candidates, args.seed + stage
+            ))
+            summary = summarize(stats, rps, elapsed, args.workers)
+            print_summary(summary)
+            summaries.append(summary)
+    finally:
+        if server:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        if fixtures_file:
+            os.unlink(fixtures_file.name)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as fh:
+            json.dump({"settings": vars(args), "stages": summaries}, fh, indent=2)
+
+    failed = [s for s in summaries if s["error_rate"] > args.max_error_rate]
+    if failed:
+        print(f"\n❌ Error rate above {args.max_error_rate:.2%} at {[s['target_rps'] for s in failed]} rps")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Throughput of the rescoring pipeline (services/rescoring_service.py).
+
+Seeds the in-memory Supabase stand-in with `jobs * applications_per_job`
+applications and rescores all of them, once per --processes value.
+
+Usage (from backend/):
+    python -m benchmarks.rescoring_benchmark --jobs 1000 --applications-per-job 100 --processes 0 4
+"""
+
+import os
+import sys
+import time
+import argparse
+from typing import List, Optional
+
+os.environ["SUPABASE_BACKEND"] = "memory"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.fixtures import build_fixtures  # noqa: E402
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rescoring pipeline benchmark")
+    parser.add_argument("--jobs", type=int, default=400)
+    parser.add_argument("--applications-per-job", type=int, default=50)
+    parser.add_argument("--candidates", type=int, default=2000)
+    parser.add_argument("--processes", type=int, nargs="+", default=[0, 2])
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    from services.supabase_client import get_client
+    from services.rescoring_service import RescoringWorker
+
+    recruiters = max(1, args.jobs // 20)
+    fixtures = build_fixtures(
+        recruiters=recruiters,
+        jobs_per_recruiter=max(1, args.jobs // recruiters),
+        candidates=args.candidates,
+        applications_per_job=args.applications_per_job,
+    )
+    fake = get_client().raw
+    started = time.perf_counter()
+    fake.load_fixtures(fixtures)
+    fake.db.latency = args.latency_ms / 1000.0
+    total = len(fake.db.tables["job_applications"])
+    print(f"Seeded {total} applications in {time.perf_counter() - started:.1f}s")
+
+    for processes in args.processes:
+        worker = RescoringWorker(processes)
+        executor = worker.executor()
+        if executor is not None:
+            # Pay the process start-up cost outside the measurement
+            list(executor.map(abs, range(processes)))
+
+        run = worker.service.enqueue(None, "benchmark")
+        started = time.perf_counter()
+        result = worker.service.run(run["id"], executor=executor)
+        elapsed = time.perf_counter() - started
+        worker.shutdown()
+
+        print(
+            f"processes={processes:<3} {result['processed']} applications in {elapsed:.1f}s "
+            f"({result['processed'] / elapsed:,.0f}/s), status={result['status']}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
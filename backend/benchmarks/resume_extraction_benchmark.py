@@ -0,0 +1,168 @@
+"""
+Throughput of resume text extraction (utils_others/resume_text.py).
+
+Extracts every PDF/DOCX/TXT file under --corpus (or a generated synthetic
+corpus) once per --processes value and reports documents/s, MB/s and the
+peak RSS of the worker processes.
+
+Usage (from backend/):
+    python -m benchmarks.resume_extraction_benchmark --corpus ~/resumes --processes 0 2 4
+"""
+
+import io
+import os
+import sys
+import time
+import random
+import zipfile
+import argparse
+import resource
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from utils_others.resume_text import extract_text  # noqa: E402
+
+EXTENSIONS = (".pdf", ".docx", ".txt")
+WORDS = (
+    "python fastapi postgres react docker kubernetes aws terraform led team of engineers "
+    "designed implemented scalable services reduced latency improved reliability mentored "
+    "interns delivered roadmap stakeholders analytics pipeline machine learning sql"
+).split()
+
+
+# ---------------------------------------------------------
+# SYNTHETIC CORPUS
+# ---------------------------------------------------------
+def _lines(rng: random.Random, count: int) -> List[str]:
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))) for _ in range(count)]
+
+
+def make_pdf(lines: List[str], lines_per_page: int = 45) -> bytes:
+    """Minimal multi-page PDF with one Helvetica text stream per page."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        ops = ["BT /F1 10 Tf 14 TL 50 790 Td"]
+        for line in page:
+            ops.append("(%s) '" % line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)"))
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def make_docx(lines: List[str]) -> bytes:
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = "".join(f"<w:p><w:r><w:t>{line}</w:t></w:r></w:p>" for line in lines)
+    document = f'<?xml version="1.0" encoding="UTF-8"?><w:document xmlns:w="{ns}"><w:body>{body}</w:body></w:document>'
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", '<?xml version="1.0"?><Types/>')
+        archive.writestr("word/document.xml", document)
+    return out.getvalue()
+
+
+def synthetic_corpus(count: int, seed: int = 7) -> List[Tuple[str, bytes]]:
+    rng = random.Random(seed)
+    docs = []
+    for i in range(count):
+        lines = _lines(rng, rng.randint(60, 240))
+        if i % 2:
+            docs.append((f"resume_{i}.docx", make_docx(lines)))
+        else:
+            docs.append((f"resume_{i}.pdf", make_pdf(lines)))
+    return docs
+
+
+def load_corpus(path: str) -> List[Tuple[str, bytes]]:
+    docs = []
+    for root, _, files in os.walk(os.path.expanduser(path)):
+        for name in sorted(files):
+            if name.lower().endswith(EXTENSIONS):
+                with open(os.path.join(root, name), "rb") as fh:
+                    docs.append((name, fh.read()))
+    return docs
+
+
+# ---------------------------------------------------------
+# MEASUREMENT
+# ---------------------------------------------------------
+def _safe_extract(filename: str, data: bytes) -> int:
+    try:
+        return extract_text(filename, data)["chars"]
+    except Exception:
+        return -1
+
+
+def run(docs: List[Tuple[str, bytes]], processes: int) -> Tuple[float, int]:
+    """Returns (elapsed seconds, failed documents)."""
+    names = [name for name, _ in docs]
+    blobs = [data for _, data in docs]
+    if processes <= 0:
+        started = time.perf_counter()
+        results = [_safe_extract(name, data) for name, data in docs]
+        return time.perf_counter() - started, sum(1 for r in results if r < 0)
+
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+        # Pay the process start-up cost outside the measurement
+        list(pool.map(abs, range(processes)))
+        started = time.perf_counter()
+        results = list(pool.map(_safe_extract, names, blobs, chunksize=4))
+        return time.perf_counter() - started, sum(1 for r in results if r < 0)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Resume extraction benchmark")
+    parser.add_argument("--corpus", help="Folder of .pdf/.docx/.txt resumes (default: synthetic)")
+    parser.add_argument("--documents", type=int, default=200, help="Synthetic corpus size")
+    parser.add_argument("--processes", type=int, nargs="+", default=[0, 2])
+    args = parser.parse_args(argv)
+
+    docs = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.documents)
+    if not docs:
+        print("No documents found")
+        return 1
+    megabytes = sum(len(data) for _, data in docs) / (1024 * 1024)
+    print(f"Corpus: {len(docs)} documents, {megabytes:.1f} MB")
+
+    for processes in args.processes:
+        elapsed, failed = run(docs, processes)
+        # ru_maxrss is KB on Linux; children are only counted once they exit
+        peak = resource.getrusage(resource.RUSAGE_SELF if processes <= 0 else resource.RUSAGE_CHILDREN).ru_maxrss
+        print(
+            f"processes={processes:<3} {len(docs) / elapsed:,.1f} docs/s  {megabytes / elapsed:,.2f} MB/s  "
+            f"failed={failed}  peak_rss={peak / 1024:.0f} MB"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""
+End-to-end benchmarks for the hot API endpoints.
+
+Drives the real FastAPI app through Starlette's TestClient against the
+in-memory Supabase stand-in (SUPABASE_BACKEND=memory) with a configurable
+per-round-trip latency, then compares the results with baselines.json.
+
+Usage (from backend/):
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --latency-ms 5 --iterations 200
+    python -m benchmarks.run_benchmarks --update-baseline
+
+Exit code is 1 when a regression is flagged.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# Must be configured before the app (and its services) are imported
+os.environ["SUPABASE_BACKEND"] = "memory"
+os.environ.setdefault("SUPABASE_JWT_SECRET", "benchmark-jwt-secret-benchmark-jwt-secret")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.fixtures import build_fixtures, bench_email, BENCH_PASSWORD  # noqa: E402
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baselines.json")
+VIDEO_PAYLOAD = b"\x1a\x45\xdf\xa3" + b"\x00" * (1024 * 1024 - 4)  # ~1 MiB webm-like blob
+
+
+# ---------------------------------------------------------
+# STATS HELPERS
+# ---------------------------------------------------------
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+# ---------------------------------------------------------
+# APP SETUP
+# ---------------------------------------------------------
+class BenchContext:
+    """Holds the app client, the fake database and per-role tokens."""
+
+    def __init__(self, latency_ms: float, fixtures: Dict[str, Any]):
+        from fastapi.testclient import TestClient
+        import main
+        from services.supabase_client import get_client
+
+        self.app = main.app
+        self.fake = get_client().raw
+        self.fake.load_fixtures(fixtures)
+        self.db = self.fake.db
+        self.TestClient = TestClient
+
+        meta = fixtures["meta"]
+        self.recruiter_id = meta["recruiter_ids"][0]
+        self.candidate_id = meta["candidate_ids"][0]
+        self.tokens = {
+            "recruiter": self._token(bench_email("recruiter", 0)),
+            "candidate": self._token(bench_email("candidate", 0)),
+        }
+
+        recruiter_jobs = {j["id"] for j in self.db.tables["jobs"] if j["created_by"] == self.recruiter_id}
+        self.application_id = next(
+            a["id"] for a in self.db.tables["job_applications"] if a["job_id"] in recruiter_jobs
+        )
+
+        self.db.latency = latency_ms / 1000.0
+        self.db.reset_counters()
+
+    def _token(self, email: str) -> str:
+        res = self.fake.auth.sign_in_with_password({"email": email, "password": BENCH_PASSWORD})
+        return res.session.access_token
+
+    def headers(self, role: str) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.tokens[role]}"}
+
+    def client(self):
+        return self.TestClient(self.app)
+
+
+# ---------------------------------------------------------
+# SCENARIOS
+# ---------------------------------------------------------
+def _get(path: str, role: str) -> Callable:
+    def call(ctx: BenchContext, client) -> Any:
+        return client.get(path.format(ctx=ctx), headers=ctx.headers(role))
+    return call
+
+
+def _video_upload(ctx: BenchContext, client) -> Any:
+    return client.post(
+        "/api/v1/video/upload",
+        headers=ctx.headers("candidate"),
+        files={"file": ("answer.webm", VIDEO_PAYLOAD, "video/webm")},
+    )
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "dashboard_summary": _get("/api/v1/dashboard/", "recruiter"),
+    "dashboard_summary_candidate": _get("/api/v1/dashboard/", "candidate"),
+    "dashboard_jobs": _get("/api/v1/dashboard/jobs", "candidate"),
+    "recruiter_applications": _get("/api/v1/recruiter/applications", "recruiter"),
+    "recruiter_application_detail": _get("/api/v1/recruiter/applications/{ctx.application_id}", "recruiter"),
+    "applicant_profile": _get("/api/v1/applicant/profile", "candidate"),
+    "video_upload": _video_upload,
+}
+
+
+def _settle() -> None:
+    """Waits for background work queued during warmup, so it is not counted against the endpoint."""
+    from services.funnel_service import funnel_worker
+    from services.recommendation_service import recommendation_worker
+
+    funnel_worker.drain()
+    recommendation_worker.drain()
+
+
+def run_scenario(ctx: BenchContext, name: str, iterations: int, warmup: int, concurrency: int) -> Dict[str, Any]:
+    call = SCENARIOS[name]
+    timings: List[float] = []
+    failures = 0
+    lock = threading.Lock()
+
+    warm_client = ctx.client()
+    for _ in range(warmup):
+        call(ctx, warm_client)
+
+    _settle()
+    ctx.db.reset_counters()
+
+    def worker(count: int) -> None:
+        nonlocal failures
+        client = ctx.client()
+        local: List[float] = []
+        local_failures = 0
+        for _ in range(count):
+            start = time.perf_counter()
+            res = call(ctx, client)
+            local.append((time.perf_counter() - start) * 1000)
+            if res.status_code >= 400:
+                local_failures += 1
+        with lock:
+            timings.extend(local)
+            failures += local_failures
+
+    shares = [iterations // concurrency + (1 if i < iterations % concurrency else 0) for i in range(concurrency)]
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, [s for s in shares if s]))
+    wall = time.perf_counter() - wall_start
+
+    return {
+        "requests": len(timings),
+        "failures": failures,
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "throughput_rps": round(len(timings) / wall, 2) if wall else 0.0,
+        "round_trips": round(ctx.db.call_count / max(len(timings), 1), 2),
+        "round_trips_by_table": {
+            table: round(count / max(len(timings), 1), 2)
+            for table, count in sorted(ctx.db.calls_by_table.items())
+        },
+    }
+
+
+# ---------------------------------------------------------
+# BASELINES
+# ---------------------------------------------------------
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def find_regressions(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Round trips are deterministic and must never grow.
+    Latency and throughput may drift by 'tolerance' (fraction) before flagging.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get("endpoints", {}).get(name)
+        if not base:
+            continue
+        if current["failures"]:
+            regressions.append(f"{name}: {current['failures']} failed requests")
+        if current["round_trips"] > base["round_trips"]:
+            regressions.append(f"{name}: round trips {base['round_trips']} -> {current['round_trips']}")
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['throughput_rps']} -> {current['throughput_rps']} rps")
+    return regressions
+
+
+def print_table(results: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    header = f"{'endpoint':32} {'p50':>9} {'p95':>9} {'p99':>9} {'rps':>9} {'trips':>6} {'base p95':>9} {'base trips':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        base = (baseline or {}).get("endpoints", {}).get(name, {})
+        print(
+            f"{name:32} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} "
+            f"{r['throughput_rps']:>9.1f} {r['round_trips']:>6} "
+            f"{base.get('p95_ms', '-'):>9} {base.get('round_trips', '-'):>10}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Skreenit API benchmarks")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Injected latency per Supabase round trip")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed latency/throughput drift (fraction)")
+    parser.add_argument("--only", nargs="*", choices=sorted(SCENARIOS), help="Run a subset of endpoints")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", dest="json_out", help="Also write raw results to this file")
+    args = parser.parse_args(argv)
+
+    settings = {
+        "latency_ms": args.latency_ms,
+        "iterations": args.iterations,
+        "concurrency": args.concurrency,
+    }
+    ctx = BenchContext(args.latency_ms, build_fixtures())
+
+    results = {}
+    for name in args.only or SCENARIOS:
+        results[name] = run_scenario(ctx, name, args.iterations, args.warmup, args.concurrency)
+
+    baseline = load_baseline(args.baseline)
+    print_table(results, baseline)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as fh:
+            json.dump({"settings": settings, "endpoints": results}, fh, indent=2)
+
+    if args.update_baseline:
+        merged = baseline or {"settings": settings, "endpoints": {}}
+        merged["settings"] = settings
+        merged["endpoints"].update(results)
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(merged, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print("\nNo baseline found; run with --update-baseline to create one.")
+        return 0
+
+    if baseline.get("settings") != settings:
+        print(f"\n⚠️ Baseline was recorded with {baseline.get('settings')}; comparing anyway.")
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print("\n❌ Regressions:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print("\n✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+"""
+Idle-connection load test for GET /api/v1/notification/stream.
+
+Opens thousands of Server-Sent Events connections against one worker, keeps
+them idle across at least one heartbeat, then measures:
+    - server RSS per open stream
+    - /health latency while the streams are held (event loop responsiveness)
+    - publish -> delivery latency (POST /notification/read-all publishes a
+      read_all event to the caller's own streams)
+
+By default a uvicorn server is started with the in-memory Supabase stand-in,
+as in benchmarks.load_test. Access tokens are signed locally with the
+server's JWT secret, so opening connections does not go through /auth/login.
+
+Usage (from backend/):
+    python -m benchmarks.sse_load_test --connections 5000 --idle 20
+    python -m benchmarks.sse_load_test --target http://localhost:8000 --jwt-secret ...
+
+Streams are spread over --candidates users; each user may hold at most
+NOTIFICATION_MAX_STREAMS_PER_USER streams (5 by default).
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import jwt
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.fixtures import build_fixtures  # noqa: E402
+from benchmarks.load_test import JWT_SECRET, wait_until_ready  # noqa: E402
+from benchmarks.run_benchmarks import percentile  # noqa: E402
+
+STREAM_PATH = "/api/v1/notification/stream"
+READ_ALL_PATH = "/api/v1/notification/read-all"
+
+
+# ---------------------------------------------------------
+# SERVER
+# ---------------------------------------------------------
+def start_server(port: int, fixtures_path: str, heartbeat: float) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "SUPABASE_BACKEND": "memory",
+        "SUPABASE_FAKE_FIXTURES": fixtures_path,
+        "SUPABASE_JWT_SECRET": JWT_SECRET,
+        "NOTIFICATION_HEARTBEAT_SECONDS": str(heartbeat),
+        "LOG_LEVEL": env.get("LOG_LEVEL", "WARNING"),
+        "ENVIRONMENT": "loadtest",
+    })
+    cmd = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", "1", "--log-level", "warning", "--no-access-log",
+        "--backlog", "4096",
+    ]
+    return subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL)
+
+
+def rss_kb(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def raise_fd_limit(needed: int) -> None:
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = min(hard, max(soft, needed))
+    if target > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+def make_token(user: Dict[str, Any], secret: str) -> str:
+    payload = {
+        "sub": user["id"],
+        "email": user["email"],
+        "role": "authenticated",
+        "user_metadata": user.get("user_metadata") or {},
+        "exp": int(time.time()) + 3600,
+    }
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+# ---------------------------------------------------------
+# SSE CLIENT
+# ---------------------------------------------------------
+class StreamConnection:
+    """Minimal HTTP/1.1 SSE reader on a raw socket (httpx costs too much per idle stream)."""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.ready = asyncio.Event()
+        self.pings = 0
+        self.events: Dict[str, List[float]] = {}
+        self.waiters: List[asyncio.Future] = []
+        self.error: Optional[str] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def open(self, host: str, port: int, token: str) -> None:
+        reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(
+            f"GET {STREAM_PATH} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+            f"Authorization: Bearer {token}\r\nAccept: text/event-stream\r\n\r\n".encode()
+        )
+        await self.writer.drain()
+        status = await reader.readline()
+        if b" 200 " not in status:
+            raise RuntimeError(status.decode(errors="replace").strip() or "connection closed")
+        chunked = False
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            if line.lower().startswith(b"transfer-encoding:") and b"chunked" in line.lower():
+                chunked = True
+        asyncio.create_task(self._read(reader, chunked))
+        await asyncio.wait_for(self.ready.wait(), 30)
+
+    async def _read(self, reader: asyncio.StreamReader, chunked: bool) -> None:
+        buffer = ""
+        try:
+            while True:
+                if chunked:
+                    size = int((await reader.readline()).strip() or b"0", 16)
+                    if size == 0:
+                        break
+                    data = await reader.readexactly(size + 2)
+                    buffer += data[:-2].decode()
+                else:
+                    data = await reader.read(4096)
+                    if not data:
+                        break
+                    buffer += data.decode()
+                while "\n\n" in buffer:
+                    block, buffer = buffer.split("\n\n", 1)
+                    self._dispatch(block)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+            self.error = str(e) or type(e).__name__
+        if self.error is None:
+            self.error = "stream closed"
+
+    def _dispatch(self, block: str) -> None:
+        name = None
+        for line in block.splitlines():
+            if line.startswith(":"):
+                self.pings += 1
+            elif line.startswith("event:"):
+                name = line[6:].strip()
+        if name is None:
+            return
+        self.events.setdefault(name, []).append(time.perf_counter())
+        if name == "ready":
+            self.ready.set()
+        for fut in self.waiters:
+            if not fut.done() and fut.event_name == name:
+                fut.set_result(time.perf_counter())
+        self.waiters = [f for f in self.waiters if not f.done()]
+
+    def wait_for(self, name: str) -> asyncio.Future:
+        fut = asyncio.get_running_loop().create_future()
+        fut.event_name = name
+        self.waiters.append(fut)
+        return fut
+
+    def close(self) -> None:
+        if self.writer:
+            self.writer.close()
+
+
+# ---------------------------------------------------------
+# RUN
+# ---------------------------------------------------------
+async def run(args, base_url: str, users: List[Dict[str, Any]], server_pid: Optional[int]) -> Dict[str, Any]:
+    parts = urlsplit(base_url)
+    host, port = parts.hostname, parts.port or 80
+    tokens = {u["id"]: make_token(u, args.jwt_secret) for u in users}
+    rng = random.Random(args.seed)
+
+    rss_before = rss_kb(server_pid) if server_pid else None
+    conns: List[StreamConnection] = []
+    connect_ms: List[float] = []
+    failures: Dict[str, int] = {}
+    sem = asyncio.Semaphore(args.open_concurrency)
+
+    async def open_one(i: int) -> None:
+        user = users[i % len(users)]
+        conn = StreamConnection(user["id"])
+        async with sem:
+            start = time.perf_counter()
+            try:
+                await conn.open(host, port, tokens[user["id"]])
+            except Exception as e:
+                key = str(e)[:80] or type(e).__name__
+                failures[key] = failures.get(key, 0) + 1
+                conn.close()
+                return
+            connect_ms.append((time.perf_counter() - start) * 1000)
+            conns.append(conn)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(open_one(i) for i in range(args.connections)))
+    open_seconds = time.perf_counter() - start
+    print(f"opened {len(conns)}/{args.connections} streams in {open_seconds:.1f}s")
+
+    await asyncio.sleep(args.idle)
+    rss_idle = rss_kb(server_pid) if server_pid else None
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+        health_ms = []
+        for _ in range(args.samples):
+            t0 = time.perf_counter()
+            await client.get("/health")
+            health_ms.append((time.perf_counter() - t0) * 1000)
+
+        delivery_ms = []
+        missed = 0
+        by_user: Dict[str, List[StreamConnection]] = {}
+        for conn in conns:
+            if conn.error is None:
+                by_user.setdefault(conn.user_id, []).append(conn)
+        sample_users = rng.sample(sorted(by_user), min(args.samples, len(by_user)))
+        for user_id in sample_users:
+            futures = [conn.wait_for("read_all") for conn in by_user[user_id]]
+            t0 = time.perf_counter()
+            res = await client.post(READ_ALL_PATH, headers={"Authorization": f"Bearer {tokens[user_id]}"})
+            if res.status_code != 200:
+                missed += len(futures)
+                continue
+            done, pending = await asyncio.wait(futures, timeout=5)
+            missed += len(pending)
+            delivery_ms.extend((f.result() - t0) * 1000 for f in done)
+
+    dropped = sum(1 for conn in conns if conn.error is not None)
+    pings = sum(conn.pings for conn in conns)
+    for conn in conns:
+        conn.close()
+
+    per_conn_kb = None
+    if rss_before is not None and rss_idle is not None and conns:
+        per_conn_kb = round((rss_idle - rss_before) / len(conns), 2)
+    return {
+        "connections": args.connections,
+        "opened": len(conns),
+        "open_failures": failures,
+        "dropped_while_idle": dropped,
+        "heartbeats_received": pings,
+        "open_seconds": round(open_seconds, 2),
+        "connect_p50_ms": round(percentile(connect_ms, 50), 2),
+        "connect_p95_ms": round(percentile(connect_ms, 95), 2),
+        "server_rss_before_kb": rss_before,
+        "server_rss_idle_kb": rss_idle,
+        "server_kb_per_stream": per_conn_kb,
+        "health_p50_ms": round(percentile(health_ms, 50), 2),
+        "health_p95_ms": round(percentile(health_ms, 95), 2),
+        "delivery_samples": len(delivery_ms),
+        "delivery_missed": missed,
+        "delivery_p50_ms": round(percentile(delivery_ms, 50), 2),
+        "delivery_p95_ms": round(percentile(delivery_ms, 95), 2),
+        "delivery_max_ms": round(max(delivery_ms), 2) if delivery_ms else 0.0,
+    }
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    print(f"\n=== {summary['opened']}/{summary['connections']} idle SSE streams")
+    if summary["open_failures"]:
+        print(f"open failures: {summary['open_failures']}")
+    print(f"dropped while idle: {summary['dropped_while_idle']}, heartbeats received: {summary['heartbeats_received']}")
+    print(f"connect p50 {summary['connect_p50_ms']}ms p95 {summary['connect_p95_ms']}ms ({summary['open_seconds']}s total)")
+    if summary["server_kb_per_stream"] is not None:
+        print(
+            f"server RSS {summary['server_rss_before_kb']} -> {summary['server_rss_idle_kb']} KB "
+            f"({summary['server_kb_per_stream']} KB per stream)"
+        )
+    print(f"/health while idle: p50 {summary['health_p50_ms']}ms p95 {summary['health_p95_ms']}ms")
+    print(
+        f"publish -> delivery: {summary['delivery_samples']} events, {summary['delivery_missed']} missed, "
+        f"p50 {summary['delivery_p50_ms']}ms p95 {summary['delivery_p95_ms']}ms max {summary['delivery_max_ms']}ms"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Skreenit notification stream load test")
+    parser.add_argument("--connections", type=int, default=2000, help="Idle SSE streams to hold open")
+    parser.add_argument("--candidates", type=int, default=1000, help="Users the streams are spread over")
+    parser.add_argument("--idle", type=float, default=20.0, help="Seconds to hold the streams before measuring")
+    parser.add_argument("--heartbeat", type=float, default=5.0, help="NOTIFICATION_HEARTBEAT_SECONDS for the local server")
+    parser.add_argument("--samples", type=int, default=200, help="Publish -> delivery samples")
+    parser.add_argument("--open-concurrency", type=int, default=200, help="Connections opened in parallel")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--target", help="Use an already running server instead of starting one")
+    parser.add_argument("--jwt-secret", default=JWT_SECRET, help="SUPABASE_JWT_SECRET of --target")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--max-failure-rate", type=float, default=0.0, help="Exit 1 when more streams fail or drop")
+    parser.add_argument("--json", dest="json_out", help="Write the summary to this file")
+    args = parser.parse_args(argv)
+
+    raise_fd_limit(args.connections * 2 + 256)
+
+    fixtures = build_fixtures(recruiters=1, jobs_per_recruiter=1, candidates=args.candidates, applications_per_job=1)
+    users = [u for u in fixtures["auth_users"] if u["user_metadata"].get("role") == "candidate"]
+
+    server = None
+    fixtures_file = None
+    base_url = args.target
+    if not base_url:
+        fixtures_file = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        json.dump(fixtures, fixtures_file)
+        fixtures_file.close()
+        server = start_server(args.port, fixtures_file.name, args.heartbeat)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        wait_until_ready(base_url)
+        summary = asyncio.run(run(args, base_url, users, server.pid if server else None))
+    finally:
+        if server:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        if fixtures_file:
+            os.unlink(fixtures_file.name)
+
+    print_summary(summary)
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as fh:
+            json.dump({"settings": vars(args), "summary": summary}, fh, indent=2)
+
+    failed = args.connections - summary["opened"] + summary["dropped_while_idle"] + summary["delivery_missed"]
+    if failed > args.connections * args.max_failure_rate:
+        print(f"\n❌ {failed} streams failed, dropped or missed events")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,14 @@ from utils_others.error_handler import register_exception_handlers
 
 from middleware.security_headers import SecurityHeadersMiddleware
 from middleware.auth_middleware import AuthMiddleware, EXCLUDED_PATHS
+from middleware.request_id import RequestIDMiddleware
+from middleware.tracing import TracingMiddleware
+from middleware.profiler import ProfilingMiddleware
+from middleware.query_stats import QueryStatsMiddleware
+from services.rescoring_service import rescoring_worker
+from services.resume_service import shutdown_executor as shutdown_resume_executor
+from services.notification_broker import notification_broker
+from services.analytics_ingest import analytics_buffer
 
 from routers import (
     auth,
@@ -21,7 +29,9 @@ from routers import (
     dashboard,
     analytics,
     notification,
-    video
+    video,
+    admin,
+    skills
 )
 
 ENV = os.getenv("ENVIRONMENT", "development")
@@ -133,6 +143,8 @@ api.include_router(dashboard.router, tags=["Dashboard"])
 api.include_router(analytics.router, tags=["Analytics"])
 api.include_router(notification.router, tags=["Notification"])
 api.include_router(video.router, tags=["Video"])
+api.include_router(admin.router, tags=["Admin"])
+api.include_router(skills.router, tags=["Skills"])
 
 @api.get("/health")
 async def versioned_health():
@@ -145,9 +157,13 @@ app.include_router(api)
 # ---------------------------------------------------------
 # FastAPI executes middleware in REVERSE order of addition.
 # Last added = First executed.
-# Desired Execution Flow: CORS -> Security -> Auth -> App
+# Desired Execution Flow: CORS -> Request ID -> Tracing -> Query Stats -> Security -> Auth -> Profiler -> App
 
-# 3. Auth Middleware (Added First, Executed Last - Inner Layer)
+# 6. Profiler (Opt-in, runs inside Auth so admin header toggles can be checked)
+if os.getenv("PROFILER_ENABLED", "false").lower() == "true":
+    app.add_middleware(ProfilingMiddleware)
+
+# 5. Auth Middleware (Executed after Security - Inner Layer)
 class PatchedAuthMiddleware(AuthMiddleware): 
     async def dispatch(self, request, call_next):
         if request.method == "OPTIONS":
@@ -156,10 +172,21 @@ class PatchedAuthMiddleware(AuthMiddleware):
 
 app.add_middleware(PatchedAuthMiddleware, excluded_paths=EXCLUDED_PATHS)
 
-# 2. Security Headers (Added Second, Executed Middle)
+# 4. Security Headers (Executed Middle)
 app.add_middleware(SecurityHeadersMiddleware)
 
-# 1. CORS Middleware (Added Third, Executed First)
+# 3b. Query Stats (Supabase round trips per request, N+1 warnings)
+# QUERY_DEBUG_HEADERS=true adds X-DB-Queries / X-DB-Tables / X-DB-N-Plus-One
+app.add_middleware(QueryStatsMiddleware)
+
+# 3. Tracing (Root span per request, W3C traceparent in/out)
+# Spans are exported when TRACE_EXPORTER=console|file (TRACE_FILE for the path)
+app.add_middleware(TracingMiddleware)
+
+# 2. Request ID (Sets the request_id ContextVar used by logs and spans)
+app.add_middleware(RequestIDMiddleware)
+
+# 1. CORS Middleware (Added Last, Executed First)
 DEFAULT_ALLOWED_ORIGINS = [
     "https://www.skreenit.com",
     "https://skreenit.com",
@@ -204,8 +231,14 @@ app.add_middleware(
 # ---------------------------------------------------------
 @app.on_event("startup")
 async def on_startup():
+    await notification_broker.start()
     logger.info("Backend Started")
 
 @app.on_event("shutdown")
 async def on_shutdown():
+    rescoring_worker.shutdown()
+    shutdown_resume_executor()
+    await notification_broker.stop()
+    # Writes buffered analytics events before the process exits
+    analytics_buffer.close()
     logger.info("Backend Stopped")
\ No newline at end of file
@@ -7,6 +7,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
 from utils_others.logger import logger
+from utils_others.tracing import start_span
 
 # ---------------------------------------------------------
 # CONFIG: EXCLUDED PATHS (Public)
@@ -62,12 +63,13 @@ class AuthMiddleware(BaseHTTPMiddleware):
         secret = os.getenv("SUPABASE_JWT_SECRET", "").strip()
 
         try:
-            payload = jwt.decode(
-                token,
-                secret,
-                algorithms=["HS256"],
-                options={"verify_aud": False}
-            )
+            with start_span("middleware.auth.verify_token"):
+                payload = jwt.decode(
+                    token,
+                    secret,
+                    algorithms=["HS256"],
+                    options={"verify_aud": False}
+                )
 
             # ✅ CRITICAL FIX: Map 'sub' (from JWT) to 'id' (expected by your code)
             payload["id"] = payload.get("sub")
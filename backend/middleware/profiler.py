@@ -0,0 +1,55 @@
+# backend/middleware/profiler.py
+
+import os
+import time
+import threading
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from utils_others.logger import logger, request_id_context
+from utils_others.profiler import profiler, profile_store
+
+PROFILE_HEADER = "X-Profile"
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """
+    Opt-in sampling profiler (PROFILER_ENABLED=true).
+    Every request is sampled while it runs; the profile is only kept when
+    the request is slower than PROFILER_THRESHOLD_MS or when an admin sends
+    'X-Profile: 1'. Must run after AuthMiddleware so the user is known.
+    """
+
+    def __init__(self, app, threshold_ms: float | None = None):
+        super().__init__(app)
+        self.threshold_ms = threshold_ms if threshold_ms is not None else float(
+            os.getenv("PROFILER_THRESHOLD_MS", "1000")
+        )
+
+    async def dispatch(self, request: Request, call_next):
+        session = profiler.begin(threading.get_ident())
+        start = time.perf_counter()
+        try:
+            return await call_next(request)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            profiler.end(session)
+
+            reason = None
+            if duration_ms >= self.threshold_ms:
+                reason = "slow"
+            elif request.headers.get(PROFILE_HEADER) == "1" and _is_admin(request):
+                reason = "header"
+
+            if reason and session.samples:
+                request_id = request_id_context.get() or getattr(request.state, "request_id", None)
+                profile_store.add(request_id, request.method, request.url.path, duration_ms, reason, session)
+                logger.info(
+                    "Request profile captured",
+                    extra={"request_id": request_id, "request_path": request.url.path},
+                )
+
+
+def _is_admin(request: Request) -> bool:
+    user = getattr(request.state, "user", None) or {}
+    meta = user.get("user_metadata", {}) or {}
+    return str(meta.get("role", "")).lower() == "admin"
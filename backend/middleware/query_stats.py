@@ -0,0 +1,58 @@
+# backend/middleware/query_stats.py
+
+import os
+from typing import AsyncIterator
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from utils_others.logger import logger
+from utils_others.query_stats import QueryStats, track_queries, format_tables, format_n_plus_one
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    """
+    Counts Supabase round trips per request (by table and by service method)
+    and logs a warning when the same table/filter lookup repeats (N+1),
+    including lookups made while a streaming body is being sent.
+    With QUERY_DEBUG_HEADERS=true the numbers are also returned as
+    X-DB-Queries, X-DB-Tables and X-DB-N-Plus-One response headers.
+    """
+
+    def __init__(self, app, debug_headers: bool | None = None):
+        super().__init__(app)
+        self.debug_headers = debug_headers if debug_headers is not None else (
+            os.getenv("QUERY_DEBUG_HEADERS", "false").lower() == "true"
+        )
+
+    async def dispatch(self, request: Request, call_next):
+        with track_queries() as stats:
+            response = await call_next(request)
+
+        # Headers go out with the first chunk, so they only cover the queries
+        # made before the response started; streamed bodies (exports, imports,
+        # SSE) keep recording into the same stats until the stream ends
+        if self.debug_headers:
+            response.headers["X-DB-Queries"] = str(stats.total)
+            response.headers["X-DB-Tables"] = format_tables(stats)
+            findings = stats.n_plus_one()
+            if findings:
+                response.headers["X-DB-N-Plus-One"] = format_n_plus_one(findings)
+
+        response.body_iterator = self._report_after(response.body_iterator, request, stats)
+        return response
+
+    async def _report_after(self, body: AsyncIterator[bytes], request: Request, stats: QueryStats) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            findings = stats.n_plus_one()
+            if findings:
+                logger.warning(
+                    "Possible N+1 query pattern",
+                    extra={
+                        "request_path": request.url.path,
+                        "db_queries": stats.total,
+                        "db_by_method": dict(stats.by_method),
+                        "n_plus_one": findings,
+                    },
+                )
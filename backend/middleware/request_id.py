@@ -4,10 +4,8 @@ import uuid
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi.responses import JSONResponse
-from utils_others.logger import logger  # ✅ Import logger
-from contextvars import ContextVar
-
-request_id_context: ContextVar[str] = ContextVar('request_id', default='')
+# ✅ Share the logger's ContextVar so RequestIDFilter and tracing see the same id
+from utils_others.logger import logger, request_id_context
 
 class RequestIDMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
@@ -20,8 +20,8 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "camera=(), microphone=(), geolocation=()"
         )
 
-        # Prevent caching of API responses
-        response.headers["Cache-Control"] = "no-store"
+        # Prevent caching of API responses (unless a route opted in, e.g. /skills)
+        response.headers.setdefault("Cache-Control", "no-store")
 
         # Content Security Policy (CSP)
         # Allows scripts/styles from 'self' and https sources. 
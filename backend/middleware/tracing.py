@@ -0,0 +1,48 @@
+# backend/middleware/tracing.py
+
+from typing import Callable
+from fastapi import Request
+from fastapi.routing import APIRoute
+from starlette.middleware.base import BaseHTTPMiddleware
+from utils_others.tracing import start_span, format_traceparent
+
+
+class TracingMiddleware(BaseHTTPMiddleware):
+    """
+    Opens the root span for every HTTP request.
+    Continues the caller's trace when a W3C 'traceparent' header is sent
+    and returns our own 'traceparent' so clients can correlate.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        with start_span(
+            f"HTTP {request.method}",
+            traceparent=request.headers.get("traceparent"),
+            **{"http.method": request.method, "http.path": request.url.path},
+        ) as span:
+            response = await call_next(request)
+            span.set_attribute("http.status_code", response.status_code)
+
+            header = format_traceparent(span)
+            if header:
+                response.headers["traceparent"] = header
+
+            return response
+
+
+class TracedRoute(APIRoute):
+    """
+    Route class that wraps the route handler (dependencies + endpoint +
+    serialization) in its own span, named after the route template.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        span_name = f"route {self.path}"
+        attributes = {"http.route": self.path, "route.name": self.name}
+
+        async def traced_handler(request: Request):
+            with start_span(span_name, **attributes):
+                return await handler(request)
+
+        return traced_handler
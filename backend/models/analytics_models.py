@@ -1,5 +1,5 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, Any, List
 
 
 # ---------------------------------------------------------
@@ -15,6 +15,15 @@ class AnalyticsEventRequest(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# ---------------------------------------------------------
+# BATCH REQUEST MODEL (frontend instrumentation)
+# ---------------------------------------------------------
+class AnalyticsBatchRequest(BaseModel):
+    events: List[AnalyticsEventRequest] = Field(..., min_length=1, max_length=500)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 # ---------------------------------------------------------
 # RESPONSE MODEL (to frontend)
 # ---------------------------------------------------------
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import List, Optional
+from uuid import UUID
 
 # -------------------------------------------------------------------
 # SHARED / BASE MODELS
@@ -74,4 +75,100 @@ class JobUpdateRequest(BaseModel):
     salary_max: Optional[int] = None
     currency: Optional[str] = None
     is_remote: Optional[bool] = None
-    status: Optional[str] = None
\ No newline at end of file
+    status: Optional[str] = None
+
+# -------------------------------------------------------------------
+# BULK JOB IMPORT MODELS
+# -------------------------------------------------------------------
+
+JOB_STATUSES = ("draft", "active", "paused", "closed")
+
+
+class JobSkillImport(BaseModel):
+    skill_name: str = Field(..., min_length=1, max_length=100)
+    is_required: bool = False
+    proficiency_level: Optional[str] = None
+
+
+class InterviewQuestionImport(BaseModel):
+    question_text: str = Field(..., min_length=1, max_length=1000)
+    time_limit: int = Field(120, ge=10, le=600)
+
+
+class JobImportRow(JobCreateRequest):
+    """
+    One job in POST /api/v1/recruiter/jobs/import, with its skills and
+    interview questions. Validated per row so one bad row does not fail
+    the rest of the file.
+    """
+    skills: List[JobSkillImport] = Field(default_factory=list, max_length=50)
+    questions: List[InterviewQuestionImport] = Field(default_factory=list, max_length=20)
+
+    @field_validator("status")
+    @classmethod
+    def _known_status(cls, value: Optional[str]) -> str:
+        value = (value or "active").lower()
+        if value not in JOB_STATUSES:
+            raise ValueError(f"status must be one of {', '.join(JOB_STATUSES)}")
+        return value
+
+
+# -------------------------------------------------------------------
+# INTERVIEW QUESTION MODELS
+# -------------------------------------------------------------------
+
+class InterviewQuestionItem(InterviewQuestionImport):
+    # Existing question id; omit for new questions
+    id: Optional[UUID] = None
+
+
+class InterviewQuestionsReplace(BaseModel):
+    """
+    Payload for PUT /api/v1/recruiter/jobs/{job_id}/questions: the complete
+    list in display order. Missing questions are deleted.
+    """
+    questions: List[InterviewQuestionItem] = Field(..., max_length=20)
+
+    @field_validator("questions")
+    @classmethod
+    def _unique_ids(cls, value: List[InterviewQuestionItem]) -> List[InterviewQuestionItem]:
+        ids = [q.id for q in value if q.id is not None]
+        if len(ids) != len(set(ids)):
+            raise ValueError("each question id may appear only once")
+        return value
+
+
+# -------------------------------------------------------------------
+# APPLICATION STATUS MODELS
+# -------------------------------------------------------------------
+
+# application_status enum (database-schema.sql + add_application_statuses.sql)
+APPLICATION_STATUSES = (
+    "submitted",
+    "under_review",
+    "shortlisted",
+    "video_pending",
+    "video_completed",
+    "interview_scheduled",
+    "interview_submitted",
+    "rejected",
+    "hired",
+)
+
+
+class ApplicationStatusBulkUpdate(BaseModel):
+    """
+    Payload for POST /api/v1/recruiter/applications/status: moves many
+    applications to one status (e.g. bulk shortlisting). Candidates are
+    notified in the background.
+    """
+    application_ids: List[str] = Field(..., min_length=1, max_length=1000)
+    status: str = Field(..., min_length=1, max_length=50)
+
+    @field_validator("status")
+    @classmethod
+    def _known_status(cls, value: str) -> str:
+        value = value.lower()
+        if value not in APPLICATION_STATUSES:
+            raise ValueError(f"status must be one of {', '.join(APPLICATION_STATUSES)}")
+        return value
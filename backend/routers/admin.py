@@ -0,0 +1,222 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Request, HTTPException, BackgroundTasks
+from fastapi.responses import PlainTextResponse
+from middleware.role_required import ensure_permission
+from middleware.tracing import TracedRoute
+from utils_others.profiler import profile_store
+from utils_others import memory_diagnostics as memdiag
+from services.scoring_service import ScoringService
+from services.rescoring_service import rescoring_worker
+from services.resume_service import ResumeService
+from services.recommendation_service import recommendation_worker
+from services.funnel_service import funnel_worker
+from services.analytics_ingest import analytics_buffer
+
+router = APIRouter(prefix="/admin", tags=["Admin"], route_class=TracedRoute)
+scoring_svc = ScoringService()
+resume_svc = ResumeService()
+
+
+# ---------------------------------------------------------
+# LIST CAPTURED PROFILES (Admin)
+# ---------------------------------------------------------
+@router.get("/profiles")
+async def list_profiles(request: Request):
+    ensure_permission(request, "diagnostics:view")
+    return {"ok": True, "data": profile_store.list()}
+
+
+# ---------------------------------------------------------
+# DOWNLOAD PROFILE AS FOLDED STACKS (Admin)
+# ---------------------------------------------------------
+@router.get("/profiles/{request_id}")
+async def download_profile(request: Request, request_id: str):
+    ensure_permission(request, "diagnostics:view")
+
+    profile = profile_store.get(request_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return PlainTextResponse(
+        profile_store.to_folded(profile),
+        headers={"Content-Disposition": f'attachment; filename="profile-{request_id}.folded"'},
+    )
+
+
+# ---------------------------------------------------------
+# MEMORY: PROCESS RSS / GC / TRACEMALLOC STATUS (Admin)
+# ---------------------------------------------------------
+@router.get("/memory")
+async def memory_stats(request: Request):
+    ensure_permission(request, "diagnostics:view")
+    return {"ok": True, "data": memdiag.process_stats()}
+
+
+@router.post("/memory/tracemalloc/start")
+async def start_tracemalloc(request: Request, frames: int = 10):
+    ensure_permission(request, "diagnostics:view")
+    return {"ok": True, "data": memdiag.start_tracing(frames)}
+
+
+@router.post("/memory/tracemalloc/stop")
+async def stop_tracemalloc(request: Request):
+    ensure_permission(request, "diagnostics:view")
+    return {"ok": True, "data": memdiag.stop_tracing()}
+
+
+# ---------------------------------------------------------
+# MEMORY: SNAPSHOTS, TOP ALLOCATORS AND DIFFS (Admin)
+# ---------------------------------------------------------
+@router.post("/memory/snapshots")
+async def take_memory_snapshot(request: Request, label: Optional[str] = None):
+    ensure_permission(request, "diagnostics:view")
+    try:
+        snapshot = memdiag.take_snapshot(label)
+        return {"ok": True, "data": {**snapshot, "process": memdiag.process_stats()}}
+    except memdiag.MemoryDiagnosticsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/memory/snapshots")
+async def list_memory_snapshots(request: Request):
+    ensure_permission(request, "diagnostics:view")
+    return {"ok": True, "data": memdiag.list_snapshots()}
+
+
+@router.get("/memory/snapshots/{snapshot_id}/top")
+async def top_memory_allocators(request: Request, snapshot_id: int, key_type: Literal["lineno", "filename", "traceback"] = "lineno", limit: int = 25):
+    ensure_permission(request, "diagnostics:view")
+    try:
+        return {
+            "ok": True,
+            "data": {
+                "snapshot_id": snapshot_id,
+                "allocators": memdiag.top_allocators(snapshot_id, key_type, limit),
+                "process": memdiag.process_stats(),
+            },
+        }
+    except memdiag.MemoryDiagnosticsError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/memory/diff")
+async def diff_memory_snapshots(
+    request: Request,
+    from_id: int,
+    to_id: int,
+    key_type: Literal["lineno", "filename", "traceback"] = "lineno",
+    limit: int = 25
+):
+    ensure_permission(request, "diagnostics:view")
+    try:
+        return {
+            "ok": True,
+            "data": {
+                "from_id": from_id,
+                "to_id": to_id,
+                "allocators": memdiag.diff_snapshots(from_id, to_id, key_type, limit),
+                "process": memdiag.process_stats(),
+            },
+        }
+    except memdiag.MemoryDiagnosticsError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+# ---------------------------------------------------------
+# SCORING: BACKFILL ai_score FOR EXISTING APPLICATIONS (Admin)
+# ---------------------------------------------------------
+@router.post("/scoring/backfill", status_code=202)
+async def backfill_scores(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    job_id: Optional[str] = None,
+    rescore: bool = False
+):
+    ensure_permission(request, "scoring:manage")
+    background_tasks.add_task(scoring_svc.backfill, job_id, rescore)
+    return {"ok": True, "data": {"status": "started", "job_id": job_id, "rescore": rescore}}
+
+
+# ---------------------------------------------------------
+# SCORING: RESCORING RUNS AND PROGRESS (Admin)
+# ---------------------------------------------------------
+@router.get("/scoring/rescoring")
+async def list_rescoring_runs(request: Request, status: Optional[str] = None, limit: int = 50):
+    ensure_permission(request, "scoring:manage")
+    try:
+        return {"ok": True, "data": rescoring_worker.service.list_runs(status, limit)}
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/scoring/rescoring/{run_id}")
+async def get_rescoring_run(request: Request, run_id: str):
+    ensure_permission(request, "scoring:manage")
+    run = rescoring_worker.service.get_run(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Rescoring run not found")
+    return {"ok": True, "data": run}
+
+
+@router.post("/scoring/rescoring", status_code=202)
+async def start_rescoring(request: Request, job_id: Optional[str] = None):
+    ensure_permission(request, "scoring:manage")
+    run = rescoring_worker.submit(job_id, "manual")
+    if not run:
+        raise HTTPException(status_code=500, detail="Failed to enqueue rescoring")
+    return {"ok": True, "data": run}
+
+
+@router.post("/scoring/rescoring/{run_id}/resume", status_code=202)
+async def resume_rescoring(request: Request, run_id: str):
+    ensure_permission(request, "scoring:manage")
+    run = rescoring_worker.service.get_run(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Rescoring run not found")
+    if run.get("status") == "completed":
+        raise HTTPException(status_code=409, detail="Rescoring run already completed")
+    if run.get("status") == "running" and not rescoring_worker.service.is_stale(run):
+        raise HTTPException(status_code=409, detail="Rescoring run is still running")
+    # force: a run left 'running' by a crashed worker (no checkpoint for
+    # RESCORING_STALE_SECONDS) continues from its checkpoint
+    rescoring_worker.schedule(run_id, force=True)
+    return {"ok": True, "data": {"id": run_id, "status": "scheduled"}}
+
+
+# ---------------------------------------------------------
+# RESUMES: EXTRACT TEXT FOR EXISTING UPLOADS (Admin)
+# ---------------------------------------------------------
+@router.post("/resumes/backfill", status_code=202)
+async def backfill_resume_text(request: Request, background_tasks: BackgroundTasks, limit: Optional[int] = None):
+    ensure_permission(request, "scoring:manage")
+    background_tasks.add_task(resume_svc.backfill, limit)
+    return {"ok": True, "data": {"status": "started", "limit": limit}}
+
+
+# ---------------------------------------------------------
+# RECOMMENDATIONS: RECOMPUTE EVERY CANDIDATE'S LIST (Admin)
+# ---------------------------------------------------------
+@router.post("/recommendations/rebuild", status_code=202)
+async def rebuild_recommendations(request: Request):
+    ensure_permission(request, "scoring:manage")
+    recommendation_worker.rebuild()
+    return {"ok": True, "data": {"status": "queued"}}
+
+
+# ---------------------------------------------------------
+# HIRING FUNNELS: RECOMPUTE EVERY JOB (Admin)
+# ---------------------------------------------------------
+@router.post("/funnels/rebuild", status_code=202)
+async def rebuild_funnels(request: Request):
+    ensure_permission(request, "analytics:manage")
+    funnel_worker.rebuild()
+    return {"ok": True, "data": {"status": "queued"}}
+
+
+# ---------------------------------------------------------
+# ANALYTICS INGEST BUFFER (this worker)
+# ---------------------------------------------------------
+@router.get("/analytics/ingest")
+async def analytics_ingest_stats(request: Request):
+    ensure_permission(request, "diagnostics:view")
+    return {"ok": True, "data": analytics_buffer.stats()}
@@ -1,27 +1,70 @@
-from fastapi import APIRouter, Request, HTTPException
-from models.analytics_models import AnalyticsEventRequest
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Request, HTTPException, Query
+from fastapi.responses import JSONResponse
+from models.analytics_models import AnalyticsEventRequest, AnalyticsBatchRequest
 from services.analytics_service import AnalyticsService
+from services.analytics_ingest import analytics_buffer, BufferFull, BufferClosed
+from services.analytics_rollups import RollupService, parse_ts
+from services.recruiter_service import RecruiterService
 # ✅ FIX: Correct Import
 from middleware.role_required import ensure_permission
+from middleware.tracing import TracedRoute
 
-router = APIRouter(prefix="/analytics", tags=["Analytics"])
+router = APIRouter(prefix="/analytics", tags=["Analytics"], route_class=TracedRoute)
 svc = AnalyticsService()
+rollup_svc = RollupService()
+rec_svc = RecruiterService()
+
+# Default window when `start` is omitted
+TIMESERIES_DEFAULT_RANGE = {"hour": timedelta(days=7), "day": timedelta(days=90)}
 
 
 # ---------------------------------------------------------
-# CREATE EVENT (All authenticated users)
+# INGEST (buffered, All authenticated users)
 # ---------------------------------------------------------
+def _ingest(request: Request, events: List[AnalyticsEventRequest]) -> JSONResponse:
+    """
+    Queues events for the next bulk insert and answers 202. A full buffer
+    answers 429 with Retry-After so clients back off and resend.
+    """
+    user = request.state.user
+    client_ip = request.client.host if request.client else None
+    user_agent = request.headers.get("user-agent")
+
+    rows: List[Dict[str, Any]] = []
+    for event in events:
+        data = event.model_dump()
+        data["user_id"] = user["id"]
+        data["ip_address"] = data.get("ip_address") or client_ip
+        data["user_agent"] = data.get("user_agent") or user_agent
+        rows.append(AnalyticsService.event_row(data))
+
+    try:
+        accepted = analytics_buffer.offer(rows)
+    except BufferFull:
+        retry_after = str(max(1, math.ceil(analytics_buffer.flush_seconds)))
+        raise HTTPException(status_code=429, detail="Analytics buffer is full", headers={"Retry-After": retry_after})
+    except BufferClosed:
+        raise HTTPException(status_code=503, detail="Analytics ingestion is shutting down", headers={"Retry-After": "5"})
+    return JSONResponse(status_code=202, content={"ok": True, "data": {"accepted": accepted}})
+
+
 @router.post("/")
 async def create_event(request: Request, payload: AnalyticsEventRequest):
     """
     All authenticated users can create analytics events.
     No permission check required, just valid auth (handled by middleware).
     """
-    try:
-        event = svc.create_event(payload.model_dump())
-        return {"ok": True, "data": event}
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return _ingest(request, [payload])
+
+
+@router.post("/batch")
+async def create_events(request: Request, payload: AnalyticsBatchRequest):
+    """Up to 500 events per call; accepted or rejected as a whole."""
+    return _ingest(request, payload.events)
 
 
 # ---------------------------------------------------------
@@ -44,4 +87,51 @@ async def list_events(
         )
         return {"ok": True, "data": events}
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+# ---------------------------------------------------------
+# TIME SERIES (pre-aggregated rollups)
+# ---------------------------------------------------------
+@router.get("/timeseries")
+async def get_timeseries(
+    request: Request,
+    interval: str = "day",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    event_type: Optional[List[str]] = Query(None),
+    job_id: Optional[str] = None,
+):
+    """
+    Event counts per hour or day from the rollup tables, zero-filled.
+    Scoped to the caller's own events, or with `job_id` to every user's
+    events about one of the caller's jobs.
+    """
+    ensure_permission(request, "analytics:view")
+    user_id = request.state.user["id"]
+
+    try:
+        end_at = parse_ts(end) if end else datetime.now(timezone.utc)
+        start_at = parse_ts(start) if start else end_at - TIMESERIES_DEFAULT_RANGE.get(interval, timedelta(days=90))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start and end must be ISO 8601 timestamps")
+
+    if job_id:
+        try:
+            rec_svc.get_job(job_id, recruiter_id=user_id)
+        except Exception:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+    try:
+        data = rollup_svc.timeseries(
+            interval,
+            start_at,
+            end_at,
+            user_id=None if job_id else user_id,
+            job_id=job_id,
+            event_types=event_type,
+        )
+        return {"ok": True, "data": data}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
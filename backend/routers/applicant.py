@@ -1,18 +1,26 @@
-from fastapi import APIRouter, HTTPException, Request, UploadFile, File, Form, Depends
+from fastapi import APIRouter, HTTPException, Request, UploadFile, File, Form, Depends, BackgroundTasks
 from typing import Optional, List
 import json
 from services.auth_service import get_current_user
-from services.applicant_service import ApplicantService
+from services.applicant_service import ApplicantService, ApplicationRejected
 from services.recruiter_service import RecruiterService
 from services.video_service import VideoService
+from services.scoring_service import ScoringService
+from services.resume_service import ResumeService
+from services.search_service import candidate_search
+from services.recommendation_service import recommendation_worker
+from services.funnel_service import funnel_worker
 from services.supabase_client import get_client
 from middleware.role_required import ensure_permission
 from models.applicant_models import ApplicationCreate
+from middleware.tracing import TracedRoute
 
-router = APIRouter(prefix="/applicant", tags=["Applicant"])
+router = APIRouter(prefix="/applicant", tags=["Applicant"], route_class=TracedRoute)
 app_svc = ApplicantService()
 rec_svc = RecruiterService()
 vd_svc = VideoService()
+scoring_svc = ScoringService()
+resume_svc = ResumeService()
 
 # ---------------------------------------------------------
 # CHECK APPLICATION STATUS
@@ -28,24 +36,53 @@ async def check_status(request: Request, job_id: str):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+# ---------------------------------------------------------
+# APPLIED JOB IDS (bulk "already applied" lookup for job boards)
+# ---------------------------------------------------------
+@router.get("/applied-jobs")
+async def list_applied_job_ids(request: Request):
+    ensure_permission(request, "applications:view")
+    user = request.state.user
+
+    try:
+        job_ids = sorted(app_svc.get_applied_job_ids(user["id"]))
+        return {"ok": True, "data": {"job_ids": job_ids}}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # ---------------------------------------------------------
 # APPLY FOR JOB
 # ---------------------------------------------------------
 @router.post("/apply")
-async def apply_for_job(request: Request, payload: ApplicationCreate):
+async def apply_for_job(request: Request, payload: ApplicationCreate, background_tasks: BackgroundTasks):
     ensure_permission(request, "applications:create")
     user = request.state.user
-    
+
+    # Clients retry with the same key; the original application is returned
+    idempotency_key = request.headers.get("Idempotency-Key")
+    if idempotency_key is not None and not 1 <= len(idempotency_key) <= 255:
+        raise HTTPException(status_code=400, detail="Idempotency-Key must be 1-255 characters")
+
     try:
         # Prepare Data
         data = payload.model_dump()
         data["candidate_id"] = user["id"]
-        result = app_svc.submit_application(data)
-        return {"ok": True, "data": result}
+        result = app_svc.submit_application(data, idempotency_key=idempotency_key)
+    except ApplicationRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         print(f"Application Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    application = result.get("application") or {}
+    # Match score is computed after the response is sent (once, not on replays)
+    if result.get("created") and application.get("id"):
+        background_tasks.add_task(scoring_svc.score_application, application["id"])
+        # Applied jobs are excluded from recommendations
+        recommendation_worker.candidate_changed(user["id"])
+
+    return {"ok": True, "data": application, "replayed": not result.get("created")}
+
 @router.get("/profile")
 async def get_profile(request: Request):
     ensure_permission(request, "profile:view")
@@ -58,6 +95,7 @@ async def get_profile(request: Request):
 @router.put("/profile")
 async def update_profile(
     request: Request, 
+    background_tasks: BackgroundTasks,
     full_name: str = Form(...),
     phone: str = Form(None),
     location: str = Form(None),
@@ -93,7 +131,7 @@ async def update_profile(
         filename = resume.filename if resume else None
 
         # Call Service
-        app_svc.update_profile(
+        result = app_svc.update_profile(
             candidate_id=user["id"],
             profile_data=profile_data,
             education=edu_list,
@@ -103,6 +141,13 @@ async def update_profile(
             resume_filename=filename
         )
 
+        background_tasks.add_task(candidate_search.refresh, user["id"])
+        recommendation_worker.candidate_changed(user["id"])
+
+        # Extract resume text for search/scoring after the response is sent
+        if file_bytes and result.get("resume_url"):
+            background_tasks.add_task(resume_svc.process_resume, user["id"], result["resume_url"], file_bytes)
+
         return {"ok": True, "message": "Profile updated successfully"}
         
     except Exception as e:
@@ -156,13 +201,16 @@ async def get_interview_setup(request: Request, application_id: str):
         if app.get("candidate_id") != current_user["id"]:
             raise HTTPException(status_code=403, detail="Unauthorized access to this interview")
         
-        # Fetch the questions related to the job
-        # Assuming questions are stored in jobs table or a joined query
-        # For now, returning the status which is crucial for the frontend flow
+        # Questions chosen for this application win; otherwise the job's
+        # questions, served from the per-job cache
+        questions = app.get("interview_questions") or [
+            q["question_text"] for q in rec_svc.list_interview_questions(app.get("job_id"))
+        ]
         return {
             "ok": True,
             "status": app.get("status"),
-            "job_id": app.get("job_id")
+            "job_id": app.get("job_id"),
+            "questions": questions,
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -262,6 +310,7 @@ async def finish_interview(
 
         # 3. Update status
         db.table("job_applications").update({"status": "interview_submitted"}).eq("id", application_id).execute()
+        funnel_worker.job_changed(application.get("job_id"))
 
         return {"ok": True, "message": "Interview completed", "status": "interview_submitted"}
 
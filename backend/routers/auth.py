@@ -6,8 +6,9 @@ from models.auth_models import LoginRequest
 from services.auth_service import AuthService
 from services.supabase_client import get_client
 from utils_others.logger import logger
+from middleware.tracing import TracedRoute
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=TracedRoute)
 _auth_service: Optional[AuthService] = None
 
 
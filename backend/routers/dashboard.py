@@ -1,10 +1,25 @@
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Request, HTTPException, Query
 from typing import Optional
 from services.dashboard_service import DashboardService
+from services.applicant_service import ApplicantService
+from services.recommendation_service import RecommendationService, recommendation_worker, TOP_K
 from middleware.role_required import ensure_permission
+from middleware.tracing import TracedRoute
 
-router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"], route_class=TracedRoute)
 dash_svc = DashboardService()
+rec_svc = RecommendationService()
+app_svc = ApplicantService()
+
+
+def _mark_applied(user: dict, jobs: list) -> list:
+    """Adds has_applied to each job for candidates (one cached set lookup per page)."""
+    if user.get("user_metadata", {}).get("role", "candidate") != "candidate":
+        return jobs
+    applied = app_svc.get_applied_job_ids(user["id"])
+    for job in jobs:
+        job["has_applied"] = str(job.get("id")) in applied
+    return jobs
 
 # ---------------------------------------------------------
 # CANDIDATE/PUBLIC: LIST ACTIVE JOBS
@@ -19,7 +34,26 @@ async def list_active_jobs(request: Request, q: Optional[str] = None):
     try:
         # Fetch jobs with optional search query
         jobs = dash_svc.list_public_jobs(search_query=q)
-        return {"ok": True, "data": jobs}
+        return {"ok": True, "data": _mark_applied(user, jobs)}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# ---------------------------------------------------------
+# CANDIDATE: RECOMMENDED JOBS (precomputed top-K)
+# ---------------------------------------------------------
+@router.get("/recommended-jobs")
+async def list_recommended_jobs(request: Request, limit: int = Query(20, ge=1, le=TOP_K)):
+    ensure_permission(request, "jobs:view")
+    user = request.state.user
+
+    try:
+        jobs = rec_svc.get_recommendations(user["id"], limit=limit)
+        if jobs is None:
+            # Not computed yet: queue it and show the latest jobs meanwhile
+            recommendation_worker.candidate_changed(user["id"])
+            jobs = _mark_applied(user, dash_svc.list_public_jobs()[:limit])
+            return {"ok": True, "data": jobs, "source": "latest"}
+        return {"ok": True, "data": jobs, "source": "recommended"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -1,13 +1,26 @@
-from fastapi import APIRouter, Request, HTTPException
+import os
+import json
+from typing import Any, Dict
+
+from fastapi import APIRouter, Request, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from models.notification_models import NotificationRequest
 from services.notification_service import NotificationService
+from services.notification_broker import notification_broker
 # ✅ FIX: Correct Import
 from middleware.role_required import ensure_permission
 from utils_others.logger import logger
+from middleware.tracing import TracedRoute
 
-router = APIRouter(prefix="/notification", tags=["Notification"])
+router = APIRouter(prefix="/notification", tags=["Notification"], route_class=TracedRoute)
 svc = NotificationService()
 
+# Comment line sent on idle streams so proxies and load balancers keep them open
+HEARTBEAT_SECONDS = float(os.getenv("NOTIFICATION_HEARTBEAT_SECONDS", "15"))
+MAX_STREAMS_PER_USER = int(os.getenv("NOTIFICATION_MAX_STREAMS_PER_USER", "5"))
+# Client reconnect delay announced to EventSource
+RECONNECT_MS = 5000
+
 
 # ---------------------------------------------------------
 # SEND NOTIFICATION (Recruiter/Admin)
@@ -44,4 +57,109 @@ async def send_notification(request: Request, payload: NotificationRequest):
                 "user_id": user["id"],
             },
         )
-        raise HTTPException(status_code=400, detail="Failed to create notification")
\ No newline at end of file
+        raise HTTPException(status_code=400, detail="Failed to create notification")
+
+
+# ---------------------------------------------------------
+# LIST NOTIFICATIONS
+# ---------------------------------------------------------
+@router.get("/")
+async def list_notifications(
+    request: Request,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=100),
+):
+    ensure_permission(request, "notifications:view")
+    user = request.state.user
+    try:
+        result = svc.list_notifications(user["id"], page, page_size)
+        return {"ok": True, "data": result["notifications"], "pagination": result["pagination"]}
+    except Exception:
+        raise HTTPException(status_code=500, detail="Failed to fetch notifications")
+
+
+# ---------------------------------------------------------
+# UNREAD COUNT (badge)
+# ---------------------------------------------------------
+@router.get("/unread-count")
+async def unread_count(request: Request):
+    ensure_permission(request, "notifications:view")
+    try:
+        return {"ok": True, "data": {"unread": svc.unread_count(request.state.user["id"])}}
+    except Exception:
+        raise HTTPException(status_code=500, detail="Failed to count unread notifications")
+
+
+# ---------------------------------------------------------
+# MARK AS READ
+# ---------------------------------------------------------
+@router.post("/read-all")
+async def mark_all_read(request: Request):
+    ensure_permission(request, "notifications:view")
+    try:
+        svc.mark_all_as_read(request.state.user["id"])
+        return {"ok": True}
+    except Exception:
+        raise HTTPException(status_code=500, detail="Failed to mark notifications as read")
+
+
+@router.post("/{notification_id}/read")
+async def mark_read(request: Request, notification_id: str):
+    ensure_permission(request, "notifications:view")
+    try:
+        result = svc.mark_as_read(notification_id, request.state.user["id"])
+    except Exception:
+        raise HTTPException(status_code=500, detail="Failed to mark notification as read")
+    if not result:
+        raise HTTPException(status_code=404, detail="Notification not found")
+    return {"ok": True, "data": result}
+
+
+# ---------------------------------------------------------
+# EVENT STREAM (Server-Sent Events)
+# ---------------------------------------------------------
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/stream")
+async def notification_stream(request: Request):
+    """
+    Pushes events for the current user instead of polling GET /notification/:
+        notification  a new notification row
+        read          {"id": ...} was marked as read
+        read_all      every notification was marked as read
+        resync        events were dropped; refetch the list
+    Idle streams get a ": ping" comment every NOTIFICATION_HEARTBEAT_SECONDS.
+    """
+    ensure_permission(request, "notifications:view")
+    user_id = request.state.user["id"]
+
+    if notification_broker.connection_count(user_id) >= MAX_STREAMS_PER_USER:
+        raise HTTPException(status_code=429, detail="Too many open notification streams")
+
+    async def events():
+        # Subscribed only once the response starts streaming: a client that
+        # disconnects before then never starts the generator, so a
+        # subscription taken outside it would never be released
+        sub = None
+        try:
+            sub = notification_broker.subscribe(user_id)
+            yield f"retry: {RECONNECT_MS}\n" + _sse("ready", {})
+            while True:
+                event = await sub.next_event(HEARTBEAT_SECONDS)
+                if event is None:
+                    if await request.is_disconnected():
+                        break
+                    yield ": ping\n\n"
+                    continue
+                yield _sse(event["event"], event["data"])
+        finally:
+            if sub is not None:
+                notification_broker.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
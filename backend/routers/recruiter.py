@@ -1,23 +1,35 @@
+import json
+import itertools
 from uuid import uuid4
-from fastapi import APIRouter, Request, HTTPException, Depends
+from typing import List, Optional
+from datetime import datetime, timezone
+from fastapi import APIRouter, Request, HTTPException, Depends, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
 from models.recruiter_models import (
     JobCreateRequest,
     JobUpdateRequest,
     RecruiterProfileUpdate,
+    InterviewQuestionsReplace,
+    ApplicationStatusBulkUpdate,
 )
 from services.auth_service import get_current_user
 from services.recruiter_service import RecruiterService
+from services.job_import_service import JobImportService, ImportFormatError, parse_import, IMPORT_MAX_BYTES
 from services.dashboard_service import DashboardService
 from services.analytics_service import AnalyticsService
 from services.video_service import VideoService
+from services.search_service import candidate_search, QuerySyntaxError
 from middleware.role_required import ensure_permission
+from utils_others.tabular_export import csv_stream, xlsx_stream
+from middleware.tracing import TracedRoute
 
-router = APIRouter(prefix="/recruiter", tags=["Recruiter"])
+router = APIRouter(prefix="/recruiter", tags=["Recruiter"], route_class=TracedRoute)
 
 rec_svc = RecruiterService()
 dash_svc = DashboardService()
 analytics_svc = AnalyticsService()
 vd_svc = VideoService()
+import_svc = JobImportService()
 
 # ---------------------------------------------------------
 # HELPER: Get or Create Company
@@ -150,7 +162,7 @@ async def update_job(request: Request, job_id: str, payload: JobUpdateRequest):
     ensure_permission(request, "jobs:edit")
     user = request.state.user
     try:
-        updated = rec_svc.update_job(job_id, payload.model_dump(), user["id"])
+        updated = rec_svc.update_job(job_id, payload.model_dump(exclude_unset=True), user["id"])
         return {"ok": True, "data": updated}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -165,16 +177,194 @@ async def delete_job(request: Request, job_id: str):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+# ---------------------------------------------------------
+# HIRING FUNNEL (precomputed per job)
+# ---------------------------------------------------------
+@router.get("/funnel")
+async def get_recruiter_funnel(request: Request):
+    ensure_permission(request, "analytics:view")
+    try:
+        return {"ok": True, "data": dash_svc.get_recruiter_funnel(request.state.user["id"])}
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/jobs/{job_id}/funnel")
+async def get_job_funnel(request: Request, job_id: str):
+    ensure_permission(request, "analytics:view")
+    try:
+        rec_svc.get_job(job_id, recruiter_id=request.state.user["id"])
+    except Exception:
+        raise HTTPException(status_code=404, detail="Job not found")
+    try:
+        funnel = dash_svc.get_recruiter_funnel(request.state.user["id"], [job_id])
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"ok": True, "data": funnel["jobs"].get(job_id), "pending": bool(funnel["pending"])}
+
+
+# ---------------------------------------------------------
+# INTERVIEW QUESTIONS (bulk replace / reorder)
+# ---------------------------------------------------------
+@router.get("/jobs/{job_id}/questions")
+async def list_job_questions(request: Request, job_id: str):
+    ensure_permission(request, "jobs:view")
+    try:
+        rec_svc.get_job(job_id, recruiter_id=request.state.user["id"])
+    except Exception:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"ok": True, "data": rec_svc.list_interview_questions(job_id)}
+
+
+@router.put("/jobs/{job_id}/questions")
+async def replace_job_questions(request: Request, job_id: str, payload: InterviewQuestionsReplace):
+    ensure_permission(request, "jobs:edit")
+    questions = [q.model_dump(mode="json", exclude_none=True) for q in payload.questions]
+    try:
+        result = rec_svc.replace_interview_questions(job_id, request.state.user["id"], questions)
+        return {"ok": True, "data": result}
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # This endpoint is valid for recruiters (to see WHO applied)
 @router.get("/applications")
-async def list_recruiter_applications(request: Request):
+async def list_recruiter_applications(
+    request: Request,
+    job_id: Optional[str] = None,
+    status: Optional[List[str]] = Query(None),
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    max_score: Optional[int] = Query(None, ge=0, le=100),
+    sort: str = Query("applied_at", pattern="^(applied_at|ai_score)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, max_length=500),
+):
     ensure_permission(request, "applications:view")
     try:
-        # Calls service to get applications for jobs OWNED by this recruiter
-        apps = rec_svc.get_recruiter_applications(request.state.user["id"])
-        return {"ok": True, "data": apps}
+        # Applications for jobs OWNED by this recruiter, one page at a time
+        page = rec_svc.list_recruiter_applications(
+            request.state.user["id"],
+            job_id=job_id,
+            statuses=status,
+            min_score=min_score,
+            max_score=max_score,
+            sort=sort,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor,
+        )
+        return {"ok": True, "data": page["items"], "next_cursor": page["next_cursor"]}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ---------------------------------------------------------
+# BULK JOB IMPORT (CSV / JSON Lines -> NDJSON results)
+# ---------------------------------------------------------
+@router.post("/jobs/import")
+async def import_jobs(
+    request: Request,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|jsonl)$"),
+):
+    ensure_permission(request, "jobs:create")
+    user = request.state.user
+
+    fmt = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "jsonl")
+    content = await file.read(IMPORT_MAX_BYTES + 1)
+    try:
+        records = parse_import(content, fmt)
+        first = next(records, None)  # surfaces header/encoding problems as a 400
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    records = itertools.chain([first], records) if first is not None else iter(())
+
+    company_id = get_or_create_company_id(user["id"])
+    results = import_svc.import_jobs(user["id"], company_id, records)
+    # One JSON line per row, sent as each batch is inserted
+    body = (json.dumps(result) + "\n" for result in results)
+    return StreamingResponse(body, media_type="application/x-ndjson")
+
+# ---------------------------------------------------------
+# EXPORT APPLICATIONS (streamed CSV / XLSX)
+# ---------------------------------------------------------
+EXPORT_COLUMNS = [
+    ("candidate_name", "Candidate"),
+    ("candidate_email", "Email"),
+    ("job_title", "Job"),
+    ("status", "Status"),
+    ("ai_score", "Score"),
+    ("applied_at", "Applied At"),
+    ("id", "Application ID"),
+    ("job_id", "Job ID"),
+    ("candidate_id", "Candidate ID"),
+]
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+@router.get("/applications/export")
+async def export_recruiter_applications(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|xlsx)$"),
+    job_id: Optional[str] = None,
+    status: Optional[List[str]] = Query(None),
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    max_score: Optional[int] = Query(None, ge=0, le=100),
+    sort: str = Query("applied_at", pattern="^(applied_at|ai_score)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+):
+    ensure_permission(request, "applications:export")
+    rows = rec_svc.iter_recruiter_applications(
+        request.state.user["id"],
+        job_id=job_id,
+        statuses=status,
+        min_score=min_score,
+        max_score=max_score,
+        sort=sort,
+        descending=order == "desc",
+    )
+    # Fetch the first page up front so a failing query is still a 500, not a truncated file
+    try:
+        first = next(rows, None)
     except Exception as e:
-        return {"ok": True, "data": []}
+        raise HTTPException(status_code=500, detail=str(e))
+    rows = itertools.chain([first], rows) if first is not None else iter(())
+
+    # Remaining rows are fetched and encoded while the response is being sent
+    body = csv_stream(EXPORT_COLUMNS, rows) if format == "csv" else xlsx_stream(EXPORT_COLUMNS, rows, "Applications")
+    filename = f"applications-{datetime.now(timezone.utc):%Y%m%d-%H%M}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+# ---------------------------------------------------------
+# SEARCH CANDIDATES (skills, experience, education, resume text)
+# ---------------------------------------------------------
+# Plain def: the first search in a worker builds the index (CPU-bound)
+@router.get("/candidates/search")
+def search_candidates(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+):
+    ensure_permission(request, "candidates:search")
+    try:
+        return {"ok": True, "data": candidate_search.search(q, limit=limit, offset=offset)}
+    except QuerySyntaxError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid query: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 # ---------------------------------------------------------
 # ✅ NEW: Get Single Application Details
@@ -224,4 +414,18 @@ def update_application_status(
     if not success:
         raise HTTPException(status_code=500, detail="Failed to update status")
         
-    return {"message": "Status updated successfully", "status": new_status}
\ No newline at end of file
+    return {"message": "Status updated successfully", "status": new_status}
+
+
+# ---------------------------------------------------------
+# BULK STATUS UPDATE (e.g. shortlist many candidates)
+# ---------------------------------------------------------
+@router.post("/applications/status")
+async def bulk_update_application_status(request: Request, payload: ApplicationStatusBulkUpdate):
+    ensure_permission(request, "applications:edit")
+    user = request.state.user
+    try:
+        result = rec_svc.bulk_update_application_status(user["id"], payload.application_ids, payload.status)
+    except RuntimeError:
+        raise HTTPException(status_code=500, detail="Failed to update application statuses")
+    return {"ok": True, "data": result}
@@ -0,0 +1,39 @@
+from typing import List
+from fastapi import APIRouter, Request, Response, Query
+from middleware.role_required import ensure_permission
+from middleware.tracing import TracedRoute
+from utils_others.skill_dictionary import skill_dictionary
+
+router = APIRouter(prefix="/skills", tags=["Skills"], route_class=TracedRoute)
+
+# The dictionary only changes with a deploy
+CACHE_CONTROL = "private, max-age=3600"
+
+
+# ---------------------------------------------------------
+# AUTOCOMPLETE (served from memory, no database access)
+# ---------------------------------------------------------
+@router.get("/autocomplete")
+async def autocomplete_skills(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+):
+    ensure_permission(request, "skills:view")
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return {"ok": True, "data": skill_dictionary.autocomplete(q, limit)}
+
+
+# ---------------------------------------------------------
+# NORMALIZE (preview what will be stored for free-text skills)
+# ---------------------------------------------------------
+@router.get("/normalize")
+async def normalize_skills(request: Request, response: Response, name: List[str] = Query(...)):
+    ensure_permission(request, "skills:view")
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    data = [
+        {"input": n, "name": skill_dictionary.canonicalize(n), "known": skill_dictionary.is_known(n)}
+        for n in name
+    ]
+    return {"ok": True, "data": data}
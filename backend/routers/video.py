@@ -2,8 +2,9 @@ from fastapi import APIRouter, Request, UploadFile, File, HTTPException
 from services.video_service import VideoService
 # ✅ FIX: Correct Import
 from middleware.role_required import ensure_permission
+from middleware.tracing import TracedRoute
 
-router = APIRouter(prefix="/video", tags=["Video"])
+router = APIRouter(prefix="/video", tags=["Video"], route_class=TracedRoute)
 svc = VideoService()
 
 
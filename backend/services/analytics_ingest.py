@@ -0,0 +1,222 @@
+"""
+Buffered ingestion for analytics events.
+
+Request handlers call analytics_buffer.offer() and return immediately; a
+daemon thread writes the buffer to analytics_events in bulk inserts of up to
+ANALYTICS_BATCH_SIZE rows, whenever a full batch is waiting or every
+ANALYTICS_FLUSH_SECONDS. The buffer holds at most ANALYTICS_BUFFER_MAX events
+(including the batch being written); offers beyond that raise BufferFull so
+the API can answer 429 instead of growing memory while the database is slow.
+
+After each bulk insert the batch's hourly/daily rollups are incremented in
+one more round trip. If that fails, the affected hours are rebuilt from the
+raw events (compact_analytics_rollups) on the next flush cycle.
+
+Buffers are per process. close() (main.on_shutdown) writes what is left.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from services.analytics_service import AnalyticsService
+from services.analytics_rollups import RollupService, truncate, parse_ts
+from utils_others.logger import logger
+
+BATCH_SIZE = int(os.getenv("ANALYTICS_BATCH_SIZE", "500"))
+FLUSH_SECONDS = float(os.getenv("ANALYTICS_FLUSH_SECONDS", "2"))
+BUFFER_MAX = int(os.getenv("ANALYTICS_BUFFER_MAX", "20000"))
+# Attempts per batch before its events are dropped
+MAX_ATTEMPTS = 5
+SHUTDOWN_TIMEOUT = float(os.getenv("ANALYTICS_SHUTDOWN_TIMEOUT", "10"))
+
+
+class BufferFull(Exception):
+    """The buffer cannot take the events right now; retry later."""
+
+
+class BufferClosed(Exception):
+    """The process is shutting down and no longer accepts events."""
+
+
+class AnalyticsBuffer:
+    def __init__(
+        self,
+        service: Optional[AnalyticsService] = None,
+        rollups: Optional[RollupService] = None,
+        batch_size: int = BATCH_SIZE,
+        flush_seconds: float = FLUSH_SECONDS,
+        max_events: int = BUFFER_MAX,
+    ):
+        self._service = service
+        self._rollups = rollups
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_events = max_events
+        self._events: Deque[Dict[str, Any]] = deque()
+        self._in_flight = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        # Hour range whose rollups missed an increment and must be rebuilt
+        self._stale: Optional[Tuple[datetime, datetime]] = None
+        self.accepted = 0
+        self.written = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+
+    @property
+    def service(self) -> AnalyticsService:
+        if self._service is None:
+            self._service = AnalyticsService()
+        return self._service
+
+    @property
+    def rollups(self) -> RollupService:
+        if self._rollups is None:
+            self._rollups = RollupService(self.service.supabase)
+        return self._rollups
+
+    # ---------------------------------------------------------
+    # PRODUCER SIDE
+    # ---------------------------------------------------------
+    def offer(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Queues already-normalised rows (AnalyticsService.event_row). All or
+        nothing: raises BufferFull when they do not fit.
+        """
+        with self._cond:
+            if self._closed:
+                raise BufferClosed()
+            if len(self._events) + self._in_flight + len(events) > self.max_events:
+                self.rejected += len(events)
+                raise BufferFull()
+            self._events.extend(events)
+            self.accepted += len(events)
+            self._ensure_thread()
+            if len(self._events) >= self.batch_size:
+                self._cond.notify()
+        return len(events)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="analytics-ingest", daemon=True)
+            self._thread.start()
+
+    # ---------------------------------------------------------
+    # FLUSHING
+    # ---------------------------------------------------------
+    def _take(self) -> List[Dict[str, Any]]:
+        # Caller holds the lock
+        batch = [self._events.popleft() for _ in range(min(self.batch_size, len(self._events)))]
+        self._in_flight = len(batch)
+        return batch
+
+    def _write(self, batch: List[Dict[str, Any]]) -> bool:
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                self.service.create_events(batch)
+                self.written += len(batch)
+                self._roll_up(batch)
+                return True
+            except Exception as e:
+                self.failed_flushes += 1
+                logger.error(
+                    f"Analytics flush failed (attempt {attempt}): {str(e)}",
+                    extra={"events": len(batch)},
+                )
+                if attempt < MAX_ATTEMPTS and not self._closed:
+                    time.sleep(min(0.5 * 2 ** (attempt - 1), 8.0))
+        self.dropped += len(batch)
+        return False
+
+    def _roll_up(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self.rollups.increment(batch)
+        except Exception as e:
+            stamps = [parse_ts(row["created_at"]) for row in batch]
+            start, end = truncate(min(stamps), "hour"), truncate(max(stamps), "hour") + timedelta(hours=1)
+            if self._stale:
+                start, end = min(start, self._stale[0]), max(end, self._stale[1])
+            self._stale = (start, end)
+            logger.error(f"Analytics rollup increment failed, will rebuild: {str(e)}", extra={"events": len(batch)})
+
+    def _compact_stale(self) -> None:
+        stale, self._stale = self._stale, None
+        if stale is None:
+            return
+        try:
+            self.rollups.compact(*stale)
+        except RuntimeError:
+            self._stale = stale if self._stale is None else (min(stale[0], self._stale[0]), max(stale[1], self._stale[1]))
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                if len(self._events) < self.batch_size and not self._closed:
+                    self._cond.wait(self.flush_seconds)
+                if self._closed and not self._events:
+                    return
+                batch = self._take()
+            try:
+                if batch:
+                    self._write(batch)
+                self._compact_stale()
+            finally:
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Writes everything buffered so far from the calling thread (tests, CLI)."""
+        while True:
+            with self._cond:
+                # Wait for a batch the flush thread may be writing
+                while self._in_flight:
+                    self._cond.wait()
+                batch = self._take()
+            try:
+                if not batch:
+                    self._compact_stale()
+                    return
+                self._write(batch)
+            finally:
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
+
+    def close(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Stops accepting events and writes the rest (bounded by `timeout`)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        if thread is None or not thread.is_alive():
+            self.flush()
+        pending = len(self._events)
+        if pending:
+            logger.error("Analytics events lost at shutdown", extra={"events": pending})
+        logger.info("Analytics buffer closed", extra={"events_written": self.written, "events_dropped": self.dropped + pending})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            buffered = len(self._events) + self._in_flight
+        return {
+            "buffered": buffered,
+            "capacity": self.max_events,
+            "accepted": self.accepted,
+            "written": self.written,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            "failed_flushes": self.failed_flushes,
+            "rollups_stale_from": self._stale[0].isoformat() if self._stale else None,
+        }
+
+
+analytics_buffer = AnalyticsBuffer()
@@ -0,0 +1,173 @@
+import os
+import re
+import sys
+import time
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from supabase import Client
+from services.supabase_client import get_client
+from utils_others.logger import logger
+
+# Rollup key for events that are not about a job (see create_analytics_rollups.sql)
+NIL_JOB_ID = "00000000-0000-0000-0000-000000000000"
+INTERVALS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+TIMESERIES_MAX_BUCKETS = int(os.getenv("ANALYTICS_TIMESERIES_MAX_BUCKETS", "5000"))
+
+_UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I)
+
+
+def parse_ts(value: Any) -> datetime:
+    ts = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def truncate(ts: datetime, interval: str) -> datetime:
+    ts = ts.astimezone(timezone.utc)
+    if interval == "day":
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def event_job_id(event_data: Optional[Dict[str, Any]]) -> str:
+    job_id = (event_data or {}).get("job_id")
+    return str(job_id) if job_id and _UUID_RE.match(str(job_id)) else NIL_JOB_ID
+
+
+def aggregate(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Hourly counts for a batch of analytics_events rows; anonymous events are skipped."""
+    counts: Counter = Counter()
+    for row in rows:
+        if not row.get("user_id") or not row.get("event_type"):
+            continue
+        bucket = truncate(parse_ts(row["created_at"]), "hour").isoformat()
+        counts[(bucket, row["user_id"], row["event_type"], event_job_id(row.get("event_data")))] += 1
+    return [
+        {"bucket": bucket, "user_id": user_id, "event_type": event_type, "job_id": job_id, "count": n}
+        for (bucket, user_id, event_type, job_id), n in counts.items()
+    ]
+
+
+class RollupService:
+    """
+    Hourly / daily event counts per (user, event type, job). Incremented by
+    the ingest buffer after each bulk insert; compact() rebuilds a range
+    from the raw events.
+    """
+
+    def __init__(self, client: Optional[Client] = None):
+        self.supabase = client or get_client()
+
+    # ---------------------------------------------------------
+    # WRITE
+    # ---------------------------------------------------------
+    def increment(self, rows: List[Dict[str, Any]]) -> int:
+        """One round trip per batch. Raises so the caller can schedule a compaction."""
+        counts = aggregate(rows)
+        if counts:
+            self.supabase.rpc("increment_analytics_rollups", {"p_rows": counts}).execute()
+        return len(counts)
+
+    def compact(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        try:
+            res = self.supabase.rpc("compact_analytics_rollups", {
+                "p_from": start.isoformat(),
+                "p_to": end.isoformat(),
+            }).execute()
+            logger.info("Analytics rollups compacted", extra={"range_start": start.isoformat(), "range_end": end.isoformat()})
+            return res.data or {}
+        except Exception as e:
+            logger.error(f"Analytics rollup compaction failed: {str(e)}", extra={"range_start": start.isoformat()})
+            raise RuntimeError("Failed to compact analytics rollups")
+
+    # ---------------------------------------------------------
+    # READ
+    # ---------------------------------------------------------
+    def timeseries(
+        self,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        user_id: Optional[str] = None,
+        job_id: Optional[str] = None,
+        event_types: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Dense series (zero-filled) per event type over [start, end):
+        {"interval": "day", "buckets": [iso, ...], "series": {"job_view": [3, 0, ...]}}
+        Raises ValueError for an unknown interval or too many buckets.
+        """
+        if interval not in INTERVALS:
+            raise ValueError(f"interval must be one of {', '.join(INTERVALS)}")
+        first = truncate(start, interval)
+        if end <= first:
+            raise ValueError("end must be after start")
+        step = INTERVALS[interval]
+        count = -(-(end - first) // step)
+        if count > TIMESERIES_MAX_BUCKETS:
+            raise ValueError(f"Range covers {count} {interval} buckets; the limit is {TIMESERIES_MAX_BUCKETS}")
+
+        try:
+            res = self.supabase.rpc("analytics_timeseries", {
+                "p_interval": interval,
+                "p_from": first.isoformat(),
+                "p_to": end.isoformat(),
+                "p_user_id": user_id,
+                "p_job_id": job_id,
+                "p_event_types": event_types or None,
+            }).execute()
+        except Exception as e:
+            logger.error(f"Analytics timeseries failed: {str(e)}", extra={"user_id": user_id, "job_id": job_id})
+            raise RuntimeError("Failed to fetch analytics timeseries")
+
+        buckets = [first + step * i for i in range(count)]
+        position = {b: i for i, b in enumerate(buckets)}
+        series: Dict[str, List[int]] = {t: [0] * count for t in (event_types or [])}
+        for row in res.data or []:
+            i = position.get(parse_ts(row["bucket"]).astimezone(timezone.utc))
+            if i is not None:
+                series.setdefault(row["event_type"], [0] * count)[i] += int(row["count"])
+        return {
+            "interval": interval,
+            "start": first.isoformat(),
+            "end": end.isoformat(),
+            "buckets": [b.isoformat() for b in buckets],
+            "series": series,
+            "totals": {t: sum(values) for t, values in series.items()},
+        }
+
+
+# ---------------------------------------------------------
+# CLI: periodic compaction (cron) or backfill
+# ---------------------------------------------------------
+def _hour_ranges(start: datetime, end: datetime, hours: int) -> Iterable[Tuple[datetime, datetime]]:
+    cursor = truncate(start, "hour")
+    while cursor < end:
+        upper = min(cursor + timedelta(hours=hours), end)
+        yield cursor, upper
+        cursor = upper
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild analytics rollups from analytics_events")
+    parser.add_argument("--since", help="ISO start (default: 24h ago)")
+    parser.add_argument("--until", help="ISO end (default: now)")
+    parser.add_argument("--chunk-hours", type=int, default=24, help="Hours rebuilt per call")
+    parser.add_argument("--every", type=float, default=0, help="Repeat for the trailing window every N seconds")
+    args = parser.parse_args(argv)
+
+    service = RollupService()
+    while True:
+        end = parse_ts(args.until) if args.until else datetime.now(timezone.utc)
+        start = parse_ts(args.since) if args.since else end - timedelta(hours=24)
+        for lower, upper in _hour_ranges(start, end, args.chunk_hours):
+            print(lower.isoformat(), upper.isoformat(), service.compact(lower, upper))
+        if not args.every:
+            return 0
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,23 +13,31 @@ class AnalyticsService:
     def __init__(self, client: Optional[Client] = None):
         self.supabase = client or get_client()
 
+    @staticmethod
+    def event_row(data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalises an event for analytics_events: event_data is always a
+        dict and the timestamp is taken when the event is accepted.
+        """
+        return {
+            "user_id": data.get("user_id"),
+            "event_type": data.get("event_type"),
+            "event_data": data.get("event_data") or {},
+            "ip_address": data.get("ip_address"),
+            "user_agent": data.get("user_agent"),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+
     # ---------------------------------------------------------
     # CREATE EVENT
     # ---------------------------------------------------------
     def create_event(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Insert an analytics event into analytics_events table.
-        Ensures event_data is always a dict and timestamp is normalized.
+        Insert a single analytics event into analytics_events table.
+        The API buffers events instead (services.analytics_ingest).
         """
         try:
-            payload = {
-                "user_id": data.get("user_id"),
-                "event_type": data.get("event_type"),
-                "event_data": data.get("event_data") or {},
-                "ip_address": data.get("ip_address"),
-                "user_agent": data.get("user_agent"),
-                "created_at": datetime.now(timezone.utc).isoformat(),
-            }
+            payload = self.event_row(data)
 
             res = self.supabase.table("analytics_events").insert(payload).execute()
 
@@ -53,6 +61,21 @@ class AnalyticsService:
             )
             raise RuntimeError("Failed to create analytics event")
 
+    # ---------------------------------------------------------
+    # CREATE EVENTS (bulk)
+    # ---------------------------------------------------------
+    def create_events(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Inserts rows produced by event_row in one statement. Raises on
+        failure so the ingest buffer can retry the batch.
+        """
+        if not rows:
+            return 0
+        res = self.supabase.table("analytics_events").insert(rows, returning="minimal").execute()
+        if getattr(res, "error", None):
+            raise RuntimeError(res.error)
+        return len(rows)
+
     # ---------------------------------------------------------
     # LIST EVENTS FOR USER
     # ---------------------------------------------------------
@@ -1,9 +1,36 @@
+import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from supabase import Client
 from services.supabase_client import get_client
+from services.funnel_service import funnel_worker
+from utils_others.cache import TTLCache
 from utils_others.logger import logger
+from utils_others.skill_dictionary import skill_dictionary
+
+# candidate_id -> frozenset of job ids the candidate has applied to.
+# Invalidated on submit in this process; other workers catch up within the TTL.
+APPLIED_CACHE_TTL = float(os.getenv("APPLIED_CACHE_TTL", "120"))
+applied_jobs_cache = TTLCache(ttl=APPLIED_CACHE_TTL, maxsize=int(os.getenv("APPLIED_CACHE_SIZE", "20000")))
+
+# submit_job_application error codes -> (HTTP status, message)
+SUBMIT_ERRORS = {
+    "job_inactive": (400, "Job is no longer active"),
+    "duplicate": (409, "You have already applied for this job"),
+    "idempotency_key_reused": (422, "Idempotency key was already used for a different job"),
+    # Unique violation on (candidate_id, idempotency_key): a concurrent request
+    # with the same key inserted first, possibly for a different job
+    "idempotency_key_conflict": (409, "Idempotency key is already in use by another request"),
+}
+
+
+class ApplicationRejected(RuntimeError):
+    """The submission was refused by the database (closed job, duplicate, ...)."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 class ApplicantService:
@@ -79,7 +106,7 @@ class ApplicantService:
                 pass 
 
             logger.info("Profile updated successfully", extra={"candidate_id": candidate_id})
-            return {"status": "success"}
+            return {"status": "success", "resume_url": profile_data.get("resume_url")}
 
         except Exception as e:
             logger.error(f"Profile update failed: {str(e)}", extra={"candidate_id": candidate_id})
@@ -109,6 +136,7 @@ class ApplicantService:
 
     def _save_skills(self, candidate_id: str, items: List[str]):
         self.supabase.table("candidate_skills").delete().eq("candidate_id", candidate_id).execute()
+        items = skill_dictionary.canonicalize_many(items)
         if not items: return
         data = [{"candidate_id": candidate_id, "skill_name": s} for s in items]
         self.supabase.table("candidate_skills").insert(data).execute()
@@ -143,9 +171,6 @@ class ApplicantService:
             logger.error(f"Get Profile Failed: {e}")
             return {}
             
-    def submit_application(self, data: Dict[str, Any]):
-        return self.supabase.table("job_applications").insert(data).execute()
-    
     # ---------------------------------------------------------
     # JOB APPLICATIONS
     # ---------------------------------------------------------
@@ -153,64 +178,68 @@ class ApplicantService:
         """
         Returns True if the candidate has already applied for this job.
         """
+        try:
+            return str(job_id) in self.get_applied_job_ids(candidate_id)
+        except Exception as e:
+            logger.error(f"Check status failed: {e}")
+            return False
+
+    def get_applied_job_ids(self, candidate_id: str) -> Set[str]:
+        """
+        Every job id the candidate has applied to, in one query per cache miss.
+        Used to mark "already applied" across a whole job board page.
+        """
+        return applied_jobs_cache.get_or_load(candidate_id, lambda: self._load_applied_job_ids(candidate_id))
+
+    def _load_applied_job_ids(self, candidate_id: str) -> frozenset:
         try:
             res = (
                 self.supabase.table("job_applications")
-                .select("id")
+                .select("job_id")
                 .eq("candidate_id", candidate_id)
-                .eq("job_id", job_id)
                 .execute()
             )
-            return len(res.data) > 0
+            return frozenset(str(r["job_id"]) for r in (res.data or []) if r.get("job_id"))
         except Exception as e:
-            logger.error(f"Check status failed: {e}")
-            return False
+            logger.error(f"Load applied jobs failed: {str(e)}", extra={"candidate_id": candidate_id})
+            raise RuntimeError("Failed to load applied jobs")
 
-    def submit_application(self, data: Dict[str, Any]):
+    def submit_application(self, data: Dict[str, Any], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
         """
-        Inserts a new record into job_applications.
+        Submits an application in one round trip (submit_job_application RPC):
+        the job status check, the insert and duplicate detection run in a
+        single transaction, so concurrent double-submits cannot both succeed.
+
+        Returns {"application": {...}, "created": bool}. created is False when
+        a retry with the same idempotency key replays the original result.
         """
-        if self.check_application_status(data["candidate_id"], data["job_id"]):
-            raise RuntimeError("You have already applied for this job")
-
-            clean_data = {
-                "job_id": data["job_id"],
-                "candidate_id": data["candidate_id"],
-                "cover_letter": data.get("cover_letter"),
-                "status": "pending"
-            }
-            res = self.supabase.table("job_applications").insert(clean_data).execute()
-            return res.data[0] if res.data else {}
+        params = {
+            "p_job_id": data["job_id"],
+            "p_candidate_id": data["candidate_id"],
+            "p_cover_letter": data.get("cover_letter"),
+            "p_idempotency_key": idempotency_key,
+        }
         try:
-            # 1. Verify Job Exists and is Active
-            job_res = self.supabase.table("jobs").select("status").eq("id", data["job_id"]).single().execute()
-            if not job_res.data or job_res.data.get("status") != "active":
-                 raise RuntimeError("Job is no longer active")
-
-            # 2. Check for Duplicate
-            if self.check_application_status(data["candidate_id"], data["job_id"]):
-                raise RuntimeError("You have already applied for this job")
-
-            # 3. Insert Application
-            # Ensure we only insert valid columns
-            clean_data = {
-                "job_id": data["job_id"],
-                "candidate_id": data["candidate_id"],
-                "cover_letter": data.get("cover_letter"),
-                # "custom_answers": data.get("custom_answers") # If you have this column
-            }
-            
-            res = self.supabase.table("job_applications").insert(clean_data).execute()
-            
-            if getattr(res, "error", None):
-                raise Exception(res.error)
-                
-            logger.info(f"Application submitted", extra={"candidate_id": data["candidate_id"], "job_id": data["job_id"]})
-            return res.data[0] if res.data else {}
-
+            res = self.supabase.rpc("submit_job_application", params).execute()
         except Exception as e:
-            logger.error(f"Application submission failed: {str(e)}")
+            if idempotency_key is not None and getattr(e, "code", None) == "23505":
+                status_code, message = SUBMIT_ERRORS["idempotency_key_conflict"]
+                logger.info("Concurrent idempotency key reuse", extra={"candidate_id": data["candidate_id"], "job_id": data["job_id"]})
+                raise ApplicationRejected(message, status_code)
+            logger.error(f"Application submission failed: {str(e)}", extra={"candidate_id": data["candidate_id"], "job_id": data["job_id"]})
             raise RuntimeError(f"Application failed: {str(e)}")
+
+        result = res.data or {}
+        error = result.get("error")
+        if error:
+            status_code, message = SUBMIT_ERRORS.get(error, (400, f"Application failed: {error}"))
+            raise ApplicationRejected(message, status_code)
+
+        applied_jobs_cache.invalidate(data["candidate_id"])
+        if result.get("created"):
+            funnel_worker.job_changed(data["job_id"])
+            logger.info(f"Application submitted", extra={"candidate_id": data["candidate_id"], "job_id": data["job_id"]})
+        return result
     
     # ---------------------------------------------------------
     # GET ALL APPLICATIONS (For Candidate Dashboard)
@@ -1,6 +1,7 @@
 from typing import Optional, Dict, Any, List
 from supabase import Client
 from services.supabase_client import get_client
+from services.funnel_service import FunnelService, funnel_worker
 from utils_others.logger import logger
 
 
@@ -16,6 +17,7 @@ class DashboardService:
 
     def __init__(self, client: Optional[Client] = None):
         self.supabase = client or get_client()
+        self.funnels = FunnelService(self.supabase)
 
     # ---------------------------------------------------------
     # PUBLIC API
@@ -82,12 +84,14 @@ class DashboardService:
             applications = self._fetch_applications_for_jobs(job_ids) if job_ids else []
 
             stats = self._compute_recruiter_stats(jobs, applications)
+            funnel = self.get_recruiter_funnel(user_id, job_ids)
 
             logger.info("Recruiter dashboard loaded", extra={"user_id": user_id})
 
             return {
                 "role": "recruiter",
                 "stats": stats,
+                "funnel": funnel,
                 "jobs": jobs,
                 "applications": applications,
             }
@@ -110,6 +114,24 @@ class DashboardService:
 
         return res.data or []
 
+    def get_recruiter_funnel(self, user_id: str, job_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Stored funnels of the recruiter's jobs (or `job_ids`, already known
+        to be theirs) plus their combined stage counts.
+        Nothing is computed here: jobs without a stored funnel are queued
+        for the funnel worker and listed under "pending".
+        """
+        if job_ids is None:
+            job_ids = [j["id"] for j in self._fetch_recruiter_jobs(user_id)]
+        by_job = self.funnels.get_funnels(job_ids)
+        pending = [job_id for job_id in job_ids if job_id not in by_job]
+        funnel_worker.jobs_changed(pending)
+        return {
+            "overall": FunnelService.combine(list(by_job.values())),
+            "jobs": by_job,
+            "pending": pending,
+        }
+
     def _fetch_applications_for_jobs(self, job_ids: List[str]) -> List[Dict[str, Any]]:
         res = (
             self.supabase.table("job_applications")
@@ -215,29 +237,6 @@ class DashboardService:
 
         return stats
 
-    def list_public_jobs(self, search_query: Optional[str] = None) -> List[Dict[str, Any]]:
-        try:
-            query = self.supabase.table("jobs").select("*").eq("status", "active")
-            
-            if search_query:
-                query = query.ilike("title", f"%{search_query}%")
-            
-            # We use .execute() which ALWAYS returns a list []
-            res = query.order("created_at", desc=True).limit(50).execute()
-            
-            # Safely handle data
-            jobs = res.data if res.data else []
-            
-            # Enrich
-            if jobs:
-                self._enrich_jobs(jobs)
-                
-            return jobs
-        except Exception as e:
-            print(f"❌ Service Error (List): {e}")
-            logger.error(f"List jobs failed: {e}")
-            return []
-
     # ---------------------------------------------------------
     # PUBLIC JOB LISTING (For Candidates)
     # ---------------------------------------------------------
@@ -285,12 +284,3 @@ class DashboardService:
                 for j in jobs:
                     j["company_name"] = c_map.get(j.get("company_id"), "Unknown Company")
             except: pass
-
-    # ---------------------------------------------------------
-    # EXISTING DASHBOARD SUMMARY LOGIC
-    # ---------------------------------------------------------
-    def get_summary(self, user_id: str) -> Dict[str, Any]:
-        # (Simplified for brevity - assumes existing logic handles role dispatch)
-        # You can keep your existing get_summary logic here if you have it, 
-        # or use this placeholder which relies on the frontend fetching specific data lists.
-        return {"role": "candidate", "stats": {}, "jobs": [], "applications": []}
\ No newline at end of file
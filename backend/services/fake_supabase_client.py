@@ -0,0 +1,1433 @@
+"""
+In-memory stand-in for the Supabase client.
+
+Implements the subset of supabase-py used by the services
+(table/select/eq/in_/order/range/limit/single/maybe_single/insert/update/
+upsert/delete, rpc, storage buckets and auth) on top of plain Python lists,
+so the service layer can be tested and benchmarked without a network.
+
+Tables, column defaults, unique constraints and foreign keys are read from
+the SQL files in 'database files/'. Every execute() can be delayed by a
+configurable latency to model the real network round trip.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEMA_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "database files"))
+
+# Loaded in order; later files may add tables, columns and constraints
+DEFAULT_SCHEMA_FILES = [
+    "database-schema.sql",
+    "add_application_statuses.sql",
+    "create_recruiter_profiles.sql",
+    "create_rescoring_jobs.sql",
+    "add_resume_text.sql",
+    "create_job_recommendations.sql",
+    "create_submit_application.sql",
+    "create_replace_interview_questions.sql",
+    "create_analytics_rollups.sql",
+    "create_job_funnels.sql",
+    "create_update_application_scores.sql",
+]
+
+
+# ---------------------------------------------------------
+# RESPONSES & ERRORS
+# ---------------------------------------------------------
+class FakeAPIResponse:
+    """Mirrors postgrest.APIResponse (data + count)."""
+
+    __slots__ = ("data", "count")
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+    def __repr__(self) -> str:
+        return f"FakeAPIResponse(data={self.data!r}, count={self.count!r})"
+
+
+class FakeAPIError(Exception):
+    """Mirrors postgrest.exceptions.APIError (message/code/details/hint)."""
+
+    def __init__(self, message: str, code: str = "PGRST000", details: Optional[str] = None, hint: Optional[str] = None):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.details = details
+        self.hint = hint
+
+    def json(self) -> Dict[str, Any]:
+        return {"message": self.message, "code": self.code, "details": self.details, "hint": self.hint}
+
+
+# ---------------------------------------------------------
+# SCHEMA
+# ---------------------------------------------------------
+class TableSchema:
+    def __init__(self, name: str):
+        self.name = name
+        self.columns: List[str] = []
+        self.defaults: Dict[str, Callable[[], Any]] = {}
+        self.primary_key: Tuple[str, ...] = ("id",)
+        self.unique: List[Tuple[str, ...]] = []
+        self.foreign_keys: Dict[str, Tuple[str, str]] = {}  # column -> (table, column)
+
+    def add_unique(self, cols: Iterable[str]) -> None:
+        key = tuple(cols)
+        if key and key not in self.unique:
+            self.unique.append(key)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _default_factory(expr: str) -> Optional[Callable[[], Any]]:
+    expr = expr.strip().rstrip(",").strip()
+    low = expr.lower()
+    if low.startswith(("gen_random_uuid", "uuid_generate_v4")):
+        return lambda: str(uuid.uuid4())
+    if low.startswith(("now()", "current_timestamp", "timezone(")):
+        return _now
+    if low in ("true", "false"):
+        value = low == "true"
+        return lambda: value
+    if low == "null":
+        return None
+    if re.fullmatch(r"-?\d+", expr):
+        number = int(expr)
+        return lambda: number
+    if re.fullmatch(r"-?\d+\.\d+", expr):
+        number = float(expr)
+        return lambda: number
+    m = re.fullmatch(r"'(.*)'(?:::[\w\[\]]+)?", expr, re.S)
+    if m:
+        text = m.group(1)
+        if text in ("{}", "[]"):
+            return (lambda: {}) if text == "{}" else (lambda: [])
+        return lambda: text
+    return None
+
+
+def _split_top_level(text: str, sep: str = ",") -> List[str]:
+    parts, depth, current, quote = [], 0, [], None
+    for ch in text:
+        if ch in "'\"" and quote in (None, ch):
+            quote = None if quote else ch
+        elif not quote and ch == "(":
+            depth += 1
+        elif not quote and ch == ")":
+            depth -= 1
+        if ch == sep and depth == 0 and not quote:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    if current:
+        parts.append("".join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+_TABLE_RE = re.compile(
+    r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:public\.)?(\w+)\s*\((.*?)\)\s*;",
+    re.I | re.S,
+)
+_ALTER_RE = re.compile(r"ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?(?:public\.)?(\w+)\s+(.*?);", re.I | re.S)
+_UNIQUE_INDEX_RE = re.compile(
+    r"CREATE\s+UNIQUE\s+INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?\w+\s+ON\s+(?:public\.)?(\w+)\s*\(([^)]*)\)\s*(WHERE[^;]*)?;",
+    re.I,
+)
+_BUCKET_RE = re.compile(r"INSERT\s+INTO\s+storage\.buckets\s*\([^)]*\)\s*VALUES\s*(.*?);", re.I | re.S)
+_CONSTRAINT_WORDS = ("PRIMARY KEY", "UNIQUE", "FOREIGN KEY", "CONSTRAINT", "CHECK", "EXCLUDE")
+
+
+def _strip_sql_comments(sql: str) -> str:
+    return re.sub(r"--[^\n]*", "", sql)
+
+
+def _parse_column(schema: TableSchema, definition: str) -> None:
+    m = re.match(r'"?(\w+)"?\s+(.*)', definition, re.S)
+    if not m:
+        return
+    name, rest = m.group(1), m.group(2)
+    if name not in schema.columns:
+        schema.columns.append(name)
+
+    default = re.search(
+        r"\bDEFAULT\s+('(?:[^']|'')*'(?:::[\w\[\]]+)?|[\w.]+\([^)]*\)|[\w.\-]+)",
+        rest,
+        re.I,
+    )
+    if default:
+        factory = _default_factory(default.group(1))
+        if factory:
+            schema.defaults[name] = factory
+
+    upper = rest.upper()
+    if "PRIMARY KEY" in upper:
+        schema.primary_key = (name,)
+    if re.search(r"\bUNIQUE\b", upper):
+        schema.add_unique((name,))
+    ref = re.search(r"REFERENCES\s+(?:public\.|auth\.)?(\w+)\s*\((\w+)\)", rest, re.I)
+    if ref and "auth.users" not in rest.lower():
+        schema.foreign_keys[name] = (ref.group(1), ref.group(2))
+
+
+def _parse_constraint(schema: TableSchema, definition: str) -> None:
+    unique = re.search(r"UNIQUE\s*\(([^)]*)\)", definition, re.I)
+    if unique:
+        schema.add_unique(c.strip().strip('"') for c in unique.group(1).split(","))
+    pk = re.search(r"PRIMARY\s+KEY\s*\(([^)]*)\)", definition, re.I)
+    if pk:
+        schema.primary_key = tuple(c.strip().strip('"') for c in pk.group(1).split(","))
+    fk = re.search(
+        r"FOREIGN\s+KEY\s*\((\w+)\)\s*REFERENCES\s+(?:public\.|auth\.)?(\w+)\s*\((\w+)\)",
+        definition,
+        re.I,
+    )
+    if fk and "auth.users" not in definition.lower():
+        schema.foreign_keys[fk.group(1)] = (fk.group(2), fk.group(3))
+
+
+def parse_schema_sql(sql: str, schemas: Optional[Dict[str, TableSchema]] = None) -> Tuple[Dict[str, TableSchema], List[str]]:
+    """
+    Extracts tables (columns, defaults, keys) and storage buckets from SQL.
+    Only the DDL subset used in 'database files/' is understood.
+    """
+    schemas = schemas if schemas is not None else {}
+    sql = _strip_sql_comments(sql)
+    buckets: List[str] = []
+
+    for m in _TABLE_RE.finditer(sql):
+        name = m.group(1)
+        schema = schemas.setdefault(name, TableSchema(name))
+        for definition in _split_top_level(m.group(2)):
+            if definition.upper().startswith(_CONSTRAINT_WORDS):
+                _parse_constraint(schema, definition)
+            else:
+                _parse_column(schema, definition)
+
+    for m in _ALTER_RE.finditer(sql):
+        schema = schemas.setdefault(m.group(1), TableSchema(m.group(1)))
+        for action in _split_top_level(m.group(2)):
+            add_column = re.match(r"ADD\s+COLUMN\s+(?:IF\s+NOT\s+EXISTS\s+)?(.*)", action, re.I | re.S)
+            if add_column:
+                _parse_column(schema, add_column.group(1))
+                continue
+            add_constraint = re.match(r"ADD\s+(.*)", action, re.I | re.S)
+            if add_constraint:
+                _parse_constraint(schema, add_constraint.group(1))
+
+    for m in _UNIQUE_INDEX_RE.finditer(sql):
+        if m.group(3):
+            continue  # partial unique indexes are not modelled
+        schema = schemas.setdefault(m.group(1), TableSchema(m.group(1)))
+        schema.add_unique(c.strip().split()[0].strip('"') for c in m.group(2).split(","))
+
+    for m in _BUCKET_RE.finditer(sql):
+        for row in re.findall(r"\(\s*'([^']+)'", m.group(1)):
+            buckets.append(row)
+
+    return schemas, buckets
+
+
+# ---------------------------------------------------------
+# FILTER EVALUATION
+# ---------------------------------------------------------
+def _coerce(value: Any, sample: Any) -> Any:
+    """Converts a filter value (often a string) to the type stored in the row."""
+    if value is None or sample is None:
+        return value
+    if isinstance(sample, bool):
+        if isinstance(value, str):
+            return value.lower() == "true"
+        return bool(value)
+    if isinstance(sample, (int, float)) and isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                return value
+    if isinstance(sample, str) and not isinstance(value, str):
+        return str(value).lower() if isinstance(value, bool) else str(value)
+    return value
+
+
+class _InValues(list):
+    """in_() operand; caches a string set so text/uuid columns match in O(1)."""
+
+    @property
+    def as_strings(self) -> frozenset:
+        cached = self.__dict__.get("_strings")
+        if cached is None:
+            cached = self.__dict__["_strings"] = frozenset(_coerce(v, "") for v in self)
+        return cached
+
+
+def _like(value: Any, pattern: str, case_insensitive: bool) -> bool:
+    if value is None:
+        return False
+    regex = "".join(
+        ".*" if ch in "%*" else "." if ch == "_" else re.escape(ch)
+        for ch in pattern
+    )
+    flags = re.I | re.S if case_insensitive else re.S
+    return re.fullmatch(regex, str(value), flags) is not None
+
+
+def _compare(op: str, row_value: Any, value: Any) -> bool:
+    if op == "is":
+        if isinstance(value, str):
+            value = {"null": None, "true": True, "false": False}.get(value.lower(), value)
+        return row_value is value or row_value == value
+    if op == "in":
+        if isinstance(row_value, str) and isinstance(value, _InValues):
+            return row_value in value.as_strings
+        return any(row_value == _coerce(v, row_value) for v in value)
+    if op == "like":
+        return _like(row_value, value, False)
+    if op == "ilike":
+        return _like(row_value, value, True)
+    if op in ("cs", "contains"):
+        if isinstance(row_value, dict):
+            return all(row_value.get(k) == v for k, v in dict(value).items())
+        return row_value is not None and all(v in row_value for v in value)
+
+    if row_value is None:
+        return False
+    value = _coerce(value, row_value)
+    try:
+        if op == "eq":
+            return row_value == value
+        if op == "neq":
+            return row_value != value
+        if op == "gt":
+            return row_value > value
+        if op == "gte":
+            return row_value >= value
+        if op == "lt":
+            return row_value < value
+        if op == "lte":
+            return row_value <= value
+    except TypeError:
+        return False
+    raise FakeAPIError(f"Unsupported filter operator: {op}", code="PGRST100")
+
+
+def _parse_logic(expr: str) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Parses PostgREST logic trees as used by or_():
+    "title.ilike.%x%,and(applied_at.eq.2024-01-01,id.lt.abc)"
+    """
+    checks = []
+    for part in _split_top_level(expr):
+        nested = re.fullmatch(r"(not\.)?(and|or)\((.*)\)", part, re.S)
+        if nested:
+            negate, kind, body = nested.group(1), nested.group(2), nested.group(3)
+            children = [_parse_logic(p) for p in _split_top_level(body)]
+            combine = all if kind == "and" else any
+            fn = (lambda cs, comb: lambda row: comb(c(row) for c in cs))(children, combine)
+            checks.append((lambda f: lambda row: not f(row))(fn) if negate else fn)
+            continue
+
+        column, op, value = _split_condition(part)
+        negate = op.startswith("not.")
+        if negate:
+            op = op[4:]
+        if op == "in":
+            value = _InValues(v.strip().strip('"') for v in value.strip("()").split(",") if v.strip())
+        elif len(value) >= 2 and value[0] == value[-1] == '"':
+            value = value[1:-1]  # quoted values may contain , . : ( )
+        check = (lambda c, o, v: lambda row: _compare(o, _lookup(row, c), v))(column, op, value)
+        checks.append((lambda f: lambda row: not f(row))(check) if negate else check)
+
+    return lambda row: any(c(row) for c in checks)
+
+
+def _split_condition(part: str) -> Tuple[str, str, str]:
+    pieces = part.split(".")
+    # Column names may be qualified (jobs.created_by) -> find the operator
+    for i in range(1, len(pieces)):
+        token = pieces[i]
+        if token == "not" and i + 1 < len(pieces):
+            return ".".join(pieces[:i]), f"not.{pieces[i + 1]}", ".".join(pieces[i + 2:])
+        if token in ("eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike", "is", "in", "cs"):
+            return ".".join(pieces[:i]), token, ".".join(pieces[i + 1:])
+    raise FakeAPIError(f"Cannot parse filter: {part}", code="PGRST100")
+
+
+def _lookup(row: Dict[str, Any], column: str) -> Any:
+    if "." in column and column not in row:
+        head, rest = column.split(".", 1)
+        nested = row.get(head)
+        if isinstance(nested, list):
+            return nested[0].get(rest) if nested else None
+        if isinstance(nested, dict):
+            return nested.get(rest)
+        return None
+    if "->>" in column:
+        head, key = column.split("->>", 1)
+        nested = row.get(head) or {}
+        value = nested.get(key.strip("'")) if isinstance(nested, dict) else None
+        return None if value is None else str(value)
+    return row.get(column)
+
+
+# ---------------------------------------------------------
+# SELECT PARSING / EMBEDDING
+# ---------------------------------------------------------
+class _Selection:
+    __slots__ = ("columns", "embeds")
+
+    def __init__(self, columns: List[Tuple[str, str]], embeds: List[Dict[str, Any]]):
+        self.columns = columns  # (output name, source column); ("*", "*") for all
+        self.embeds = embeds
+
+
+def _parse_select(spec: str) -> _Selection:
+    columns, embeds = [], []
+    for part in _split_top_level(spec or "*"):
+        m = re.fullmatch(r"(?:(\w+):)?(\w+)(?:!(\w+))?\((.*)\)", part, re.S)
+        if m:
+            alias, table, hint, inner = m.groups()
+            embeds.append({
+                "name": alias or table,
+                "table": table,
+                "inner": hint == "inner",
+                "selection": _parse_select(inner),
+            })
+            continue
+        if part == "*":
+            columns.append(("*", "*"))
+            continue
+        m = re.fullmatch(r"(?:(\w+):)?([\w\->']+)", part)
+        if m:
+            alias, column = m.groups()
+            if column == "count":
+                continue
+            columns.append((alias or column, column))
+    if not columns and not embeds:
+        columns.append(("*", "*"))
+    return _Selection(columns, embeds)
+
+
+def _project(row: Dict[str, Any], selection: _Selection) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for name, column in selection.columns:
+        if column == "*":
+            out.update(row)
+        else:
+            out[name] = _lookup(row, column)
+    return out
+
+
+# ---------------------------------------------------------
+# DATABASE
+# ---------------------------------------------------------
+class FakeDatabase:
+    """Thread-safe in-memory tables plus call accounting and latency."""
+
+    def __init__(self, latency: float = 0.0):
+        self.schemas: Dict[str, TableSchema] = {}
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.rpc_functions: Dict[str, Callable[["FakeDatabase", Dict[str, Any]], Any]] = {}
+        # AFTER INSERT/UPDATE row triggers: fn(db, old_row_or_None, new_row)
+        self.triggers: Dict[str, List[Callable[["FakeDatabase", Optional[Dict[str, Any]], Dict[str, Any]], None]]] = {}
+        self.latency = latency
+        self.lock = threading.RLock()
+        self.call_count = 0
+        self.calls_by_table: Dict[str, int] = {}
+        # Hash indexes on key columns, built on first lookup and kept in
+        # sync by every write; keeps bulk seeds/upserts O(n) instead of O(n^2)
+        self.indexes: Dict[str, Dict[Tuple[str, ...], Dict[Tuple[Any, ...], Dict[str, Any]]]] = {}
+
+    # -------- schema / seeding --------
+    def load_schema_files(self, paths: Iterable[str]) -> List[str]:
+        buckets: List[str] = []
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as fh:
+                _, found = parse_schema_sql(fh.read(), self.schemas)
+            buckets.extend(found)
+        for name in self.schemas:
+            self.tables.setdefault(name, [])
+        return buckets
+
+    def schema(self, table: str) -> TableSchema:
+        if table not in self.schemas:
+            self.schemas[table] = TableSchema(table)
+            self.tables.setdefault(table, [])
+        return self.schemas[table]
+
+    def seed(self, table: str, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Inserts rows without latency or call accounting."""
+        with self.lock:
+            return [self._insert_row(table, dict(row)) for row in rows]
+
+    def reset_counters(self) -> None:
+        with self.lock:
+            self.call_count = 0
+            self.calls_by_table = {}
+
+    def register_rpc(self, name: str, fn: Callable[["FakeDatabase", Dict[str, Any]], Any]) -> None:
+        self.rpc_functions[name] = fn
+
+    # -------- round trips --------
+    def round_trip(self, target: str) -> None:
+        if self.latency > 0:
+            time.sleep(self.latency)
+        with self.lock:
+            self.call_count += 1
+            self.calls_by_table[target] = self.calls_by_table.get(target, 0) + 1
+
+    # -------- row helpers --------
+    def _apply_defaults(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        schema = self.schema(table)
+        for column, factory in schema.defaults.items():
+            if column not in row or (row[column] is None and column in schema.primary_key):
+                row[column] = factory()
+        if "id" in schema.primary_key and row.get("id") is None and "id" not in schema.defaults:
+            if "id" in schema.columns or not schema.columns:
+                row["id"] = str(uuid.uuid4())
+        return row
+
+    def _conflicting_row(self, table: str, row: Dict[str, Any], cols: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+        values = tuple(row.get(c) for c in cols)
+        if any(v is None for v in values):
+            return None  # NULLs never conflict in Postgres
+        existing = self._index(table, cols).get(values)
+        return existing if existing is not row else None
+
+    # -------- key indexes --------
+    def _index(self, table: str, cols: Tuple[str, ...]) -> Dict[Tuple[Any, ...], Dict[str, Any]]:
+        table_indexes = self.indexes.setdefault(table, {})
+        index = table_indexes.get(cols)
+        if index is None:
+            index = {}
+            for existing in self.tables.get(table, []):
+                key = tuple(existing.get(c) for c in cols)
+                if None not in key:
+                    index.setdefault(key, existing)
+            table_indexes[cols] = index
+        return index
+
+    def index_add(self, table: str, row: Dict[str, Any]) -> None:
+        for cols, index in self.indexes.get(table, {}).items():
+            key = tuple(row.get(c) for c in cols)
+            if None not in key:
+                index.setdefault(key, row)
+
+    def index_remove(self, table: str, row: Dict[str, Any]) -> None:
+        for cols, index in self.indexes.get(table, {}).items():
+            key = tuple(row.get(c) for c in cols)
+            if index.get(key) is row:
+                del index[key]
+
+    def update_row(self, table: str, row: Dict[str, Any], changes: Dict[str, Any]) -> None:
+        """In-place update that keeps the key indexes in sync."""
+        previous = dict(row) if table in self.triggers else None
+        self.index_remove(table, row)
+        row.update(changes)
+        self.index_add(table, row)
+        if previous is not None:
+            self._fire(table, previous, row)
+
+    def delete_rows(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        doomed = {id(r) for r in rows}
+        for row in rows:
+            self.index_remove(table, row)
+        self.tables[table] = [r for r in self.tables.get(table, []) if id(r) not in doomed]
+
+    def _check_unique(self, table: str, row: Dict[str, Any]) -> None:
+        schema = self.schema(table)
+        for cols in [schema.primary_key] + schema.unique:
+            if self._conflicting_row(table, row, cols) is not None:
+                raise FakeAPIError(
+                    f'duplicate key value violates unique constraint "{table}_{"_".join(cols)}_key"',
+                    code="23505",
+                    details=f"Key ({', '.join(cols)}) already exists.",
+                )
+
+    def _insert_row(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        row = self._apply_defaults(table, row)
+        self._check_unique(table, row)
+        self.tables.setdefault(table, []).append(row)
+        self.index_add(table, row)
+        self._fire(table, None, row)
+        return row
+
+    def _fire(self, table: str, old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> None:
+        for trigger in self.triggers.get(table, []):
+            trigger(self, old, new)
+
+    # -------- embedding --------
+    def _relation(self, parent: str, child: str) -> Optional[Tuple[str, str, str]]:
+        """Returns (kind, parent_column, child_column) for a foreign key between two tables."""
+        for column, (ref_table, ref_column) in self.schema(parent).foreign_keys.items():
+            if ref_table == child:
+                return "one", column, ref_column
+        for column, (ref_table, ref_column) in self.schema(child).foreign_keys.items():
+            if ref_table == parent:
+                return "many", ref_column, column
+        return None
+
+    def embed(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        selection: _Selection,
+        embedded_filters: Dict[str, List[Callable[[Dict[str, Any]], bool]]],
+    ) -> List[Dict[str, Any]]:
+        results = []
+        for row in rows:
+            out = _project(row, selection)
+            keep = True
+            for embed in selection.embeds:
+                relation = self._relation(table, embed["table"])
+                if relation is None:
+                    raise FakeAPIError(
+                        f"Could not find a relationship between '{table}' and '{embed['table']}'",
+                        code="PGRST200",
+                    )
+                kind, parent_col, child_col = relation
+                key = row.get(parent_col)
+                filters = embedded_filters.get(embed["name"], [])
+                if kind == "one":
+                    # A foreign key references a unique column: use the key index
+                    target = self._index(embed["table"], (child_col,)).get((key,)) if key is not None else None
+                    matches = [target] if target is not None and all(f(target) for f in filters) else []
+                else:
+                    matches = [
+                        r for r in self.tables.get(embed["table"], [])
+                        if key is not None and r.get(child_col) == key and all(f(r) for f in filters)
+                    ]
+                projected = self.embed(embed["table"], matches, embed["selection"], {})
+                if kind == "one":
+                    out[embed["name"]] = projected[0] if projected else None
+                    if embed["inner"] and not projected:
+                        keep = False
+                else:
+                    out[embed["name"]] = projected
+                    if embed["inner"] and not projected:
+                        keep = False
+            if keep:
+                results.append(out)
+        return results
+
+
+# ---------------------------------------------------------
+# QUERY BUILDER
+# ---------------------------------------------------------
+class FakeQueryBuilder:
+    """
+    Chainable builder mirroring postgrest's SyncRequestBuilder family.
+    Each method returns self; execute() performs the operation.
+    """
+
+    def __init__(self, db: FakeDatabase, table: str):
+        self._db = db
+        self._table = table
+        self._operation = "select"
+        self._selection = _parse_select("*")
+        self._payload: Any = None
+        self._filters: List[Callable[[Dict[str, Any]], bool]] = []
+        self._embedded_filters: Dict[str, List[Callable[[Dict[str, Any]], bool]]] = {}
+        self._order: List[Tuple[str, bool, Optional[bool]]] = []
+        self._offset = 0
+        self._limit: Optional[int] = None
+        self._count: Optional[str] = None
+        self._head = False
+        self._single: Optional[str] = None  # "single" | "maybe"
+        self._on_conflict: Optional[str] = None
+        self._ignore_duplicates = False
+        self._negate_next = False
+
+    # -------- operations --------
+    def select(self, *columns: str, count: Optional[str] = None, head: Optional[bool] = None) -> "FakeQueryBuilder":
+        self._operation = "select"
+        self._selection = _parse_select(",".join(columns) if columns else "*")
+        self._count = count
+        self._head = bool(head)
+        return self
+
+    def insert(self, json: Any, *, count: Optional[str] = None, returning: Any = None, upsert: bool = False, default_to_null: bool = True) -> "FakeQueryBuilder":
+        self._operation = "upsert" if upsert else "insert"
+        self._payload = json
+        self._count = count
+        return self
+
+    def upsert(self, json: Any, *, count: Optional[str] = None, returning: Any = None, ignore_duplicates: bool = False, on_conflict: str = "", default_to_null: bool = True) -> "FakeQueryBuilder":
+        self._operation = "upsert"
+        self._payload = json
+        self._count = count
+        self._on_conflict = on_conflict or None
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, json: Dict[str, Any], *, count: Optional[str] = None, returning: Any = None) -> "FakeQueryBuilder":
+        self._operation = "update"
+        self._payload = json
+        self._count = count
+        return self
+
+    def delete(self, *, count: Optional[str] = None, returning: Any = None) -> "FakeQueryBuilder":
+        self._operation = "delete"
+        self._count = count
+        return self
+
+    # -------- filters --------
+    def _add_filter(self, column: str, op: str, value: Any) -> "FakeQueryBuilder":
+        negate, self._negate_next = self._negate_next, False
+        head, _, rest = column.partition(".")
+        if rest and any(e["name"] == head for e in self._selection.embeds):
+            check = lambda row, c=rest, o=op, v=value: _compare(o, _lookup(row, c), v)
+            if negate:
+                check = (lambda f: lambda row: not f(row))(check)
+            self._embedded_filters.setdefault(head, []).append(check)
+            return self
+        check = lambda row, c=column, o=op, v=value: _compare(o, _lookup(row, c), v)
+        self._filters.append((lambda f: lambda row: not f(row))(check) if negate else check)
+        return self
+
+    @property
+    def not_(self) -> "FakeQueryBuilder":
+        self._negate_next = True
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeQueryBuilder":
+        return self._add_filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "FakeQueryBuilder":
+        return self._add_filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "FakeQueryBuilder":
+        return self._add_filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "FakeQueryBuilder":
+        return self._add_filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "FakeQueryBuilder":
+        return self._add_filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "FakeQueryBuilder":
+        return self._add_filter(column, "lte", value)
+
+    def like(self, column: str, pattern: str) -> "FakeQueryBuilder":
+        return self._add_filter(column, "like", pattern)
+
+    def ilike(self, column: str, pattern: str) -> "FakeQueryBuilder":
+        return self._add_filter(column, "ilike", pattern)
+
+    def is_(self, column: str, value: Any) -> "FakeQueryBuilder":
+        return self._add_filter(column, "is", value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "FakeQueryBuilder":
+        return self._add_filter(column, "in", _InValues(values))
+
+    def contains(self, column: str, value: Any) -> "FakeQueryBuilder":
+        return self._add_filter(column, "cs", value)
+
+    def match(self, query: Dict[str, Any]) -> "FakeQueryBuilder":
+        for column, value in query.items():
+            self.eq(column, value)
+        return self
+
+    def filter(self, column: str, operator: str, criteria: Any) -> "FakeQueryBuilder":
+        negate = operator.startswith("not.")
+        if negate:
+            self._negate_next = True
+            operator = operator[4:]
+        if operator == "in" and isinstance(criteria, str):
+            criteria = _InValues(v.strip().strip('"') for v in criteria.strip("()").split(",") if v.strip())
+        return self._add_filter(column, operator, criteria)
+
+    def or_(self, filters: str, reference_table: Optional[str] = None) -> "FakeQueryBuilder":
+        check = _parse_logic(filters)
+        if reference_table:
+            self._embedded_filters.setdefault(reference_table, []).append(check)
+        else:
+            self._filters.append(check)
+        return self
+
+    # -------- modifiers --------
+    def order(self, column: str, *, desc: bool = False, nullsfirst: Optional[bool] = None, foreign_table: Optional[str] = None) -> "FakeQueryBuilder":
+        self._order.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size: int, *, foreign_table: Optional[str] = None) -> "FakeQueryBuilder":
+        self._limit = size
+        return self
+
+    def offset(self, size: int) -> "FakeQueryBuilder":
+        self._offset = size
+        return self
+
+    def range(self, start: int, end: int, foreign_table: Optional[str] = None) -> "FakeQueryBuilder":
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def single(self) -> "FakeQueryBuilder":
+        self._single = "single"
+        return self
+
+    def maybe_single(self) -> "FakeQueryBuilder":
+        self._single = "maybe"
+        return self
+
+    # -------- execution --------
+    def _matches(self, row: Dict[str, Any]) -> bool:
+        return all(f(row) for f in self._filters)
+
+    def _sorted(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for column, desc, nullsfirst in reversed(self._order):
+            nulls_first = desc if nullsfirst is None else nullsfirst
+            present = [r for r in rows if _lookup(r, column) is not None]
+            missing = [r for r in rows if _lookup(r, column) is None]
+            present.sort(key=lambda r: _lookup(r, column), reverse=desc)
+            rows = missing + present if nulls_first else present + missing
+        return rows
+
+    def _window(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        end = None if self._limit is None else self._offset + self._limit
+        return rows[self._offset:end]
+
+    def execute(self) -> Optional[FakeAPIResponse]:
+        self._db.round_trip(self._table)
+        with self._db.lock:
+            if self._operation == "select":
+                response = self._execute_select()
+            elif self._operation == "insert":
+                response = self._execute_insert()
+            elif self._operation == "upsert":
+                response = self._execute_upsert()
+            elif self._operation == "update":
+                response = self._execute_update()
+            else:
+                response = self._execute_delete()
+        return self._shape(response)
+
+    def _shape(self, response: FakeAPIResponse) -> Optional[FakeAPIResponse]:
+        if self._single is None:
+            return response
+        rows = response.data or []
+        if len(rows) == 1:
+            return FakeAPIResponse(rows[0], response.count)
+        if not rows and self._single == "maybe":
+            # supabase-py returns None instead of a response here
+            return None
+        raise FakeAPIError(
+            "JSON object requested, multiple (or no) rows returned",
+            code="PGRST116",
+            details=f"The result contains {len(rows)} rows",
+        )
+
+    def _execute_select(self) -> FakeAPIResponse:
+        rows = [r for r in self._db.tables.get(self._table, []) if self._matches(r)]
+        if self._selection.embeds:
+            # Embedding runs before windowing so !inner can drop parents
+            rows = self._db.embed(self._table, self._sorted(rows), self._selection, self._embedded_filters)
+        else:
+            rows = [_project(r, self._selection) for r in self._sorted(rows)]
+        count = len(rows) if self._count else None
+        data = [] if self._head else self._window(rows)
+        return FakeAPIResponse(data, count)
+
+    def _rows_payload(self) -> List[Dict[str, Any]]:
+        payload = self._payload
+        rows = payload if isinstance(payload, list) else [payload]
+        return [dict(r) for r in rows]
+
+    def _execute_insert(self) -> FakeAPIResponse:
+        inserted = []
+        staged = len(self._db.tables.get(self._table, []))
+        try:
+            for row in self._rows_payload():
+                inserted.append(self._db._insert_row(self._table, row))
+        except FakeAPIError:
+            # Statements are atomic: undo the rows staged by this insert
+            self._db.delete_rows(self._table, self._db.tables[self._table][staged:])
+            raise
+        data = [dict(r) for r in inserted]
+        return FakeAPIResponse(data, len(data) if self._count else None)
+
+    def _execute_upsert(self) -> FakeAPIResponse:
+        schema = self._db.schema(self._table)
+        conflict_cols = (
+            tuple(c.strip() for c in self._on_conflict.split(","))
+            if self._on_conflict else schema.primary_key
+        )
+        results = []
+        for row in self._rows_payload():
+            existing = self._db._conflicting_row(self._table, row, conflict_cols)
+            if existing is not None:
+                if self._ignore_duplicates:
+                    continue
+                self._db.update_row(self._table, existing, row)
+                results.append(existing)
+            else:
+                results.append(self._db._insert_row(self._table, row))
+        data = [dict(r) for r in results]
+        return FakeAPIResponse(data, len(data) if self._count else None)
+
+    def _execute_update(self) -> FakeAPIResponse:
+        updated = []
+        for row in self._db.tables.get(self._table, []):
+            if self._matches(row):
+                previous = dict(row)
+                self._db.update_row(self._table, row, self._payload)
+                try:
+                    self._db._check_unique(self._table, row)
+                except FakeAPIError:
+                    self._db.index_remove(self._table, row)
+                    row.clear()
+                    row.update(previous)
+                    self._db.index_add(self._table, row)
+                    raise
+                updated.append(dict(row))
+        return FakeAPIResponse(updated, len(updated) if self._count else None)
+
+    def _execute_delete(self) -> FakeAPIResponse:
+        rows = self._db.tables.get(self._table, [])
+        deleted = [r for r in rows if self._matches(r)]
+        if deleted:
+            self._db.delete_rows(self._table, deleted)
+        return FakeAPIResponse([dict(r) for r in deleted], len(deleted) if self._count else None)
+
+
+class FakeRPCBuilder:
+    def __init__(self, db: FakeDatabase, fn: str, params: Dict[str, Any]):
+        self._db = db
+        self._fn = fn
+        self._params = params or {}
+
+    def execute(self) -> FakeAPIResponse:
+        impl = self._db.rpc_functions.get(self._fn)
+        if impl is None:
+            raise FakeAPIError(f"Could not find the function public.{self._fn}", code="PGRST202")
+        self._db.round_trip(f"rpc:{self._fn}")
+        with self._db.lock:
+            return FakeAPIResponse(impl(self._db, self._params))
+
+
+# ---------------------------------------------------------
+# STORAGE
+# ---------------------------------------------------------
+class FakeBucket:
+    def __init__(self, storage: "FakeStorage", name: str):
+        self._storage = storage
+        self._name = name
+
+    @property
+    def _objects(self) -> Dict[str, bytes]:
+        return self._storage.buckets.setdefault(self._name, {})
+
+    def upload(self, path: str, file: Any, file_options: Optional[Dict[str, Any]] = None) -> SimpleNamespace:
+        self._storage.db.round_trip(f"storage:{self._name}")
+        options = {k.lower(): str(v).lower() for k, v in (file_options or {}).items()}
+        upsert = options.get("upsert") == "true" or options.get("x-upsert") == "true"
+        content = file if isinstance(file, (bytes, bytearray)) else open(file, "rb").read()
+        with self._storage.db.lock:
+            if path in self._objects and not upsert:
+                raise FakeAPIError("The resource already exists", code="409")
+            self._objects[path] = bytes(content)
+        return SimpleNamespace(path=path, full_path=f"{self._name}/{path}")
+
+    def update(self, path: str, file: Any, file_options: Optional[Dict[str, Any]] = None) -> SimpleNamespace:
+        return self.upload(path, file, {**(file_options or {}), "upsert": "true"})
+
+    def download(self, path: str, *args: Any, **kwargs: Any) -> bytes:
+        self._storage.db.round_trip(f"storage:{self._name}")
+        if path not in self._objects:
+            raise FakeAPIError("Object not found", code="404")
+        return self._objects[path]
+
+    def remove(self, paths: List[str]) -> List[Dict[str, Any]]:
+        self._storage.db.round_trip(f"storage:{self._name}")
+        removed = []
+        with self._storage.db.lock:
+            for path in paths:
+                if self._objects.pop(path, None) is not None:
+                    removed.append({"name": path, "bucket_id": self._name})
+        return removed
+
+    def list(self, path: Optional[str] = None, *args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+        self._storage.db.round_trip(f"storage:{self._name}")
+        prefix = f"{path.rstrip('/')}/" if path else ""
+        return [{"name": p[len(prefix):]} for p in sorted(self._objects) if p.startswith(prefix)]
+
+    def get_public_url(self, path: str, *args: Any, **kwargs: Any) -> str:
+        return f"{self._storage.base_url}/storage/v1/object/public/{self._name}/{path}"
+
+    def create_signed_url(self, path: str, expires_in: int, *args: Any, **kwargs: Any) -> Dict[str, str]:
+        self._storage.db.round_trip(f"storage:{self._name}")
+        url = f"{self._storage.base_url}/storage/v1/object/sign/{self._name}/{path}?token=fake&expires_in={expires_in}"
+        return {"signedURL": url, "signedUrl": url}
+
+
+class FakeStorage:
+    def __init__(self, db: FakeDatabase, base_url: str):
+        self.db = db
+        self.base_url = base_url
+        self.buckets: Dict[str, Dict[str, bytes]] = {}
+
+    def from_(self, bucket: str) -> FakeBucket:
+        return FakeBucket(self, bucket)
+
+    def create_bucket(self, bucket: str, *args: Any, **kwargs: Any) -> Dict[str, str]:
+        self.buckets.setdefault(bucket, {})
+        return {"name": bucket}
+
+    def list_buckets(self) -> List[SimpleNamespace]:
+        return [SimpleNamespace(id=name, name=name) for name in self.buckets]
+
+
+# ---------------------------------------------------------
+# AUTH
+# ---------------------------------------------------------
+def _user_object(record: Dict[str, Any]) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=record["id"],
+        email=record["email"],
+        user_metadata=dict(record.get("user_metadata") or {}),
+        app_metadata=dict(record.get("app_metadata") or {}),
+        created_at=record.get("created_at"),
+    )
+
+
+class FakeAuthAdmin:
+    def __init__(self, auth: "FakeAuth"):
+        self._auth = auth
+
+    def get_user_by_id(self, uid: str) -> SimpleNamespace:
+        self._auth.db.round_trip("auth")
+        record = self._auth.users.get(uid)
+        if record is None:
+            raise FakeAPIError("User not found", code="user_not_found")
+        return SimpleNamespace(user=_user_object(record))
+
+    def update_user_by_id(self, uid: str, attributes: Dict[str, Any]) -> SimpleNamespace:
+        self._auth.db.round_trip("auth")
+        record = self._auth.users.get(uid)
+        if record is None:
+            raise FakeAPIError("User not found", code="user_not_found")
+        with self._auth.db.lock:
+            if "user_metadata" in attributes:
+                record.setdefault("user_metadata", {}).update(attributes["user_metadata"] or {})
+            if "password" in attributes:
+                record["password"] = attributes["password"]
+            if "email" in attributes:
+                record["email"] = attributes["email"]
+        return SimpleNamespace(user=_user_object(record))
+
+    def create_user(self, attributes: Dict[str, Any]) -> SimpleNamespace:
+        record = self._auth.add_user(
+            email=attributes["email"],
+            password=attributes.get("password"),
+            user_metadata=attributes.get("user_metadata"),
+        )
+        return SimpleNamespace(user=_user_object(record))
+
+    def delete_user(self, uid: str, *args: Any, **kwargs: Any) -> None:
+        self._auth.db.round_trip("auth")
+        self._auth.users.pop(uid, None)
+
+
+class FakeAuth:
+    """
+    Minimal GoTrue stand-in. Issued access tokens are HS256 JWTs signed with
+    SUPABASE_JWT_SECRET so AuthMiddleware accepts them.
+    """
+
+    def __init__(self, db: FakeDatabase):
+        self.db = db
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.admin = FakeAuthAdmin(self)
+
+    def add_user(
+        self,
+        email: str,
+        password: Optional[str] = None,
+        user_metadata: Optional[Dict[str, Any]] = None,
+        user_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        with self.db.lock:
+            if any(u["email"] == email for u in self.users.values()):
+                raise FakeAPIError("User already registered", code="user_already_exists")
+            record = {
+                "id": user_id or str(uuid.uuid4()),
+                "email": email,
+                "password": password,
+                "user_metadata": dict(user_metadata or {}),
+                "created_at": _now(),
+            }
+            self.users[record["id"]] = record
+            # Mirrors the on_auth_user_created trigger
+            if "users" in self.db.tables and self.db._conflicting_row("users", {"id": record["id"]}, ("id",)) is None:
+                self.db._insert_row("users", {
+                    "id": record["id"],
+                    "email": email,
+                    "full_name": record["user_metadata"].get("full_name"),
+                })
+        return record
+
+    def _session(self, record: Dict[str, Any]) -> SimpleNamespace:
+        import jwt
+
+        payload = {
+            "sub": record["id"],
+            "email": record["email"],
+            "role": "authenticated",
+            "user_metadata": record.get("user_metadata") or {},
+            "exp": int(time.time()) + 3600,
+        }
+        secret = os.getenv("SUPABASE_JWT_SECRET", "").strip() or "fake-supabase-secret"
+        return SimpleNamespace(
+            access_token=jwt.encode(payload, secret, algorithm="HS256"),
+            refresh_token=uuid.uuid4().hex,
+            expires_in=3600,
+        )
+
+    def sign_in_with_password(self, credentials: Dict[str, Any]) -> SimpleNamespace:
+        self.db.round_trip("auth")
+        for record in self.users.values():
+            if record["email"] == credentials.get("email") and record.get("password") == credentials.get("password"):
+                return SimpleNamespace(user=_user_object(record), session=self._session(record))
+        raise FakeAPIError("Invalid login credentials", code="invalid_credentials")
+
+    def sign_up(self, credentials: Dict[str, Any]) -> SimpleNamespace:
+        self.db.round_trip("auth")
+        options = credentials.get("options") or {}
+        record = self.add_user(credentials["email"], credentials.get("password"), options.get("data"))
+        return SimpleNamespace(user=_user_object(record), session=self._session(record))
+
+    def get_user(self, jwt_token: Optional[str] = None) -> Optional[SimpleNamespace]:
+        if not jwt_token:
+            return None
+        import jwt
+
+        secret = os.getenv("SUPABASE_JWT_SECRET", "").strip() or "fake-supabase-secret"
+        try:
+            payload = jwt.decode(jwt_token, secret, algorithms=["HS256"], options={"verify_aud": False})
+        except Exception:
+            raise FakeAPIError("Invalid JWT", code="bad_jwt")
+        record = self.users.get(payload.get("sub"))
+        return SimpleNamespace(user=_user_object(record)) if record else None
+
+    def reset_password_email(self, email: str, options: Optional[Dict[str, Any]] = None) -> None:
+        self.db.round_trip("auth")
+
+    def sign_out(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+# ---------------------------------------------------------
+# RPC FUNCTIONS (Python versions of the SQL functions in 'database files/')
+# ---------------------------------------------------------
+def _rpc_submit_job_application(db: FakeDatabase, params: Dict[str, Any]) -> Dict[str, Any]:
+    """create_submit_application.sql; runs under db.lock like a transaction."""
+    job_id, candidate_id = params.get("p_job_id"), params.get("p_candidate_id")
+    key = params.get("p_idempotency_key")
+
+    if key is not None:
+        app = db._index("job_applications", ("candidate_id", "idempotency_key")).get((candidate_id, key))
+        if app is not None:
+            if app.get("job_id") != job_id:
+                return {"error": "idempotency_key_reused"}
+            return {"application": dict(app), "created": False}
+
+    job = db._index("jobs", ("id",)).get((job_id,))
+    if job is None or job.get("status") != "active":
+        return {"error": "job_inactive"}
+
+    app = db._index("job_applications", ("job_id", "candidate_id")).get((job_id, candidate_id))
+    if app is not None:
+        if key is not None and app.get("idempotency_key") == key:
+            return {"application": dict(app), "created": False}
+        return {"error": "duplicate"}
+
+    app = db._insert_row("job_applications", {
+        "job_id": job_id,
+        "candidate_id": candidate_id,
+        "cover_letter": params.get("p_cover_letter"),
+        "idempotency_key": key,
+    })
+    return {"application": dict(app), "created": True}
+
+
+def _rpc_replace_interview_questions(db: FakeDatabase, params: Dict[str, Any]) -> Dict[str, Any]:
+    """create_replace_interview_questions.sql"""
+    job_id = params.get("p_job_id")
+    job = db._index("jobs", ("id",)).get((job_id,))
+    if job is None or job.get("created_by") != params.get("p_recruiter_id"):
+        return {"error": "job_not_found"}
+
+    current = {q["id"]: q for q in db.tables.get("interview_questions", []) if q.get("job_id") == job_id}
+    desired = [
+        {
+            "id": q.get("id"),
+            "question_text": q.get("question_text"),
+            "time_limit": q.get("time_limit") if q.get("time_limit") is not None else 120,
+            "question_order": order,
+        }
+        for order, q in enumerate(params.get("p_questions") or [], start=1)
+    ]
+    ids = [d["id"] for d in desired if d["id"] is not None]
+    for qid in ids:
+        try:
+            uuid.UUID(str(qid))
+        except ValueError:
+            # (q->>'id')::UUID
+            raise FakeAPIError(f'invalid input syntax for type uuid: "{qid}"', code="22P02")
+    if len(ids) != len(set(ids)):
+        return {"error": "duplicate_question"}
+    if any(d["id"] is not None and d["id"] not in current for d in desired):
+        return {"error": "unknown_question"}
+
+    keep = {d["id"] for d in desired if d["id"] is not None}
+    doomed = [q for qid, q in current.items() if qid not in keep]
+    db.delete_rows("interview_questions", doomed)
+
+    updated = inserted = 0
+    fields = ("question_text", "time_limit", "question_order")
+    for d in desired:
+        if d["id"] is None:
+            db._insert_row("interview_questions", {"job_id": job_id, **{f: d[f] for f in fields}})
+            inserted += 1
+        elif any(current[d["id"]].get(f) != d[f] for f in fields):
+            db.update_row("interview_questions", current[d["id"]], {f: d[f] for f in fields})
+            updated += 1
+
+    questions = sorted(
+        (dict(q) for q in db.tables["interview_questions"] if q.get("job_id") == job_id),
+        key=lambda q: q["question_order"],
+    )
+    return {"questions": questions, "inserted": inserted, "updated": updated, "deleted": len(doomed)}
+
+
+def _ts(value: Any) -> datetime:
+    ts = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return (ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)).astimezone(timezone.utc)
+
+
+def _day(ts: datetime) -> datetime:
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_rollup(db: FakeDatabase, table: str, key: Tuple[Any, ...], count: int) -> None:
+    cols = ("bucket", "user_id", "event_type", "job_id")
+    row = db._index(table, cols).get(key)
+    if row is None:
+        db._insert_row(table, {**dict(zip(cols, key)), "count": count})
+    else:
+        db.update_row(table, row, {"count": row["count"] + count})
+
+
+def _rpc_increment_analytics_rollups(db: FakeDatabase, params: Dict[str, Any]) -> int:
+    """create_analytics_rollups.sql"""
+    from services.analytics_rollups import NIL_JOB_ID
+
+    rows = params.get("p_rows") or []
+    for r in rows:
+        hour = _ts(r["bucket"]).replace(minute=0, second=0, microsecond=0)
+        key = (r["user_id"], r["event_type"], r.get("job_id") or NIL_JOB_ID)
+        _add_rollup(db, "analytics_rollups_hourly", (hour.isoformat(), *key), int(r["count"]))
+        _add_rollup(db, "analytics_rollups_daily", (_day(hour).isoformat(), *key), int(r["count"]))
+    return len(rows)
+
+
+def _rpc_compact_analytics_rollups(db: FakeDatabase, params: Dict[str, Any]) -> Dict[str, Any]:
+    """create_analytics_rollups.sql"""
+    from services.analytics_rollups import aggregate
+
+    start = _ts(params["p_from"]).replace(minute=0, second=0, microsecond=0)
+    end = _ts(params["p_to"])
+    if end.replace(minute=0, second=0, microsecond=0) != end:
+        end = end.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    day_start = _day(start)
+    day_end = _day(end - timedelta(microseconds=1)) + timedelta(days=1)
+
+    hourly = db.tables.get("analytics_rollups_hourly", [])
+    db.delete_rows("analytics_rollups_hourly", [r for r in hourly if start <= _ts(r["bucket"]) < end])
+    events = [e for e in db.tables.get("analytics_events", []) if start <= _ts(e["created_at"]) < end]
+    counts = aggregate(events)
+    for r in counts:
+        db._insert_row("analytics_rollups_hourly", {**r, "bucket": _ts(r["bucket"]).isoformat()})
+
+    daily = db.tables.get("analytics_rollups_daily", [])
+    db.delete_rows("analytics_rollups_daily", [r for r in daily if day_start <= _ts(r["bucket"]) < day_end])
+    days = 0
+    for r in db.tables["analytics_rollups_hourly"]:
+        bucket = _ts(r["bucket"])
+        if day_start <= bucket < day_end:
+            before = len(db.tables["analytics_rollups_daily"])
+            _add_rollup(db, "analytics_rollups_daily", (_day(bucket).isoformat(), r["user_id"], r["event_type"], r["job_id"]), r["count"])
+            days += len(db.tables["analytics_rollups_daily"]) - before
+    return {"hourly_rows": len(counts), "daily_rows": days}
+
+
+def _rpc_analytics_timeseries(db: FakeDatabase, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """create_analytics_rollups.sql"""
+    table = "analytics_rollups_daily" if params.get("p_interval") == "day" else "analytics_rollups_hourly"
+    start, end = _ts(params["p_from"]), _ts(params["p_to"])
+    user_id, job_id, types = params.get("p_user_id"), params.get("p_job_id"), params.get("p_event_types")
+    sums: Dict[Tuple[str, str], int] = {}
+    for r in db.tables.get(table, []):
+        if user_id is not None and r["user_id"] != user_id:
+            continue
+        if job_id is not None and r["job_id"] != job_id:
+            continue
+        if types and r["event_type"] not in types:
+            continue
+        if start <= _ts(r["bucket"]) < end:
+            key = (r["bucket"], r["event_type"])
+            sums[key] = sums.get(key, 0) + r["count"]
+    return [{"bucket": b, "event_type": t, "count": n} for (b, t), n in sorted(sums.items())]
+
+
+def _rpc_update_application_scores(db: FakeDatabase, params: Dict[str, Any]) -> int:
+    """create_update_application_scores.sql"""
+    updated = 0
+    for r in params.get("p_rows") or []:
+        app = db._index("job_applications", ("id",)).get((r["id"],))
+        if app is not None:
+            db.update_row("job_applications", app, {"ai_score": r.get("ai_score"), "ai_analysis": r.get("ai_analysis")})
+            updated += 1
+    return updated
+
+
+def _trg_record_application_status(db: FakeDatabase, old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> None:
+    """create_job_funnels.sql"""
+    if old is not None and old.get("status") == new.get("status"):
+        return
+    if "application_status_history" not in db.tables or not new.get("job_id"):
+        return
+    db._insert_row("application_status_history", {
+        "application_id": new["id"],
+        "job_id": new["job_id"],
+        "from_status": old.get("status") if old else None,
+        "to_status": new.get("status"),
+        "changed_at": (new.get("applied_at") or _now()) if old is None else _now(),
+    })
+
+
+BUILTIN_TRIGGERS: Dict[str, List[Callable[[FakeDatabase, Optional[Dict[str, Any]], Dict[str, Any]], None]]] = {
+    "job_applications": [_trg_record_application_status],
+}
+
+
+BUILTIN_RPCS: Dict[str, Callable[[FakeDatabase, Dict[str, Any]], Any]] = {
+    "submit_job_application": _rpc_submit_job_application,
+    "replace_interview_questions": _rpc_replace_interview_questions,
+    "increment_analytics_rollups": _rpc_increment_analytics_rollups,
+    "compact_analytics_rollups": _rpc_compact_analytics_rollups,
+    "analytics_timeseries": _rpc_analytics_timeseries,
+    "update_application_scores": _rpc_update_application_scores,
+}
+
+
+# ---------------------------------------------------------
+# CLIENT
+# ---------------------------------------------------------
+class FakeSupabaseClient:
+    """Drop-in replacement for supabase.Client backed by FakeDatabase."""
+
+    def __init__(self, db: Optional[FakeDatabase] = None, base_url: str = "http://supabase.local"):
+        self.db = db or FakeDatabase()
+        self.supabase_url = base_url
+        self.storage = FakeStorage(self.db, base_url)
+        self.auth = FakeAuth(self.db)
+
+    def table(self, table_name: str) -> FakeQueryBuilder:
+        return FakeQueryBuilder(self.db, table_name)
+
+    def from_(self, table_name: str) -> FakeQueryBuilder:
+        return self.table(table_name)
+
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None, *args: Any, **kwargs: Any) -> FakeRPCBuilder:
+        return FakeRPCBuilder(self.db, fn, params or {})
+
+    # -------- seeding helpers --------
+    def seed(self, table: str, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self.db.seed(table, rows)
+
+    def load_fixtures(self, fixtures: Dict[str, Any]) -> None:
+        """
+        Loads a fixture document:
+        {"auth_users": [...], "tables": {"jobs": [...]}, "storage": {"bucket": {"path": "text"}}}
+        """
+        for user in fixtures.get("auth_users", []):
+            self.auth.add_user(
+                email=user["email"],
+                password=user.get("password"),
+                user_metadata=user.get("user_metadata"),
+                user_id=user.get("id"),
+            )
+        for table, rows in (fixtures.get("tables") or {}).items():
+            if table == "users":
+                # Rows may already exist via the auth trigger; merge them
+                with self.db.lock:
+                    for row in rows:
+                        existing = self.db._conflicting_row("users", row, ("id",))
+                        if existing is not None:
+                            self.db.update_row("users", existing, row)
+                        else:
+                            self.db._insert_row("users", dict(row))
+                continue
+            self.seed(table, rows)
+        for bucket, objects in (fixtures.get("storage") or {}).items():
+            store = self.storage.buckets.setdefault(bucket, {})
+            for path, content in objects.items():
+                store[path] = content.encode("utf-8") if isinstance(content, str) else content
+
+
+def create_fake_client(
+    schema_files: Optional[Iterable[str]] = None,
+    latency: float = 0.0,
+    fixtures: Optional[Dict[str, Any]] = None,
+) -> FakeSupabaseClient:
+    """
+    Builds a FakeSupabaseClient with the schema from 'database files/'.
+    latency is in seconds and applied to every round trip.
+    """
+    db = FakeDatabase(latency=latency)
+    paths = schema_files if schema_files is not None else [os.path.join(SCHEMA_DIR, f) for f in DEFAULT_SCHEMA_FILES]
+    buckets = db.load_schema_files(p for p in paths if os.path.exists(p))
+    for name, fn in BUILTIN_RPCS.items():
+        db.register_rpc(name, fn)
+    for table, triggers in BUILTIN_TRIGGERS.items():
+        db.triggers[table] = list(triggers)
+
+    client = FakeSupabaseClient(db)
+    for bucket in buckets + ["video-responses"]:
+        client.storage.create_bucket(bucket)
+
+    if fixtures:
+        client.load_fixtures(fixtures)
+    return client
+
+
+def create_fake_client_from_env() -> FakeSupabaseClient:
+    """
+    Used by get_client() when SUPABASE_BACKEND=memory.
+    SUPABASE_FAKE_LATENCY_MS - per round trip latency
+    SUPABASE_FAKE_FIXTURES   - optional JSON fixture file
+    """
+    latency = float(os.getenv("SUPABASE_FAKE_LATENCY_MS", "0")) / 1000.0
+    fixtures = None
+    fixtures_path = os.getenv("SUPABASE_FAKE_FIXTURES")
+    if fixtures_path:
+        with open(fixtures_path, "r", encoding="utf-8") as fh:
+            fixtures = json.load(fh)
+    return create_fake_client(latency=latency, fixtures=fixtures)
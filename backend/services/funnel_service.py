@@ -0,0 +1,336 @@
+import os
+import sys
+import time
+import queue
+import argparse
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from supabase import Client
+from services.supabase_client import get_client
+from utils_others.logger import logger
+
+# 'shortlisted' and 'interview_submitted' are added to application_status by
+# "database files/add_application_statuses.sql"
+FUNNEL_STAGES = ("applied", "shortlisted", "interview_scheduled", "interview_submitted", "hired")
+# Application status -> funnel stage. Statuses not listed (rejected) end an
+# application at the furthest stage it reached.
+STAGE_OF_STATUS = {
+    "submitted": 0,
+    "applied": 0,
+    "under_review": 0,
+    "shortlisted": 1,
+    "video_pending": 2,
+    "interview_scheduled": 2,
+    "video_completed": 3,
+    "interview_submitted": 3,
+    "hired": 4,
+}
+PERCENTILES = (50, 75, 90)
+
+# Rows read per round trip (PostgREST returns at most 1000)
+PAGE_SIZE = int(os.getenv("FUNNEL_PAGE_SIZE", "1000"))
+# Jobs refreshed per batch
+JOB_BATCH_SIZE = int(os.getenv("FUNNEL_JOB_BATCH_SIZE", "50"))
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _epoch(value: Any) -> float:
+    if not value:
+        return np.nan
+    ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return (ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)).timestamp()
+
+
+# ---------------------------------------------------------
+# ENGINE
+# ---------------------------------------------------------
+def compute_funnel(applications: List[Dict[str, Any]], history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Funnel for one job from its applications (id, status, applied_at) and
+    their application_status_history rows (application_id, from_status,
+    to_status, changed_at).
+
+    An application counts for every stage up to the furthest one it
+    reached, so skipped stages (shortlisted straight to hired) still
+    convert. Time in stage runs from entering a stage to entering a later
+    one; applications still in a stage, or that left it by rejection,
+    are not part of the percentiles.
+    {
+        "applications": 120,
+        "stages": [{"stage": "applied", "count": 120, "conversion": None, "overall": 1.0,
+                    "rejected": 40, "hours_in_stage": {"p50": 30.5, "p75": ..., "p90": ..., "samples": 64}}, ...]
+    }
+    """
+    n_stages = len(FUNNEL_STAGES)
+    n = len(applications)
+    index = {a["id"]: i for i, a in enumerate(applications)}
+
+    # One event per (application, stage entered, time): the application
+    # itself, its current status (time unknown) and every history row
+    rows = [(i, 0, _epoch(a.get("applied_at"))) for i, a in enumerate(applications)]
+    rows += [(i, STAGE_OF_STATUS.get(a.get("status"), -1), np.nan) for i, a in enumerate(applications)]
+    # A first row (no from_status) beyond "applied" is a backfilled current
+    # status: the stage was reached, but not at that time
+    rows += [
+        (
+            index[h["application_id"]],
+            STAGE_OF_STATUS.get(h.get("to_status"), -1),
+            _epoch(h.get("changed_at")) if h.get("from_status") or STAGE_OF_STATUS.get(h.get("to_status")) == 0 else np.nan,
+        )
+        for h in history if h.get("application_id") in index
+    ]
+    events = np.array(rows, dtype=np.float64).reshape(-1, 3)
+    app = events[:, 0].astype(np.int64)
+    stage = events[:, 1].astype(np.int64)
+    at = events[:, 2]
+    known = stage >= 0
+
+    reached = np.zeros(n, dtype=np.int64)
+    np.maximum.at(reached, app[known], stage[known])
+    # count[s] = applications that reached stage s or beyond
+    counts = np.bincount(reached, minlength=n_stages)[::-1].cumsum()[::-1]
+    rejected_mask = np.array([a.get("status") == "rejected" for a in applications], dtype=bool)
+    rejected = np.bincount(reached[rejected_mask], minlength=n_stages)
+
+    # entered[i, s] = first time application i entered stage s (NaN: never / unknown)
+    entered = np.full((n, n_stages), np.nan)
+    timed = known & ~np.isnan(at)
+    np.fmin.at(entered, (app[timed], stage[timed]), at[timed])
+    # Earliest entry into any later stage, per stage (fmin skips NaN)
+    left = np.fmin.accumulate(entered[:, :0:-1], axis=1)[:, ::-1]
+    hours = (left - entered[:, :-1]) / 3600.0
+
+    stages = []
+    for s, name in enumerate(FUNNEL_STAGES):
+        count = int(counts[s])
+        previous = int(counts[s - 1]) if s else 0
+        dwell = None
+        if s < n_stages - 1:
+            samples = hours[:, s][~np.isnan(hours[:, s]) & (hours[:, s] >= 0)]
+            dwell = {"samples": int(samples.size)}
+            values = np.percentile(samples, PERCENTILES) if samples.size else [None] * len(PERCENTILES)
+            for p, value in zip(PERCENTILES, values):
+                dwell[f"p{p}"] = round(float(value), 2) if value is not None else None
+        stages.append({
+            "stage": name,
+            "count": count,
+            "conversion": round(count / previous, 4) if s and previous else None,
+            "overall": round(count / n, 4) if n else None,
+            "rejected": int(rejected[s]),
+            "hours_in_stage": dwell,
+        })
+    return {"applications": n, "stages": stages}
+
+
+# ---------------------------------------------------------
+# SERVICE
+# ---------------------------------------------------------
+class FunnelService:
+    """
+    Per-job hiring funnels, computed in batches from job_applications and
+    application_status_history and stored one row per job in
+    'job_funnels', so reading a recruiter's funnels is one query.
+    """
+
+    def __init__(self, client: Optional[Client] = None):
+        self.supabase = client or get_client()
+
+    # ---------------------------------------------------------
+    # SERVE
+    # ---------------------------------------------------------
+    def get_funnels(self, job_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored funnels by job id; jobs not computed yet are missing."""
+        if not job_ids:
+            return {}
+        try:
+            rows = (
+                self.supabase.table("job_funnels")
+                .select("job_id, applications, stats, computed_at")
+                .in_("job_id", job_ids)
+                .execute()
+            ).data or []
+            return {r["job_id"]: {**(r.get("stats") or {}), "computed_at": r.get("computed_at")} for r in rows}
+        except Exception as e:
+            logger.error(f"Get funnels failed: {str(e)}", extra={"jobs": len(job_ids)})
+            raise RuntimeError("Failed to fetch hiring funnels")
+
+    @staticmethod
+    def combine(funnels: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Stage counts and conversion summed over several jobs (percentiles do not add up)."""
+        counts = np.zeros(len(FUNNEL_STAGES), dtype=np.int64)
+        rejected = np.zeros(len(FUNNEL_STAGES), dtype=np.int64)
+        for funnel in funnels:
+            stages = funnel.get("stages") or []
+            if len(stages) == len(FUNNEL_STAGES):
+                counts += [s["count"] for s in stages]
+                rejected += [s["rejected"] for s in stages]
+        total = int(counts[0])
+        return {
+            "applications": total,
+            "stages": [
+                {
+                    "stage": name,
+                    "count": int(counts[s]),
+                    "conversion": round(int(counts[s]) / int(counts[s - 1]), 4) if s and counts[s - 1] else None,
+                    "overall": round(int(counts[s]) / total, 4) if total else None,
+                    "rejected": int(rejected[s]),
+                }
+                for s, name in enumerate(FUNNEL_STAGES)
+            ],
+        }
+
+    # ---------------------------------------------------------
+    # COMPUTE
+    # ---------------------------------------------------------
+    def refresh_jobs(self, job_ids: List[str]) -> int:
+        """Recomputes and stores the funnels of `job_ids`, JOB_BATCH_SIZE jobs per batch."""
+        written = 0
+        for start in range(0, len(job_ids), JOB_BATCH_SIZE):
+            chunk = list(dict.fromkeys(job_ids[start:start + JOB_BATCH_SIZE]))
+            applications: Dict[str, List[Dict[str, Any]]] = {job_id: [] for job_id in chunk}
+            history: Dict[str, List[Dict[str, Any]]] = {job_id: [] for job_id in chunk}
+            for row in self._pages("job_applications", "id, job_id, status, applied_at", chunk):
+                applications[row["job_id"]].append(row)
+            for row in self._pages("application_status_history", "id, job_id, application_id, from_status, to_status, changed_at", chunk):
+                history[row["job_id"]].append(row)
+
+            rows = []
+            for job_id in chunk:
+                funnel = compute_funnel(applications[job_id], history[job_id])
+                rows.append({
+                    "job_id": job_id,
+                    "applications": funnel["applications"],
+                    "stats": funnel,
+                    "computed_at": _now(),
+                })
+            self.supabase.table("job_funnels").upsert(rows, on_conflict="job_id").execute()
+            written += len(rows)
+        return written
+
+    def refresh_all(self) -> int:
+        written = 0
+        for job_ids in self._job_pages():
+            written += self.refresh_jobs(job_ids)
+        logger.info("Hiring funnels rebuilt", extra={"jobs": written})
+        return written
+
+    def _pages(self, table: str, fields: str, job_ids: List[str]) -> Iterator[Dict[str, Any]]:
+        last_id = None
+        while True:
+            query = self.supabase.table(table).select(fields).in_("job_id", job_ids)
+            if last_id:
+                query = query.gt("id", last_id)
+            page = query.order("id").limit(PAGE_SIZE).execute().data or []
+            yield from page
+            if len(page) < PAGE_SIZE:
+                return
+            last_id = page[-1]["id"]
+
+    def _job_pages(self) -> Iterator[List[str]]:
+        last_id = None
+        while True:
+            query = self.supabase.table("jobs").select("id")
+            if last_id:
+                query = query.gt("id", last_id)
+            page = query.order("id").limit(JOB_BATCH_SIZE).execute().data or []
+            if not page:
+                return
+            yield [j["id"] for j in page]
+            if len(page) < JOB_BATCH_SIZE:
+                return
+            last_id = page[-1]["id"]
+
+
+# ---------------------------------------------------------
+# BACKGROUND WORKER
+# ---------------------------------------------------------
+class FunnelWorker:
+    """
+    Recomputes funnels on one daemon thread after applications change, so
+    request handlers only enqueue. Changes to a job that is already queued
+    are coalesced into one refresh.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._pending: set = set()
+        self._thread: Optional[threading.Thread] = None
+        self._service: Optional[FunnelService] = None
+        self._lock = threading.Lock()
+
+    @property
+    def service(self) -> FunnelService:
+        if self._service is None:
+            self._service = FunnelService()
+        return self._service
+
+    def job_changed(self, job_id: Optional[str]) -> None:
+        if job_id:
+            self._submit(job_id)
+
+    def jobs_changed(self, job_ids: List[str]) -> None:
+        for job_id in dict.fromkeys(job_ids):
+            self.job_changed(job_id)
+
+    def rebuild(self) -> None:
+        self._submit(None)
+
+    def _submit(self, job_id: Optional[str]) -> None:
+        with self._lock:
+            if job_id in self._pending:
+                return
+            self._pending.add(job_id)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="funnel-worker", daemon=True)
+                self._thread.start()
+        self._queue.put(job_id)
+
+    def _loop(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            with self._lock:
+                self._pending.discard(job_id)
+            try:
+                if job_id is None:
+                    self.service.refresh_all()
+                else:
+                    self.service.refresh_jobs([job_id])
+            except Exception as e:
+                logger.error(f"Funnel refresh failed: {str(e)}", extra={"job_id": job_id})
+            finally:
+                self._queue.task_done()
+
+    def drain(self) -> None:
+        """Blocks until every queued refresh has been written."""
+        self._queue.join()
+
+
+funnel_worker = FunnelWorker()
+
+
+# ---------------------------------------------------------
+# CLI: full rebuild (e.g. nightly, or after the migration)
+# ---------------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Recompute stored hiring funnels")
+    parser.add_argument("--job-id", action="append", help="Only these jobs; repeatable")
+    args = parser.parse_args(argv)
+
+    service = FunnelService()
+    started = time.perf_counter()
+    if args.job_id:
+        written = service.refresh_jobs(args.job_id)
+    else:
+        written = service.refresh_all()
+    print(f"{written} jobs in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
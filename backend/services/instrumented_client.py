@@ -0,0 +1,144 @@
+from typing import Any, Optional, Tuple
+
+from utils_others.tracing import start_span
+from utils_others.query_stats import record_query
+
+
+# Builder methods that decide what kind of statement is sent
+_OPERATIONS = {"select", "insert", "update", "upsert", "delete"}
+
+# Filters whose first argument is a column name; used for N+1 signatures
+_COLUMN_FILTERS = {
+    "eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike", "is_", "in_",
+    "contains", "contained_by", "filter", "text_search",
+}
+
+# Storage calls that perform a network round trip
+_STORAGE_CALLS = {"upload", "update", "download", "remove", "move", "create_signed_url", "list"}
+
+
+class InstrumentedClient:
+    """
+    Thin proxy around the Supabase client.
+    Every query builder returned by table()/rpc() is wrapped so that its
+    execute() runs inside a tracing span and is counted in the request's
+    QueryStats (N+1 detection); storage calls are wrapped too.
+    Anything else (auth, functions, ...) is passed straight through.
+    """
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    @property
+    def raw(self) -> Any:
+        return self._client
+
+    def table(self, table_name: str) -> "_QueryProxy":
+        return _QueryProxy(self._client.table(table_name), table_name)
+
+    def from_(self, table_name: str) -> "_QueryProxy":
+        return self.table(table_name)
+
+    def rpc(self, fn: str, params: Optional[dict] = None, *args: Any, **kwargs: Any) -> "_QueryProxy":
+        builder = self._client.rpc(fn, params if params is not None else {}, *args, **kwargs)
+        return _QueryProxy(builder, f"rpc:{fn}", ("rpc",))
+
+    @property
+    def storage(self) -> "_StorageProxy":
+        return _StorageProxy(self._client.storage)
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._client, item)
+
+
+class _QueryProxy:
+    __slots__ = ("_builder", "_table", "_ops", "_filters")
+
+    def __init__(self, builder: Any, table: str, ops: Tuple[str, ...] = (), filters: Tuple[str, ...] = ()):
+        self._builder = builder
+        self._table = table
+        self._ops = ops
+        self._filters = filters
+
+    def _wrap(self, result: Any, name: str, filters: Tuple[str, ...] = ()) -> Any:
+        if hasattr(result, "execute"):
+            return _QueryProxy(result, self._table, self._ops + (name,), self._filters + filters)
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._builder, name)
+
+        if not callable(attr):
+            # e.g. postgrest's `.not_` property returns another builder
+            return self._wrap(attr, name)
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            return self._wrap(attr(*args, **kwargs), name, _filter_columns(name, args))
+
+        return call
+
+    @property
+    def operation(self) -> str:
+        for op in self._ops:
+            if op in _OPERATIONS or op == "rpc":
+                return op
+        return "select"
+
+    def execute(self) -> Any:
+        operation = self.operation
+        record_query(self._table, operation, self._filters)
+        with start_span(
+            f"supabase.{operation} {self._table}",
+            **{"db.system": "postgrest", "db.table": self._table, "db.operation": operation},
+        ) as span:
+            res = self._builder.execute()
+            data = getattr(res, "data", None)
+            if isinstance(data, list):
+                span.set_attribute("db.rows", len(data))
+            return res
+
+
+def _filter_columns(name: str, args: Tuple[Any, ...]) -> Tuple[str, ...]:
+    if name in _COLUMN_FILTERS and args:
+        return (str(args[0]),)
+    if name == "match" and args and isinstance(args[0], dict):
+        return tuple(args[0])
+    if name == "or_":
+        return ("or",)
+    return ()
+
+
+class _StorageProxy:
+    __slots__ = ("_storage",)
+
+    def __init__(self, storage: Any):
+        self._storage = storage
+
+    def from_(self, bucket: str) -> "_BucketProxy":
+        return _BucketProxy(self._storage.from_(bucket), bucket)
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._storage, item)
+
+
+class _BucketProxy:
+    __slots__ = ("_bucket", "_name")
+
+    def __init__(self, bucket: Any, name: str):
+        self._bucket = bucket
+        self._name = name
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._bucket, name)
+        if name not in _STORAGE_CALLS or not callable(attr):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            attributes = {"storage.bucket": self._name, "storage.operation": name}
+            if name in ("upload", "update") and len(args) >= 2 and isinstance(args[1], (bytes, bytearray)):
+                attributes["storage.bytes"] = len(args[1])
+            record_query(f"storage:{self._name}", name)
+            with start_span(f"storage.{name} {self._name}", **attributes):
+                return attr(*args, **kwargs)
+
+        return call
@@ -0,0 +1,197 @@
+import csv
+import io
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from supabase import Client
+from services.supabase_client import get_client
+from services.recommendation_service import recommendation_worker
+from models.recruiter_models import JobImportRow
+from utils_others.logger import logger
+from utils_others.skill_dictionary import skill_dictionary
+
+# Jobs per insert statement (skills and questions of the batch go in one statement each)
+IMPORT_BATCH_SIZE = int(os.getenv("JOB_IMPORT_BATCH_SIZE", "100"))
+IMPORT_MAX_ROWS = int(os.getenv("JOB_IMPORT_MAX_ROWS", "5000"))
+IMPORT_MAX_BYTES = int(os.getenv("JOB_IMPORT_MAX_BYTES", str(10 * 1024 * 1024)))
+
+# CSV list columns: "Python; AWS" and "Tell us about...|Why us?"
+CSV_SKILL_SEPARATOR = ";"
+CSV_QUESTION_SEPARATOR = "|"
+CSV_REQUIRED_COLUMNS = ("title", "description", "location", "job_type")
+
+
+class ImportFormatError(ValueError):
+    """The file itself cannot be read (encoding, header, size)."""
+
+
+# ---------------------------------------------------------
+# PARSING
+# ---------------------------------------------------------
+def _split(value: Optional[str], sep: str) -> List[str]:
+    return [part.strip() for part in (value or "").split(sep) if part.strip()]
+
+
+def _csv_record(row: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    """Flat CSV columns -> the nested JobImportRow shape. Empty cells are omitted."""
+    record: Dict[str, Any] = {k.strip(): v.strip() for k, v in row.items() if k and v is not None and v.strip()}
+    required = _split(record.pop("required_skills", None), CSV_SKILL_SEPARATOR)
+    required_keys = {s.lower() for s in required}
+    optional = [s for s in _split(record.pop("skills", None), CSV_SKILL_SEPARATOR) if s.lower() not in required_keys]
+    record["skills"] = [{"skill_name": s, "is_required": s.lower() in required_keys} for s in required + optional]
+    record["questions"] = [{"question_text": q} for q in _split(record.pop("questions", None), CSV_QUESTION_SEPARATOR)]
+    return record
+
+
+def parse_import(content: bytes, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Yields (row number, record) from a CSV or JSON Lines file. record is a
+    dict, or an error message string for lines that cannot be parsed.
+    Row numbers are 1-based data rows (the CSV header is not counted).
+    """
+    if len(content) > IMPORT_MAX_BYTES:
+        raise ImportFormatError(f"File is larger than {IMPORT_MAX_BYTES} bytes")
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ImportFormatError("File must be UTF-8 encoded")
+
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        columns = {f.strip() for f in reader.fieldnames or [] if f}
+        missing = [c for c in CSV_REQUIRED_COLUMNS if c not in columns]
+        if missing:
+            raise ImportFormatError(
+                f"CSV header must include at least: {', '.join(CSV_REQUIRED_COLUMNS)} (missing: {', '.join(missing)})"
+            )
+        for number, row in enumerate(reader, start=1):
+            yield number, _csv_record(row)
+        return
+
+    number = 0
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield number, f"Invalid JSON: {e.msg}"
+            continue
+        yield number, record if isinstance(record, dict) else "Each line must be a JSON object"
+
+
+def _validation_errors(e: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()]
+
+
+# ---------------------------------------------------------
+# IMPORT
+# ---------------------------------------------------------
+class JobImportService:
+    def __init__(self, client: Optional[Client] = None):
+        self.supabase = client or get_client()
+
+    def import_jobs(
+        self,
+        recruiter_id: str,
+        company_id: str,
+        records: Iterable[Tuple[int, Any]],
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Validates and inserts jobs with their skills and questions, yielding
+        one result per row as each batch completes, then a summary:
+            {"row": 3, "ok": true, "job_id": "..."}
+            {"row": 4, "ok": false, "errors": ["salary_min: ..."]}
+            {"summary": {"rows": 4, "created": 3, "failed": 1}}
+
+        A batch costs three inserts (jobs, job_skills, interview_questions).
+        If one of them fails, the batch's jobs are removed and its rows are
+        retried one by one so the error is reported against the right row.
+        """
+        created = failed = rows = 0
+        batch: List[Tuple[int, JobImportRow]] = []
+
+        def flush() -> Iterator[Dict[str, Any]]:
+            nonlocal created, failed
+            for result in self._insert_batch(recruiter_id, company_id, batch):
+                created += result["ok"]
+                failed += not result["ok"]
+                yield result
+            batch.clear()
+
+        for number, record in records:
+            if rows >= IMPORT_MAX_ROWS:
+                yield {"row": number, "ok": False, "errors": [f"Import is limited to {IMPORT_MAX_ROWS} rows; the rest was skipped"]}
+                break
+            rows += 1
+            if isinstance(record, str):
+                failed += 1
+                yield {"row": number, "ok": False, "errors": [record]}
+                continue
+            try:
+                batch.append((number, JobImportRow.model_validate(record)))
+            except ValidationError as e:
+                failed += 1
+                yield {"row": number, "ok": False, "errors": _validation_errors(e)}
+                continue
+            if len(batch) >= batch_size:
+                yield from flush()
+
+        if batch:
+            yield from flush()
+
+        logger.info("Job import finished", extra={"recruiter_id": recruiter_id, "rows": rows, "jobs_created": created, "rows_failed": failed})
+        yield {"summary": {"rows": rows, "created": created, "failed": failed}}
+
+    def _insert_batch(self, recruiter_id: str, company_id: str, batch: List[Tuple[int, JobImportRow]]) -> List[Dict[str, Any]]:
+        try:
+            job_ids = self._insert_jobs(recruiter_id, company_id, [job for _, job in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"Job import row failed: {str(e)}", extra={"recruiter_id": recruiter_id, "row": batch[0][0]})
+                return [{"row": batch[0][0], "ok": False, "errors": [str(e)]}]
+            logger.error(f"Job import batch failed, retrying per row: {str(e)}", extra={"recruiter_id": recruiter_id})
+            return [result for item in batch for result in self._insert_batch(recruiter_id, company_id, [item])]
+
+        for (_, job), job_id in zip(batch, job_ids):
+            if job.status == "active":
+                recommendation_worker.job_changed(job_id)
+        return [{"row": number, "ok": True, "job_id": job_id} for (number, _), job_id in zip(batch, job_ids)]
+
+    def _insert_jobs(self, recruiter_id: str, company_id: str, jobs: List[JobImportRow]) -> List[str]:
+        rows = [
+            {**job.model_dump(exclude={"skills", "questions"}), "created_by": recruiter_id, "company_id": company_id}
+            for job in jobs
+        ]
+        res = self.supabase.table("jobs").insert(rows).execute()
+        inserted = res.data or []
+        if len(inserted) != len(rows):
+            raise RuntimeError("Job insert returned an unexpected number of rows")
+        # PostgREST returns inserted rows in payload order
+        job_ids = [row["id"] for row in inserted]
+
+        skills, questions = [], []
+        for job, job_id in zip(jobs, job_ids):
+            seen = set()
+            for skill in job.skills:
+                name = skill_dictionary.canonicalize(skill.skill_name)
+                if name and name.lower() not in seen:
+                    seen.add(name.lower())
+                    skills.append({**skill.model_dump(), "skill_name": name, "job_id": job_id})
+            for order, question in enumerate(job.questions, start=1):
+                questions.append({**question.model_dump(), "question_order": order, "job_id": job_id})
+
+        try:
+            if skills:
+                self.supabase.table("job_skills").insert(skills).execute()
+            if questions:
+                self.supabase.table("interview_questions").insert(questions).execute()
+        except Exception:
+            # Children cascade with the job; leave nothing half-imported
+            self.supabase.table("jobs").delete().in_("id", job_ids).execute()
+            raise
+        return job_ids
@@ -0,0 +1,212 @@
+"""
+Per-user pub/sub for the notification stream (GET /notification/stream).
+
+InProcessBroker delivers to the SSE connections held by this worker. With
+several API workers a notification created on one worker must reach streams
+held by the others, so NOTIFICATION_BROKER=redis relays every event through
+Redis pub/sub: each worker keeps one pattern subscription and fans incoming
+messages out to its local connections.
+
+publish() may be called from the event loop or from a threadpool thread
+(sync route handlers, background tasks); delivery always happens on the
+subscriber's loop.
+"""
+
+import os
+import json
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from utils_others.logger import logger
+
+BROKER_BACKEND = os.getenv("NOTIFICATION_BROKER", "memory").lower()
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_CHANNEL_PREFIX = "notifications:"
+
+# Events buffered per connection before the client is told to resync
+STREAM_QUEUE_SIZE = int(os.getenv("NOTIFICATION_STREAM_QUEUE_SIZE", "100"))
+
+RESYNC_EVENT = {"event": "resync", "data": {}}
+
+
+class Subscription:
+    """One open stream. Events are queued on the loop that created it."""
+
+    def __init__(self, user_id: str, maxsize: int = STREAM_QUEUE_SIZE):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def _put(self, event: Dict[str, Any]) -> None:
+        # Runs on self.loop
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A stalled client should refetch rather than grow memory without bound
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # Loop already closed (worker shutting down)
+            pass
+
+    async def next_event(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next event, or None when nothing arrived within `timeout` seconds."""
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is RESYNC_EVENT:
+            self.overflowed = False
+        return event
+
+
+# ---------------------------------------------------------
+# IN-PROCESS
+# ---------------------------------------------------------
+class InProcessBroker:
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+    def subscribe(self, user_id: str) -> Subscription:
+        sub = Subscription(user_id)
+        with self._lock:
+            self._subscribers[user_id].add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.user_id)
+            if subs is None:
+                return
+            subs.discard(sub)
+            if not subs:
+                del self._subscribers[sub.user_id]
+
+    def connection_count(self, user_id: Optional[str] = None) -> int:
+        with self._lock:
+            if user_id is not None:
+                return len(self._subscribers.get(user_id, ()))
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    def deliver_local(self, user_id: str, event: Dict[str, Any]) -> int:
+        with self._lock:
+            subs = list(self._subscribers.get(user_id, ()))
+        for sub in subs:
+            sub.deliver(event)
+        return len(subs)
+
+    def publish(self, user_id: str, event_type: str, data: Dict[str, Any]) -> None:
+        """Best effort: a failed publish never fails the write that triggered it."""
+        if not user_id:
+            return
+        self.deliver_local(str(user_id), {"event": event_type, "data": data})
+
+
+# ---------------------------------------------------------
+# REDIS (multi-worker)
+# ---------------------------------------------------------
+class RedisBroker(InProcessBroker):
+    def __init__(self, url: str = REDIS_URL):
+        super().__init__()
+        try:
+            import redis
+            import redis.asyncio as redis_async
+        except ImportError:
+            raise RuntimeError("NOTIFICATION_BROKER=redis requires the redis package (pip install redis)")
+        self.url = url
+        self._publisher = redis.Redis.from_url(url)
+        self._redis_async = redis_async
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._publisher.close()
+
+    def _resync_all(self) -> None:
+        with self._lock:
+            subs = [sub for group in self._subscribers.values() for sub in group]
+        for sub in subs:
+            sub.deliver(RESYNC_EVENT)
+
+    def publish(self, user_id: str, event_type: str, data: Dict[str, Any]) -> None:
+        if not user_id:
+            return
+        message = json.dumps({"event": event_type, "data": data}, default=str)
+        try:
+            self._publisher.publish(f"{REDIS_CHANNEL_PREFIX}{user_id}", message)
+        except Exception as e:
+            logger.error(f"Notification publish failed: {str(e)}", extra={"user_id": user_id})
+
+    async def _listen(self) -> None:
+        backoff = 1.0
+        reconnecting = False
+        while True:
+            client = self._redis_async.Redis.from_url(self.url)
+            pubsub = client.pubsub()
+            try:
+                await pubsub.psubscribe(f"{REDIS_CHANNEL_PREFIX}*")
+                backoff = 1.0
+                if reconnecting:
+                    # Events published while disconnected are lost
+                    self._resync_all()
+                reconnecting = True
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    try:
+                        event = json.loads(message["data"])
+                    except (TypeError, ValueError):
+                        continue
+                    self.deliver_local(channel[len(REDIS_CHANNEL_PREFIX):], event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification broker connection lost: {str(e)}", extra={"retry_in": backoff})
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                try:
+                    await pubsub.aclose()
+                    await client.aclose()
+                except Exception:
+                    pass
+
+
+def create_broker() -> InProcessBroker:
+    if BROKER_BACKEND == "redis":
+        return RedisBroker()
+    return InProcessBroker()
+
+
+notification_broker = create_broker()
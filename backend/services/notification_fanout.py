@@ -0,0 +1,213 @@
+import os
+import queue
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from supabase import Client
+from services.supabase_client import get_client
+from services.notification_service import NotificationService
+from utils_others.logger import logger
+
+# Recipients resolved and notification rows inserted per round trip
+FANOUT_BATCH_SIZE = int(os.getenv("FANOUT_BATCH_SIZE", "500"))
+# Also email every recipient (through utils_others.resend_email)
+FANOUT_EMAILS = os.getenv("FANOUT_EMAILS", "false").lower() == "true"
+
+# Applications that are already decided do not hear about the job closing
+CLOSED_APPLICATION_STATUSES = ("rejected", "hired")
+
+# One message per application_status value (models.recruiter_models.APPLICATION_STATUSES)
+STATUS_MESSAGES = {
+    "submitted": "Your application for {title} has been received.",
+    "under_review": "Your application for {title} is being reviewed.",
+    "shortlisted": "You have been shortlisted for {title}.",
+    "video_pending": "Please record your video interview for {title}.",
+    "video_completed": "Your video interview for {title} has been received.",
+    "interview_scheduled": "You have been invited to interview for {title}.",
+    "interview_submitted": "Your interview for {title} has been submitted for review.",
+    "rejected": "Your application for {title} was not selected.",
+    "hired": "Congratulations! You have been selected for {title}.",
+}
+
+RECIPIENT_FIELDS = "id, candidate_id, status, jobs(title), users(email, full_name)"
+
+
+# ---------------------------------------------------------
+# EMAIL OUTBOX
+# ---------------------------------------------------------
+class EmailOutbox:
+    """Sends fan-out emails one at a time on a daemon thread."""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, recipient: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="fanout-email", daemon=True)
+                self._thread.start()
+        self._queue.put(recipient)
+
+    def _loop(self) -> None:
+        from utils_others.email_templates import EmailTemplates
+        from utils_others.resend_email import send_email
+
+        templates = EmailTemplates()
+        while True:
+            recipient = self._queue.get()
+            try:
+                content = templates.notification(recipient)
+                send_email(recipient["email"], content["subject"], content["html"], content["text"], email_type="noreply")
+            except Exception as e:
+                logger.error(f"Fan-out email failed: {str(e)}", extra={"user_id": recipient.get("user_id")})
+            finally:
+                self._queue.task_done()
+
+    def drain(self) -> None:
+        self._queue.join()
+
+
+email_outbox = EmailOutbox()
+
+
+# ---------------------------------------------------------
+# FAN-OUT
+# ---------------------------------------------------------
+class FanoutService:
+    """
+    Turns one event into a notification per affected candidate. Recipients
+    are read from job_applications in keyset pages and each page is written
+    with a single insert, so cost grows with pages rather than recipients.
+    """
+
+    def __init__(self, client: Optional[Client] = None, batch_size: int = FANOUT_BATCH_SIZE):
+        self.supabase = client or get_client()
+        self.notifications = NotificationService(self.supabase)
+        self.batch_size = batch_size
+
+    def job_closed(self, job_id: str, title: str, email: bool = FANOUT_EMAILS) -> int:
+        sent = 0
+        for page in self._job_applicants(job_id):
+            recipients = [r for r in page if r.get("status") not in CLOSED_APPLICATION_STATUSES]
+            sent += self._deliver([
+                (r, {
+                    "title": "Job closed",
+                    "message": f"{title or 'A job you applied to'} is no longer accepting applications.",
+                    "type": "application",
+                    "related_id": r["id"],
+                })
+                for r in recipients
+            ], email)
+        logger.info("Job closed fan-out finished", extra={"job_id": job_id, "recipients": sent})
+        return sent
+
+    def application_status(self, application_ids: List[str], status: str, email: bool = FANOUT_EMAILS) -> int:
+        sent = 0
+        for page in self._applications(application_ids):
+            notes = []
+            for r in page:
+                title = (r.get("jobs") or {}).get("title") or "your job application"
+                template = STATUS_MESSAGES.get(status, "Your application for {title} is now " + status.replace("_", " ") + ".")
+                notes.append((r, {
+                    "title": "Application update",
+                    "message": template.format(title=title),
+                    "type": "application",
+                    "related_id": r["id"],
+                }))
+            sent += self._deliver(notes, email)
+        logger.info("Status fan-out finished", extra={"status": status, "recipients": sent})
+        return sent
+
+    # ---------------------------------------------------------
+    # RECIPIENTS (streamed pages)
+    # ---------------------------------------------------------
+    def _job_applicants(self, job_id: str) -> Iterator[List[Dict[str, Any]]]:
+        last_id = None
+        while True:
+            query = self.supabase.table("job_applications").select(RECIPIENT_FIELDS).eq("job_id", job_id)
+            if last_id:
+                query = query.gt("id", last_id)
+            page = query.order("id").limit(self.batch_size).execute().data or []
+            if not page:
+                return
+            yield page
+            if len(page) < self.batch_size:
+                return
+            last_id = page[-1]["id"]
+
+    def _applications(self, application_ids: List[str]) -> Iterator[List[Dict[str, Any]]]:
+        for start in range(0, len(application_ids), self.batch_size):
+            chunk = application_ids[start:start + self.batch_size]
+            page = self.supabase.table("job_applications").select(RECIPIENT_FIELDS).in_("id", chunk).execute().data or []
+            if page:
+                yield page
+
+    def _deliver(self, notes: List[Tuple[Dict[str, Any], Dict[str, Any]]], email: bool) -> int:
+        if not notes:
+            return 0
+        self.notifications.create_notifications([{**note, "user_id": r["candidate_id"]} for r, note in notes])
+        if email:
+            for r, note in notes:
+                user = r.get("users") or {}
+                if user.get("email"):
+                    email_outbox.enqueue({**note, "user_id": r["candidate_id"], "email": user["email"], "full_name": user.get("full_name")})
+        return len(notes)
+
+
+# ---------------------------------------------------------
+# BACKGROUND WORKER
+# ---------------------------------------------------------
+class FanoutWorker:
+    """
+    Runs fan-outs on one daemon thread so the request that caused them
+    only enqueues. A failed fan-out is logged and dropped; notifications
+    already inserted for earlier pages are kept.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[Tuple[str, tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._service: Optional[FanoutService] = None
+        self._lock = threading.Lock()
+
+    @property
+    def service(self) -> FanoutService:
+        if self._service is None:
+            self._service = FanoutService()
+        return self._service
+
+    def job_closed(self, job_id: str, title: Optional[str]) -> None:
+        self._submit("job_closed", (job_id, title))
+
+    def application_status(self, application_ids: List[str], status: str) -> None:
+        if application_ids:
+            self._submit("application_status", (list(application_ids), status))
+
+    def _submit(self, kind: str, args: tuple) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="notification-fanout", daemon=True)
+                self._thread.start()
+        self._queue.put((kind, args))
+
+    def _loop(self) -> None:
+        while True:
+            kind, args = self._queue.get()
+            try:
+                if kind == "job_closed":
+                    self.service.job_closed(*args)
+                else:
+                    self.service.application_status(*args)
+            except Exception as e:
+                logger.error(f"Notification fan-out failed: {str(e)}", extra={"kind": kind})
+            finally:
+                self._queue.task_done()
+
+    def drain(self) -> None:
+        """Blocks until every queued fan-out has been written."""
+        self._queue.join()
+
+
+fanout_worker = FanoutWorker()
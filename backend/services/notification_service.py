@@ -1,6 +1,8 @@
 from typing import Optional, Dict, Any, List
 from supabase import Client
 from services.supabase_client import get_client
+from services.notification_broker import notification_broker
+from services.unread_counter import unread_counter
 from utils_others.logger import logger
 from datetime import datetime, timezone
 
@@ -13,52 +15,97 @@ class NotificationService:
     def __init__(self, client: Optional[Client] = None):
         self.supabase = client or get_client()
 
+    @staticmethod
+    def _row(notif: Dict[str, Any], created_at: str) -> Dict[str, Any]:
+        row = {
+            "user_id": notif.get("user_id") or notif.get("created_by"),
+            "title": notif.get("title") or "",
+            "message": notif.get("message"),
+            "type": notif.get("type") or notif.get("category") or "system",
+            "related_id": notif.get("related_id"),
+            "is_read": False,
+            "created_at": created_at,
+        }
+        if not row["user_id"] or not row["message"]:
+            raise ValueError("user_id and message are required")
+        return row
+
+    @staticmethod
+    def _announce(created: List[Dict[str, Any]]) -> None:
+        for row in created:
+            unread_counter.incr(row["user_id"])
+            notification_broker.publish(row["user_id"], "notification", row)
+
     # ---------------------------------------------------------
     # CREATE NOTIFICATION
     # ---------------------------------------------------------
     def create_notification(self, notif: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Insert a notification into the notifications table.
+        Insert a notification into the notifications table and push it to
+        the recipient's open streams.
         Required fields:
-        - created_by (user_id)
+        - user_id (recipient; defaults to created_by)
         - message
-        - category
+        - category (stored as type)
         """
         try:
-            payload = {
-                "created_by": notif.get("created_by"),
-                "message": notif.get("message"),
-                "category": notif.get("category"),
-                "is_read": False,
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "metadata": notif.get("metadata") or {},
-            }
-
-            if not payload["created_by"] or not payload["message"]:
-                raise ValueError("created_by and message are required")
+            payload = self._row(notif, datetime.now(timezone.utc).isoformat())
 
             res = self.supabase.table("notifications").insert(payload).execute()
 
             if getattr(res, "error", None):
                 raise RuntimeError(res.error)
 
+            created = res.data[0] if res.data else {}
+            self._announce([created or payload])
+
             logger.info(
                 "Notification created",
                 extra={
-                    "user_id": payload["created_by"],
-                    "category": payload["category"],
+                    "user_id": payload["user_id"],
+                    "category": payload["type"],
                 },
             )
 
-            return res.data or {}
+            return created
 
         except Exception as e:
             logger.error(
                 f"Notification creation failed: {str(e)}",
-                extra={"user_id": notif.get("created_by")},
+                extra={"user_id": notif.get("user_id") or notif.get("created_by")},
             )
             raise RuntimeError("Failed to create notification")
 
+    # ---------------------------------------------------------
+    # CREATE MANY (one insert)
+    # ---------------------------------------------------------
+    def create_notifications(self, notifs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Bulk version of create_notification for fan-out: one insert for the
+        whole list, then counters and streams are updated per recipient.
+        """
+        if not notifs:
+            return []
+        try:
+            now = datetime.now(timezone.utc).isoformat()
+            rows = [self._row(notif, now) for notif in notifs]
+
+            res = self.supabase.table("notifications").insert(rows).execute()
+
+            if getattr(res, "error", None):
+                raise RuntimeError(res.error)
+
+            created = res.data or rows
+            self._announce(created)
+            return created
+
+        except Exception as e:
+            logger.error(
+                f"Bulk notification creation failed: {str(e)}",
+                extra={"count": len(notifs)},
+            )
+            raise RuntimeError("Failed to create notifications")
+
     # ---------------------------------------------------------
     # LIST NOTIFICATIONS FOR USER (WITH PAGINATION)
     # ---------------------------------------------------------
@@ -82,7 +129,7 @@ class NotificationService:
             res = (
                 self.supabase.table("notifications")
                 .select("*", count="exact")
-                .eq("created_by", user_id)
+                .eq("user_id", user_id)
                 .order("created_at", desc=True)
                 .range(offset, offset + page_size - 1)
                 .execute()
@@ -120,26 +167,42 @@ class NotificationService:
     # ---------------------------------------------------------
     def mark_as_read(self, notification_id: str, user_id: str) -> Dict[str, Any]:
         """
-        Mark a single notification as read.
+        Mark a single notification as read. Returns {} when the user has no
+        such notification; marking an already read one is a no-op.
         """
         try:
+            # Only unread rows match, so the counter moves once per notification
             res = (
                 self.supabase.table("notifications")
                 .update({"is_read": True})
                 .eq("id", notification_id)
-                .eq("created_by", user_id)
+                .eq("user_id", user_id)
+                .eq("is_read", False)
                 .execute()
             )
 
             if getattr(res, "error", None):
                 raise RuntimeError(res.error)
 
+            if not res.data:
+                existing = (
+                    self.supabase.table("notifications")
+                    .select("*")
+                    .eq("id", notification_id)
+                    .eq("user_id", user_id)
+                    .execute()
+                )
+                return existing.data[0] if existing.data else {}
+
+            unread_counter.decr(user_id)
+            notification_broker.publish(user_id, "read", {"id": notification_id})
+
             logger.info(
                 "Notification marked as read",
                 extra={"notification_id": notification_id, "user_id": user_id},
             )
 
-            return res.data or {}
+            return res.data[0]
 
         except Exception as e:
             logger.error(
@@ -155,17 +218,23 @@ class NotificationService:
         """
         Mark all notifications for a user as read.
         """
-        try:
+        def mark_all() -> None:
             res = (
                 self.supabase.table("notifications")
                 .update({"is_read": True})
-                .eq("created_by", user_id)
+                .eq("user_id", user_id)
+                .eq("is_read", False)
                 .execute()
             )
 
             if getattr(res, "error", None):
                 raise RuntimeError(res.error)
 
+        try:
+            # 0 is only stored if no notification was created meanwhile
+            unread_counter.set_after(user_id, 0, mark_all)
+            notification_broker.publish(user_id, "read_all", {})
+
             logger.info("All notifications marked as read", extra={"user_id": user_id})
 
         except Exception as e:
@@ -174,3 +243,31 @@ class NotificationService:
                 extra={"user_id": user_id},
             )
             raise RuntimeError("Failed to mark notifications as read")
+
+    # ---------------------------------------------------------
+    # UNREAD COUNT
+    # ---------------------------------------------------------
+    def unread_count(self, user_id: str) -> int:
+        """
+        Badge count, served from the unread counter; the table is only
+        counted on a miss or when the entry is due for reconciliation.
+        """
+        try:
+            return unread_counter.get(user_id, self._count_unread)
+        except Exception as e:
+            logger.error(
+                f"Unread count failed: {str(e)}",
+                extra={"user_id": user_id},
+            )
+            raise RuntimeError("Failed to count unread notifications")
+
+    def _count_unread(self, user_id: str) -> int:
+        # Answered from idx_notifications_user (user_id, is_read)
+        res = (
+            self.supabase.table("notifications")
+            .select("id", count="exact", head=True)
+            .eq("user_id", user_id)
+            .eq("is_read", False)
+            .execute()
+        )
+        return res.count or 0
@@ -0,0 +1,544 @@
+import os
+import sys
+import time
+import queue
+import argparse
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from supabase import Client
+from services.supabase_client import get_client
+from services.scoring_service import (
+    ScoringService,
+    SKILL_WEIGHT,
+    TEXT_WEIGHT,
+    TEXT_SATURATION,
+    REQUIRED_SKILL_WEIGHT,
+    SCORING_VERSION,
+    candidate_document,
+    job_document,
+    normalize_skill,
+)
+from utils_others.logger import logger
+from utils_others.skill_dictionary import skill_dictionary
+
+# Jobs stored per candidate; the endpoint serves up to this many
+TOP_K = int(os.getenv("RECOMMEND_TOP_K", "50"))
+# After closed jobs are dropped, lists shorter than this are recomputed
+REFILL_BELOW = int(os.getenv("RECOMMEND_REFILL_BELOW", "20"))
+# Hashed features are folded to this many dimensions for the job matrix
+# (power of two; 2048 floats per active job)
+DIM = int(os.getenv("RECOMMEND_DIM", "2048"))
+# The in-process job matrix is rebuilt after this long, so jobs changed
+# through other API workers are picked up
+MATRIX_TTL_SECONDS = int(os.getenv("RECOMMEND_MATRIX_TTL", "600"))
+# Candidates scored per batch
+BATCH_SIZE = int(os.getenv("RECOMMEND_BATCH_SIZE", "200"))
+
+# Job fields that change recommendations (besides status)
+RECOMMEND_FIELDS = ("title", "description", "requirements", "responsibilities", "status")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _fold(docs: List[Dict[int, float]]) -> np.ndarray:
+    """Sparse HASH_DIM feature dicts -> L2-normalized dense rows of width DIM."""
+    mat = np.zeros((len(docs), DIM), dtype=np.float32)
+    for row, features in enumerate(docs):
+        if features:
+            idx = np.fromiter(features.keys(), dtype=np.int64, count=len(features)) % DIM
+            np.add.at(mat[row], idx, np.fromiter(features.values(), dtype=np.float32, count=len(features)))
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+# ---------------------------------------------------------
+# ACTIVE JOB MATRIX (per process)
+# ---------------------------------------------------------
+class JobMatrix:
+    """
+    Every active job as one row: folded text vector, per-skill postings
+    and the job's total skill weight. Scores a batch of candidates against
+    all jobs with one matrix product, using the same formula as ai_score.
+    Rows of closed/changed jobs are retired, new ones appended.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.vectors = np.zeros((0, DIM), dtype=np.float32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.skill_total = np.zeros(0, dtype=np.float32)
+        # normalized skill -> {row: weight}
+        self.skills: Dict[str, Dict[int, float]] = {}
+        self.built_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return int(self.alive.sum())
+
+    def add(self, job_id: str, job: Dict[str, Any]) -> None:
+        """job: {"job": row, "skills": [job_skills rows]} (ScoringService.load_jobs format)."""
+        self.remove(job_id)
+        row = len(self.ids)
+        if row >= len(self.vectors):
+            size = max(256, row * 2)
+            vectors = np.zeros((size, DIM), dtype=np.float32)
+            vectors[:row] = self.vectors[:row]
+            self.vectors = vectors
+            self.alive = np.concatenate([self.alive[:row], np.zeros(size - row, dtype=bool)])
+            self.skill_total = np.concatenate([self.skill_total[:row], np.zeros(size - row, dtype=np.float32)])
+
+        self.ids.append(job_id)
+        self.rows[job_id] = row
+        self.vectors[row] = _fold([job_document(job["job"], job["skills"])])[0]
+        self.alive[row] = True
+        total = 0.0
+        for skill in job["skills"]:
+            name = normalize_skill(skill.get("skill_name", ""))
+            if not name:
+                continue
+            weight = REQUIRED_SKILL_WEIGHT if skill.get("is_required") else 1.0
+            postings = self.skills.setdefault(name, {})
+            postings[row] = postings.get(row, 0.0) + weight
+            total += weight
+        self.skill_total[row] = total
+
+    def remove(self, job_id: str) -> None:
+        row = self.rows.pop(job_id, None)
+        if row is not None:
+            self.alive[row] = False
+
+    def score(self, candidates: List[Dict[str, Any]]) -> np.ndarray:
+        """Candidates in ScoringService.load_candidates format -> (B, rows) scores in [0, 1]; -1 for retired rows."""
+        size = len(self.ids)
+        text = _fold([candidate_document(c) for c in candidates]) @ self.vectors[:size].T
+        text = np.minimum(1.0, np.clip(text, 0.0, 1.0) / TEXT_SATURATION)
+
+        matched = np.zeros_like(text)
+        for b, cand in enumerate(candidates):
+            for name in {normalize_skill(s) for s in cand.get("skills") or []}:
+                postings = self.skills.get(name)
+                if postings:
+                    rows = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+                    matched[b, rows] += np.fromiter(postings.values(), dtype=np.float32, count=len(postings))
+
+        totals = self.skill_total[:size]
+        has_skills = totals > 0
+        skill = np.divide(matched, totals, out=np.zeros_like(matched), where=has_skills)
+        scores = np.where(has_skills, SKILL_WEIGHT * skill + TEXT_WEIGHT * text, text)
+        scores[:, ~self.alive[:size]] = -1.0
+        return scores
+
+
+class RecommendationService:
+    """
+    Precomputed top-K active jobs per candidate, stored one row per
+    candidate in 'job_recommendations' (parallel job_ids/scores arrays),
+    so serving is a single primary-key read.
+    """
+
+    def __init__(self, client: Optional[Client] = None):
+        self.supabase = client or get_client()
+        self.scoring = ScoringService(self.supabase)
+        self._matrix: Optional[JobMatrix] = None
+
+    # ---------------------------------------------------------
+    # SERVE
+    # ---------------------------------------------------------
+    def get_recommendations(self, candidate_id: str, limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+        """Ranked jobs for the candidate, or None when nothing is stored yet."""
+        try:
+            res = (
+                self.supabase.table("job_recommendations")
+                .select("job_ids, scores, computed_at")
+                .eq("candidate_id", candidate_id)
+                .maybe_single()
+                .execute()
+            )
+            stored = res.data if res else None
+            if not stored:
+                return None
+            ranked = list(zip(stored.get("job_ids") or [], stored.get("scores") or []))[:limit]
+            return self._hydrate(ranked)
+        except Exception as e:
+            logger.error(f"Get recommendations failed: {str(e)}", extra={"candidate_id": candidate_id})
+            raise RuntimeError("Failed to fetch recommended jobs")
+
+    def _hydrate(self, ranked: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+        if not ranked:
+            return []
+        ids = [job_id for job_id, _ in ranked]
+        jobs = (
+            self.supabase.table("jobs")
+            .select("*")
+            .in_("id", ids)
+            .eq("status", "active")
+            .execute()
+        ).data or []
+        company_ids = list({j["company_id"] for j in jobs if j.get("company_id")})
+        companies = {}
+        if company_ids:
+            rows = self.supabase.table("companies").select("id, name").in_("id", company_ids).execute().data or []
+            companies = {c["id"]: c["name"] for c in rows}
+
+        by_id = {j["id"]: j for j in jobs}
+        results = []
+        for job_id, score in ranked:
+            job = by_id.get(job_id)
+            if job:  # closed since the list was computed
+                results.append({
+                    **job,
+                    "company_name": companies.get(job.get("company_id"), "Unknown Company"),
+                    "match_score": score,
+                })
+        return results
+
+    # ---------------------------------------------------------
+    # JOB MATRIX
+    # ---------------------------------------------------------
+    def matrix(self) -> JobMatrix:
+        if self._matrix is None or time.monotonic() - self._matrix.built_at > MATRIX_TTL_SECONDS:
+            self._matrix = self._build_matrix()
+        return self._matrix
+
+    def _build_matrix(self) -> JobMatrix:
+        started = time.perf_counter()
+        matrix = JobMatrix()
+        last_id = None
+        while True:
+            query = self.supabase.table("jobs").select("id").eq("status", "active")
+            if last_id:
+                query = query.gt("id", last_id)
+            page = query.order("id").limit(1000).execute().data or []
+            if not page:
+                break
+            jobs = self.scoring.load_jobs([j["id"] for j in page])
+            for job_id, job in jobs.items():
+                matrix.add(job_id, job)
+            last_id = page[-1]["id"]
+        logger.info(f"Job matrix built: {len(matrix)} active jobs in {time.perf_counter() - started:.1f}s")
+        return matrix
+
+    # ---------------------------------------------------------
+    # FULL COMPUTE (per candidate batch)
+    # ---------------------------------------------------------
+    def refresh_candidates(self, user_ids: List[str]) -> int:
+        """Recomputes and stores the top-K list of each candidate (users.id)."""
+        matrix = self.matrix()
+        written = 0
+        for start in range(0, len(user_ids), BATCH_SIZE):
+            batch = user_ids[start:start + BATCH_SIZE]
+            candidates = self.scoring.load_candidates(batch)
+            applied = self._applied(batch)
+            rows = []
+            if len(matrix.ids):
+                scores = matrix.score([candidates[uid] for uid in batch])
+                for b, uid in enumerate(batch):
+                    for job_id in applied.get(uid, ()):
+                        if job_id in matrix.rows:
+                            scores[b, matrix.rows[job_id]] = -1.0
+                    rows.append(self._row(uid, self._top_k(scores[b], matrix)))
+            else:
+                rows = [self._row(uid, []) for uid in batch]
+            self._write(rows)
+            written += len(rows)
+        return written
+
+    def refresh_all(self) -> int:
+        written = 0
+        for user_ids in self._candidate_pages():
+            written += self.refresh_candidates(user_ids)
+        logger.info(f"Recommendations rebuilt for {written} candidates")
+        return written
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, matrix: JobMatrix) -> List[Tuple[str, int]]:
+        k = min(TOP_K, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(matrix.ids[i], int(round(100 * scores[i]))) for i in top if scores[i] > 0]
+
+    # ---------------------------------------------------------
+    # INCREMENTAL UPDATES
+    # ---------------------------------------------------------
+    def job_changed(self, job_id: str) -> None:
+        """
+        A job was posted, edited or reopened: scores it against the
+        candidates it can reach and merges it into lists where it makes
+        the top K. For a job with skills these are the candidates listing
+        one of them (any known spelling, read from candidate_skills) plus
+        those already listing the job; anyone else scores at most TEXT_WEIGHT and picks the job up
+        on their next full refresh. Jobs without skills are text-only and
+        still scored against every candidate.
+        """
+        res = self.supabase.table("jobs").select("status").eq("id", job_id).maybe_single().execute()
+        job = self.scoring.load_jobs([job_id]).get(job_id) if res and res.data else None
+        if not job or res.data.get("status") != "active":
+            self.job_removed(job_id)
+            return
+
+        matrix = self.matrix()
+        matrix.add(job_id, job)
+        applied = {
+            a["candidate_id"]
+            for a in (
+                self.supabase.table("job_applications").select("candidate_id").eq("job_id", job_id).execute().data or []
+            )
+        }
+
+        skills = {normalize_skill(s.get("skill_name", "")) for s in job["skills"]} - {""}
+        if not skills:
+            for user_ids in self._candidate_pages():
+                self._merge_job(job_id, matrix, user_ids, applied)
+            return
+
+        seen: set = set()
+        names = [s.get("skill_name") for s in job["skills"]]
+        for user_ids in self._candidates_with_skills(names):
+            user_ids = [uid for uid in user_ids if uid not in seen]
+            seen.update(user_ids)
+            self._merge_job(job_id, matrix, user_ids, applied)
+
+        listed = (
+            self.supabase.table("job_recommendations")
+            .select("candidate_id")
+            .contains("job_ids", [job_id])
+            .execute()
+        ).data or []
+        user_ids = list(dict.fromkeys(r["candidate_id"] for r in listed if r["candidate_id"] not in seen))
+        for start in range(0, len(user_ids), BATCH_SIZE):
+            self._merge_job(job_id, matrix, user_ids[start:start + BATCH_SIZE], applied)
+
+    def _candidates_with_skills(self, names: List[str]) -> Iterator[List[str]]:
+        """
+        users.id of candidates listing any of the skills, in keyset pages of
+        candidate_skills rows (idx_candidate_skills_skill_name). Skills
+        reference candidate_profiles.id; rows written with the user id by
+        older code are passed through.
+        """
+        spellings = sorted({form for name in names for form in skill_dictionary.spellings(name)})
+        if not spellings:
+            return
+        last_id = None
+        while True:
+            query = self.supabase.table("candidate_skills").select("id, candidate_id").in_("skill_name", spellings)
+            if last_id:
+                query = query.gt("id", last_id)
+            page = query.order("id").limit(BATCH_SIZE).execute().data or []
+            if not page:
+                return
+            owner_ids = list(dict.fromkeys(r["candidate_id"] for r in page))
+            profiles = (
+                self.supabase.table("candidate_profiles")
+                .select("id, user_id")
+                .in_("id", owner_ids)
+                .execute()
+            ).data or []
+            owner = {p["id"]: p["user_id"] for p in profiles}
+            yield list(dict.fromkeys(owner.get(cid, cid) for cid in owner_ids))
+            if len(page) < BATCH_SIZE:
+                return
+            last_id = page[-1]["id"]
+
+    def _merge_job(self, job_id: str, matrix: JobMatrix, user_ids: List[str], applied: set) -> None:
+        candidates = self.scoring.load_candidates(user_ids)
+        user_ids = [uid for uid in user_ids if uid in candidates]
+        if not user_ids:
+            return
+        job_scores = matrix.score([candidates[uid] for uid in user_ids])[:, matrix.rows[job_id]]
+        stored = self._stored(user_ids)
+        changed, refill = [], []
+        for uid, score in zip(user_ids, job_scores.tolist()):
+            previous = stored.get(uid)
+            if previous is None:
+                continue  # never computed; the first visit computes the full list
+            ranked = [(j, s) for j, s in previous if j != job_id]
+            was_listed = len(ranked) != len(previous)
+            value = int(round(100 * score))
+            if uid not in applied and value > 0 and (len(ranked) < TOP_K or value > ranked[-1][1]):
+                ranked.append((job_id, value))
+                ranked.sort(key=lambda item: -item[1])
+                changed.append(self._row(uid, ranked[:TOP_K]))
+            elif was_listed and len(ranked) < REFILL_BELOW:
+                refill.append(uid)
+            elif was_listed:
+                changed.append(self._row(uid, ranked))
+        self._write(changed)
+        if refill:
+            self.refresh_candidates(refill)
+
+    def job_removed(self, job_id: str) -> None:
+        """A job was closed, paused or deleted: drops it from every stored list."""
+        if self._matrix is not None:
+            self._matrix.remove(job_id)
+        rows = (
+            self.supabase.table("job_recommendations")
+            .select("candidate_id, job_ids, scores")
+            .contains("job_ids", [job_id])
+            .execute()
+        ).data or []
+        refill, changed = [], []
+        for row in rows:
+            ranked = [(j, s) for j, s in zip(row["job_ids"], row["scores"]) if j != job_id]
+            if len(ranked) < REFILL_BELOW:
+                refill.append(row["candidate_id"])
+            else:
+                changed.append(self._row(row["candidate_id"], ranked))
+        self._write(changed)
+        if refill:
+            self.refresh_candidates(refill)
+
+    # ---------------------------------------------------------
+    # STORAGE HELPERS
+    # ---------------------------------------------------------
+    @staticmethod
+    def _row(candidate_id: str, ranked: List[Tuple[str, int]]) -> Dict[str, Any]:
+        return {
+            "candidate_id": candidate_id,
+            "job_ids": [job_id for job_id, _ in ranked],
+            "scores": [score for _, score in ranked],
+            "version": SCORING_VERSION,
+            "computed_at": _now(),
+        }
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        for start in range(0, len(rows), BATCH_SIZE):
+            chunk = rows[start:start + BATCH_SIZE]
+            self.supabase.table("job_recommendations").upsert(chunk, on_conflict="candidate_id").execute()
+
+    def _stored(self, user_ids: List[str]) -> Dict[str, List[Tuple[str, int]]]:
+        rows = (
+            self.supabase.table("job_recommendations")
+            .select("candidate_id, job_ids, scores")
+            .in_("candidate_id", user_ids)
+            .execute()
+        ).data or []
+        return {r["candidate_id"]: list(zip(r["job_ids"] or [], r["scores"] or [])) for r in rows}
+
+    def _applied(self, user_ids: List[str]) -> Dict[str, List[str]]:
+        rows = (
+            self.supabase.table("job_applications")
+            .select("candidate_id, job_id")
+            .in_("candidate_id", user_ids)
+            .execute()
+        ).data or []
+        applied: Dict[str, List[str]] = {}
+        for row in rows:
+            applied.setdefault(row["candidate_id"], []).append(row["job_id"])
+        return applied
+
+    def _candidate_pages(self) -> Iterator[List[str]]:
+        """users.id of every candidate profile, BATCH_SIZE at a time (keyset on profile id)."""
+        last_id = None
+        while True:
+            query = self.supabase.table("candidate_profiles").select("id, user_id")
+            if last_id:
+                query = query.gt("id", last_id)
+            page = query.order("id").limit(BATCH_SIZE).execute().data or []
+            if not page:
+                return
+            yield [p["user_id"] for p in page if p.get("user_id")]
+            if len(page) < BATCH_SIZE:
+                return
+            last_id = page[-1]["id"]
+
+
+# ---------------------------------------------------------
+# BACKGROUND WORKER
+# ---------------------------------------------------------
+class RecommendationWorker:
+    """
+    Applies recommendation updates on one daemon thread, so request
+    handlers only enqueue. Repeated events for the same candidate or job
+    are coalesced while they wait.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[Tuple[str, Optional[str]]]" = queue.Queue()
+        self._pending: set = set()
+        self._thread: Optional[threading.Thread] = None
+        self._service: Optional[RecommendationService] = None
+        self._lock = threading.Lock()
+
+    @property
+    def service(self) -> RecommendationService:
+        if self._service is None:
+            self._service = RecommendationService()
+        return self._service
+
+    def candidate_changed(self, candidate_id: str) -> None:
+        self._submit("candidate", candidate_id)
+
+    def job_changed(self, job_id: str) -> None:
+        self._submit("job", job_id)
+
+    def job_removed(self, job_id: str) -> None:
+        self._submit("job_removed", job_id)
+
+    def rebuild(self) -> None:
+        self._submit("all", None)
+
+    def _submit(self, kind: str, key: Optional[str]) -> None:
+        with self._lock:
+            if (kind, key) in self._pending:
+                return
+            self._pending.add((kind, key))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="recommendation-worker", daemon=True)
+                self._thread.start()
+        self._queue.put((kind, key))
+
+    def _loop(self) -> None:
+        while True:
+            kind, key = self._queue.get()
+            with self._lock:
+                self._pending.discard((kind, key))
+            try:
+                if kind == "candidate":
+                    self.service.refresh_candidates([key])
+                elif kind == "job":
+                    self.service.job_changed(key)
+                elif kind == "job_removed":
+                    self.service.job_removed(key)
+                else:
+                    self.service.refresh_all()
+            except Exception as e:
+                logger.error(f"Recommendation update failed: {str(e)}", extra={"kind": kind, "key": key})
+            finally:
+                self._queue.task_done()
+
+    def drain(self) -> None:
+        """Blocks until every queued update has been applied."""
+        self._queue.join()
+
+
+recommendation_worker = RecommendationWorker()
+
+
+# ---------------------------------------------------------
+# CLI: full rebuild (e.g. nightly, or after changing the formula)
+# ---------------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Recompute stored job recommendations")
+    parser.add_argument("--candidate-id", action="append", help="Only these candidates (users.id); repeatable")
+    args = parser.parse_args(argv)
+
+    service = RecommendationService()
+    started = time.perf_counter()
+    if args.candidate_id:
+        written = service.refresh_candidates(args.candidate_id)
+    else:
+        written = service.refresh_all()
+    print(f"{written} candidates in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,74 @@
-from typing import Optional, Dict, Any, List
+import os
+import json
+import base64
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from supabase import Client
 from services.supabase_client import get_client
+from services.rescoring_service import rescoring_worker, SCORING_FIELDS
+from services.recommendation_service import recommendation_worker, RECOMMEND_FIELDS
+from services.notification_fanout import fanout_worker
+from services.funnel_service import funnel_worker
+from utils_others.cache import TTLCache
 from utils_others.logger import logger
-from uuid import uuid4
+from utils_others.skill_dictionary import skill_dictionary
+from uuid import UUID, uuid4
+from datetime import datetime
+
+
+# ---------------------------------------------------------
+# APPLICATION LISTING (keyset pagination)
+# ---------------------------------------------------------
+APPLICATION_SORTS = ("applied_at", "ai_score")
+APPLICATION_LIST_FIELDS = (
+    "id, job_id, candidate_id, status, ai_score, applied_at, updated_at, "
+    "jobs!inner(title), users(full_name, email)"
+)
+# Rows per keyset page when streaming an export
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "1000"))
+
+# job_id -> questions in display order. Cleared on every write in this
+# process; other workers pick up changes within the TTL.
+question_cache = TTLCache(ttl=float(os.getenv("QUESTION_CACHE_TTL", "300")), maxsize=5000)
+
+
+def _encode_cursor(sort: str, value: Any, row_id: str) -> str:
+    raw = json.dumps([sort, value, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> Tuple[Any, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, row_id = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort:
+        raise ValueError("Cursor was issued for a different sort order")
+    # Both parts end up inside an or() filter, so only accept what the
+    # listing itself would have encoded: a row UUID and a value of the
+    # sort column's type
+    try:
+        row_id = str(UUID(str(row_id)))
+        if value is not None:
+            if sort == "ai_score":
+                if isinstance(value, bool) or not isinstance(value, int):
+                    raise ValueError
+            elif not isinstance(value, str):
+                raise ValueError
+            else:
+                datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError("Invalid cursor")
+    return value, row_id
+
+
+def _keyset_filter(sort: str, descending: bool, value: Any, row_id: str) -> str:
+    """Rows strictly after (value, id) in ORDER BY sort, id with NULLs last."""
+    op = "lt" if descending else "gt"
+    if value is None:
+        return f"and({sort}.is.null,id.{op}.{row_id})"
+    quoted = f'"{value}"'
+    return f"{sort}.{op}.{quoted},and({sort}.eq.{quoted},id.{op}.{row_id}),{sort}.is.null"
 
 
 class RecruiterService:
@@ -27,6 +93,10 @@ class RecruiterService:
                 raise Exception(res.error)
 
             logger.info("Job posted", extra={"created_by": job_data.get("created_by")})
+
+            for job in res.data or []:
+                if job.get("status") == "active":
+                    recommendation_worker.job_changed(job["id"])
             return res.data
 
         except Exception as e:
@@ -83,18 +153,62 @@ class RecruiterService:
 
     def update_job(self, job_id: str, update_data: Dict[str, Any], recruiter_id: str) -> Dict[str, Any]:
         try:
-            res = (
+            # Stored values of the fields that drive rescoring/recommendations,
+            # so background work only runs when one of them actually changes
+            watched = [f for f in dict.fromkeys(SCORING_FIELDS + RECOMMEND_FIELDS) if f in update_data]
+            before: Dict[str, Any] = {}
+            if watched:
+                current = (
+                    self.supabase.table("jobs")
+                    .select(", ".join(watched))
+                    .eq("id", job_id)
+                    .eq("created_by", recruiter_id)
+                    .maybe_single()
+                    .execute()
+                )
+                before = (current.data if current else None) or {}
+            changed = {f for f in watched if update_data[f] != before.get(f)}
+
+            query = (
                 self.supabase.table("jobs")
                 .update(update_data)
                 .eq("id", job_id)
                 .eq("created_by", recruiter_id)
-                .execute()
             )
+            closing = update_data.get("status") == "closed"
+            if closing:
+                # Only the update that actually closes the job notifies applicants
+                query = query.neq("status", "closed")
+            res = query.execute()
 
             if getattr(res, "error", None):
                 raise Exception(res.error)
 
+            if closing and res.data:
+                fanout_worker.job_closed(job_id, res.data[0].get("title"))
+            elif closing:
+                # Already closed (or not this recruiter's job): apply the other fields as usual
+                res = (
+                    self.supabase.table("jobs")
+                    .update(update_data)
+                    .eq("id", job_id)
+                    .eq("created_by", recruiter_id)
+                    .execute()
+                )
+
             logger.info("Job updated", extra={"job_id": job_id, "recruiter_id": recruiter_id})
+
+            # Existing match scores are stale once the job text changes
+            if res.data and changed.intersection(SCORING_FIELDS):
+                rescoring_worker.submit(job_id, "job_updated")
+
+            # Closing/pausing drops the job from recommendations; edits re-rank it
+            if res.data and changed.intersection(RECOMMEND_FIELDS):
+                if update_data.get("status") not in (None, "active"):
+                    recommendation_worker.job_removed(job_id)
+                else:
+                    recommendation_worker.job_changed(job_id)
+
             return res.data
 
         except Exception as e:
@@ -115,6 +229,8 @@ class RecruiterService:
                 raise Exception(res.error)
 
             logger.info("Job deleted", extra={"job_id": job_id})
+            if res.data:
+                recommendation_worker.job_removed(job_id)
             return res.data
 
         except Exception as e:
@@ -124,78 +240,100 @@ class RecruiterService:
     # ---------------------------------------------------------
     # GET APPLICATIONS FOR RECRUITER'S JOBS ONLY (FIXED)
     # ---------------------------------------------------------
-    def get_recruiter_applications(self, recruiter_id: str, job_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    def list_recruiter_applications(
+        self,
+        recruiter_id: str,
+        job_id: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+        min_score: Optional[int] = None,
+        max_score: Optional[int] = None,
+        sort: str = "applied_at",
+        descending: bool = True,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        One page of applications for jobs owned by the recruiter, in one query.
+
+        Ownership is a join filter (jobs!inner ... jobs.created_by) rather than
+        an IN list of every job id, and paging is keyset-based: next_cursor
+        encodes the (sort value, id) of the last row, so deep pages cost the
+        same as the first one.
+        """
+        if sort not in APPLICATION_SORTS:
+            raise ValueError(f"sort must be one of {', '.join(APPLICATION_SORTS)}")
+        after = _decode_cursor(cursor, sort) if cursor else None
+
         try:
-            # 1. Fetch ONLY jobs created by this recruiter
-            job_query = self.supabase.table("jobs").select("id, title").eq("created_by", recruiter_id)
-            
-            # If job_id is specific, only fetch that job
+            query = (
+                self.supabase.table("job_applications")
+                .select(APPLICATION_LIST_FIELDS)
+                .eq("jobs.created_by", recruiter_id)
+            )
             if job_id:
-                job_query = job_query.eq("id", job_id)
-                
-            jobs_res = job_query.execute()
-            jobs = getattr(jobs_res, "data", []) or []
-            
-            if not jobs:
-                return [] 
-                
-            # Extract IDs and map them
-            job_ids = [j["id"] for j in jobs]
-            job_map = {j["id"]: j["title"] for j in jobs}
-
-            # 2. Fetch applications ONLY for these job IDs
-            # CRITICAL FIX: Breaking the chain to avoid "AttributeError: execute"
-            query = self.supabase.table("job_applications").select("*").in_("job_id", job_ids).order("applied_at", desc=True)
-
-            # Only limit if we are NOT filtering by a specific job. 
-            # If viewing a specific job, we want to see ALL candidates.
-            if not job_id:
-                query = query.limit(100)
-            
-            apps_res = query.execute()
-            
-            applications = getattr(apps_res, "data", []) or []
-            
-            if not applications:
-                return []
-
-            # 3. Get Candidate Names
-            candidate_ids = list(set(a["candidate_id"] for a in applications))
-            cand_map = {}
-            
-            if candidate_ids:
-                users_res = self.supabase.table("users")\
-                    .select("id, full_name, email")\
-                    .in_("id", candidate_ids)\
-                    .execute()
-                
-                users_data = getattr(users_res, "data", []) or []
-                
-                for u in users_data:
-                    cand_map[u["id"]] = u.get("full_name") or u.get("email") or "Candidate"
-
-            # 4. Format the Data
-            results = []
-            for app in applications:
-                enriched_app = dict(app)
-                enriched_app["job_title"] = job_map.get(app["job_id"], "Unknown Job")
-                enriched_app["candidate_name"] = cand_map.get(app["candidate_id"], "Unknown Candidate")
-                results.append(enriched_app)
-                
-            return results
+                query = query.eq("job_id", job_id)
+            if statuses:
+                query = query.in_("status", statuses)
+            if min_score is not None:
+                query = query.gte("ai_score", min_score)
+            if max_score is not None:
+                query = query.lte("ai_score", max_score)
+            if after:
+                query = query.or_(_keyset_filter(sort, descending, after[0], after[1]))
 
+            res = (
+                query.order(sort, desc=descending, nullsfirst=False)
+                .order("id", desc=descending)
+                .limit(limit + 1)
+                .execute()
+            )
+            rows = getattr(res, "data", []) or []
         except Exception as e:
-            logger.error(f"Get recruiter applications failed: {str(e)}")
-            return []
+            logger.error(f"List recruiter applications failed: {str(e)}", extra={"recruiter_id": recruiter_id})
+            raise RuntimeError("Failed to fetch applications")
+
+        page = rows[:limit]
+        items = []
+        for row in page:
+            job = row.pop("jobs", None) or {}
+            user = row.pop("users", None) or {}
+            row["job_title"] = job.get("title") or "Unknown Job"
+            row["candidate_name"] = user.get("full_name") or user.get("email") or "Unknown Candidate"
+            row["candidate_email"] = user.get("email")
+            items.append(row)
+
+        next_cursor = _encode_cursor(sort, page[-1][sort], page[-1]["id"]) if len(rows) > limit else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    def iter_recruiter_applications(self, recruiter_id: str, chunk_size: int = EXPORT_CHUNK_SIZE, **filters: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Every matching application, fetched page by page with the same
+        enrichment as the listing. Only one page is held in memory.
+        """
+        cursor = None
+        while True:
+            page = self.list_recruiter_applications(recruiter_id, limit=chunk_size, cursor=cursor, **filters)
+            yield from page["items"]
+            cursor = page["next_cursor"]
+            if not cursor:
+                return
 
     # ---------------------------------------------------------
     # JOB SKILLS CRUD
     # ---------------------------------------------------------
     def add_job_skill(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         try:
+            payload = {**payload, "skill_name": skill_dictionary.canonicalize(payload.get("skill_name"))}
+            if not payload["skill_name"]:
+                raise ValueError("skill_name is required")
             res = self.supabase.table("job_skills").insert(payload).execute()
             if getattr(res, "error", None):
                 raise Exception(res.error)
+
+            if payload.get("job_id"):
+                rescoring_worker.submit(payload["job_id"], "job_skill_added")
+                recommendation_worker.job_changed(payload["job_id"])
+
             return res.data
         except Exception as e:
             logger.error(f"Add job skill failed: {str(e)}")
@@ -224,12 +362,17 @@ class RecruiterService:
             res = self.supabase.table("interview_questions").insert(payload).execute()
             if getattr(res, "error", None):
                 raise Exception(res.error)
+            question_cache.invalidate(payload.get("job_id"))
             return res.data
         except Exception as e:
             logger.error(f"Add interview question failed: {str(e)}")
             raise RuntimeError("Failed to add interview question")
 
     def list_interview_questions(self, job_id: str) -> List[Dict[str, Any]]:
+        """Served from the per-job cache; the interview room reads this on every load."""
+        return list(question_cache.get_or_load(job_id, lambda: self._load_interview_questions(job_id)))
+
+    def _load_interview_questions(self, job_id: str) -> tuple:
         try:
             res = (
                 self.supabase.table("interview_questions")
@@ -238,14 +381,44 @@ class RecruiterService:
                 .order("question_order")
                 .execute()
             )
-            return res.data
+            return tuple(res.data or [])
         except Exception as e:
             logger.error(f"List interview questions failed: {str(e)}")
             raise RuntimeError("Failed to fetch interview questions")
 
+    def replace_interview_questions(self, job_id: str, recruiter_id: str, questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Sets the job's questions to `questions` (display order) through the
+        replace_interview_questions RPC: one round trip, one transaction,
+        and only the rows that actually changed are touched.
+        """
+        params = {"p_job_id": job_id, "p_recruiter_id": recruiter_id, "p_questions": questions}
+        try:
+            res = self.supabase.rpc("replace_interview_questions", params).execute()
+        except Exception as e:
+            logger.error(f"Replace interview questions failed: {str(e)}", extra={"job_id": job_id})
+            raise RuntimeError("Failed to update interview questions")
+
+        result = res.data or {}
+        if result.get("error") == "job_not_found":
+            raise LookupError("Job not found")
+        if result.get("error") == "unknown_question":
+            raise ValueError("One or more question ids do not belong to this job")
+        if result.get("error") == "duplicate_question":
+            raise ValueError("Each question id may appear only once")
+
+        question_cache.set(job_id, tuple(result.get("questions") or []))
+        logger.info(
+            "Interview questions replaced",
+            extra={"job_id": job_id, "inserted": result.get("inserted"), "updated": result.get("updated"), "deleted": result.get("deleted")},
+        )
+        return result
+
     def delete_interview_question(self, question_id: str) -> None:
         try:
-            self.supabase.table("interview_questions").delete().eq("id", question_id).execute()
+            res = self.supabase.table("interview_questions").delete().eq("id", question_id).execute()
+            for row in res.data or []:
+                question_cache.invalidate(row.get("job_id"))
         except Exception as e:
             logger.error(f"Delete interview question failed: {str(e)}")
             raise RuntimeError("Failed to delete interview question")
@@ -455,10 +628,64 @@ class RecruiterService:
             if questions is not None:
                 update_data["interview_questions"] = questions
 
-            self.supabase.table("job_applications").update(update_data).eq("id", app_id).execute()
+            # Matches only when the status changes, so repeats do not notify again
+            res = (
+                self.supabase.table("job_applications")
+                .update(update_data)
+                .eq("id", app_id)
+                .neq("status", new_status)
+                .execute()
+            )
+            if res.data:
+                fanout_worker.application_status([app_id], new_status)
+                funnel_worker.job_changed(res.data[0].get("job_id"))
+            elif questions is not None:
+                self.supabase.table("job_applications").update(update_data).eq("id", app_id).execute()
             return True
             
         except Exception as e:
             logger.error(f"Update status failed: {str(e)}")
             print(f"❌ DB UPDATE ERROR: {str(e)}") 
-            return False
\ No newline at end of file
+            return False
+
+    def bulk_update_application_status(self, recruiter_id: str, application_ids: List[str], new_status: str) -> Dict[str, Any]:
+        """
+        Moves the recruiter's applications among `application_ids` to
+        `new_status` in one update and queues one notification fan-out for
+        the ones that changed. Ids that are unknown or belong to another
+        recruiter's jobs are returned as not_found.
+        """
+        try:
+            ids = list(dict.fromkeys(application_ids))
+            owned = (
+                self.supabase.table("job_applications")
+                .select("id, jobs!inner(created_by)")
+                .in_("id", ids)
+                .eq("jobs.created_by", recruiter_id)
+                .execute()
+            ).data or []
+            owned_ids = [row["id"] for row in owned]
+
+            changed: List[str] = []
+            if owned_ids:
+                res = (
+                    self.supabase.table("job_applications")
+                    .update({"status": new_status})
+                    .in_("id", owned_ids)
+                    .neq("status", new_status)
+                    .execute()
+                )
+                changed = [row["id"] for row in (res.data or [])]
+                fanout_worker.application_status(changed, new_status)
+                funnel_worker.jobs_changed([row["job_id"] for row in (res.data or []) if row.get("job_id")])
+
+            logger.info("Bulk status update", extra={"recruiter_id": recruiter_id, "status": new_status, "updated": len(changed)})
+            owned_set = set(owned_ids)
+            return {
+                "updated": len(changed),
+                "unchanged": len(owned_ids) - len(changed),
+                "not_found": [i for i in ids if i not in owned_set],
+            }
+        except Exception as e:
+            logger.error(f"Bulk status update failed: {str(e)}", extra={"recruiter_id": recruiter_id})
+            raise RuntimeError("Failed to update application statuses")
@@ -0,0 +1,340 @@
+import os
+import sys
+import time
+import queue
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from supabase import Client
+from services.supabase_client import get_client
+from services.scoring_service import ScoringService
+from utils_others.logger import logger
+
+# Applications streamed per keyset page; each page is scored and written
+# before the checkpoint moves, so at most one page is redone after a crash
+CHUNK_SIZE = int(os.getenv("RESCORING_CHUNK_SIZE", "2000"))
+# Pairs per task sent to a worker process
+TASK_SIZE = int(os.getenv("RESCORING_TASK_SIZE", "250"))
+# 0 scores in the worker thread itself (no process pool)
+PROCESSES = int(os.getenv("RESCORING_PROCESSES", str(max(1, (os.cpu_count() or 2) - 1))))
+# "thread": runs are drained by a background thread in the API process
+# "external": the API only records runs; `python -m services.rescoring_service --poll 5` drains them
+WORKER_MODE = os.getenv("RESCORING_WORKER", "thread").lower()
+
+# A 'running' run whose last checkpoint is older than this is treated as
+# abandoned (crashed worker) and may be taken over by a forced resume
+STALE_SECONDS = int(os.getenv("RESCORING_STALE_SECONDS", "600"))
+
+# Job fields that feed the match score
+SCORING_FIELDS = ("title", "description", "requirements", "responsibilities")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# ---------------------------------------------------------
+# LIVE PROGRESS (per process)
+# ---------------------------------------------------------
+_progress: Dict[str, Dict[str, Any]] = {}
+_progress_lock = threading.Lock()
+
+
+def _update_progress(run_id: str, processed: int, total: Optional[int], started: float) -> None:
+    elapsed = time.perf_counter() - started
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    remaining = max((total or 0) - processed, 0)
+    with _progress_lock:
+        _progress[run_id] = {
+            "processed": processed,
+            "total": total,
+            "per_second": round(rate, 1),
+            "elapsed_seconds": round(elapsed, 1),
+            "eta_seconds": round(remaining / rate, 1) if rate and total else None,
+        }
+
+
+def live_progress(run_id: str) -> Optional[Dict[str, Any]]:
+    with _progress_lock:
+        return dict(_progress[run_id]) if run_id in _progress else None
+
+
+class RescoringService:
+    """
+    Recomputes ai_score for many applications at once.
+    Runs are recorded in 'rescoring_jobs' with a keyset checkpoint
+    (last_application_id) so they can be resumed after interruption.
+    """
+
+    def __init__(self, client: Optional[Client] = None, scoring: Optional[ScoringService] = None):
+        self.supabase = client or get_client()
+        self.scoring = scoring or ScoringService(self.supabase)
+
+    # ---------------------------------------------------------
+    # RUN RECORDS
+    # ---------------------------------------------------------
+    def enqueue(self, job_id: Optional[str], reason: str) -> Dict[str, Any]:
+        """Creates a pending run; reuses one that is still pending for the same job."""
+        try:
+            query = self.supabase.table("rescoring_jobs").select("*").eq("status", "pending")
+            query = query.eq("job_id", job_id) if job_id else query.is_("job_id", "null")
+            pending = query.limit(1).execute().data or []
+            if pending:
+                return pending[0]
+
+            res = self.supabase.table("rescoring_jobs").insert({
+                "job_id": job_id,
+                "reason": reason,
+                "status": "pending",
+                "processed": 0,
+            }).execute()
+            return res.data[0] if res.data else {}
+        except Exception as e:
+            logger.error(f"Enqueue rescoring failed: {str(e)}", extra={"job_id": job_id})
+            raise RuntimeError("Failed to enqueue rescoring")
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        res = self.supabase.table("rescoring_jobs").select("*").eq("id", run_id).maybe_single().execute()
+        run = res.data if res else None
+        if run:
+            run["live"] = live_progress(run_id)
+        return run
+
+    def list_runs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        try:
+            query = self.supabase.table("rescoring_jobs").select("*")
+            if status:
+                query = query.eq("status", status)
+            runs = query.order("created_at", desc=True).limit(limit).execute().data or []
+            for run in runs:
+                run["live"] = live_progress(run["id"])
+            return runs
+        except Exception as e:
+            logger.error(f"List rescoring runs failed: {str(e)}")
+            raise RuntimeError("Failed to fetch rescoring runs")
+
+    def pending_run_ids(self) -> List[str]:
+        res = (
+            self.supabase.table("rescoring_jobs")
+            .select("id")
+            .eq("status", "pending")
+            .order("created_at")
+            .execute()
+        )
+        return [r["id"] for r in (res.data or [])]
+
+    @staticmethod
+    def is_stale(run: Dict[str, Any]) -> bool:
+        """True for a 'running' run that has not checkpointed within STALE_SECONDS."""
+        if run.get("status") != "running":
+            return False
+        updated = run.get("updated_at") or run.get("started_at")
+        if not updated:
+            return True
+        updated_at = datetime.fromisoformat(str(updated).replace("Z", "+00:00"))
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        return updated_at < datetime.now(timezone.utc) - timedelta(seconds=STALE_SECONDS)
+
+    def _claim(self, run_id: str, force: bool) -> Optional[Dict[str, Any]]:
+        # Conditional update: only one worker moves a run to 'running'.
+        # With force, a 'running' run is taken over only once it is stale,
+        # so a live executor is never joined by a second one.
+        query = (
+            self.supabase.table("rescoring_jobs")
+            .update({"status": "running", "started_at": _now(), "updated_at": _now(), "error": None})
+            .eq("id", run_id)
+        )
+        if force:
+            cutoff = (datetime.now(timezone.utc) - timedelta(seconds=STALE_SECONDS)).isoformat()
+            query = query.or_(f'status.in.(pending,failed),and(status.eq.running,updated_at.lt."{cutoff}")')
+        else:
+            query = query.in_("status", ["pending", "failed"])
+        res = query.execute()
+        return res.data[0] if res.data else None
+
+    def _checkpoint(self, run_id: str, fields: Dict[str, Any]) -> None:
+        # updated_at doubles as the heartbeat checked by _claim
+        self.supabase.table("rescoring_jobs").update({**fields, "updated_at": _now()}).eq("id", run_id).execute()
+
+    # ---------------------------------------------------------
+    # PIPELINE
+    # ---------------------------------------------------------
+    def run(self, run_id: str, executor: Optional[Executor] = None, force: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Streams the run's applications page by page, scores each page
+        (fanned out over `executor` when given) and writes it back in bulk.
+        Returns the final run row, or None if another worker owns the run.
+        """
+        run = self._claim(run_id, force)
+        if not run:
+            return None
+
+        job_id = run.get("job_id")
+        processed = run.get("processed") or 0
+        started = time.perf_counter()
+
+        try:
+            total = self._count(job_id)
+            self._checkpoint(run_id, {"total": total})
+
+            for page in self._pages(job_id, run.get("last_application_id")):
+                results = self.scoring.score_applications(page, executor=executor, batch_size=TASK_SIZE)
+                self.scoring.write_scores(results)
+
+                processed += len(page)
+                self._checkpoint(run_id, {"processed": processed, "last_application_id": page[-1]["id"]})
+                _update_progress(run_id, processed, total, started)
+
+            self._checkpoint(run_id, {"status": "completed", "finished_at": _now()})
+            logger.info(
+                f"Rescoring finished: {processed} applications in {time.perf_counter() - started:.1f}s",
+                extra={"job_id": job_id},
+            )
+        except Exception as e:
+            logger.error(f"Rescoring failed: {str(e)}", extra={"job_id": job_id})
+            self._checkpoint(run_id, {"status": "failed", "error": str(e)[:500]})
+        finally:
+            with _progress_lock:
+                _progress.pop(run_id, None)
+
+        return self.get_run(run_id)
+
+    def _count(self, job_id: Optional[str]) -> int:
+        query = self.supabase.table("job_applications").select("id", count="exact", head=True)
+        if job_id:
+            query = query.eq("job_id", job_id)
+        return query.execute().count or 0
+
+    def _pages(self, job_id: Optional[str], after_id: Optional[str]) -> Iterator[List[Dict[str, Any]]]:
+        """Keyset pagination on id; never holds more than one page in memory."""
+        while True:
+            query = self.supabase.table("job_applications").select("id, job_id, candidate_id")
+            if job_id:
+                query = query.eq("job_id", job_id)
+            if after_id:
+                query = query.gt("id", after_id)
+            page = query.order("id").limit(CHUNK_SIZE).execute().data or []
+            if not page:
+                return
+            yield page
+            if len(page) < CHUNK_SIZE:
+                return
+            after_id = page[-1]["id"]
+
+
+# ---------------------------------------------------------
+# BACKGROUND WORKER
+# ---------------------------------------------------------
+class RescoringWorker:
+    """
+    Drains rescoring runs on one daemon thread so request workers never
+    score in-line. CPU-bound scoring is fanned out to a process pool
+    (spawned, so workers do not inherit the server's threads).
+    """
+
+    def __init__(self, processes: int = PROCESSES):
+        self.processes = processes
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._service: Optional[RescoringService] = None
+        self._lock = threading.Lock()
+
+    @property
+    def service(self) -> RescoringService:
+        if self._service is None:
+            self._service = RescoringService()
+        return self._service
+
+    def submit(self, job_id: Optional[str], reason: str) -> Optional[Dict[str, Any]]:
+        """Records a run and schedules it. Never raises; callers are request handlers."""
+        try:
+            run = self.service.enqueue(job_id, reason)
+        except RuntimeError:
+            return None
+        if run and WORKER_MODE == "thread":
+            self.schedule(run["id"])
+        return run
+
+    def schedule(self, run_id: str, force: bool = False) -> None:
+        self._ensure_thread()
+        self._queue.put((run_id, force))
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="rescoring-worker", daemon=True)
+                self._thread.start()
+
+    def executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.processes <= 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _loop(self) -> None:
+        while True:
+            run_id, force = self._queue.get()
+            try:
+                self.service.run(run_id, executor=self.executor(), force=force)
+            except Exception as e:
+                logger.error(f"Rescoring worker error: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def drain(self) -> None:
+        """Blocks until every scheduled run has finished."""
+        self._queue.join()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+rescoring_worker = RescoringWorker()
+
+
+# ---------------------------------------------------------
+# CLI: standalone worker (RESCORING_WORKER=external)
+# ---------------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run pending application rescoring jobs")
+    parser.add_argument("--run-id", help="Resume a specific run (even if it was left 'running')")
+    parser.add_argument("--job-id", help="Create and run a rescoring run for one job")
+    parser.add_argument("--all", action="store_true", help="Create and run a rescoring run for every application")
+    parser.add_argument("--poll", type=float, default=0, help="Keep polling for pending runs every N seconds")
+    parser.add_argument("--processes", type=int, default=PROCESSES)
+    args = parser.parse_args(argv)
+
+    worker = RescoringWorker(args.processes)
+    service = worker.service
+    try:
+        if args.run_id:
+            print(service.run(args.run_id, executor=worker.executor(), force=True))
+            return 0
+        if args.job_id or args.all:
+            run = service.enqueue(args.job_id, "manual")
+            print(service.run(run["id"], executor=worker.executor()))
+            return 0
+        while True:
+            for run_id in service.pending_run_ids():
+                print(service.run(run_id, executor=worker.executor()))
+            if not args.poll:
+                return 0
+            time.sleep(args.poll)
+    finally:
+        worker.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
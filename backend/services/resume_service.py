@@ -0,0 +1,199 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from supabase import Client
+from services.supabase_client import get_client
+from services.scoring_service import ScoringService
+from services.search_service import candidate_search
+from services.recommendation_service import recommendation_worker
+from utils_others.logger import logger
+from utils_others.resume_text import extract_text, content_hash, ResumeExtractionError
+
+# 0 extracts in the calling thread (no process pool)
+PROCESSES = int(os.getenv("RESUME_EXTRACT_PROCESSES", "2"))
+TIMEOUT_SECONDS = float(os.getenv("RESUME_EXTRACT_TIMEOUT", "30"))
+BACKFILL_BATCH = int(os.getenv("RESUME_BACKFILL_BATCH", "50"))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> Optional[ProcessPoolExecutor]:
+    """Shared extraction pool, created on first use (spawned, not forked)."""
+    global _executor
+    if PROCESSES <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+class ResumeService:
+    """
+    Extracts plain text from uploaded resumes into candidate_profiles
+    (resume_text / resume_hash), where scoring and search pick it up.
+    """
+
+    def __init__(self, client: Optional[Client] = None):
+        self.supabase = client or get_client()
+        self.scoring = ScoringService(self.supabase)
+
+    # ---------------------------------------------------------
+    # SINGLE RESUME (runs after a profile update as a BackgroundTask)
+    # ---------------------------------------------------------
+    def process_resume(self, candidate_id: str, path: str, content: Optional[bytes] = None) -> Dict[str, Any]:
+        """
+        Extracts and stores the resume text for a candidate (users.id).
+        Skips extraction when the content hash matches what is stored.
+        Never raises, so it is safe to schedule as a background task.
+        """
+        try:
+            if content is None:
+                content = self.supabase.storage.from_("resumes").download(path)
+
+            digest = content_hash(content)
+            res = (
+                self.supabase.table("candidate_profiles")
+                .select("resume_hash")
+                .eq("user_id", candidate_id)
+                .maybe_single()
+                .execute()
+            )
+            if res and res.data and res.data.get("resume_hash") == digest:
+                return {"status": "unchanged", "hash": digest}
+
+            extracted = self._extract(path, content)
+            self._store(candidate_id, extracted)
+
+            # Application scores and candidate search include resume text
+            self.scoring.score_candidate(candidate_id)
+            candidate_search.refresh(candidate_id)
+            recommendation_worker.candidate_changed(candidate_id)
+
+            logger.info("Resume text extracted", extra={"candidate_id": candidate_id})
+            return {"status": "extracted", "hash": digest, "chars": extracted["chars"]}
+
+        except ResumeExtractionError as e:
+            logger.warning(f"Resume extraction skipped: {str(e)}", extra={"candidate_id": candidate_id})
+            return {"status": "unsupported", "error": str(e)}
+        except Exception as e:
+            logger.error(f"Resume processing failed: {str(e)}", extra={"candidate_id": candidate_id})
+            return {"status": "failed", "error": str(e)}
+
+    def _extract(self, path: str, content: bytes) -> Dict[str, Any]:
+        executor = get_executor()
+        if executor is None:
+            return extract_text(path, content)
+        return executor.submit(extract_text, path, content).result(timeout=TIMEOUT_SECONDS)
+
+    def _store(self, candidate_id: str, extracted: Dict[str, Any]) -> None:
+        self.supabase.table("candidate_profiles").update({
+            "resume_text": extracted["text"],
+            "resume_hash": extracted["hash"],
+            "resume_extracted_at": datetime.now(timezone.utc).isoformat(),
+        }).eq("user_id", candidate_id).execute()
+
+    def _store_failed(self, candidate_id: str, digest: str) -> None:
+        self.supabase.table("candidate_profiles").update({
+            "resume_hash": digest,
+            "resume_extracted_at": datetime.now(timezone.utc).isoformat(),
+        }).eq("user_id", candidate_id).execute()
+
+    # ---------------------------------------------------------
+    # BACKFILL (Admin)
+    # ---------------------------------------------------------
+    def backfill(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Extracts text for profiles that have a resume but no resume_hash,
+        BACKFILL_BATCH documents at a time across the process pool.
+        """
+        counts = {"extracted": 0, "failed": 0}
+        last_id = None
+        try:
+            while limit is None or counts["extracted"] + counts["failed"] < limit:
+                query = (
+                    self.supabase.table("candidate_profiles")
+                    .select("id, user_id, resume_url")
+                    .is_("resume_hash", "null")
+                    .not_.is_("resume_url", "null")
+                )
+                if last_id:
+                    query = query.gt("id", last_id)
+                page = query.order("id").limit(BACKFILL_BATCH).execute().data or []
+                if not page:
+                    break
+                last_id = page[-1]["id"]
+
+                extracted: List[str] = []
+                for profile, (digest, outcome) in zip(page, self._extract_many(page)):
+                    if isinstance(outcome, Exception):
+                        counts["failed"] += 1
+                        logger.warning(f"Resume backfill failed: {str(outcome)}", extra={"candidate_id": profile["user_id"]})
+                        if digest:
+                            # Same bytes would fail again: record the hash so later runs skip it
+                            self._store_failed(profile["user_id"], digest)
+                        continue
+                    self._store(profile["user_id"], outcome)
+                    candidate_search.refresh(profile["user_id"])
+                    recommendation_worker.candidate_changed(profile["user_id"])
+                    extracted.append(profile["user_id"])
+                    counts["extracted"] += 1
+
+                # Same hook as process_resume: scores include resume text
+                if extracted:
+                    self.scoring.score_candidates(extracted)
+
+            logger.info(f"Resume backfill finished: {counts}")
+            return counts
+        except Exception as e:
+            logger.error(f"Resume backfill failed: {str(e)}")
+            raise RuntimeError("Failed to backfill resume text")
+
+    def _extract_many(self, profiles: List[Dict[str, Any]]) -> List[Tuple[Optional[str], Any]]:
+        """
+        (content hash, extracted dict or Exception) per profile. The hash is
+        None when the download failed, so the profile is retried next run.
+        """
+        bucket = self.supabase.storage.from_("resumes")
+        executor = get_executor()
+        futures = []
+        for profile in profiles:
+            try:
+                content = bucket.download(profile["resume_url"])
+            except Exception as e:
+                futures.append((None, e))
+                continue
+            digest = content_hash(content)
+            if executor is None:
+                try:
+                    futures.append((digest, extract_text(profile["resume_url"], content)))
+                except Exception as e:
+                    futures.append((digest, e))
+            else:
+                futures.append((digest, executor.submit(extract_text, profile["resume_url"], content)))
+
+        results = []
+        for digest, item in futures:
+            if hasattr(item, "result"):
+                try:
+                    item = item.result(timeout=TIMEOUT_SECONDS)
+                except Exception as e:
+                    item = e
+            results.append((digest, item))
+        return results
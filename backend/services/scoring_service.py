@@ -0,0 +1,405 @@
+import os
+import re
+import math
+import time
+import zlib
+from concurrent.futures import Executor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from supabase import Client
+from services.supabase_client import get_client
+from utils_others.logger import logger
+from utils_others.skill_dictionary import skill_dictionary
+
+# Bump when the formula changes so stale scores can be found via ai_analysis->>version
+SCORING_VERSION = 2
+
+HASH_DIM = int(os.getenv("SCORING_HASH_DIM", str(2 ** 13)))
+CHUNK_SIZE = int(os.getenv("SCORING_CHUNK_SIZE", "512"))
+BATCH_SIZE = int(os.getenv("SCORING_BATCH_SIZE", "500"))
+
+# Final score = SKILL_WEIGHT * skill match + TEXT_WEIGHT * text similarity.
+# Cosine between a profile and a job description rarely exceeds ~0.5,
+# so text similarity is rescaled by TEXT_SATURATION before weighting.
+SKILL_WEIGHT = 0.65
+TEXT_WEIGHT = 0.35
+TEXT_SATURATION = 0.5
+REQUIRED_SKILL_WEIGHT = 2.0
+
+# Skills are hashed as whole phrases as well, weighted above plain words
+SKILL_FEATURE_WEIGHT = 3.0
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or our the to we with you your will this that "
+    "years year experience working work using".split()
+)
+
+# Reads are batched with in_() filters of at most this many ids
+_IN_CHUNK = 200
+
+
+# ---------------------------------------------------------
+# FEATURES (pure functions; safe to ship to worker processes)
+# ---------------------------------------------------------
+def normalize_skill(skill: str) -> str:
+    # Aliases share a key, so "JS" on a profile matches "JavaScript" on a job
+    return skill_dictionary.normalize(skill)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return [t.rstrip(".") for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def _bucket(feature: str) -> Tuple[int, float]:
+    # crc32 is stable across processes (unlike hash()), so vectors built in
+    # different workers or on different days agree
+    h = zlib.crc32(feature.encode("utf-8"))
+    return h % HASH_DIM, (1.0 if h & 0x80000000 else -1.0)
+
+
+def document_features(text: str, skills: Iterable[str]) -> Dict[int, float]:
+    """Sparse hashed term-frequency vector (sublinear tf) for one document."""
+    counts: Dict[int, float] = {}
+    for token in tokenize(text):
+        idx, sign = _bucket(token)
+        counts[idx] = counts.get(idx, 0.0) + sign
+    for skill in skills:
+        idx, sign = _bucket("skill:" + normalize_skill(skill))
+        counts[idx] = counts.get(idx, 0.0) + sign * SKILL_FEATURE_WEIGHT
+    return {i: math.copysign(1.0 + math.log(abs(v)), v) for i, v in counts.items() if v}
+
+
+def _matrix(docs: Sequence[Dict[int, float]]) -> np.ndarray:
+    mat = np.zeros((len(docs), HASH_DIM), dtype=np.float32)
+    for row, features in enumerate(docs):
+        if features:
+            idx = np.fromiter(features.keys(), dtype=np.int64, count=len(features))
+            mat[row, idx] = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+def text_similarity(job_docs: Sequence[Dict[int, float]], candidate_docs: Sequence[Dict[int, float]]) -> np.ndarray:
+    """
+    Row-wise cosine similarity of paired documents, computed in chunks so
+    memory stays at 2 * CHUNK_SIZE * HASH_DIM floats regardless of batch size.
+    """
+    out = np.empty(len(job_docs), dtype=np.float32)
+    for start in range(0, len(job_docs), CHUNK_SIZE):
+        end = start + CHUNK_SIZE
+        jobs = _matrix(job_docs[start:end])
+        cands = _matrix(candidate_docs[start:end])
+        out[start:end] = np.einsum("ij,ij->i", jobs, cands)
+    return np.clip(out, 0.0, 1.0)
+
+
+def skill_match(job_skills: List[Dict[str, Any]], candidate_skills: Iterable[str]) -> Dict[str, Any]:
+    have = {normalize_skill(s) for s in candidate_skills}
+    total = matched_weight = 0.0
+    matched, missing, required_missing = [], [], []
+    for skill in job_skills:
+        name = normalize_skill(skill.get("skill_name", ""))
+        if not name:
+            continue
+        weight = REQUIRED_SKILL_WEIGHT if skill.get("is_required") else 1.0
+        total += weight
+        if name in have:
+            matched_weight += weight
+            matched.append(name)
+        else:
+            missing.append(name)
+            if skill.get("is_required"):
+                required_missing.append(name)
+    return {
+        "score": matched_weight / total if total else 0.0,
+        "matched": matched,
+        "missing": missing,
+        "required_missing": required_missing,
+    }
+
+
+def job_document(job: Dict[str, Any], job_skills: List[Dict[str, Any]]) -> Dict[int, float]:
+    text = " ".join(str(job.get(k) or "") for k in ("title", "description", "requirements", "responsibilities"))
+    return document_features(text, [s.get("skill_name", "") for s in job_skills])
+
+
+def candidate_document(candidate: Dict[str, Any]) -> Dict[int, float]:
+    profile = candidate.get("profile") or {}
+    parts = [profile.get("title"), profile.get("bio"), profile.get("resume_text")]
+    for exp in candidate.get("experience") or []:
+        parts.extend([exp.get("position"), exp.get("description")])
+    return document_features(" ".join(p for p in parts if p), candidate.get("skills") or [])
+
+
+def score_pairs(pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Scores (job, candidate) pairs. A job is {"job": row, "skills": [...]};
+    a candidate is {"profile": row, "skills": [...], "experience": [...]}.
+    Returns {"ai_score": int, "ai_analysis": dict} per pair, in order.
+    """
+    if not pairs:
+        return []
+
+    job_docs: Dict[int, Dict[int, float]] = {}
+    cand_docs: Dict[int, Dict[int, float]] = {}
+    left, right = [], []
+    for job, cand in pairs:
+        if id(job) not in job_docs:
+            job_docs[id(job)] = job_document(job["job"], job["skills"])
+        if id(cand) not in cand_docs:
+            cand_docs[id(cand)] = candidate_document(cand)
+        left.append(job_docs[id(job)])
+        right.append(cand_docs[id(cand)])
+
+    similarities = text_similarity(left, right)
+
+    results = []
+    for (job, cand), similarity in zip(pairs, similarities.tolist()):
+        skills = skill_match(job["skills"], cand.get("skills") or [])
+        text_score = min(1.0, similarity / TEXT_SATURATION)
+        if job["skills"]:
+            combined = SKILL_WEIGHT * skills["score"] + TEXT_WEIGHT * text_score
+        else:
+            combined = text_score
+        results.append({
+            "ai_score": int(round(100 * combined)),
+            "ai_analysis": {
+                "version": SCORING_VERSION,
+                "skill_match": round(skills["score"], 4),
+                "text_similarity": round(similarity, 4),
+                "matched_skills": skills["matched"],
+                "missing_skills": skills["missing"],
+                "required_missing": skills["required_missing"],
+            },
+        })
+    return results
+
+
+# ---------------------------------------------------------
+# SERVICE
+# ---------------------------------------------------------
+class ScoringService:
+    def __init__(self, client: Optional[Client] = None):
+        self.supabase = client or get_client()
+
+    # ---------------------------------------------------------
+    # SINGLE APPLICATION (runs after submit as a BackgroundTask)
+    # ---------------------------------------------------------
+    def score_application(self, application_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Scores one application and stores ai_score / ai_analysis.
+        Never raises, so it is safe to schedule as a background task.
+        """
+        try:
+            res = (
+                self.supabase.table("job_applications")
+                .select("id, job_id, candidate_id")
+                .eq("id", application_id)
+                .maybe_single()
+                .execute()
+            )
+            app = res.data if res else None
+            if not app:
+                return None
+
+            results = self.score_applications([app])
+            self.write_scores(results)
+            return results[0] if results else None
+        except Exception as e:
+            logger.error(f"Scoring failed: {str(e)}", extra={"application_id": application_id})
+            return None
+
+    def score_candidate(self, candidate_id: str) -> int:
+        """Rescores every application of one candidate (e.g. after a new resume)."""
+        return self.score_candidates([candidate_id])
+
+    def score_candidates(self, candidate_ids: List[str]) -> int:
+        """Rescores every application of the given candidates, one IN-list chunk at a time."""
+        try:
+            updated = 0
+            for ids in _chunks(candidate_ids):
+                apps = (
+                    self.supabase.table("job_applications")
+                    .select("id, job_id, candidate_id")
+                    .in_("candidate_id", ids)
+                    .execute()
+                ).data or []
+                if apps:
+                    updated += self.write_scores(self.score_applications(apps))
+            return updated
+        except Exception as e:
+            logger.error(f"Candidate scoring failed: {str(e)}", extra={"candidates": len(candidate_ids)})
+            return 0
+
+    # ---------------------------------------------------------
+    # BATCH SCORING
+    # ---------------------------------------------------------
+    def score_applications(
+        self,
+        applications: List[Dict[str, Any]],
+        executor: Optional[Executor] = None,
+        batch_size: int = CHUNK_SIZE
+    ) -> List[Dict[str, Any]]:
+        """
+        Loads jobs and candidates for the given application rows in bulk and
+        scores them. Returns rows ready for write_scores().
+        With an executor (e.g. a ProcessPoolExecutor) the pairs are scored in
+        batches of batch_size across its workers.
+        """
+        job_ids = list({a["job_id"] for a in applications if a.get("job_id")})
+        candidate_ids = list({a["candidate_id"] for a in applications if a.get("candidate_id")})
+
+        jobs = self.load_jobs(job_ids)
+        candidates = self.load_candidates(candidate_ids)
+
+        scorable = [a for a in applications if a.get("job_id") in jobs and a.get("candidate_id") in candidates]
+        pairs = [(jobs[a["job_id"]], candidates[a["candidate_id"]]) for a in scorable]
+        if executor is None or len(pairs) <= batch_size:
+            scores = score_pairs(pairs)
+        else:
+            batches = [pairs[i:i + batch_size] for i in range(0, len(pairs), batch_size)]
+            scores = [score for batch in executor.map(score_pairs, batches) for score in batch]
+
+        return [
+            {
+                "id": a["id"],
+                "job_id": a["job_id"],
+                "candidate_id": a["candidate_id"],
+                **score,
+            }
+            for a, score in zip(scorable, scores)
+        ]
+
+    def write_scores(self, results: List[Dict[str, Any]]) -> int:
+        """
+        Bulk write: one update_application_scores call per chunk. Updates by
+        id only, so applications deleted meanwhile are not re-inserted.
+        Returns the number of applications updated.
+        """
+        updated = 0
+        for start in range(0, len(results), BATCH_SIZE):
+            rows = [
+                {"id": r["id"], "ai_score": r["ai_score"], "ai_analysis": r.get("ai_analysis")}
+                for r in results[start:start + BATCH_SIZE]
+            ]
+            res = self.supabase.rpc("update_application_scores", {"p_rows": rows}).execute()
+            updated += res.data if isinstance(res.data, int) else len(rows)
+        return updated
+
+    # ---------------------------------------------------------
+    # BACKFILL (Admin)
+    # ---------------------------------------------------------
+    def backfill(self, job_id: Optional[str] = None, rescore: bool = False, batch_size: int = BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Scores applications page by page (keyset on id).
+        By default only applications without an ai_score are touched.
+        """
+        started = time.perf_counter()
+        scored = 0
+        last_id = None
+        try:
+            while True:
+                query = self.supabase.table("job_applications").select("id, job_id, candidate_id")
+                if job_id:
+                    query = query.eq("job_id", job_id)
+                if not rescore:
+                    query = query.is_("ai_score", "null")
+                if last_id:
+                    # Keyset paging also steps over rows that cannot be scored
+                    # (deleted job/candidate), which would otherwise repeat
+                    query = query.gt("id", last_id)
+                page = query.order("id").limit(batch_size).execute().data or []
+                if not page:
+                    break
+
+                scored += self.write_scores(self.score_applications(page))
+                last_id = page[-1]["id"]
+                if len(page) < batch_size:
+                    break
+
+            elapsed = time.perf_counter() - started
+            logger.info(f"Scoring backfill finished: {scored} applications in {elapsed:.1f}s")
+            return {
+                "scored": scored,
+                "seconds": round(elapsed, 3),
+                "per_second": round(scored / elapsed, 1) if elapsed else None,
+            }
+        except Exception as e:
+            logger.error(f"Scoring backfill failed: {str(e)}", extra={"job_id": job_id})
+            raise RuntimeError("Failed to backfill application scores")
+
+    # ---------------------------------------------------------
+    # LOADERS
+    # ---------------------------------------------------------
+    def load_jobs(self, job_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        jobs: Dict[str, Dict[str, Any]] = {}
+        for ids in _chunks(job_ids):
+            rows = (
+                self.supabase.table("jobs")
+                .select("id, title, description, requirements, responsibilities")
+                .in_("id", ids)
+                .execute()
+            ).data or []
+            for row in rows:
+                jobs[row["id"]] = {"job": row, "skills": []}
+            skills = (
+                self.supabase.table("job_skills")
+                .select("job_id, skill_name, is_required")
+                .in_("job_id", ids)
+                .execute()
+            ).data or []
+            for skill in skills:
+                if skill["job_id"] in jobs:
+                    jobs[skill["job_id"]]["skills"].append(skill)
+        return jobs
+
+    def load_candidates(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Keyed by users.id (what job_applications.candidate_id stores).
+        Skills/experience reference candidate_profiles.id; rows written with
+        the user id by older code are picked up as well.
+        """
+        candidates: Dict[str, Dict[str, Any]] = {
+            uid: {"profile": {}, "skills": [], "experience": []} for uid in user_ids
+        }
+        for ids in _chunks(user_ids):
+            profiles = (
+                self.supabase.table("candidate_profiles")
+                .select("*")
+                .in_("user_id", ids)
+                .execute()
+            ).data or []
+            owner = {uid: uid for uid in ids}
+            for profile in profiles:
+                candidates[profile["user_id"]]["profile"] = profile
+                owner[profile["id"]] = profile["user_id"]
+
+            owner_ids = list(owner)
+            skills = (
+                self.supabase.table("candidate_skills")
+                .select("candidate_id, skill_name")
+                .in_("candidate_id", owner_ids)
+                .execute()
+            ).data or []
+            for row in skills:
+                candidates[owner[row["candidate_id"]]]["skills"].append(row["skill_name"])
+
+            experience = (
+                self.supabase.table("candidate_experience")
+                .select("candidate_id, position, description")
+                .in_("candidate_id", owner_ids)
+                .execute()
+            ).data or []
+            for row in experience:
+                candidates[owner[row["candidate_id"]]]["experience"].append(row)
+        return candidates
+
+
+def _chunks(items: List[str], size: int = _IN_CHUNK) -> Iterable[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
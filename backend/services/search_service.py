@@ -0,0 +1,674 @@
+import os
+import re
+import math
+import time
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from supabase import Client
+from services.supabase_client import get_client
+from services.scoring_service import normalize_skill, tokenize
+from utils_others.logger import logger
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Field weights applied to term frequencies (skills count most)
+FIELD_WEIGHTS = {
+    "skills": 3.0,
+    "title": 2.0,
+    "experience": 1.5,
+    "education": 1.0,
+    "bio": 1.0,
+    "resume": 1.0,
+}
+# Fields that also get prefixed terms for field queries (skill:python, company:acme)
+FIELD_PREFIXES = {"title": "title", "company": "company", "school": "school"}
+
+# Highest-weighted distinct terms kept per document; bounds memory for long resumes
+MAX_TERMS_PER_DOC = int(os.getenv("SEARCH_MAX_TERMS_PER_DOC", "256"))
+# Documents held in the mutable delta segment before it is merged into the base arrays
+MERGE_THRESHOLD = int(os.getenv("SEARCH_MERGE_THRESHOLD", "2000"))
+# Full rebuild interval; picks up profile edits made by other API workers (0 = never)
+REBUILD_SECONDS = int(os.getenv("SEARCH_INDEX_REBUILD_SECONDS", "900"))
+# Profiles read per keyset page while building
+BUILD_PAGE_SIZE = int(os.getenv("SEARCH_INDEX_BUILD_PAGE", "1000"))
+# Reads are batched with in_() filters of at most this many ids
+_IN_CHUNK = 200
+
+_QUERY_TOKEN_RE = re.compile(r'\(|\)|[+-]?[a-z_]+:"[^"]*"|[+-]?"[^"]*"|[^\s()]+', re.IGNORECASE)
+
+
+class QuerySyntaxError(ValueError):
+    """Raised for malformed search queries (unbalanced parentheses, dangling operators)."""
+    pass
+
+
+# ---------------------------------------------------------
+# DOCUMENTS
+# ---------------------------------------------------------
+def document_terms(fields: Dict[str, Any]) -> Dict[str, float]:
+    """
+    fields: {"skills": [..], "title": str, "bio": str, "resume": str,
+             "experience": [{"position", "company_name", "description"}],
+             "education": [{"degree", "field_of_study", "institution"}]}
+    Returns weighted term frequencies. Plain words feed ranked queries;
+    prefixed terms (skill:, title:, company:, school:) serve field queries.
+    """
+    tf: Dict[str, float] = {}
+
+    def add(terms: Iterable[str], weight: float) -> None:
+        for term in terms:
+            tf[term] = tf.get(term, 0.0) + weight
+
+    for skill in fields.get("skills") or []:
+        name = normalize_skill(skill)
+        if name:
+            add([f"skill:{name}"], 1.0)
+            add(tokenize(name), FIELD_WEIGHTS["skills"])
+
+    title = fields.get("title")
+    add(tokenize(title), FIELD_WEIGHTS["title"])
+    add((f"title:{t}" for t in tokenize(title)), 1.0)
+    add(tokenize(fields.get("bio")), FIELD_WEIGHTS["bio"])
+    add(tokenize(fields.get("resume")), FIELD_WEIGHTS["resume"])
+
+    for exp in fields.get("experience") or []:
+        add(tokenize(exp.get("position")), FIELD_WEIGHTS["experience"])
+        add(tokenize(exp.get("description")), FIELD_WEIGHTS["experience"])
+        add(tokenize(exp.get("company_name")), FIELD_WEIGHTS["experience"])
+        add((f"company:{t}" for t in tokenize(exp.get("company_name"))), 1.0)
+
+    for edu in fields.get("education") or []:
+        for key in ("degree", "field_of_study", "institution"):
+            add(tokenize(edu.get(key)), FIELD_WEIGHTS["education"])
+        add((f"school:{t}" for t in tokenize(edu.get("institution"))), 1.0)
+
+    if len(tf) > MAX_TERMS_PER_DOC:
+        # Prefixed (field) terms are always kept; plain words compete on weight
+        fielded = {t: w for t, w in tf.items() if ":" in t}
+        plain = sorted((t for t in tf if ":" not in t), key=lambda t: -tf[t])
+        room = max(MAX_TERMS_PER_DOC - len(fielded), 0)
+        tf = {**fielded, **{t: tf[t] for t in plain[:room]}}
+    return tf
+
+
+def _doc_length(tf: Dict[str, float]) -> float:
+    return sum(w for t, w in tf.items() if ":" not in t)
+
+
+# ---------------------------------------------------------
+# QUERY PARSING
+# ---------------------------------------------------------
+# Nodes: ("term", str) | ("and", [nodes]) | ("or", [nodes]) | ("not", node)
+#        ("bool", must, should, must_not)
+#
+# Syntax (Lucene-like; juxtaposed clauses are optional and ranked):
+#   python django              either term, ranked by BM25
+#   +python +aws -php          required / excluded terms
+#   python AND (aws OR gcp)    boolean operators (upper case)
+#   skill:"machine learning"   exact skill; also title:, company:, school:
+#   "data engineer"            all words of the phrase
+def parse_query(query: str) -> Any:
+    tokens = _QUERY_TOKEN_RE.findall(query or "")
+    parser = _Parser(tokens)
+    node = parser.parse_bool(top=True)
+    if parser.pos != len(tokens):
+        raise QuerySyntaxError("Unbalanced parentheses")
+    return node
+
+
+class _Parser:
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self) -> str:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse_bool(self, top: bool = False) -> Any:
+        must, should, must_not = [], [], []
+        while self.peek() is not None and self.peek() != ")":
+            token = self.peek()
+            occur = should
+            if token[0] in "+-":
+                occur = must if token[0] == "+" else must_not
+                if len(token) > 1:
+                    self.tokens[self.pos] = token[1:]
+                else:
+                    self.take()  # "+(...)" / "-(...)"
+            node = self.parse_or()
+            if node is not None and node[0] == "not" and occur is should:
+                must_not.append(node[1])  # "python NOT php" excludes php
+            elif node is not None:
+                occur.append(node)
+        if not top and self.peek() is None:
+            raise QuerySyntaxError("Missing closing parenthesis")
+        return ("bool", must, should, must_not)
+
+    def parse_or(self) -> Any:
+        nodes = [self.parse_and()]
+        while self.peek() == "OR":
+            self.take()
+            nodes.append(self.parse_and())
+        nodes = [n for n in nodes if n is not None]
+        if not nodes:
+            return None
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and(self) -> Any:
+        nodes = [self.parse_unary()]
+        while self.peek() == "AND":
+            self.take()
+            nodes.append(self.parse_unary())
+        nodes = [n for n in nodes if n is not None]
+        if not nodes:
+            return None
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_unary(self) -> Any:
+        token = self.peek()
+        if token is None or token == ")":
+            raise QuerySyntaxError("Operator without an operand")
+        if token == "NOT":
+            self.take()
+            inner = self.parse_unary()
+            return ("not", inner) if inner is not None else None
+        if token in ("AND", "OR"):
+            raise QuerySyntaxError(f"Unexpected {token}")
+        self.take()
+        if token == "(":
+            node = self.parse_bool()
+            self.take()  # ")"
+            return node
+        return _atom(token)
+
+
+def _atom(token: str) -> Any:
+    field, _, value = token.partition(":")
+    if value and field.lower() in ("skill", *FIELD_PREFIXES):
+        field = field.lower()
+        value = value.strip('"')
+        if field == "skill":
+            name = normalize_skill(value)
+            return ("term", f"skill:{name}") if name else None
+        terms = [f"{FIELD_PREFIXES[field]}:{t}" for t in tokenize(value)]
+    else:
+        terms = tokenize(token.strip('"'))
+    if not terms:
+        return None  # stopwords only
+    return ("term", terms[0]) if len(terms) == 1 else ("and", [("term", t) for t in terms])
+
+
+def positive_terms(node: Any) -> List[str]:
+    """Terms that contribute to the BM25 score (everything not negated)."""
+    kind = node[0]
+    if kind == "term":
+        return [node[1]]
+    if kind == "not":
+        return []
+    if kind == "bool":
+        return [t for child in node[1] + node[2] for t in positive_terms(child)]
+    return [t for child in node[1] for t in positive_terms(child)]
+
+
+# ---------------------------------------------------------
+# INDEX
+# ---------------------------------------------------------
+class CandidateIndex:
+    """
+    Inverted index over candidate documents.
+
+    Postings live in a compact base segment (CSR arrays: term -> slice of
+    doc slots and weighted tfs) plus a small dict-based delta segment for
+    recent updates. An update retires the document's old slot and gives it
+    a new one, so base postings never need editing; once the delta holds
+    MERGE_THRESHOLD documents both segments are merged and slots compacted.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._slots: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._live_count = 0
+        self._total_length = 0.0
+        # Base segment
+        self._terms: Dict[str, int] = {}
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._docs = np.zeros(0, dtype=np.int32)
+        self._tfs = np.zeros(0, dtype=np.float32)
+        # Delta segment
+        self._delta: Dict[str, Dict[int, float]] = {}
+        self._delta_docs = 0
+        # Per-term (docs, tfs) of live postings; cleared on every write
+        self._cache: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    # ---------------------------------------------------------
+    # WRITES
+    # ---------------------------------------------------------
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[str, Dict[str, float]]]) -> "CandidateIndex":
+        """Bulk build: postings are collected as flat arrays and sorted once."""
+        index = cls()
+        term_index: Dict[str, int] = {}
+        term_ids, docs, tfs = array("i"), array("i"), array("f")
+        for candidate_id, tf in documents:
+            index._retire(candidate_id)
+            slot = index._new_slot(candidate_id, tf)
+            for term, weight in tf.items():
+                term_ids.append(term_index.setdefault(term, len(term_index)))
+                docs.append(slot)
+                tfs.append(weight)
+        index._compact(
+            list(term_index),
+            np.frombuffer(term_ids, dtype=np.int32).astype(np.int64),
+            np.frombuffer(docs, dtype=np.int32).astype(np.int64),
+            np.frombuffer(tfs, dtype=np.float32),
+        )
+        return index
+
+    def upsert(self, candidate_id: str, tf: Dict[str, float]) -> None:
+        with self._lock:
+            self._retire(candidate_id)
+            self._add(candidate_id, tf)
+            if self._delta_docs >= MERGE_THRESHOLD:
+                self._merge()
+
+    def remove(self, candidate_id: str) -> None:
+        with self._lock:
+            self._retire(candidate_id)
+            self._cache.clear()
+
+    def _retire(self, candidate_id: str) -> None:
+        slot = self._slots.pop(candidate_id, None)
+        if slot is not None and self._alive[slot]:
+            self._alive[slot] = False
+            self._live_count -= 1
+            self._total_length -= float(self._lengths[slot])
+
+    def _new_slot(self, candidate_id: str, tf: Dict[str, float]) -> int:
+        slot = len(self._ids)
+        if slot >= len(self._alive):
+            size = max(1024, slot * 2)
+            self._alive = np.resize(self._alive, size)
+            self._alive[slot:] = False
+            self._lengths = np.resize(self._lengths, size)
+        self._ids.append(candidate_id)
+        self._slots[candidate_id] = slot
+        self._alive[slot] = True
+        self._lengths[slot] = length = _doc_length(tf)
+        self._live_count += 1
+        self._total_length += length
+        return slot
+
+    def _add(self, candidate_id: str, tf: Dict[str, float]) -> None:
+        slot = self._new_slot(candidate_id, tf)
+        for term, weight in tf.items():
+            self._delta.setdefault(term, {})[slot] = weight
+        self._delta_docs += 1
+        self._cache.clear()
+
+    def _merge(self) -> None:
+        """Folds the delta into the base arrays, dropping retired slots."""
+        term_list = list(self._terms)
+        terms = dict(self._terms)
+        term_ids = [np.repeat(np.arange(len(term_list), dtype=np.int64), np.diff(self._offsets))]
+        docs = [self._docs.astype(np.int64)]
+        tfs = [self._tfs]
+        for term, postings in self._delta.items():
+            if term not in terms:
+                terms[term] = len(term_list)
+                term_list.append(term)
+            term_ids.append(np.full(len(postings), terms[term], dtype=np.int64))
+            docs.append(np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)))
+            tfs.append(np.fromiter(postings.values(), dtype=np.float32, count=len(postings)))
+        self._compact(term_list, np.concatenate(term_ids), np.concatenate(docs), np.concatenate(tfs))
+
+    def _compact(self, term_list: List[str], term_ids: np.ndarray, docs: np.ndarray, tfs: np.ndarray) -> None:
+        """Rebuilds the base CSR arrays from (term, slot, tf) triples; compacts live slots to 0..n-1."""
+        size = len(self._ids)
+        keep = self._alive[docs]
+        term_ids, docs, tfs = term_ids[keep], docs[keep], tfs[keep]
+
+        live = np.flatnonzero(self._alive[:size])
+        remap = np.full(size, -1, dtype=np.int64)
+        remap[live] = np.arange(len(live))
+        docs = remap[docs]
+
+        order = np.lexsort((docs, term_ids))
+        term_ids, docs, tfs = term_ids[order], docs[order], tfs[order]
+        counts = np.bincount(term_ids, minlength=len(term_list))
+
+        # Drop terms that no longer have postings
+        used = np.flatnonzero(counts)
+        self._terms = {term_list[i]: n for n, i in enumerate(used)}
+        self._offsets = np.concatenate(([0], np.cumsum(counts[used]))).astype(np.int64)
+        self._docs = docs.astype(np.int32)
+        self._tfs = tfs.astype(np.float32)
+
+        self._ids = [self._ids[i] for i in live]
+        self._slots = {cid: n for n, cid in enumerate(self._ids)}
+        self._lengths = self._lengths[live].copy()
+        self._alive = np.ones(len(live), dtype=bool)
+        self._delta = {}
+        self._delta_docs = 0
+        self._cache.clear()
+
+    # ---------------------------------------------------------
+    # READS
+    # ---------------------------------------------------------
+    def _postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        cached = self._cache.get(term)
+        if cached is not None:
+            return cached
+        docs, tfs = [], []
+        index = self._terms.get(term)
+        if index is not None:
+            start, end = self._offsets[index], self._offsets[index + 1]
+            docs.append(self._docs[start:end])
+            tfs.append(self._tfs[start:end])
+        delta = self._delta.get(term)
+        if delta:
+            docs.append(np.fromiter(delta.keys(), dtype=np.int32, count=len(delta)))
+            tfs.append(np.fromiter(delta.values(), dtype=np.float32, count=len(delta)))
+        if docs:
+            d, t = np.concatenate(docs), np.concatenate(tfs)
+            keep = self._alive[d]
+            result = (d[keep], t[keep])
+        else:
+            result = (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32))
+        self._cache[term] = result
+        return result
+
+    def _mask(self, node: Any) -> np.ndarray:
+        size = len(self._ids)
+        kind = node[0]
+        if kind == "term":
+            mask = np.zeros(size, dtype=bool)
+            mask[self._postings(node[1])[0]] = True
+            return mask
+        if kind == "not":
+            return self._alive[:size] & ~self._mask(node[1])
+        if kind == "and":
+            mask = self._mask(node[1][0])
+            for child in node[1][1:]:
+                mask &= self._mask(child)
+            return mask
+        if kind == "or":
+            mask = np.zeros(size, dtype=bool)
+            for child in node[1]:
+                mask |= self._mask(child)
+            return mask
+
+        _, must, should, must_not = node
+        if must:
+            mask = self._mask(("and", must))
+        elif should:
+            mask = self._mask(("or", should))
+        else:
+            mask = self._alive[:size].copy()
+        for child in must_not:
+            mask &= ~self._mask(child)
+        return mask
+
+    def _bm25(self, terms: List[str]) -> np.ndarray:
+        size = len(self._ids)
+        scores = np.zeros(size, dtype=np.float32)
+        if not self._live_count:
+            return scores
+        avgdl = max(self._total_length / self._live_count, 1.0)
+        norm = K1 * (1 - B + B * self._lengths[:size] / avgdl)
+        for term in dict.fromkeys(terms):
+            docs, tfs = self._postings(term)
+            if not len(docs):
+                continue
+            df = len(docs)
+            idf = math.log(1 + (self._live_count - df + 0.5) / (df + 0.5))
+            scores[docs] += idf * tfs * (K1 + 1) / (tfs + norm[docs])
+        return scores
+
+    def with_any(self, terms: Iterable[str]) -> List[str]:
+        """Candidate ids whose document has at least one of `terms` (e.g. skill:python)."""
+        with self._lock:
+            mask = np.zeros(len(self._ids), dtype=bool)
+            for term in dict.fromkeys(terms):
+                mask[self._postings(term)[0]] = True
+            return [self._ids[slot] for slot in np.flatnonzero(mask)]
+
+    def search(self, query: Any, limit: int = 20, offset: int = 0) -> Tuple[int, List[Tuple[str, float]]]:
+        """query: a string or a parsed node. Returns (total matches, [(candidate_id, score)])."""
+        node = parse_query(query) if isinstance(query, str) else query
+        with self._lock:
+            if not node[1] and not node[2]:
+                return 0, []  # only exclusions (or nothing): not a search
+            mask = self._mask(node)
+            matches = np.flatnonzero(mask)
+            total = len(matches)
+            if not total:
+                return 0, []
+
+            scores = self._bm25(positive_terms(node))[matches]
+            wanted = min(offset + limit, total)
+            if wanted < total:
+                top = np.argpartition(-scores, wanted - 1)[:wanted]
+            else:
+                top = np.arange(total)
+            # Highest score first; ties in slot order keep pages stable
+            top = top[np.lexsort((matches[top], -scores[top]))][offset:wanted]
+            return total, [(self._ids[matches[i]], round(float(scores[i]), 4)) for i in top]
+
+
+# ---------------------------------------------------------
+# SERVICE
+# ---------------------------------------------------------
+class CandidateSearchService:
+    """
+    Keeps a per-process CandidateIndex over candidate profiles, skills,
+    experience, education and extracted resume text. Built lazily on the
+    first search, updated per candidate on profile saves and rebuilt every
+    REBUILD_SECONDS in the background.
+    """
+
+    def __init__(self, client: Optional[Client] = None):
+        self.supabase = client or get_client()
+        self._index: Optional[CandidateIndex] = None
+        self._built_at = 0.0
+        self._build_lock = threading.Lock()
+        self._rebuilding = False
+        # Candidates refreshed while a background rebuild was reading the database
+        self._dirty: set = set()
+
+    # ---------------------------------------------------------
+    # INDEX LIFECYCLE
+    # ---------------------------------------------------------
+    def index(self) -> CandidateIndex:
+        if self._index is None:
+            with self._build_lock:
+                if self._index is None:
+                    self._index = self._build()
+                    self._built_at = time.monotonic()
+        elif REBUILD_SECONDS and time.monotonic() - self._built_at > REBUILD_SECONDS:
+            self.rebuild_in_background()
+        return self._index
+
+    def rebuild_in_background(self) -> None:
+        with self._build_lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+            self._built_at = time.monotonic()
+        threading.Thread(target=self._rebuild, name="candidate-search-rebuild", daemon=True).start()
+
+    def _rebuild(self) -> None:
+        try:
+            index = self._build()
+            with self._build_lock:
+                self._index = index
+                self._built_at = time.monotonic()
+                dirty, self._dirty = self._dirty, set()
+            for candidate_id in dirty:
+                self.refresh(candidate_id)
+        except Exception as e:
+            logger.error(f"Candidate index rebuild failed: {str(e)}")
+        finally:
+            self._rebuilding = False
+
+    def _build(self) -> CandidateIndex:
+        started = time.perf_counter()
+        index = CandidateIndex.build(self._all_documents())
+        logger.info(
+            f"Candidate index built: {len(index)} profiles in {time.perf_counter() - started:.1f}s"
+        )
+        return index
+
+    def _all_documents(self) -> Iterable[Tuple[str, Dict[str, float]]]:
+        last_id = None
+        while True:
+            query = self.supabase.table("candidate_profiles").select("id, user_id, title, bio, resume_text")
+            if last_id:
+                query = query.gt("id", last_id)
+            page = query.order("id").limit(BUILD_PAGE_SIZE).execute().data or []
+            if not page:
+                return
+            yield from self._documents(page)
+            if len(page) < BUILD_PAGE_SIZE:
+                return
+            last_id = page[-1]["id"]
+
+    def _documents(self, profiles: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, float]]]:
+        """
+        Skills/experience/education reference candidate_profiles.id; rows
+        written with the user id by older code are picked up as well.
+        """
+        fields: Dict[str, Dict[str, Any]] = {}
+        owner: Dict[str, str] = {}
+        for profile in profiles:
+            uid = profile.get("user_id")
+            if not uid:
+                continue
+            owner[profile["id"]] = owner[uid] = uid
+            fields[uid] = {
+                "title": profile.get("title"),
+                "bio": profile.get("bio"),
+                "resume": profile.get("resume_text"),
+                "skills": [],
+                "experience": [],
+                "education": [],
+            }
+
+        related = (
+            ("candidate_skills", "candidate_id, skill_name", "skills"),
+            ("candidate_experience", "candidate_id, position, company_name, description", "experience"),
+            ("candidate_education", "candidate_id, degree, field_of_study, institution", "education"),
+        )
+        owner_ids = list(owner)
+        for start in range(0, len(owner_ids), _IN_CHUNK):
+            ids = owner_ids[start:start + _IN_CHUNK]
+            for table, columns, key in related:
+                rows = self.supabase.table(table).select(columns).in_("candidate_id", ids).execute().data or []
+                for row in rows:
+                    value = row["skill_name"] if key == "skills" else row
+                    fields[owner[row["candidate_id"]]][key].append(value)
+
+        return [(uid, document_terms(doc)) for uid, doc in fields.items()]
+
+    # ---------------------------------------------------------
+    # INCREMENTAL UPDATES (after profile saves / resume extraction)
+    # ---------------------------------------------------------
+    def refresh(self, candidate_id: str) -> None:
+        """Re-indexes one candidate (users.id). Never raises; runs as a BackgroundTask."""
+        if self._rebuilding:
+            self._dirty.add(candidate_id)
+        index = self._index
+        if index is None:
+            return  # the first search builds from current data
+        try:
+            res = (
+                self.supabase.table("candidate_profiles")
+                .select("id, user_id, title, bio, resume_text")
+                .eq("user_id", candidate_id)
+                .maybe_single()
+                .execute()
+            )
+            profile = res.data if res else None
+            if not profile:
+                index.remove(candidate_id)
+                return
+            for uid, tf in self._documents([profile]):
+                index.upsert(uid, tf)
+        except Exception as e:
+            logger.error(f"Candidate index refresh failed: {str(e)}", extra={"candidate_id": candidate_id})
+
+    # ---------------------------------------------------------
+    # SEARCH
+    # ---------------------------------------------------------
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """Raises QuerySyntaxError for malformed queries."""
+        node = parse_query(query)
+        started = time.perf_counter()
+        total, hits = self.index().search(node, limit=limit, offset=offset)
+        took_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        try:
+            results = self._hydrate(hits)
+        except Exception as e:
+            logger.error(f"Candidate search hydration failed: {str(e)}")
+            raise RuntimeError("Failed to search candidates")
+        return {"total": total, "results": results, "took_ms": took_ms}
+
+    def _hydrate(self, hits: List[Tuple[str, float]]) -> List[Dict[str, Any]]:
+        ids = [candidate_id for candidate_id, _ in hits]
+        if not ids:
+            return []
+        users = self.supabase.table("users").select("id, full_name, location").in_("id", ids).execute().data or []
+        profiles = (
+            self.supabase.table("candidate_profiles")
+            .select("id, user_id, title, experience_years")
+            .in_("user_id", ids)
+            .execute()
+        ).data or []
+        owner = {uid: uid for uid in ids}
+        owner.update({p["id"]: p["user_id"] for p in profiles})
+        skills = (
+            self.supabase.table("candidate_skills")
+            .select("candidate_id, skill_name")
+            .in_("candidate_id", list(owner))
+            .execute()
+        ).data or []
+
+        user_map = {u["id"]: u for u in users}
+        profile_map = {p["user_id"]: p for p in profiles}
+        skill_map: Dict[str, List[str]] = {}
+        for row in skills:
+            skill_map.setdefault(owner[row["candidate_id"]], []).append(row["skill_name"])
+
+        results = []
+        for candidate_id, score in hits:
+            user = user_map.get(candidate_id, {})
+            profile = profile_map.get(candidate_id, {})
+            results.append({
+                "candidate_id": candidate_id,
+                "score": score,
+                "full_name": user.get("full_name"),
+                "location": user.get("location"),
+                "title": profile.get("title"),
+                "experience_years": profile.get("experience_years"),
+                "skills": skill_map.get(candidate_id, []),
+            })
+        return results
+
+
+candidate_search = CandidateSearchService()
@@ -1,6 +1,7 @@
 import os
 from supabase import create_client, Client
 from utils_others.logger import logger
+from services.instrumented_client import InstrumentedClient
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -12,12 +13,23 @@ def get_client() -> Client:
     Returns a singleton Supabase client.
     Ensures credentials exist and logs failures clearly.
     Safe for use across all services.
+    The client is wrapped in InstrumentedClient so every query,
+    storage call and RPC is traced.
+    Set SUPABASE_BACKEND=memory to use the in-memory stand-in instead.
     """
     global _supabase_client
 
     if _supabase_client is not None:
         return _supabase_client
 
+    # Offline mode: in-memory stand-in for tests, benchmarks and load tests
+    if os.getenv("SUPABASE_BACKEND", "").lower() == "memory":
+        from services.fake_supabase_client import create_fake_client_from_env
+
+        _supabase_client = InstrumentedClient(create_fake_client_from_env())
+        logger.info("Using in-memory Supabase stand-in (SUPABASE_BACKEND=memory)")
+        return _supabase_client
+
     supabase_url = os.getenv("SUPABASE_URL")
     supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
@@ -41,7 +53,7 @@ def get_client() -> Client:
         except Exception:
             pass  # ignore — not all clients have a session
 
-        _supabase_client = client
+        _supabase_client = InstrumentedClient(client)
         logger.info("Supabase client initialized successfully")
 
         return _supabase_client
@@ -0,0 +1,234 @@
+"""
+Per-user unread notification counts for badges (GET /notification/unread-count).
+
+Counts are loaded once with a head count over idx_notifications_user
+(user_id, is_read) and then kept current by NotificationService: +n on
+create, -1 when a notification is marked read, 0 on mark-all-read. A count loaded
+while the user's count changed is not stored, and a mark-all-read raced
+by a new notification drops the entry so the next read recounts. Each
+entry is reconciled against the table again after UNREAD_RECONCILE_SECONDS,
+which bounds drift from writes that bypass the service (SQL, other workers
+with the in-process backend).
+
+UNREAD_COUNTER_BACKEND=redis keeps the counts in Redis so all workers share
+them; it defaults to the notification broker backend.
+"""
+
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from services.notification_broker import BROKER_BACKEND, REDIS_URL
+from utils_others.logger import logger
+
+COUNTER_BACKEND = os.getenv("UNREAD_COUNTER_BACKEND", BROKER_BACKEND).lower()
+RECONCILE_SECONDS = float(os.getenv("UNREAD_RECONCILE_SECONDS", "300"))
+COUNTER_MAX_USERS = int(os.getenv("UNREAD_COUNTER_MAX_USERS", "100000"))
+REDIS_KEY_PREFIX = "notifications:unread:"
+# Bumped by every write to a count; must outlive the slowest load
+REDIS_GENERATION_PREFIX = "notifications:unread:gen:"
+REDIS_GENERATION_TTL = 86400
+
+Loader = Callable[[str], int]
+
+
+# ---------------------------------------------------------
+# IN-PROCESS
+# ---------------------------------------------------------
+class UnreadCounter:
+    def __init__(self, reconcile_seconds: float = RECONCILE_SECONDS, max_users: int = COUNTER_MAX_USERS):
+        self.reconcile_seconds = reconcile_seconds
+        self.max_users = max_users
+        # user_id -> (count, reconcile at)
+        self._counts: Dict[str, Tuple[int, float]] = {}
+        # user_id -> [loads/writes in flight, generation]; any change while
+        # one runs bumps the generation and its count is not stored
+        self._loading: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, loader: Loader) -> int:
+        """Cached count; `loader` (outside the lock) on a miss or when reconciliation is due."""
+        entry = self._counts.get(user_id)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        return self._guarded(user_id, lambda: loader(user_id))
+
+    def set_after(self, user_id: str, count: int, write: Callable[[], Any]) -> Any:
+        """Runs `write` (outside the lock), then stores `count` unless the count changed meanwhile."""
+        return self._guarded(user_id, write, count)
+
+    def _guarded(self, user_id: str, work: Callable[[], Any], count: Optional[int] = None) -> Any:
+        with self._lock:
+            loading = self._loading.setdefault(user_id, [0, 0])
+            loading[0] += 1
+            generation = loading[1]
+        try:
+            result = work()
+            with self._lock:
+                if loading[1] == generation:
+                    self._store(user_id, result if count is None else count)
+                elif count is not None:
+                    # A write raced ours, so neither count is known; recount next time
+                    self._counts.pop(user_id, None)
+                if count is not None:
+                    # Loads that started before the write may have read the old rows
+                    self._changed(user_id)
+            return result
+        finally:
+            with self._lock:
+                loading[0] -= 1
+                if not loading[0]:
+                    del self._loading[user_id]
+
+    def _store(self, user_id: str, count: int) -> None:
+        if user_id not in self._counts and len(self._counts) >= self.max_users:
+            self._evict_expired()
+        self._counts[user_id] = (max(count, 0), time.monotonic() + self.reconcile_seconds)
+
+    def _changed(self, user_id: str) -> None:
+        if user_id in self._loading:
+            self._loading[user_id][1] += 1
+
+    def incr(self, user_id: str, amount: int = 1) -> None:
+        # Unknown users stay unknown: the next read loads the exact count
+        with self._lock:
+            entry = self._counts.get(user_id)
+            if entry is not None:
+                self._counts[user_id] = (max(entry[0] + amount, 0), entry[1])
+            self._changed(user_id)
+
+    def decr(self, user_id: str, amount: int = 1) -> None:
+        self.incr(user_id, -amount)
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._counts.pop(user_id, None)
+            self._changed(user_id)
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        expired = [uid for uid, (_, due) in self._counts.items() if due <= now]
+        for uid in expired:
+            del self._counts[uid]
+        if len(self._counts) >= self.max_users:
+            # Still full: drop the entries closest to reconciliation
+            for uid, _ in sorted(self._counts.items(), key=lambda kv: kv[1][1])[: max(len(self._counts) // 10, 1)]:
+                del self._counts[uid]
+
+
+# ---------------------------------------------------------
+# REDIS (shared by all workers)
+# ---------------------------------------------------------
+# Adjusts a count only when it is already cached, never below zero
+_INCR_IF_EXISTS = """
+if redis.call('exists', KEYS[1]) == 1 then
+    local value = redis.call('incrby', KEYS[1], ARGV[1])
+    if value < 0 then redis.call('set', KEYS[1], 0, 'keepttl') end
+end
+redis.call('incr', KEYS[2])
+redis.call('expire', KEYS[2], ARGV[2])
+return 0
+"""
+
+# Stores a count only if no write happened since the generation was read;
+# ARGV[4] == '1' marks the store itself as a write (dropped when raced)
+_SET_IF_GENERATION = """
+if (redis.call('get', KEYS[2]) or '0') == ARGV[1] then
+    redis.call('set', KEYS[1], ARGV[2], 'ex', ARGV[3])
+elseif ARGV[4] == '1' then
+    redis.call('del', KEYS[1])
+end
+if ARGV[4] == '1' then
+    redis.call('incr', KEYS[2])
+    redis.call('expire', KEYS[2], ARGV[5])
+end
+return 0
+"""
+
+
+class RedisUnreadCounter:
+    def __init__(self, url: str = REDIS_URL, reconcile_seconds: float = RECONCILE_SECONDS):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("UNREAD_COUNTER_BACKEND=redis requires the redis package (pip install redis)")
+        self.reconcile_seconds = reconcile_seconds
+        self._redis = redis.Redis.from_url(url)
+        self._incr = self._redis.register_script(_INCR_IF_EXISTS)
+        self._set_if_generation = self._redis.register_script(_SET_IF_GENERATION)
+
+    def _key(self, user_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}{user_id}"
+
+    def _generation_key(self, user_id: str) -> str:
+        return f"{REDIS_GENERATION_PREFIX}{user_id}"
+
+    def get(self, user_id: str, loader: Loader) -> int:
+        try:
+            value, generation = self._redis.mget(self._key(user_id), self._generation_key(user_id))
+        except Exception as e:
+            logger.error(f"Unread counter read failed: {str(e)}", extra={"user_id": user_id})
+            return loader(user_id)
+        if value is not None:
+            return int(value)
+        count = loader(user_id)
+        self._store(user_id, count, generation, write=False)
+        return count
+
+    def set_after(self, user_id: str, count: int, write: Callable[[], Any]) -> Any:
+        try:
+            generation = self._redis.get(self._generation_key(user_id))
+        except Exception as e:
+            logger.error(f"Unread counter read failed: {str(e)}", extra={"user_id": user_id})
+            result = write()
+            self.invalidate(user_id)
+            return result
+        result = write()
+        self._store(user_id, count, generation, write=True)
+        return result
+
+    def _store(self, user_id: str, count: int, generation: Optional[bytes], write: bool) -> None:
+        try:
+            # Expiry is the reconciliation schedule
+            self._set_if_generation(
+                keys=[self._key(user_id), self._generation_key(user_id)],
+                args=[
+                    (generation or b"0").decode(),
+                    max(count, 0),
+                    max(int(self.reconcile_seconds), 1),
+                    "1" if write else "0",
+                    REDIS_GENERATION_TTL,
+                ],
+            )
+        except Exception as e:
+            logger.error(f"Unread counter write failed: {str(e)}", extra={"user_id": user_id})
+
+    def incr(self, user_id: str, amount: int = 1) -> None:
+        try:
+            self._incr(keys=[self._key(user_id), self._generation_key(user_id)], args=[amount, REDIS_GENERATION_TTL])
+        except Exception as e:
+            logger.error(f"Unread counter update failed: {str(e)}", extra={"user_id": user_id})
+            self.invalidate(user_id)
+
+    def decr(self, user_id: str, amount: int = 1) -> None:
+        self.incr(user_id, -amount)
+
+    def invalidate(self, user_id: str) -> None:
+        try:
+            pipe = self._redis.pipeline()
+            pipe.delete(self._key(user_id))
+            pipe.incr(self._generation_key(user_id))
+            pipe.expire(self._generation_key(user_id), REDIS_GENERATION_TTL)
+            pipe.execute()
+        except Exception:
+            pass
+
+
+def create_counter():
+    if COUNTER_BACKEND == "redis":
+        return RedisUnreadCounter()
+    return UnreadCounter()
+
+
+unread_counter = create_counter()
@@ -0,0 +1,27 @@
+"""
+Tests run against the in-memory Supabase stand-in; the backend must be
+selected before any service module creates its client.
+"""
+
+import os
+
+os.environ["SUPABASE_BACKEND"] = "memory"
+
+import pytest  # noqa: E402
+
+from services.fake_supabase_client import create_fake_client  # noqa: E402
+
+
+@pytest.fixture
+def fake():
+    return create_fake_client()
+
+
+@pytest.fixture
+def recruiter(fake):
+    return fake.seed("users", [{"email": "recruiter@example.com", "role": "recruiter", "full_name": "Rita Recruiter"}])[0]
+
+
+@pytest.fixture
+def job(fake, recruiter):
+    return fake.seed("jobs", [{"title": "Backend Engineer", "created_by": recruiter["id"], "status": "active"}])[0]
@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+import services.analytics_ingest as ingest
+from services.analytics_ingest import AnalyticsBuffer, BufferClosed, BufferFull
+from services.analytics_service import AnalyticsService
+
+
+def _events(user_id, n, event_type="job_view"):
+    return [AnalyticsService.event_row({"user_id": user_id, "event_type": event_type}) for _ in range(n)]
+
+
+@pytest.fixture
+def buffer(fake):
+    buf = AnalyticsBuffer(AnalyticsService(fake), batch_size=4, flush_seconds=60, max_events=10)
+    yield buf
+    buf.close(timeout=1)
+
+
+def test_flush_writes_events_in_one_insert(fake, buffer, recruiter):
+    assert buffer.offer(_events(recruiter["id"], 3)) == 3
+    fake.db.reset_counters()
+    buffer.flush()
+
+    assert len(fake.db.tables["analytics_events"]) == 3
+    assert fake.db.calls_by_table.get("analytics_events") == 1
+    assert buffer.stats()["buffered"] == 0
+    assert buffer.stats()["written"] == 3
+
+
+def test_full_batch_is_written_in_the_background(fake, buffer, recruiter):
+    buffer.offer(_events(recruiter["id"], 4))
+    deadline = time.monotonic() + 5
+    while buffer.written < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert buffer.written == 4
+    assert len(fake.db.tables["analytics_events"]) == 4
+
+
+def test_offers_beyond_capacity_are_rejected_whole(fake, buffer, recruiter):
+    buffer.batch_size = 100  # keep the flush thread idle
+    buffer.offer(_events(recruiter["id"], 3))
+    buffer.offer(_events(recruiter["id"], 3))
+    with pytest.raises(BufferFull):
+        buffer.offer(_events(recruiter["id"], 5))
+    stats = buffer.stats()
+    assert (stats["accepted"], stats["rejected"]) == (6, 5)
+
+    buffer.flush()
+    assert len(fake.db.tables["analytics_events"]) == 6
+    buffer.offer(_events(recruiter["id"], 5))  # room again once written
+
+
+def test_close_writes_the_rest_and_refuses_new_events(fake, buffer, recruiter):
+    buffer.offer(_events(recruiter["id"], 2))
+    buffer.close(timeout=5)
+    assert len(fake.db.tables["analytics_events"]) == 2
+    with pytest.raises(BufferClosed):
+        buffer.offer(_events(recruiter["id"], 1))
+
+
+def test_batch_is_dropped_after_the_last_attempt(monkeypatch, recruiter):
+    class FailingService:
+        def create_events(self, rows):
+            raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(ingest, "MAX_ATTEMPTS", 1)
+    buf = AnalyticsBuffer(FailingService(), batch_size=4, flush_seconds=60, max_events=10)
+    buf.offer(_events(recruiter["id"], 3))
+    buf.flush()
+    stats = buf.stats()
+    assert (stats["written"], stats["dropped"], stats["failed_flushes"], stats["buffered"]) == (0, 3, 1, 0)
+    buf.close(timeout=1)
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import services.analytics_rollups as analytics_rollups
+from services.analytics_ingest import AnalyticsBuffer
+from services.analytics_rollups import NIL_JOB_ID, RollupService, _hour_ranges, aggregate
+from services.analytics_service import AnalyticsService
+
+START = datetime(2026, 3, 1, tzinfo=timezone.utc)
+JOB_ID = "3f2b8c1e-7d4a-4e59-9b61-0c2d8e4f5a17"
+
+
+def _event(user_id, created_at, event_type="job_view", job_id=None):
+    return {
+        "user_id": user_id,
+        "event_type": event_type,
+        "event_data": {"job_id": job_id} if job_id else {},
+        "created_at": created_at.isoformat(),
+    }
+
+
+# ---------------------------------------------------------
+# AGGREGATION
+# ---------------------------------------------------------
+def test_aggregate_counts_per_hour_user_type_and_job():
+    counts = aggregate([
+        _event("u1", START + timedelta(minutes=5), job_id=JOB_ID),
+        _event("u1", START + timedelta(minutes=50), job_id=JOB_ID),
+        _event("u1", START + timedelta(hours=1, minutes=1), job_id=JOB_ID),
+        _event("u1", START, job_id="not-a-uuid"),
+        _event(None, START),
+    ])
+    assert sorted((c["bucket"], c["job_id"], c["count"]) for c in counts) == [
+        (START.isoformat(), NIL_JOB_ID, 1),
+        (START.isoformat(), JOB_ID, 2),
+        ((START + timedelta(hours=1)).isoformat(), JOB_ID, 1),
+    ]
+
+
+def test_hour_ranges_cover_the_window_in_chunks():
+    ranges = list(_hour_ranges(START + timedelta(minutes=30), START + timedelta(hours=5), 2))
+    assert ranges == [
+        (START, START + timedelta(hours=2)),
+        (START + timedelta(hours=2), START + timedelta(hours=4)),
+        (START + timedelta(hours=4), START + timedelta(hours=5)),
+    ]
+
+
+# ---------------------------------------------------------
+# TIME SERIES
+# ---------------------------------------------------------
+@pytest.fixture
+def rollups(fake):
+    return RollupService(fake)
+
+
+def test_increments_feed_a_zero_filled_series(rollups):
+    rollups.increment([_event("u1", START + timedelta(minutes=m)) for m in (1, 2)])
+    rollups.increment([_event("u1", START + timedelta(hours=2)), _event("u2", START, event_type="search")])
+
+    hourly = rollups.timeseries("hour", START, START + timedelta(hours=3), user_id="u1", event_types=["job_view", "apply"])
+    assert len(hourly["buckets"]) == 3
+    assert hourly["series"] == {"job_view": [2, 0, 1], "apply": [0, 0, 0]}
+    assert hourly["totals"] == {"job_view": 3, "apply": 0}
+
+    daily = rollups.timeseries("day", START + timedelta(hours=6), START + timedelta(days=2))
+    assert daily["start"] == START.isoformat()
+    assert daily["series"] == {"job_view": [3, 0], "search": [1, 0]}
+
+
+def test_series_can_be_filtered_by_job(rollups):
+    rollups.increment([_event("u1", START, job_id=JOB_ID), _event("u1", START)])
+    series = rollups.timeseries("hour", START, START + timedelta(hours=1), job_id=JOB_ID)
+    assert series["totals"] == {"job_view": 1}
+
+
+def test_invalid_ranges_are_rejected(rollups, monkeypatch):
+    with pytest.raises(ValueError, match="interval"):
+        rollups.timeseries("minute", START, START + timedelta(hours=1))
+    with pytest.raises(ValueError, match="after start"):
+        rollups.timeseries("hour", START, START)
+    monkeypatch.setattr(analytics_rollups, "TIMESERIES_MAX_BUCKETS", 24)
+    with pytest.raises(ValueError, match="limit is 24"):
+        rollups.timeseries("hour", START, START + timedelta(hours=25))
+
+
+# ---------------------------------------------------------
+# COMPACTION
+# ---------------------------------------------------------
+def test_compact_rebuilds_the_range_from_raw_events(fake, rollups):
+    fake.seed("analytics_events", [_event("u1", START + timedelta(minutes=m)) for m in (1, 2, 3)])
+    # Drifted counts, e.g. an increment applied twice
+    rollups.increment([_event("u1", START)] * 5)
+
+    assert rollups.compact(START, START + timedelta(hours=1)) == {"hourly_rows": 1, "daily_rows": 1}
+    assert rollups.timeseries("hour", START, START + timedelta(hours=1))["totals"] == {"job_view": 3}
+    assert rollups.timeseries("day", START, START + timedelta(days=1))["totals"] == {"job_view": 3}
+
+
+def test_failed_increment_is_repaired_by_compaction(fake, rollups, monkeypatch):
+    def failing(rows):
+        raise RuntimeError("rollup write timed out")
+
+    monkeypatch.setattr(rollups, "increment", failing)
+    buffer = AnalyticsBuffer(AnalyticsService(fake), rollups, batch_size=100, flush_seconds=60, max_events=100)
+    now = datetime.now(timezone.utc)
+    buffer.offer([AnalyticsService.event_row({"user_id": "u1", "event_type": "job_view"}) for _ in range(2)])
+    # The events are written; the flush cycle then rebuilds the hour it could not increment
+    buffer.flush()
+
+    assert buffer.stats()["rollups_stale_from"] is None
+    series = rollups.timeseries("hour", now - timedelta(hours=1), now + timedelta(hours=1), user_id="u1")
+    assert series["totals"] == {"job_view": 2}
+    buffer.close(timeout=1)
@@ -0,0 +1,86 @@
+import pytest
+
+import services.applicant_service as applicant_service
+from services.applicant_service import ApplicantService, ApplicationRejected, applied_jobs_cache
+from services.fake_supabase_client import BUILTIN_RPCS, FakeAPIError
+
+
+@pytest.fixture
+def candidate(fake):
+    return fake.seed("users", [{"email": "candidate@example.com", "role": "candidate"}])[0]
+
+
+@pytest.fixture
+def svc(fake, monkeypatch):
+    monkeypatch.setattr(applicant_service.funnel_worker, "job_changed", lambda job_id: None)
+    return ApplicantService(fake)
+
+
+def _submit(svc, job, candidate, key=None):
+    return svc.submit_application({"job_id": job["id"], "candidate_id": candidate["id"]}, idempotency_key=key)
+
+
+def test_submit_creates_once_and_replays_with_the_same_key(fake, svc, job, candidate):
+    first = _submit(svc, job, candidate, key="k1")
+    again = _submit(svc, job, candidate, key="k1")
+
+    assert first["created"] is True and again["created"] is False
+    assert again["application"]["id"] == first["application"]["id"]
+    assert len(fake.db.tables["job_applications"]) == 1
+
+
+@pytest.mark.parametrize("key", [None, "other"])
+def test_second_application_to_a_job_is_a_duplicate(svc, job, candidate, key):
+    _submit(svc, job, candidate, key="k1")
+    with pytest.raises(ApplicationRejected) as exc:
+        _submit(svc, job, candidate, key=key)
+    assert exc.value.status_code == 409
+
+
+def test_key_reused_for_another_job_is_rejected(fake, svc, recruiter, job, candidate):
+    other = fake.seed("jobs", [{"title": "Other", "created_by": recruiter["id"], "status": "active"}])[0]
+    _submit(svc, job, candidate, key="k1")
+    with pytest.raises(ApplicationRejected) as exc:
+        _submit(svc, other, candidate, key="k1")
+    assert exc.value.status_code == 422
+
+
+def test_inactive_job_is_rejected(svc, job, candidate):
+    job["status"] = "closed"
+    with pytest.raises(ApplicationRejected) as exc:
+        _submit(svc, job, candidate)
+    assert exc.value.status_code == 400
+
+
+def test_concurrent_key_reuse_is_a_conflict(fake, svc, recruiter, job, candidate):
+    other = fake.seed("jobs", [{"title": "Other", "created_by": recruiter["id"], "status": "active"}])[0]
+
+    def racing_submit(db, params):
+        # Another request with the same key inserted after this one's key lookup
+        if not db.tables.get("job_applications"):
+            BUILTIN_RPCS["submit_job_application"](db, {**params, "p_job_id": other["id"]})
+            raise FakeAPIError(
+                'duplicate key value violates unique constraint "idx_job_applications_idempotency"', code="23505"
+            )
+        return BUILTIN_RPCS["submit_job_application"](db, params)
+
+    fake.db.register_rpc("submit_job_application", racing_submit)
+    with pytest.raises(ApplicationRejected) as exc:
+        _submit(svc, job, candidate, key="k1")
+    assert exc.value.status_code == 409
+
+
+def test_other_database_errors_still_fail(fake, svc, job, candidate):
+    def broken(db, params):
+        raise FakeAPIError("connection reset", code="08006")
+
+    fake.db.register_rpc("submit_job_application", broken)
+    with pytest.raises(RuntimeError) as exc:
+        _submit(svc, job, candidate, key="k1")
+    assert not isinstance(exc.value, ApplicationRejected)
+
+
+def test_submit_clears_the_applied_jobs_cache(svc, job, candidate):
+    applied_jobs_cache.set(candidate["id"], frozenset())
+    _submit(svc, job, candidate)
+    assert applied_jobs_cache.get(candidate["id"]) is None
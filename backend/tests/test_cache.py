@@ -0,0 +1,78 @@
+import threading
+
+from services.applicant_service import ApplicantService, applied_jobs_cache
+from utils_others.cache import TTLCache
+
+
+def _racing_load(load, change):
+    """Runs `load(loader)` on a thread and calls `change()` while its loader is running."""
+    started, resume = threading.Event(), threading.Event()
+    result = {}
+
+    def loader(*_):
+        started.set()
+        resume.wait(5)
+        return "stale"
+
+    thread = threading.Thread(target=lambda: result.setdefault("value", load(loader)))
+    thread.start()
+    started.wait(5)
+    change()
+    resume.set()
+    thread.join(5)
+    return result["value"]
+
+
+def test_get_or_load_caches_and_counts():
+    cache = TTLCache(ttl=60)
+    calls = []
+    assert cache.get_or_load("k", lambda: calls.append(1) or "v") == "v"
+    assert cache.get_or_load("k", lambda: calls.append(1) or "other") == "v"
+    assert len(calls) == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_load_racing_invalidate_is_not_cached():
+    cache = TTLCache(ttl=60)
+    assert _racing_load(lambda loader: cache.get_or_load("k", loader), lambda: cache.invalidate("k")) == "stale"
+    assert cache.get("k") is None
+    assert cache.get_or_load("k", lambda: "fresh") == "fresh"
+    assert cache.get("k") == "fresh"
+    assert not cache._loading
+
+
+def test_load_racing_clear_is_not_cached():
+    cache = TTLCache(ttl=60)
+    _racing_load(lambda loader: cache.get_or_load("k", loader), cache.clear)
+    assert cache.get("k") is None
+
+
+def test_invalidating_another_key_does_not_block_caching():
+    cache = TTLCache(ttl=60)
+    _racing_load(lambda loader: cache.get_or_load("k", loader), lambda: cache.invalidate("other"))
+    assert cache.get("k") == "stale"
+
+
+def test_expired_and_evicted_entries():
+    cache = TTLCache(ttl=-1)
+    cache.set("k", 1)
+    assert cache.get("k", "missing") == "missing"
+
+    cache = TTLCache(ttl=60, maxsize=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.get("a") is None and cache.get("c") == "c"
+
+
+def test_applied_job_ids_are_loaded_once_per_candidate(fake, job):
+    candidate = fake.seed("users", [{"email": "candidate@example.com", "role": "candidate"}])[0]
+    fake.seed("job_applications", [{"job_id": job["id"], "candidate_id": candidate["id"]}])
+    applied_jobs_cache.invalidate(candidate["id"])
+    svc = ApplicantService(fake)
+    fake.db.reset_counters()
+
+    assert svc.get_applied_job_ids(candidate["id"]) == {job["id"]}
+    assert svc.check_application_status(candidate["id"], job["id"])
+    assert not svc.check_application_status(candidate["id"], "other")
+    assert fake.db.call_count == 1
+    applied_jobs_cache.invalidate(candidate["id"])
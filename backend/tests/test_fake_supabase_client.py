@@ -0,0 +1,95 @@
+import pytest
+
+from services.fake_supabase_client import FakeAPIError
+
+
+@pytest.fixture
+def applications(fake, job):
+    candidates = fake.seed("users", [
+        {"email": f"c{i}@example.com", "role": "candidate", "full_name": f"Candidate {i}"} for i in range(4)
+    ])
+    return fake.seed("job_applications", [
+        {"job_id": job["id"], "candidate_id": c["id"], "status": status, "ai_score": score}
+        for c, status, score in zip(candidates, ["submitted", "under_review", "rejected", "hired"], [10, 55, None, 90])
+    ])
+
+
+def _ids(res):
+    return sorted(row["id"] for row in res.data)
+
+
+def test_comparison_and_null_filters(fake, applications):
+    table = lambda: fake.table("job_applications").select("id, ai_score")  # noqa: E731
+    assert _ids(table().gte("ai_score", 55).execute()) == sorted(a["id"] for a in applications[1::2])
+    assert _ids(table().is_("ai_score", "null").execute()) == [applications[2]["id"]]
+    assert len(table().not_.is_("ai_score", "null").execute().data) == 3
+    assert _ids(table().in_("status", ["hired", "rejected"]).execute()) == sorted(a["id"] for a in applications[2:])
+    assert len(table().neq("status", "hired").execute().data) == 3
+
+
+def test_order_limit_and_nulls_last(fake, applications):
+    rows = (
+        fake.table("job_applications")
+        .select("ai_score")
+        .order("ai_score", desc=True, nullsfirst=False)
+        .limit(4)
+        .execute()
+    ).data
+    assert [r["ai_score"] for r in rows] == [90, 55, 10, None]
+
+
+def test_or_with_nested_and_and_quoted_values(fake, applications):
+    res = (
+        fake.table("job_applications")
+        .select("id")
+        .or_('status.in.(hired,rejected),and(ai_score.gt."50",status.eq.under_review)')
+        .execute()
+    )
+    assert _ids(res) == sorted(a["id"] for a in applications[1:])
+
+
+def test_embeds_and_inner_join_filter(fake, recruiter, job, applications):
+    other = fake.seed("users", [{"email": "other@example.com", "role": "recruiter"}])[0]
+    other_job = fake.seed("jobs", [{"title": "Other", "created_by": other["id"], "status": "active"}])[0]
+    fake.seed("job_applications", [{"job_id": other_job["id"], "candidate_id": applications[0]["candidate_id"]}])
+
+    rows = (
+        fake.table("job_applications")
+        .select("id, jobs!inner(title), users(full_name)")
+        .eq("jobs.created_by", recruiter["id"])
+        .execute()
+    ).data
+    assert len(rows) == len(applications)
+    assert {r["jobs"]["title"] for r in rows} == {"Backend Engineer"}
+    assert {r["users"]["full_name"] for r in rows} == {f"Candidate {i}" for i in range(4)}
+
+
+def test_single_and_maybe_single(fake, job):
+    assert fake.table("jobs").select("id").eq("id", job["id"]).single().execute().data["id"] == job["id"]
+    assert fake.table("jobs").select("id").eq("title", "missing").maybe_single().execute() is None
+
+
+def test_upsert_updates_on_conflict_and_unique_violation(fake, job):
+    fake.table("job_funnels").upsert({"job_id": job["id"], "applications": 1, "stats": {}}, on_conflict="job_id").execute()
+    fake.table("job_funnels").upsert({"job_id": job["id"], "applications": 2, "stats": {}}, on_conflict="job_id").execute()
+    rows = fake.table("job_funnels").select("applications").eq("job_id", job["id"]).execute().data
+    assert rows == [{"applications": 2}]
+
+    with pytest.raises(FakeAPIError):
+        fake.table("job_funnels").insert({"job_id": job["id"], "applications": 3, "stats": {}}).execute()
+
+
+def test_update_and_delete_return_affected_rows(fake, applications):
+    res = fake.table("job_applications").update({"status": "hired"}).neq("status", "hired").execute()
+    assert len(res.data) == 3
+    res = fake.table("job_applications").delete().eq("status", "hired").execute()
+    assert len(res.data) == 4
+    assert fake.table("job_applications").select("id").execute().data == []
+
+
+def test_round_trips_are_counted(fake, job):
+    fake.db.reset_counters()
+    fake.table("jobs").select("id").execute()
+    fake.table("jobs").select("id").eq("id", job["id"]).execute()
+    assert fake.db.call_count == 2
+    assert fake.db.calls_by_table == {"jobs": 2}
@@ -0,0 +1,104 @@
+import os
+import re
+from datetime import datetime, timedelta, timezone
+
+from services.fake_supabase_client import SCHEMA_DIR
+from services.funnel_service import FUNNEL_STAGES, STAGE_OF_STATUS, FunnelService, compute_funnel
+
+T0 = datetime(2026, 3, 2, 9, 0, tzinfo=timezone.utc)
+
+
+def _at(hours):
+    return (T0 + timedelta(hours=hours)).isoformat()
+
+
+def _history(app_id, *steps):
+    """steps: (to_status, hours); the first step has no from_status."""
+    rows, previous = [], None
+    for status, hours in steps:
+        rows.append({"application_id": app_id, "from_status": previous, "to_status": status, "changed_at": _at(hours)})
+        previous = status
+    return rows
+
+
+def _funnel():
+    applications = [
+        {"id": "a1", "status": "hired", "applied_at": _at(0)},
+        {"id": "a2", "status": "rejected", "applied_at": _at(0)},
+        {"id": "a3", "status": "under_review", "applied_at": _at(0)},
+        # Predates the history trigger: only the backfilled current status
+        {"id": "a4", "status": "hired", "applied_at": _at(0)},
+    ]
+    history = (
+        _history("a1", ("submitted", 0), ("shortlisted", 10), ("interview_scheduled", 20), ("interview_submitted", 30), ("hired", 50))
+        + _history("a2", ("submitted", 0), ("shortlisted", 4), ("rejected", 6))
+        + _history("a3", ("submitted", 0), ("under_review", 1))
+        + _history("a4", ("hired", 40))
+        + _history("unknown", ("submitted", 0))
+    )
+    return compute_funnel(applications, history)
+
+
+def test_counts_include_every_stage_up_to_the_furthest_reached():
+    funnel = _funnel()
+    assert funnel["applications"] == 4
+    assert [s["stage"] for s in funnel["stages"]] == list(FUNNEL_STAGES)
+    assert [s["count"] for s in funnel["stages"]] == [4, 3, 2, 2, 2]
+    assert [s["conversion"] for s in funnel["stages"]] == [None, 0.75, 0.6667, 1.0, 1.0]
+    assert [s["overall"] for s in funnel["stages"]] == [1.0, 0.75, 0.5, 0.5, 0.5]
+    # a2 was rejected after reaching shortlisted
+    assert [s["rejected"] for s in funnel["stages"]] == [0, 1, 0, 0, 0]
+
+
+def test_time_in_stage_percentiles():
+    stages = {s["stage"]: s["hours_in_stage"] for s in _funnel()["stages"]}
+    # Left "applied" after 10h (a1) and 4h (a2); a3 is still there, a4 has no times
+    assert stages["applied"] == {"samples": 2, "p50": 7.0, "p75": 8.5, "p90": 9.4}
+    # a2 left "shortlisted" by rejection, which is not a dwell sample
+    assert stages["shortlisted"] == {"samples": 1, "p50": 10.0, "p75": 10.0, "p90": 10.0}
+    assert stages["interview_submitted"]["p50"] == 20.0
+    assert stages["hired"] is None
+
+
+def test_empty_job():
+    funnel = compute_funnel([], [])
+    assert funnel["applications"] == 0
+    assert all(s["count"] == 0 and s["overall"] is None and s["conversion"] is None for s in funnel["stages"])
+    assert funnel["stages"][0]["hours_in_stage"] == {"samples": 0, "p50": None, "p75": None, "p90": None}
+
+
+def test_combine_sums_counts_across_jobs():
+    combined = FunnelService.combine([_funnel(), _funnel(), {"stages": []}])
+    assert combined["applications"] == 8
+    assert [s["count"] for s in combined["stages"]] == [8, 6, 4, 4, 4]
+    assert combined["stages"][1]["conversion"] == 0.75
+    assert combined["stages"][1]["rejected"] == 2
+
+
+def test_refresh_stores_one_row_per_job(fake, job):
+    candidate = fake.seed("users", [{"email": "c@example.com", "role": "candidate"}])[0]
+    app = fake.seed("job_applications", [{"job_id": job["id"], "candidate_id": candidate["id"]}])[0]
+    # The history trigger records status changes
+    fake.table("job_applications").update({"status": "under_review"}).eq("id", app["id"]).execute()
+
+    svc = FunnelService(fake)
+    assert svc.refresh_jobs([job["id"], job["id"]]) == 1
+    stored = svc.get_funnels([job["id"]])[job["id"]]
+    assert stored["applications"] == 1
+    assert stored["stages"][0]["count"] == 1
+    assert stored["computed_at"]
+
+
+def _application_statuses():
+    with open(os.path.join(SCHEMA_DIR, "database-schema.sql"), encoding="utf-8") as fh:
+        enum = re.search(r"CREATE TYPE application_status AS ENUM \(([^)]*)\)", fh.read()).group(1)
+    with open(os.path.join(SCHEMA_DIR, "add_application_statuses.sql"), encoding="utf-8") as fh:
+        added = re.findall(r"ADD VALUE IF NOT EXISTS '(\w+)'", fh.read())
+    return set(re.findall(r"'(\w+)'", enum)) | set(added)
+
+
+def test_every_stage_is_a_storable_status():
+    statuses = _application_statuses()
+    # "applied" is the application itself; every later stage is a status
+    assert set(FUNNEL_STAGES[1:]) <= statuses
+    assert set(STAGE_OF_STATUS) - {"applied"} <= statuses
@@ -0,0 +1,132 @@
+import json
+
+import pytest
+
+import services.job_import_service as job_import_service
+from services.job_import_service import ImportFormatError, JobImportService, parse_import
+
+HEADER = "title,description,location,job_type,salary_min,skills,required_skills,questions\n"
+
+
+@pytest.fixture
+def company(fake):
+    return fake.seed("companies", [{"name": "Acme"}])[0]
+
+
+@pytest.fixture
+def recommended(monkeypatch):
+    changed = []
+    monkeypatch.setattr(job_import_service.recommendation_worker, "job_changed", changed.append)
+    return changed
+
+
+@pytest.fixture
+def svc(fake, recommended):
+    return JobImportService(fake)
+
+
+def _import(svc, recruiter, company, content, fmt="csv", batch_size=2):
+    return list(svc.import_jobs(recruiter["id"], company["id"], parse_import(content.encode(), fmt), batch_size=batch_size))
+
+
+# ---------------------------------------------------------
+# PARSING
+# ---------------------------------------------------------
+def test_csv_rows_become_nested_records():
+    content = HEADER + 'API Engineer,Build APIs,Pune,full-time,,"Python; AWS; js",python,Why us?|A project you liked\n'
+    [(number, record)] = list(parse_import(content.encode("utf-8-sig"), "csv"))
+
+    assert number == 1
+    assert "salary_min" not in record
+    assert record["skills"] == [
+        {"skill_name": "python", "is_required": True},
+        {"skill_name": "AWS", "is_required": False},
+        {"skill_name": "js", "is_required": False},
+    ]
+    assert [q["question_text"] for q in record["questions"]] == ["Why us?", "A project you liked"]
+
+
+def test_csv_header_must_have_the_required_columns():
+    with pytest.raises(ImportFormatError, match="missing: location, job_type"):
+        list(parse_import(b"title,description\nA,B\n", "csv"))
+
+
+def test_jsonl_skips_blank_lines_and_reports_bad_ones():
+    content = b'{"title": "A"}\n\nnot json\n[1]\n'
+    rows = list(parse_import(content, "jsonl"))
+    assert [number for number, _ in rows] == [1, 2, 3]
+    assert rows[0][1] == {"title": "A"}
+    assert all(isinstance(record, str) for _, record in rows[1:])
+
+
+def test_undecodable_and_oversized_files_are_rejected(monkeypatch):
+    with pytest.raises(ImportFormatError, match="UTF-8"):
+        list(parse_import("title\n\xe9".encode("latin-1"), "csv"))
+    monkeypatch.setattr(job_import_service, "IMPORT_MAX_BYTES", 4)
+    with pytest.raises(ImportFormatError, match="larger than"):
+        list(parse_import(b"12345", "jsonl"))
+
+
+# ---------------------------------------------------------
+# IMPORT
+# ---------------------------------------------------------
+def test_valid_rows_are_inserted_in_batches(fake, svc, recruiter, company, recommended):
+    content = HEADER + "".join(
+        f"Job {i},Desc,Pune,full-time,{1000 * i},Python; JS,,Why us?\n" for i in range(3)
+    )
+    fake.db.reset_counters()
+    results = _import(svc, recruiter, company, content)
+
+    assert [r["ok"] for r in results[:-1]] == [True, True, True]
+    assert results[-1] == {"summary": {"rows": 3, "created": 3, "failed": 0}}
+    jobs = fake.db.tables["jobs"]
+    assert {j["created_by"] for j in jobs} == {recruiter["id"]}
+    assert sorted(s["skill_name"] for s in fake.db.tables["job_skills"]) == ["JavaScript"] * 3 + ["Python"] * 3
+    assert len(fake.db.tables["interview_questions"]) == 3
+    # Two batches of (jobs, job_skills, interview_questions) inserts
+    assert fake.db.calls_by_table == {"jobs": 2, "job_skills": 2, "interview_questions": 2}
+    assert sorted(recommended) == sorted(r["job_id"] for r in results[:-1])
+
+
+def test_invalid_rows_are_reported_without_failing_the_file(fake, svc, recruiter, company, recommended):
+    lines = [
+        {"title": "Good", "description": "D", "location": "Pune", "job_type": "full-time"},
+        {"title": "Bad status", "description": "D", "location": "Pune", "job_type": "full-time", "status": "archived"},
+        {"title": "Draft", "description": "D", "location": "Pune", "job_type": "full-time", "status": "draft"},
+    ]
+    content = "\n".join(json.dumps(line) for line in lines) + "\n{broken\n"
+    results = _import(svc, recruiter, company, content, fmt="jsonl")
+
+    by_row = {r["row"]: r for r in results[:-1]}
+    assert by_row[1]["ok"] and by_row[3]["ok"]
+    assert not by_row[2]["ok"] and "status" in by_row[2]["errors"][0]
+    assert not by_row[4]["ok"]
+    assert results[-1]["summary"] == {"rows": 4, "created": 2, "failed": 2}
+    # Drafts are not recommended
+    assert recommended == [by_row[1]["job_id"]]
+
+
+def test_failed_batch_is_retried_row_by_row(fake, svc, recruiter, company, monkeypatch):
+    insert_jobs = svc._insert_jobs
+
+    def failing(recruiter_id, company_id, jobs):
+        if any(job.title == "Boom" for job in jobs):
+            raise RuntimeError("insert failed")
+        return insert_jobs(recruiter_id, company_id, jobs)
+
+    monkeypatch.setattr(svc, "_insert_jobs", failing)
+    content = HEADER + "Ok,D,Pune,full-time,,,,\nBoom,D,Pune,full-time,,,,\n"
+    results = _import(svc, recruiter, company, content)
+
+    assert [(r["row"], r["ok"]) for r in results[:-1]] == [(1, True), (2, False)]
+    assert [j["title"] for j in fake.db.tables["jobs"]] == ["Ok"]
+
+
+def test_rows_beyond_the_limit_are_skipped(svc, recruiter, company, monkeypatch):
+    monkeypatch.setattr(job_import_service, "IMPORT_MAX_ROWS", 1)
+    content = HEADER + "A,D,Pune,full-time,,,,\nB,D,Pune,full-time,,,,\n"
+    results = _import(svc, recruiter, company, content)
+
+    by_row = {r["row"]: r for r in results[:-1]}
+    assert by_row[2] == {"row": 2, "ok": False, "errors": ["Import is limited to 1 rows; the rest was skipped"]}
+    assert results[-1]["summary"] == {"rows": 1, "created": 1, "failed": 0}
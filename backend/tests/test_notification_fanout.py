@@ -0,0 +1,80 @@
+import pytest
+from pydantic import ValidationError
+
+import services.notification_fanout as fanout
+import services.recruiter_service as recruiter_service
+from models.recruiter_models import APPLICATION_STATUSES, ApplicationStatusBulkUpdate
+from services.notification_fanout import CLOSED_APPLICATION_STATUSES, STATUS_MESSAGES, FanoutService
+from services.recruiter_service import RecruiterService
+
+
+@pytest.fixture
+def applications(fake, job):
+    candidates = fake.seed("users", [
+        {"email": f"c{i}@example.com", "role": "candidate", "full_name": f"Candidate {i}"} for i in range(5)
+    ])
+    statuses = ["submitted", "under_review", "shortlisted", "rejected", "hired"]
+    return fake.seed("job_applications", [
+        {"job_id": job["id"], "candidate_id": c["id"], "status": s} for c, s in zip(candidates, statuses)
+    ])
+
+
+def _notified(fake):
+    return sorted(n["user_id"] for n in fake.db.tables["notifications"])
+
+
+def test_job_closed_notifies_undecided_applicants_page_by_page(fake, job, applications):
+    fake.db.reset_counters()
+    sent = FanoutService(fake, batch_size=2).job_closed(job["id"], "Backend Engineer", email=False)
+
+    assert sent == 3
+    assert _notified(fake) == sorted(a["candidate_id"] for a in applications[:3])
+    assert {n["message"] for n in fake.db.tables["notifications"]} == {
+        "Backend Engineer is no longer accepting applications."
+    }
+    # 3 recipient pages of 2 (keyset on id), and one insert per page with an undecided applicant
+    by_id = sorted(applications, key=lambda a: a["id"])
+    pages = [by_id[i:i + 2] for i in range(0, len(by_id), 2)]
+    inserts = sum(any(a["status"] not in CLOSED_APPLICATION_STATUSES for a in page) for page in pages)
+    assert fake.db.calls_by_table == {"job_applications": 3, "notifications": inserts}
+
+
+def test_application_status_uses_the_status_message(fake, applications):
+    ids = [a["id"] for a in applications[:2]]
+    assert FanoutService(fake).application_status(ids, "shortlisted", email=False) == 2
+    assert {n["message"] for n in fake.db.tables["notifications"]} == {"You have been shortlisted for Backend Engineer."}
+    assert {n["related_id"] for n in fake.db.tables["notifications"]} == set(ids)
+
+
+def test_every_application_status_has_a_message():
+    assert set(STATUS_MESSAGES) == set(APPLICATION_STATUSES)
+
+
+def test_emails_are_queued_for_recipients(fake, monkeypatch, applications):
+    queued = []
+    monkeypatch.setattr(fanout.email_outbox, "enqueue", queued.append)
+    FanoutService(fake).application_status([applications[0]["id"]], "hired", email=True)
+    assert [(r["email"], r["full_name"]) for r in queued] == [("c0@example.com", "Candidate 0")]
+
+
+def test_bulk_update_changes_owned_applications_only(fake, monkeypatch, recruiter, applications):
+    fanned_out = []
+    monkeypatch.setattr(recruiter_service.fanout_worker, "application_status", lambda ids, status: fanned_out.append((ids, status)))
+    monkeypatch.setattr(recruiter_service.funnel_worker, "jobs_changed", lambda job_ids: None)
+
+    other = fake.seed("users", [{"email": "other@example.com", "role": "recruiter"}])[0]
+    other_job = fake.seed("jobs", [{"title": "Other", "created_by": other["id"], "status": "active"}])[0]
+    foreign = fake.seed("job_applications", [{"job_id": other_job["id"], "candidate_id": applications[0]["candidate_id"]}])[0]
+
+    ids = [applications[0]["id"], applications[2]["id"], foreign["id"]]
+    result = RecruiterService(fake).bulk_update_application_status(recruiter["id"], ids, "shortlisted")
+
+    assert result == {"updated": 1, "unchanged": 1, "not_found": [foreign["id"]]}
+    assert fanned_out == [([applications[0]["id"]], "shortlisted")]
+    assert foreign["status"] == "submitted"
+
+
+def test_bulk_status_must_be_an_application_status():
+    assert ApplicationStatusBulkUpdate(application_ids=["a"], status="Shortlisted").status == "shortlisted"
+    with pytest.raises(ValidationError):
+        ApplicationStatusBulkUpdate(application_ids=["a"], status="archived")
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import routers.notification as notification_router
+import services.notification_service as notification_service
+from services.notification_broker import RESYNC_EVENT, InProcessBroker, Subscription
+from services.notification_service import NotificationService
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = InProcessBroker()
+    monkeypatch.setattr(notification_router, "notification_broker", broker)
+    monkeypatch.setattr(notification_service, "notification_broker", broker)
+    return broker
+
+
+# ---------------------------------------------------------
+# BROKER
+# ---------------------------------------------------------
+def test_events_reach_only_the_users_streams(broker):
+    async def run():
+        mine, other = broker.subscribe("u1"), broker.subscribe("u2")
+        broker.publish("u1", "read", {"id": "n1"})
+        assert await mine.next_event(1) == {"event": "read", "data": {"id": "n1"}}
+        assert await other.next_event(0.01) is None
+
+    asyncio.run(run())
+
+
+def test_publish_from_another_thread_is_delivered_on_the_loop(broker):
+    async def run():
+        sub = broker.subscribe("u1")
+        thread = threading.Thread(target=broker.publish, args=("u1", "read_all", {}))
+        thread.start()
+        thread.join()
+        assert await sub.next_event(1) == {"event": "read_all", "data": {}}
+
+    asyncio.run(run())
+
+
+def test_stalled_stream_is_told_to_resync():
+    async def run():
+        sub = Subscription("u1", maxsize=2)
+        for i in range(5):
+            sub.deliver({"event": "notification", "data": {"id": i}})
+        await asyncio.sleep(0)
+        assert await sub.next_event(1) is RESYNC_EVENT
+        assert await sub.next_event(0.01) is None
+        # Delivery resumes once the client has been told to refetch
+        sub.deliver({"event": "notification", "data": {"id": 5}})
+        assert (await sub.next_event(1))["data"] == {"id": 5}
+
+    asyncio.run(run())
+
+
+def test_unsubscribe_releases_the_connection(broker):
+    async def run():
+        first, second = broker.subscribe("u1"), broker.subscribe("u1")
+        assert broker.connection_count("u1") == 2
+        broker.unsubscribe(first)
+        broker.unsubscribe(first)
+        assert broker.connection_count("u1") == 1
+        broker.unsubscribe(second)
+        assert broker.connection_count() == 0
+        assert broker.deliver_local("u1", {"event": "read_all", "data": {}}) == 0
+
+    asyncio.run(run())
+
+
+def test_service_writes_are_published(fake, recruiter, broker):
+    svc = NotificationService(fake)
+
+    async def run():
+        sub = broker.subscribe(recruiter["id"])
+        created = svc.create_notification({"user_id": recruiter["id"], "title": "t", "message": "m"})
+        event = await sub.next_event(1)
+        assert (event["event"], event["data"]["id"]) == ("notification", created["id"])
+
+        svc.mark_as_read(created["id"], recruiter["id"])
+        assert await sub.next_event(1) == {"event": "read", "data": {"id": created["id"]}}
+        svc.mark_all_as_read(recruiter["id"])
+        assert await sub.next_event(1) == {"event": "read_all", "data": {}}
+
+    asyncio.run(run())
+
+
+# ---------------------------------------------------------
+# STREAM ENDPOINT
+# ---------------------------------------------------------
+def _request(user_id):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/notification/stream",
+        "headers": [],
+        "state": {"user": {"id": user_id, "user_metadata": {"role": "candidate"}}},
+    })
+
+
+def test_stream_sends_events_and_releases_on_close(broker):
+    async def run():
+        response = await notification_router.notification_stream(_request("u1"))
+        body = response.body_iterator
+        # Nothing is held until the response starts streaming
+        assert broker.connection_count("u1") == 0
+
+        first = await body.__anext__()
+        assert first.startswith("retry: ") and "event: ready" in first
+        assert broker.connection_count("u1") == 1
+
+        broker.publish("u1", "read", {"id": "n1"})
+        assert await body.__anext__() == 'event: read\ndata: {"id": "n1"}\n\n'
+
+        await body.aclose()
+        assert broker.connection_count("u1") == 0
+
+    asyncio.run(run())
+
+
+def test_streams_per_user_are_limited(broker, monkeypatch):
+    monkeypatch.setattr(notification_router, "MAX_STREAMS_PER_USER", 2)
+
+    async def run():
+        for _ in range(2):
+            broker.subscribe("u1")
+        with pytest.raises(HTTPException) as exc:
+            await notification_router.notification_stream(_request("u1"))
+        assert exc.value.status_code == 429
+        # Other users are unaffected
+        await notification_router.notification_stream(_request("u2"))
+
+    asyncio.run(run())
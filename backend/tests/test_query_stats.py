@@ -0,0 +1,57 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from middleware.query_stats import QueryStatsMiddleware
+from utils_others.query_stats import record_query
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, debug_headers=True)
+
+    @app.get("/plain")
+    def plain():
+        record_query("jobs", "select", ("id",))
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        record_query("jobs", "select", ("id",))
+
+        def rows():
+            # One lookup per row while the body is being sent
+            for i in range(4):
+                record_query("users", "select", ("id",))
+                yield f"{i}\n"
+
+        return StreamingResponse(rows(), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def _n_plus_one_warnings(caplog):
+    return [r for r in caplog.records if r.getMessage() == "Possible N+1 query pattern"]
+
+
+def test_plain_responses_report_in_headers(client, caplog):
+    with caplog.at_level(logging.WARNING):
+        res = client.get("/plain")
+    assert res.headers["X-DB-Queries"] == "1"
+    assert _n_plus_one_warnings(caplog) == []
+
+
+def test_queries_while_streaming_are_counted(client, caplog):
+    with caplog.at_level(logging.WARNING):
+        res = client.get("/stream")
+
+    assert res.text == "0\n1\n2\n3\n"
+    # Headers were sent before the body started
+    assert res.headers["X-DB-Queries"] == "1"
+    [warning] = _n_plus_one_warnings(caplog)
+    assert warning.db_queries == 5
+    assert warning.n_plus_one[0]["table"] == "users"
@@ -0,0 +1,69 @@
+import pytest
+
+import services.recommendation_service as recommendation_service
+import services.search_service as search_service
+from services.recommendation_service import RecommendationService
+
+
+@pytest.fixture
+def candidates(fake):
+    users = fake.seed("users", [{"email": f"c{i}@example.com", "role": "candidate"} for i in range(3)])
+    profiles = fake.seed("candidate_profiles", [
+        {"user_id": u["id"], "title": title} for u, title in zip(users, ["Frontend Developer", "Data Analyst", "Web Developer"])
+    ])
+    fake.seed("candidate_skills", [
+        {"candidate_id": profiles[0]["id"], "skill_name": "JavaScript"},
+        {"candidate_id": profiles[1]["id"], "skill_name": "SQL"},
+        # Legacy row: alias spelling, keyed by the user id
+        {"candidate_id": users[2]["id"], "skill_name": "js"},
+    ])
+    return users
+
+
+def _post_job(fake, recruiter, title, skills):
+    job = fake.seed("jobs", [{"title": title, "description": title, "created_by": recruiter["id"], "status": "active"}])[0]
+    fake.seed("job_skills", [{"job_id": job["id"], "skill_name": s, "is_required": True} for s in skills])
+    return job
+
+
+def _stored(fake):
+    return {r["candidate_id"]: r["job_ids"] for r in fake.db.tables["job_recommendations"]}
+
+
+@pytest.fixture
+def svc(fake, recruiter, candidates, monkeypatch):
+    # Reaching candidates must not build the search index
+    monkeypatch.setattr(search_service.candidate_search, "index", lambda: pytest.fail("search index was built"))
+    _post_job(fake, recruiter, "Data Analyst", ["SQL"])
+    svc = RecommendationService(fake)
+    svc.refresh_candidates([c["id"] for c in candidates])
+    return svc
+
+
+def test_new_job_reaches_candidates_with_any_spelling_of_its_skills(fake, recruiter, candidates, svc):
+    job = _post_job(fake, recruiter, "Frontend Developer", ["JS"])
+    svc.job_changed(job["id"])
+
+    stored = _stored(fake)
+    assert job["id"] in stored[candidates[0]["id"]]
+    assert job["id"] in stored[candidates[2]["id"]]
+    assert job["id"] not in stored[candidates[1]["id"]]
+
+
+def test_candidates_with_skills_pages_and_maps_to_user_ids(fake, candidates, svc, monkeypatch):
+    monkeypatch.setattr(recommendation_service, "BATCH_SIZE", 1)
+    pages = list(svc._candidates_with_skills(["javascript", None]))
+    assert len(pages) == 2
+    assert sorted(uid for page in pages for uid in page) == sorted([candidates[0]["id"], candidates[2]["id"]])
+    assert list(svc._candidates_with_skills([])) == []
+
+
+def test_closed_job_is_dropped_and_not_served(fake, recruiter, candidates, svc):
+    job = _post_job(fake, recruiter, "Frontend Developer", ["JavaScript"])
+    svc.job_changed(job["id"])
+    assert [j["id"] for j in svc.get_recommendations(candidates[0]["id"])] == [job["id"]]
+
+    job["status"] = "closed"
+    svc.job_changed(job["id"])
+    assert job["id"] not in _stored(fake)[candidates[0]["id"]]
+    assert svc.get_recommendations(fake.seed("users", [{"email": "new@example.com"}])[0]["id"]) is None
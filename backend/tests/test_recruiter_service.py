@@ -0,0 +1,208 @@
+import base64
+import json
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+import services.recruiter_service as recruiter_service
+from models.recruiter_models import InterviewQuestionsReplace
+from services.fake_supabase_client import FakeAPIError
+from services.recruiter_service import RecruiterService, _keyset_filter
+
+
+# ---------------------------------------------------------
+# JOB UPDATES
+# ---------------------------------------------------------
+@pytest.fixture
+def queued(monkeypatch):
+    calls = []
+    monkeypatch.setattr(recruiter_service.rescoring_worker, "submit", lambda job_id, reason: calls.append(("rescore", job_id)))
+    monkeypatch.setattr(recruiter_service.recommendation_worker, "job_changed", lambda job_id: calls.append(("recommend", job_id)))
+    monkeypatch.setattr(recruiter_service.recommendation_worker, "job_removed", lambda job_id: calls.append(("remove", job_id)))
+    monkeypatch.setattr(recruiter_service.fanout_worker, "job_closed", lambda job_id, title: None)
+    return calls
+
+
+def test_update_job_without_text_changes_queues_nothing(fake, recruiter, job, queued):
+    job["description"] = "Build APIs"
+    svc = RecruiterService(fake)
+
+    svc.update_job(job["id"], {"salary_min": 100000}, recruiter["id"])
+    svc.update_job(job["id"], {"description": "Build APIs", "status": "active"}, recruiter["id"])
+
+    assert queued == []
+    assert job["salary_min"] == 100000
+
+
+def test_update_job_queues_work_for_changed_fields(fake, recruiter, job, queued):
+    svc = RecruiterService(fake)
+
+    svc.update_job(job["id"], {"description": "Build and run APIs"}, recruiter["id"])
+    assert queued == [("rescore", job["id"]), ("recommend", job["id"])]
+
+    queued.clear()
+    svc.update_job(job["id"], {"status": "paused"}, recruiter["id"])
+    assert queued == [("remove", job["id"])]
+
+
+def test_update_job_of_another_recruiter_queues_nothing(fake, job, queued):
+    other = fake.seed("users", [{"email": "other@example.com", "role": "recruiter"}])[0]
+    assert RecruiterService(fake).update_job(job["id"], {"title": "Hijacked"}, other["id"]) == []
+    assert queued == []
+    assert job["title"] == "Backend Engineer"
+
+
+# ---------------------------------------------------------
+# KEYSET PAGING
+# ---------------------------------------------------------
+def test_keyset_filter_expressions():
+    assert _keyset_filter("ai_score", True, 70, "abc") == (
+        'ai_score.lt."70",and(ai_score.eq."70",id.lt.abc),ai_score.is.null'
+    )
+    assert _keyset_filter("applied_at", False, None, "abc") == "and(applied_at.is.null,id.gt.abc)"
+
+
+@pytest.fixture
+def scored_applications(fake, job):
+    candidates = fake.seed("users", [{"email": f"c{i}@example.com", "role": "candidate"} for i in range(11)])
+    # Ties and NULL scores are the cases a plain "score < last score" cursor gets wrong
+    scores = [80, 80, 80, 65, None, 40, None, 80, 12, 65, None]
+    return fake.seed("job_applications", [
+        {"job_id": job["id"], "candidate_id": c["id"], "ai_score": s} for c, s in zip(candidates, scores)
+    ])
+
+
+def _all_pages(svc, recruiter_id, **kwargs):
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = svc.list_recruiter_applications(recruiter_id, limit=3, cursor=cursor, **kwargs)
+        seen.extend(page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if not cursor:
+            return seen, pages
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_keyset_pages_cover_every_row_once(fake, recruiter, scored_applications, descending):
+    seen, pages = _all_pages(RecruiterService(fake), recruiter["id"], sort="ai_score", descending=descending)
+
+    assert pages == 4
+    assert sorted(r["id"] for r in seen) == sorted(a["id"] for a in scored_applications)
+    scores = [r["ai_score"] for r in seen if r["ai_score"] is not None]
+    assert scores == sorted(scores, reverse=descending)
+    # NULL scores come last in both directions
+    assert all(r["ai_score"] is None for r in seen[-3:])
+
+
+def test_keyset_pages_by_applied_at(fake, recruiter, scored_applications):
+    seen, _ = _all_pages(RecruiterService(fake), recruiter["id"], sort="applied_at")
+    assert sorted(r["id"] for r in seen) == sorted(a["id"] for a in scored_applications)
+
+
+def _cursor(*parts):
+    return base64.urlsafe_b64encode(json.dumps(list(parts)).encode()).decode().rstrip("=")
+
+
+def test_cursor_is_bound_to_its_sort(fake, recruiter, scored_applications):
+    svc = RecruiterService(fake)
+    cursor = svc.list_recruiter_applications(recruiter["id"], sort="ai_score", limit=2)["next_cursor"]
+    with pytest.raises(ValueError):
+        svc.list_recruiter_applications(recruiter["id"], sort="applied_at", cursor=cursor)
+    with pytest.raises(ValueError):
+        svc.list_recruiter_applications(recruiter["id"], cursor="not-a-cursor")
+
+
+@pytest.mark.parametrize("cursor", [
+    # PostgREST filter syntax smuggled through either part of the cursor
+    _cursor("ai_score", 50, "x),or(jobs.created_by.neq.y"),
+    _cursor("ai_score", '50",id.neq."x', str(uuid.uuid4())),
+    _cursor("ai_score", True, str(uuid.uuid4())),
+    _cursor("applied_at", 50, str(uuid.uuid4())),
+    _cursor("applied_at", "2026-01-01),or(status.eq.hired", str(uuid.uuid4())),
+])
+def test_tampered_cursor_is_rejected(fake, recruiter, scored_applications, cursor):
+    sort = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))[0]
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        RecruiterService(fake).list_recruiter_applications(recruiter["id"], sort=sort, cursor=cursor)
+
+
+# ---------------------------------------------------------
+# INTERVIEW QUESTIONS (replace_interview_questions RPC)
+# ---------------------------------------------------------
+@pytest.fixture
+def questions(fake, job):
+    return fake.seed("interview_questions", [
+        {"job_id": job["id"], "question_text": text, "time_limit": 120, "question_order": order}
+        for order, text in enumerate(["Intro", "Design", "Debugging"], start=1)
+    ])
+
+
+def _replace(fake, job, recruiter, items):
+    return fake.rpc("replace_interview_questions", {
+        "p_job_id": job["id"], "p_recruiter_id": recruiter["id"], "p_questions": items,
+    }).execute().data
+
+
+def test_replace_applies_the_minimal_diff(fake, job, recruiter, questions):
+    intro, design, debugging = questions
+    result = _replace(fake, job, recruiter, [
+        {"id": design["id"], "question_text": "Design"},
+        {"id": intro["id"], "question_text": "Intro", "time_limit": 120},
+        {"question_text": "Why us?", "time_limit": 60},
+    ])
+
+    assert (result["inserted"], result["updated"], result["deleted"]) == (1, 2, 1)
+    assert [q["question_text"] for q in result["questions"]] == ["Design", "Intro", "Why us?"]
+    assert [q["question_order"] for q in result["questions"]] == [1, 2, 3]
+    # Existing questions keep their ids (and so their video responses)
+    assert [q["id"] for q in result["questions"][:2]] == [design["id"], intro["id"]]
+    assert debugging["id"] not in {q["id"] for q in fake.db.tables["interview_questions"]}
+
+
+def test_replace_unchanged_list_touches_nothing(fake, job, recruiter, questions):
+    result = _replace(fake, job, recruiter, [
+        {"id": q["id"], "question_text": q["question_text"], "time_limit": q["time_limit"]} for q in questions
+    ])
+    assert (result["inserted"], result["updated"], result["deleted"]) == (0, 0, 0)
+
+
+def test_replace_rejects_without_changing_anything(fake, job, recruiter, questions):
+    before = [dict(q) for q in fake.db.tables["interview_questions"]]
+
+    assert _replace(fake, job, recruiter, [{"id": str(uuid.uuid4()), "question_text": "x"}]) == {"error": "unknown_question"}
+    assert _replace(fake, job, recruiter, [
+        {"id": questions[0]["id"], "question_text": "a"},
+        {"id": questions[0]["id"], "question_text": "b"},
+    ]) == {"error": "duplicate_question"}
+    with pytest.raises(FakeAPIError) as exc:
+        _replace(fake, job, recruiter, [{"id": "not-a-uuid", "question_text": "x"}])
+    assert exc.value.code == "22P02"
+
+    other = fake.seed("users", [{"email": "other@example.com", "role": "recruiter"}])[0]
+    assert _replace(fake, job, other, []) == {"error": "job_not_found"}
+    assert fake.db.tables["interview_questions"] == before
+
+
+def test_service_maps_rpc_errors(fake, job, recruiter, questions):
+    svc = RecruiterService(fake)
+    with pytest.raises(LookupError):
+        svc.replace_interview_questions(str(uuid.uuid4()), recruiter["id"], [])
+    with pytest.raises(ValueError):
+        svc.replace_interview_questions(job["id"], recruiter["id"], [
+            {"id": questions[0]["id"], "question_text": "a"},
+            {"id": questions[0]["id"], "question_text": "b"},
+        ])
+
+
+def test_replace_payload_validation():
+    qid = str(uuid.uuid4())
+    payload = InterviewQuestionsReplace(questions=[{"id": qid, "question_text": "a"}, {"question_text": "b"}])
+    assert payload.questions[0].model_dump(mode="json", exclude_none=True) == {
+        "id": qid, "question_text": "a", "time_limit": 120,
+    }
+    with pytest.raises(ValidationError):
+        InterviewQuestionsReplace(questions=[{"id": qid, "question_text": "a"}, {"id": qid, "question_text": "b"}])
+    with pytest.raises(ValidationError):
+        InterviewQuestionsReplace(questions=[{"id": "7", "question_text": "a"}])
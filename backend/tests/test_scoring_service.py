@@ -0,0 +1,73 @@
+import uuid
+
+import pytest
+
+import services.scoring_service as scoring_service
+from services.scoring_service import ScoringService, score_pairs, skill_match
+
+
+@pytest.fixture
+def applications(fake, recruiter, job):
+    fake.seed("job_skills", [
+        {"job_id": job["id"], "skill_name": "Python", "is_required": True},
+        {"job_id": job["id"], "skill_name": "PostgreSQL", "is_required": False},
+    ])
+    users = fake.seed("users", [{"email": f"c{i}@example.com", "role": "candidate"} for i in range(3)])
+    profiles = fake.seed("candidate_profiles", [
+        {"user_id": u["id"], "title": title, "bio": bio}
+        for u, title, bio in zip(users, ["Backend Engineer", "Backend Developer", "Illustrator"],
+                                 ["Python APIs", "Services in Python", "Watercolours"])
+    ])
+    fake.seed("candidate_skills", [
+        {"candidate_id": profiles[0]["id"], "skill_name": "Python"},
+        {"candidate_id": profiles[0]["id"], "skill_name": "Postgres"},
+        {"candidate_id": profiles[1]["id"], "skill_name": "python3"},
+    ])
+    return fake.seed("job_applications", [{"job_id": job["id"], "candidate_id": u["id"]} for u in users])
+
+
+def test_skill_match_uses_aliases_and_weights_required_skills():
+    result = skill_match(
+        [{"skill_name": "Python", "is_required": True}, {"skill_name": "Go", "is_required": False}],
+        ["python3", "Rust"],
+    )
+    assert result["matched"] == ["python"]
+    assert result["missing"] == ["go"]
+    assert result["required_missing"] == []
+    assert 0.5 < result["score"] < 1
+
+
+def test_scores_rank_matching_candidates_first(fake, applications):
+    svc = ScoringService(fake)
+    assert svc.write_scores(svc.score_applications(applications)) == 3
+
+    scores = [a["ai_score"] for a in applications]
+    assert scores[0] > scores[1] > scores[2]
+    assert applications[0]["ai_analysis"]["missing_skills"] == []
+    assert applications[1]["ai_analysis"]["missing_skills"] == ["postgresql"]
+
+
+def test_write_scores_skips_deleted_applications(fake, applications):
+    svc = ScoringService(fake)
+    results = svc.score_applications(applications)
+    fake.table("job_applications").delete().eq("id", applications[2]["id"]).execute()
+
+    assert svc.write_scores(results) == 2
+    assert len(fake.db.tables["job_applications"]) == 2
+
+
+def test_score_candidates_reads_applications_in_chunks(fake, applications):
+    # Candidates without applications still count towards the IN-list size
+    ids = [a["candidate_id"] for a in applications] + [str(uuid.uuid4()) for _ in range(scoring_service._IN_CHUNK)]
+    fake.db.reset_counters()
+
+    assert ScoringService(fake).score_candidates(ids) == 3
+    assert all(a["ai_score"] is not None for a in applications)
+    assert fake.db.calls_by_table["job_applications"] == 2
+
+
+def test_score_pairs_without_skills_is_text_only():
+    job = {"job": {"title": "Data Analyst", "description": "SQL reports"}, "skills": []}
+    candidate = {"profile": {"title": "Data Analyst"}, "skills": [], "experience": []}
+    [score] = score_pairs([(job, candidate)])
+    assert 0 < score["ai_score"] <= 100
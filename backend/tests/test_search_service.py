@@ -0,0 +1,126 @@
+import pytest
+
+import services.search_service as search_service
+from services.search_service import (
+    CandidateIndex,
+    CandidateSearchService,
+    QuerySyntaxError,
+    document_terms,
+    parse_query,
+    positive_terms,
+)
+
+
+# ---------------------------------------------------------
+# QUERY PARSING
+# ---------------------------------------------------------
+def test_parse_required_excluded_and_optional_terms():
+    assert parse_query("+python -php django") == (
+        "bool", [("term", "python")], [("term", "django")], [("term", "php")]
+    )
+
+
+def test_parse_boolean_operators_and_groups():
+    assert parse_query("python AND (aws OR gcp) NOT php") == (
+        "bool",
+        [],
+        [("and", [("term", "python"), ("bool", [], [("or", [("term", "aws"), ("term", "gcp")])], [])])],
+        [("term", "php")],
+    )
+
+
+def test_parse_field_terms_and_phrases():
+    assert parse_query('skill:"JS" title:"data engineer"') == (
+        "bool",
+        [],
+        [("term", "skill:javascript"), ("and", [("term", "title:data"), ("term", "title:engineer")])],
+        [],
+    )
+
+
+@pytest.mark.parametrize("query", ["(python", "python)", "python AND", "OR aws", "NOT"])
+def test_malformed_queries_are_rejected(query):
+    with pytest.raises(QuerySyntaxError):
+        parse_query(query)
+
+
+def test_negated_terms_do_not_score():
+    assert positive_terms(parse_query("+python aws -php NOT java")) == ["python", "aws"]
+
+
+# ---------------------------------------------------------
+# INDEX (BM25)
+# ---------------------------------------------------------
+def _doc(title, skills=(), bio=None):
+    return document_terms({"title": title, "skills": list(skills), "bio": bio})
+
+
+@pytest.fixture
+def index():
+    return CandidateIndex.build([
+        ("a", _doc("Backend Engineer", ["Python", "AWS"])),
+        ("b", _doc("Data Engineer", ["Python", "SQL"], bio="python python pipelines")),
+        ("c", _doc("Frontend Developer", ["JavaScript"])),
+        ("d", _doc("PHP Developer", ["PHP", "Python"])),
+    ])
+
+
+def test_document_terms_weight_skills_and_keep_field_terms():
+    tf = document_terms({"title": "Backend Engineer", "skills": ["js"]})
+    assert tf["skill:javascript"] == 1.0
+    assert tf["javascript"] == search_service.FIELD_WEIGHTS["skills"]
+    assert tf["title:backend"] == 1.0
+
+
+def test_document_terms_are_capped(monkeypatch):
+    monkeypatch.setattr(search_service, "MAX_TERMS_PER_DOC", 5)
+    tf = document_terms({"title": "Lead", "bio": " ".join(f"word{i}" for i in range(20))})
+    assert "title:lead" in tf and "lead" in tf
+    assert len(tf) == 5
+
+
+def test_search_ranks_by_bm25_and_applies_boolean_filters(index):
+    total, hits = index.search("python")
+    assert total == 3
+    assert hits[0][0] == "b"  # highest term frequency
+    assert index.search("+python -php")[0] == 2
+    assert sorted(cid for cid, _ in index.search("skill:sql OR skill:aws")[1]) == ["a", "b"]
+    assert index.search("-python") == (0, [])
+
+
+def test_search_pages_are_stable(index):
+    _, everything = index.search("python", limit=3)
+    _, first = index.search("python", limit=2)
+    _, second = index.search("python", limit=2, offset=2)
+    assert first + second == everything
+
+
+def test_upsert_and_remove_update_results(index):
+    index.upsert("c", _doc("Frontend Developer", ["JavaScript", "Python"]))
+    assert "c" in index.with_any(["skill:python"])
+    index.remove("a")
+    assert sorted(index.with_any(["skill:python", "skill:aws"])) == ["b", "c", "d"]
+    assert len(index) == 3
+
+
+def test_delta_segment_is_merged_into_the_base(monkeypatch, index):
+    monkeypatch.setattr(search_service, "MERGE_THRESHOLD", 2)
+    for i in range(5):
+        index.upsert(f"n{i}", _doc("Go Developer", ["Go"]))
+    assert index._delta_docs < 2
+    assert index.search("skill:go")[0] == 5
+    assert index.search("python")[0] == 3
+
+
+# ---------------------------------------------------------
+# SERVICE
+# ---------------------------------------------------------
+def test_service_builds_from_profiles_and_hydrates(fake):
+    user = fake.seed("users", [{"email": "dev@example.com", "role": "candidate", "full_name": "Dev One"}])[0]
+    profile = fake.seed("candidate_profiles", [{"user_id": user["id"], "title": "Rust Developer"}])[0]
+    fake.seed("candidate_skills", [{"candidate_id": profile["id"], "skill_name": "Rust"}])
+
+    result = CandidateSearchService(fake).search("skill:rust")
+    assert result["total"] == 1
+    [hit] = result["results"]
+    assert (hit["candidate_id"], hit["full_name"], hit["skills"]) == (user["id"], "Dev One", ["Rust"])
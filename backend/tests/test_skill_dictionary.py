@@ -0,0 +1,57 @@
+import pytest
+
+from utils_others.skill_dictionary import SkillDictionary, skill_key
+
+SKILLS = {
+    "JavaScript": ["js", "ecmascript"],
+    "Java": ["core java"],
+    "Machine Learning": ["ml"],
+    "Go": ["golang"],
+    "Node.js": ["node", "nodejs"],
+}
+
+
+@pytest.fixture
+def skills():
+    return SkillDictionary(SKILLS)
+
+
+def test_skill_key_tidies_case_and_whitespace():
+    assert skill_key("  Machine   LEARNING ") == "machine learning"
+    assert skill_key(None) == ""
+
+
+def test_canonicalize_maps_aliases_and_keeps_unknown_text(skills):
+    assert skills.canonicalize(" JS ") == "JavaScript"
+    assert skills.canonicalize("golang") == "Go"
+    assert skills.canonicalize("  Rocket   Science ") == "Rocket Science"
+    assert skills.normalize("ECMAScript") == skills.normalize("javascript") == "javascript"
+    assert skills.is_known("ML") and not skills.is_known("Rocket Science")
+    assert len(skills) == len(SKILLS)
+
+
+def test_canonicalize_many_drops_blanks_and_duplicates(skills):
+    assert skills.canonicalize_many(["js", "JavaScript", "", None, "node", "Go", "golang"]) == [
+        "JavaScript", "Node.js", "Go",
+    ]
+
+
+def test_autocomplete_ranks_exact_then_names_words_and_aliases(skills):
+    assert [s["name"] for s in skills.autocomplete("java")] == ["Java", "JavaScript"]
+    # Later words of a name match too
+    assert skills.autocomplete("learn") == [{"name": "Machine Learning", "alias": None}]
+    # Alias hits say which alias matched
+    assert skills.autocomplete("gol") == [{"name": "Go", "alias": "golang"}]
+    # A name is listed once even when several of its keys match
+    assert [s["name"] for s in skills.autocomplete("no")] == ["Node.js"]
+
+
+def test_autocomplete_limits_and_empty_prefixes(skills):
+    assert len(skills.autocomplete("j", limit=1)) == 1
+    assert skills.autocomplete("   ") == []
+    assert skills.autocomplete("java", limit=0) == []
+
+
+def test_canonical_names_win_over_colliding_aliases():
+    skills = SkillDictionary({"Go": ["golang"], "Golang Tools": ["go"]})
+    assert skills.canonicalize("go") == "Go"
@@ -0,0 +1,84 @@
+import csv
+import io
+import re
+import uuid
+import zipfile
+
+import pytest
+
+import utils_others.tabular_export as tabular_export
+from services.recruiter_service import RecruiterService
+from utils_others.tabular_export import csv_stream, xlsx_stream
+
+COLUMNS = [("name", "Name"), ("score", "Score"), ("remote", "Remote")]
+ROWS = [
+    {"name": "Ada", "score": 91, "remote": True},
+    {"name": "=HYPERLINK(\"x\")", "score": None, "remote": False},
+    {"name": "Zoë <b>&</b>\x01", "score": 7.5},
+]
+
+
+def test_csv_has_bom_header_and_neutralised_formulas():
+    data = b"".join(csv_stream(COLUMNS, ROWS)).decode("utf-8")
+    assert data.startswith("﻿")
+    rows = list(csv.reader(io.StringIO(data[1:])))
+    assert rows == [
+        ["Name", "Score", "Remote"],
+        ["Ada", "91", "true"],
+        ["'=HYPERLINK(\"x\")", "", "false"],
+        ["Zoë <b>&</b>\x01", "7.5", ""],
+    ]
+
+
+def test_csv_is_streamed_in_chunks(monkeypatch):
+    monkeypatch.setattr(tabular_export, "FLUSH_ROWS", 2)
+    chunks = list(csv_stream(COLUMNS, ({"name": str(i)} for i in range(5))))
+    assert len(chunks) == 3
+    assert b"".join(chunks).decode("utf-8").count("\r\n") == 6
+
+
+def _sheet(data: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        assert 'name="Applications"' in zf.read("xl/workbook.xml").decode()
+        return zf.read("xl/worksheets/sheet1.xml").decode("utf-8")
+
+
+def test_xlsx_is_a_valid_workbook_with_typed_cells():
+    sheet = _sheet(b"".join(xlsx_stream(COLUMNS, ROWS, "Applications")))
+    rows = re.findall(r"<row>(.*?)</row>", sheet)
+    assert len(rows) == 4
+    assert "<c><v>91</v></c>" in rows[1]
+    assert '<t xml:space="preserve">true</t>' in rows[1]
+    assert "<c/>" in rows[2]
+    # Markup is escaped and control characters dropped
+    assert "Zoë &lt;b&gt;&amp;&lt;/b&gt;</t>" in rows[3]
+
+
+def test_xlsx_is_streamed_in_chunks(monkeypatch):
+    monkeypatch.setattr(tabular_export, "FLUSH_ROWS", 100)
+    # Random names, so the deflater hands bytes back while rows are still coming
+    rows = ({"name": uuid.uuid4().hex * 4, "score": i} for i in range(2000))
+    chunks = list(xlsx_stream(COLUMNS, rows, "Applications"))
+    assert len(chunks) > 3
+    assert len(re.findall(r"<row>", _sheet(b"".join(chunks)))) == 2001
+
+
+@pytest.fixture
+def applications(fake, job):
+    candidates = fake.seed("users", [
+        {"email": f"c{i}@example.com", "role": "candidate", "full_name": f"Candidate {i}"} for i in range(5)
+    ])
+    return fake.seed("job_applications", [
+        {"job_id": job["id"], "candidate_id": c["id"], "ai_score": 10 * i} for i, c in enumerate(candidates)
+    ])
+
+
+def test_export_rows_are_read_in_keyset_pages(fake, recruiter, applications):
+    fake.db.reset_counters()
+    rows = list(RecruiterService(fake).iter_recruiter_applications(recruiter["id"], chunk_size=2, sort="ai_score"))
+
+    assert [r["ai_score"] for r in rows] == [40, 30, 20, 10, 0]
+    assert {r["job_title"] for r in rows} == {"Backend Engineer"}
+    assert rows[0]["candidate_name"] == "Candidate 4"
+    assert fake.db.calls_by_table == {"job_applications": 3}
@@ -0,0 +1,81 @@
+import threading
+
+import services.notification_service as notification_service
+from services.notification_service import NotificationService
+from services.unread_counter import UnreadCounter
+
+
+def _racing(work, change):
+    """Runs `work(block)` on a thread and calls `change()` while `block` is running."""
+    started, resume = threading.Event(), threading.Event()
+    result = {}
+
+    def block(*_):
+        started.set()
+        resume.wait(5)
+        return 7
+
+    thread = threading.Thread(target=lambda: result.setdefault("value", work(block)))
+    thread.start()
+    started.wait(5)
+    change()
+    resume.set()
+    thread.join(5)
+    return result["value"]
+
+
+def test_counts_are_loaded_once_and_kept_current():
+    counter = UnreadCounter(reconcile_seconds=60)
+    assert counter.get("u", lambda _: 4) == 4
+    counter.incr("u", 2)
+    counter.decr("u")
+    assert counter.get("u", lambda _: 0) == 5
+    counter.set_after("u", 0, lambda: None)
+    counter.decr("u")
+    assert counter.get("u", lambda _: 9) == 0
+    assert not counter._loading
+
+
+def test_unknown_users_are_not_created_by_increments():
+    counter = UnreadCounter(reconcile_seconds=60)
+    counter.incr("u")
+    assert counter.get("u", lambda _: 3) == 3
+
+
+def test_load_racing_an_increment_is_not_stored():
+    counter = UnreadCounter(reconcile_seconds=60)
+    assert _racing(lambda load: counter.get("u", load), lambda: counter.incr("u")) == 7
+    assert counter.get("u", lambda _: 4) == 4
+
+
+def test_mark_all_racing_an_increment_is_recounted():
+    counter = UnreadCounter(reconcile_seconds=60)
+    counter.get("u", lambda _: 2)
+    _racing(lambda write: counter.set_after("u", 0, write), lambda: counter.incr("u"))
+    assert counter.get("u", lambda _: 1) == 1
+
+
+def test_load_racing_mark_all_is_not_stored():
+    counter = UnreadCounter(reconcile_seconds=60)
+    # The load read the rows before they were marked read
+    _racing(lambda load: counter.get("u", load), lambda: counter.set_after("u", 0, lambda: None))
+    assert counter.get("u", lambda _: 5) == 0
+
+
+def test_due_entries_are_reconciled():
+    counter = UnreadCounter(reconcile_seconds=-1)
+    assert counter.get("u", lambda _: 2) == 2
+    assert counter.get("u", lambda _: 3) == 3
+
+
+def test_notification_service_keeps_the_badge_current(fake, recruiter, monkeypatch):
+    monkeypatch.setattr(notification_service, "unread_counter", UnreadCounter(reconcile_seconds=60))
+    svc = NotificationService(fake)
+    for i in range(3):
+        svc.create_notification({"user_id": recruiter["id"], "title": "t", "message": f"m{i}"})
+    assert svc.unread_count(recruiter["id"]) == 3
+
+    svc.mark_all_as_read(recruiter["id"])
+    fake.db.reset_counters()
+    assert svc.unread_count(recruiter["id"]) == 0
+    assert fake.db.call_count == 0
@@ -103,6 +103,21 @@ class EmailTemplates:
             "text": f"Your password was updated. Login at {self.frontend_url}",
         }
 
+    def notification(self, user_data: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "subject": user_data.get("title") or "New notification on Skreenit",
+            "html": self._render(
+                "notification.html",
+                {
+                    "name": user_data.get("full_name"),
+                    "title": user_data.get("title"),
+                    "message": user_data.get("message"),
+                    "login_url": self.frontend_url,
+                },
+            ),
+            "text": f"{user_data.get('message')} Login at {self.frontend_url}",
+        }
+
 
 # ---------------------------------------------------------
 # DEFAULT TEMPLATE GENERATOR (RUNS ONLY IF FILES MISSING)
@@ -157,6 +172,16 @@ def write_default_templates() -> None:
     <p>Dear {{ name }},</p>
     <p><a href="{{ login_url }}">{{ login_url }}</a></p>
 </body>
+</html>""",
+
+        "notification.html": """<!DOCTYPE html>
+<html>
+<body>
+    <h2>{{ title }}</h2>
+    <p>Dear {{ name }},</p>
+    <p>{{ message }}</p>
+    <p><a href="{{ login_url }}">{{ login_url }}</a></p>
+</body>
 </html>""",
     }
 
@@ -1,6 +1,7 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+from fastapi.encoders import jsonable_encoder
 from fastapi import HTTPException
 from utils_others.logger import logger
 
@@ -69,10 +70,12 @@ def register_exception_handlers(app: FastAPI) -> None:
     # -----------------------------
     @app.exception_handler(RequestValidationError)
     async def handle_validation_error(request: Request, exc: RequestValidationError):
+        # Custom validators put the raised ValueError in ctx; send its message
+        errors = jsonable_encoder(exc.errors(), custom_encoder={Exception: str})
         logger.error(
             "Request validation failed",
             extra={
-                "errors": exc.errors(),
+                "errors": errors,
                 "path": request.url.path,
                 "request_id": getattr(request.state, "request_id", None),
             },
@@ -82,7 +85,7 @@ def register_exception_handlers(app: FastAPI) -> None:
             content={
                 "ok": False,
                 "error": "validation_error",
-                "message": exc.errors(),
+                "message": errors,
                 "request_id": getattr(request.state, "request_id", None),
             },
         )
@@ -109,6 +112,8 @@ def register_exception_handlers(app: FastAPI) -> None:
                 "message": exc.detail,
                 "request_id": getattr(request.state, "request_id", None),
             },
+            # e.g. Retry-After on 429/503
+            headers=getattr(exc, "headers", None),
         )
 
     # -----------------------------
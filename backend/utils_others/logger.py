@@ -34,7 +34,7 @@ class JSONFormatter(logging.Formatter):
             log_record["request_id"] = request_id
 
         # Other fields (only if explicitly passed in extra={})
-        for field in ["request_path", "request_method", "user_id", "role", "ip"]:
+        for field in ["request_path", "request_method", "user_id", "role", "ip", "db_queries", "db_by_method", "n_plus_one"]:
             if hasattr(record, field):
                 log_record[field] = getattr(record, field)
 
@@ -0,0 +1,184 @@
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource  # POSIX only
+except ImportError:  # pragma: no cover - Windows dev machines
+    resource = None
+
+
+MAX_SNAPSHOTS = int(os.getenv("MEMORY_MAX_SNAPSHOTS", "10"))
+
+# Frames from these files are allocation noise, not application code
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+_snapshots: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+_next_id = 1
+_lock = threading.Lock()
+
+
+class MemoryDiagnosticsError(Exception):
+    """Raised for invalid diagnostics operations (e.g. unknown snapshot)."""
+    pass
+
+
+# ---------------------------------------------------------
+# TRACEMALLOC CONTROL
+# ---------------------------------------------------------
+def start_tracing(frames: int = 10) -> Dict[str, Any]:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(max(1, frames))
+    return tracing_status()
+
+
+def stop_tracing() -> Dict[str, Any]:
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    with _lock:
+        _snapshots.clear()
+    return tracing_status()
+
+
+def tracing_status() -> Dict[str, Any]:
+    tracing = tracemalloc.is_tracing()
+    current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+    return {
+        "tracing": tracing,
+        "frames": tracemalloc.get_traceback_limit() if tracing else 0,
+        "traced_current_bytes": current,
+        "traced_peak_bytes": peak,
+        "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+    }
+
+
+# ---------------------------------------------------------
+# SNAPSHOTS
+# ---------------------------------------------------------
+def take_snapshot(label: Optional[str] = None) -> Dict[str, Any]:
+    global _next_id
+
+    if not tracemalloc.is_tracing():
+        raise MemoryDiagnosticsError("tracemalloc is not running")
+
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, pattern) for pattern in _IGNORED_FILES]
+    )
+    total = sum(stat.size for stat in snapshot.statistics("filename"))
+
+    with _lock:
+        snapshot_id = _next_id
+        _next_id += 1
+        _snapshots[snapshot_id] = {
+            "id": snapshot_id,
+            "label": label,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "total_bytes": total,
+            "snapshot": snapshot,
+        }
+        while len(_snapshots) > MAX_SNAPSHOTS:
+            _snapshots.popitem(last=False)
+
+    return _describe(_snapshots[snapshot_id])
+
+
+def list_snapshots() -> List[Dict[str, Any]]:
+    with _lock:
+        return [_describe(s) for s in _snapshots.values()]
+
+
+def _describe(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in entry.items() if k != "snapshot"}
+
+
+def _get(snapshot_id: int) -> tracemalloc.Snapshot:
+    with _lock:
+        entry = _snapshots.get(snapshot_id)
+    if not entry:
+        raise MemoryDiagnosticsError(f"Snapshot {snapshot_id} not found")
+    return entry["snapshot"]
+
+
+def _check_key(key_type: str) -> str:
+    if key_type not in ("lineno", "filename", "traceback"):
+        raise MemoryDiagnosticsError("key_type must be 'lineno', 'filename' or 'traceback'")
+    return key_type
+
+
+# ---------------------------------------------------------
+# REPORTS
+# ---------------------------------------------------------
+def top_allocators(snapshot_id: int, key_type: str = "lineno", limit: int = 25) -> List[Dict[str, Any]]:
+    stats = _get(snapshot_id).statistics(_check_key(key_type))
+    return [
+        {
+            "location": _format_traceback(stat.traceback, key_type),
+            "size_bytes": stat.size,
+            "count": stat.count,
+        }
+        for stat in stats[:limit]
+    ]
+
+
+def diff_snapshots(old_id: int, new_id: int, key_type: str = "lineno", limit: int = 25) -> List[Dict[str, Any]]:
+    diff = _get(new_id).compare_to(_get(old_id), _check_key(key_type))
+    return [
+        {
+            "location": _format_traceback(stat.traceback, key_type),
+            "size_bytes": stat.size,
+            "size_diff_bytes": stat.size_diff,
+            "count": stat.count,
+            "count_diff": stat.count_diff,
+        }
+        for stat in diff[:limit]
+    ]
+
+
+def _format_traceback(traceback: tracemalloc.Traceback, key_type: str) -> Any:
+    if key_type == "filename":
+        return traceback[0].filename
+    if key_type == "lineno":
+        return f"{traceback[0].filename}:{traceback[0].lineno}"
+    return [f"{frame.filename}:{frame.lineno}" for frame in traceback]
+
+
+# ---------------------------------------------------------
+# PROCESS / GC STATS
+# ---------------------------------------------------------
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", "r") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def process_stats() -> Dict[str, Any]:
+    return {
+        "pid": os.getpid(),
+        "rss_bytes": _rss_bytes(),
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "threads": threading.active_count(),
+        "gc": {
+            "enabled": gc.isenabled(),
+            "counts": gc.get_count(),
+            "thresholds": gc.get_threshold(),
+            "generations": gc.get_stats(),
+            "garbage": len(gc.garbage),
+        },
+        "tracemalloc": tracing_status(),
+    }
@@ -0,0 +1,154 @@
+import os
+import sys
+import time
+import threading
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+# ---------------------------------------------------------
+# SAMPLING SESSION
+# ---------------------------------------------------------
+class ProfileSession:
+    """Collects folded stack samples for one request."""
+
+    __slots__ = ("thread_id", "stacks", "samples", "started")
+
+    def __init__(self, thread_id: int):
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started = time.perf_counter()
+
+
+def _fold(frame, max_depth: int = 128) -> str:
+    parts: List[str] = []
+    while frame is not None and len(parts) < max_depth:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    parts.reverse()
+    return ";".join(parts)
+
+
+class SamplingProfiler:
+    """
+    Statistical stack profiler.
+    A single daemon thread wakes every `interval` seconds while at least one
+    session is open and records the current stack of each session's thread.
+    Requests sharing the event loop thread share samples, so attribution is
+    approximate under heavy concurrency.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._sessions: List[ProfileSession] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def begin(self, thread_id: Optional[int] = None) -> ProfileSession:
+        session = ProfileSession(thread_id or threading.get_ident())
+        with self._lock:
+            self._sessions.append(session)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return session
+
+    def end(self, session: ProfileSession) -> ProfileSession:
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        return session
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while True:
+            with self._lock:
+                sessions = list(self._sessions)
+            if not sessions:
+                self._wakeup.clear()
+                self._wakeup.wait(timeout=5.0)
+                continue
+
+            frames = sys._current_frames()
+            folded: Dict[int, str] = {}
+            for session in sessions:
+                if session.thread_id == own_id:
+                    continue
+                frame = frames.get(session.thread_id)
+                if frame is None:
+                    continue
+                if session.thread_id not in folded:
+                    folded[session.thread_id] = _fold(frame)
+                session.stacks[folded[session.thread_id]] += 1
+                session.samples += 1
+
+            del frames
+            time.sleep(self.interval)
+
+
+# ---------------------------------------------------------
+# PROFILE STORE
+# ---------------------------------------------------------
+class ProfileStore:
+    """
+    Bounded in-memory store of captured profiles (per worker).
+    Profiles are kept in "folded stacks" form, which flamegraph.pl,
+    speedscope and inferno can load directly.
+    """
+
+    def __init__(self, max_profiles: int = 50):
+        self._profiles: deque = deque(maxlen=max_profiles)
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        request_id: Optional[str],
+        method: str,
+        path: str,
+        duration_ms: float,
+        reason: str,
+        session: ProfileSession,
+    ) -> Dict[str, Any]:
+        profile = {
+            "request_id": request_id,
+            "method": method,
+            "path": path,
+            "duration_ms": round(duration_ms, 3),
+            "reason": reason,
+            "samples": session.samples,
+            "pid": os.getpid(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "stacks": dict(session.stacks),
+        }
+        with self._lock:
+            self._profiles.append(profile)
+        return profile
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            profiles = list(self._profiles)
+        return [
+            {k: v for k, v in p.items() if k != "stacks"}
+            for p in reversed(profiles)
+        ]
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for profile in reversed(self._profiles):
+                if profile["request_id"] == request_id:
+                    return profile
+        return None
+
+    @staticmethod
+    def to_folded(profile: Dict[str, Any]) -> str:
+        lines = [f"{stack} {count}" for stack, count in sorted(profile["stacks"].items())]
+        return "\n".join(lines) + "\n"
+
+
+profiler = SamplingProfiler(interval=float(os.getenv("PROFILER_INTERVAL_MS", "5")) / 1000.0)
+profile_store = ProfileStore(max_profiles=int(os.getenv("PROFILER_MAX_PROFILES", "50")))
@@ -0,0 +1,154 @@
+import os
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Same (table, operation, filter columns) issued this many times in one
+# request is reported as an N+1 pattern
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "3"))
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SERVICES_DIR = os.path.join(_BACKEND_DIR, "services") + os.sep
+_ROUTERS_DIR = os.path.join(_BACKEND_DIR, "routers") + os.sep
+
+# Data-layer modules are never the "caller" of a query
+_SKIP_FILES = ("instrumented_client.py", "supabase_client.py", "fake_supabase_client.py")
+
+
+class QueryStats:
+    """Supabase round trips issued while handling one request."""
+
+    __slots__ = ("total", "by_table", "by_method", "signatures", "signature_methods")
+
+    def __init__(self):
+        self.total = 0
+        self.by_table: Counter = Counter()
+        self.by_method: Counter = Counter()
+        self.signatures: Counter = Counter()
+        self.signature_methods: Dict[Tuple[str, str, Tuple[str, ...]], Counter] = {}
+
+    def record(self, table: str, operation: str, filters: Tuple[str, ...], method: str) -> None:
+        signature = (table, operation, tuple(sorted(set(filters))))
+        self.total += 1
+        self.by_table[table] += 1
+        self.by_method[method] += 1
+        self.signatures[signature] += 1
+        self.signature_methods.setdefault(signature, Counter())[method] += 1
+
+    def n_plus_one(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Dict[str, Any]]:
+        findings = []
+        for (table, operation, filters), count in self.signatures.most_common():
+            if count < threshold:
+                break
+            findings.append({
+                "table": table,
+                "operation": operation,
+                "filters": list(filters),
+                "count": count,
+                "methods": dict(self.signature_methods[(table, operation, filters)]),
+            })
+        return findings
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "by_table": dict(self.by_table.most_common()),
+            "by_method": dict(self.by_method.most_common()),
+            "n_plus_one": self.n_plus_one(),
+        }
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+# ---------------------------------------------------------
+# RECORDING (called by InstrumentedClient)
+# ---------------------------------------------------------
+def record_query(table: str, operation: str, filters: Tuple[str, ...] = ()) -> None:
+    stats = current_query_stats.get()
+    if stats is None:
+        return
+    stats.record(table, operation, filters, _calling_method())
+
+
+def _calling_method() -> str:
+    """
+    Nearest service method on the stack (e.g. 'ApplicantService.get_profile'),
+    falling back to the router function for queries issued from routers.
+    """
+    router_fn = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not filename.endswith(_SKIP_FILES):
+            if filename.startswith(_SERVICES_DIR):
+                owner = frame.f_locals.get("self")
+                if owner is not None:
+                    return f"{type(owner).__name__}.{frame.f_code.co_name}"
+                return f"{os.path.basename(filename)[:-3]}.{frame.f_code.co_name}"
+            if router_fn is None and filename.startswith(_ROUTERS_DIR):
+                router_fn = f"{os.path.basename(filename)[:-3]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return router_fn or "unknown"
+
+
+# ---------------------------------------------------------
+# SCOPES
+# ---------------------------------------------------------
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, allow_n_plus_one: bool = False) -> Iterator[QueryStats]:
+    """
+    Test helper for code running in the current thread/context:
+
+        with assert_max_queries(3):
+            ApplicantService().get_profile(user_id)
+    """
+    with track_queries() as stats:
+        yield stats
+    _check_budget(stats.total, max_queries, stats.by_table, stats.n_plus_one(), allow_n_plus_one)
+
+
+def assert_endpoint_queries(response: Any, max_queries: int, allow_n_plus_one: bool = False) -> int:
+    """
+    Test helper for HTTP responses (TestClient/httpx). Reads the debug headers
+    set by QueryStatsMiddleware, so QUERY_DEBUG_HEADERS must be enabled.
+    """
+    header = response.headers.get("X-DB-Queries")
+    if header is None:
+        raise AssertionError("X-DB-Queries header missing; set QUERY_DEBUG_HEADERS=true")
+    n_plus_one = response.headers.get("X-DB-N-Plus-One")
+    findings = [{"pattern": p} for p in n_plus_one.split(", ")] if n_plus_one else []
+    _check_budget(int(header), max_queries, response.headers.get("X-DB-Tables"), findings, allow_n_plus_one)
+    return int(header)
+
+
+def _check_budget(total: int, max_queries: int, tables: Any, findings: List[Dict[str, Any]], allow_n_plus_one: bool) -> None:
+    if total > max_queries:
+        raise AssertionError(f"Expected at most {max_queries} Supabase queries, got {total} ({tables})")
+    if findings and not allow_n_plus_one:
+        raise AssertionError(f"N+1 query pattern detected: {findings}")
+
+
+# ---------------------------------------------------------
+# HEADER FORMATTING
+# ---------------------------------------------------------
+def format_tables(stats: QueryStats) -> str:
+    return ",".join(f"{table}={count}" for table, count in stats.by_table.most_common())
+
+
+def format_n_plus_one(findings: List[Dict[str, Any]]) -> str:
+    return ", ".join(
+        f"{f['table']}.{f['operation']}({','.join(f['filters'])})x{f['count']}" for f in findings
+    )
@@ -10,8 +10,13 @@ ROLES_PERMISSIONS = {
         "profile:view",
         "profile:edit",
         "applications:view",
+        "applications:edit",
+        "applications:export",
+        "candidates:search",
+        "skills:view",
         "dashboard:view",
         "notifications:create",
+        "notifications:view",
         "analytics:view"
     ],
     "candidate": [
@@ -20,7 +25,9 @@ ROLES_PERMISSIONS = {
         "profile:edit",
         "applications:create",
         "applications:view",
+        "skills:view",
         "dashboard:view",
+        "notifications:view",
         "video:upload"
     ],
     "admin": ["*"]
@@ -2,6 +2,7 @@ import os
 import time
 from typing import List, Union, Optional, Dict, Any
 from utils_others.logger import logger
+from utils_others.tracing import traced
 
 
 class EmailError(Exception):
@@ -9,6 +10,7 @@ class EmailError(Exception):
     pass
 
 
+@traced("email.send")
 def send_email(
     to: Union[str, List[str]],
     subject: str,
@@ -0,0 +1,166 @@
+import io
+import os
+import re
+import hashlib
+import zipfile
+import unicodedata
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional
+
+from utils_others.logger import logger
+
+# Bounds per document; keeps a worker's memory flat whatever gets uploaded
+MAX_RESUME_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+MAX_TEXT_CHARS = int(os.getenv("RESUME_TEXT_MAX_CHARS", "50000"))
+MAX_PDF_PAGES = int(os.getenv("RESUME_MAX_PDF_PAGES", "30"))
+# Uncompressed size of word/document.xml (zip bomb guard)
+MAX_DOCX_XML_BYTES = int(os.getenv("RESUME_MAX_DOCX_XML_BYTES", str(20 * 1024 * 1024)))
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_SPACES_RE = re.compile(r"[ \t ]+")
+
+
+class ResumeExtractionError(Exception):
+    """Raised when a resume cannot be read (unsupported, too large, corrupt)."""
+    pass
+
+
+class _BoundedText:
+    """Collects text pieces until MAX_TEXT_CHARS, then signals the caller to stop."""
+
+    def __init__(self, limit: int = MAX_TEXT_CHARS):
+        self.parts: List[str] = []
+        self.size = 0
+        self.limit = limit
+        self.truncated = False
+
+    def add(self, text: str) -> bool:
+        if self.truncated or not text:
+            return not self.truncated
+        room = self.limit - self.size
+        if len(text) > room:
+            text = text[:room]
+            self.truncated = True
+        self.parts.append(text)
+        self.size += len(text)
+        return not self.truncated
+
+    def value(self) -> str:
+        return "".join(self.parts)
+
+
+# ---------------------------------------------------------
+# HELPERS
+# ---------------------------------------------------------
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def detect_format(filename: Optional[str], data: bytes) -> str:
+    if data[:5] == b"%PDF-":
+        return "pdf"
+    if data[:4] == b"PK\x03\x04":
+        return "docx"
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext in (".txt", ".md"):
+        return "text"
+    raise ResumeExtractionError(f"Unsupported resume format: {ext or 'unknown'}")
+
+
+def normalize_text(text: str) -> str:
+    """NFKC, collapsed spaces, no blank lines, capped at MAX_TEXT_CHARS."""
+    text = unicodedata.normalize("NFKC", text).replace("\x00", "")
+    lines = (_SPACES_RE.sub(" ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)[:MAX_TEXT_CHARS]
+
+
+# ---------------------------------------------------------
+# EXTRACTORS
+# ---------------------------------------------------------
+def extract_pdf(data: bytes) -> _BoundedText:
+    # ---------------------------------------------------------
+    # Import pypdf safely (optional dependency)
+    # ---------------------------------------------------------
+    try:
+        from pypdf import PdfReader
+    except Exception as e:
+        logger.error(f"pypdf import failed: {str(e)}")
+        raise ResumeExtractionError(f"PDF support unavailable: {e}")
+
+    out = _BoundedText()
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        for number, page in enumerate(reader.pages):
+            if number >= MAX_PDF_PAGES:
+                out.truncated = True
+                break
+            if not out.add((page.extract_text() or "") + "\n"):
+                break
+    except ResumeExtractionError:
+        raise
+    except Exception as e:
+        raise ResumeExtractionError(f"Unreadable PDF: {e}")
+    return out
+
+
+def extract_docx(data: bytes) -> _BoundedText:
+    """
+    Streams word/document.xml with iterparse and clears each element once
+    read, so memory stays bounded by the largest paragraph.
+    """
+    out = _BoundedText()
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            try:
+                info = archive.getinfo("word/document.xml")
+            except KeyError:
+                raise ResumeExtractionError("Not a Word document (word/document.xml missing)")
+            if info.file_size > MAX_DOCX_XML_BYTES:
+                raise ResumeExtractionError("Word document is too large")
+
+            with archive.open(info) as xml:
+                for _, elem in ET.iterparse(xml, events=("end",)):
+                    tag = elem.tag
+                    if tag == _W_NS + "t":
+                        keep_going = out.add(elem.text or "")
+                    elif tag in (_W_NS + "tab", _W_NS + "br"):
+                        keep_going = out.add(" ")
+                    elif tag == _W_NS + "p":
+                        keep_going = out.add("\n")
+                        elem.clear()
+                    else:
+                        keep_going = True
+                    if not keep_going:
+                        break
+    except ResumeExtractionError:
+        raise
+    except (zipfile.BadZipFile, ET.ParseError) as e:
+        raise ResumeExtractionError(f"Unreadable Word document: {e}")
+    return out
+
+
+def extract_text(filename: Optional[str], data: bytes) -> Dict[str, Any]:
+    """
+    Entry point (runs inside worker processes).
+    Returns {"text", "hash", "format", "chars", "truncated"}.
+    """
+    if len(data) > MAX_RESUME_BYTES:
+        raise ResumeExtractionError(f"Resume exceeds {MAX_RESUME_BYTES} bytes")
+
+    fmt = detect_format(filename, data)
+    if fmt == "pdf":
+        raw = extract_pdf(data)
+    elif fmt == "docx":
+        raw = extract_docx(data)
+    else:
+        raw = _BoundedText()
+        raw.add(data.decode("utf-8", errors="replace"))
+
+    text = normalize_text(raw.value())
+    return {
+        "text": text,
+        "hash": content_hash(data),
+        "format": fmt,
+        "chars": len(text),
+        "truncated": raw.truncated,
+    }
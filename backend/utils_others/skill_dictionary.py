@@ -0,0 +1,114 @@
+import bisect
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils_others.skills_config import SKILLS
+
+# Autocomplete match kinds, best first
+_MATCH_NAME = 0    # prefix of the canonical name ("java" -> "JavaScript")
+_MATCH_WORD = 1    # prefix of a later word ("learn" -> "Machine Learning")
+_MATCH_ALIAS = 2   # prefix of an alias ("golang" -> "Go")
+
+
+def skill_key(name: Optional[str]) -> str:
+    """Lookup key: lower case, single spaces, no surrounding whitespace."""
+    return " ".join((name or "").lower().split())
+
+
+class SkillDictionary:
+    """
+    Canonical skill names with an alias map (exact lookups) and a sorted
+    key array for prefix autocomplete (bisect into the matching range).
+    Unknown skills are kept as free text, tidied but not rewritten.
+    """
+
+    def __init__(self, skills: Dict[str, List[str]] = SKILLS):
+        self._canonical: Dict[str, str] = {}
+        self._spellings: Dict[str, List[str]] = {}
+        entries: List[Tuple[str, int, str]] = []
+
+        for name in skills:
+            key = skill_key(name)
+            self._canonical[key] = name
+            entries.append((key, _MATCH_NAME, name))
+            words = key.split()
+            for i in range(1, len(words)):
+                entries.append((" ".join(words[i:]), _MATCH_WORD, name))
+
+        # Canonical names win over aliases that happen to collide with them
+        for name, aliases in skills.items():
+            self._spellings[name] = list(dict.fromkeys([name, skill_key(name), *aliases]))
+            for alias in aliases:
+                key = skill_key(alias)
+                self._canonical.setdefault(key, name)
+                if key != skill_key(name):
+                    entries.append((key, _MATCH_ALIAS, name))
+
+        entries.sort()
+        self._keys = [entry[0] for entry in entries]
+        self._entries = entries
+
+    def __len__(self) -> int:
+        return len(set(self._canonical.values()))
+
+    # ---------------------------------------------------------
+    # NORMALIZATION
+    # ---------------------------------------------------------
+    def canonicalize(self, name: Optional[str]) -> str:
+        """'js ' -> 'JavaScript'; unknown skills come back with whitespace tidied."""
+        return self._canonical.get(skill_key(name)) or " ".join((name or "").split())
+
+    def normalize(self, name: Optional[str]) -> str:
+        """Comparison key: aliases of one skill share it ('JS' and 'javascript' -> 'javascript')."""
+        return skill_key(self.canonicalize(name))
+
+    def is_known(self, name: Optional[str]) -> bool:
+        return skill_key(name) in self._canonical
+
+    def spellings(self, name: Optional[str]) -> List[str]:
+        """Stored forms of a skill: 'js' -> ['JavaScript', 'javascript', 'js', ...]; unknown skills as given."""
+        canonical = self.canonicalize(name)
+        if not canonical:
+            return []
+        return self._spellings.get(canonical) or list(dict.fromkeys([canonical, skill_key(canonical)]))
+
+    def canonicalize_many(self, names: Iterable[Optional[str]]) -> List[str]:
+        """Canonical names in input order, without blanks or duplicates."""
+        seen = set()
+        result = []
+        for name in names:
+            canonical = self.canonicalize(name)
+            key = skill_key(canonical)
+            if key and key not in seen:
+                seen.add(key)
+                result.append(canonical)
+        return result
+
+    # ---------------------------------------------------------
+    # AUTOCOMPLETE
+    # ---------------------------------------------------------
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Skills whose name, later word or alias starts with `prefix`.
+        Exact matches first, then names before words before aliases,
+        then shorter names.
+        """
+        key = skill_key(prefix)
+        if not key or limit <= 0:
+            return []
+        lo = bisect.bisect_left(self._keys, key)
+        hi = bisect.bisect_left(self._keys, key + "\uffff", lo)
+
+        best: Dict[str, Tuple[Tuple[int, int, int, str], str]] = {}
+        for matched, kind, name in self._entries[lo:hi]:
+            rank = (0 if matched == key else 1, kind, len(name), name)
+            if name not in best or rank < best[name][0]:
+                best[name] = (rank, matched)
+
+        ordered = sorted(best.items(), key=lambda item: item[1][0])[:limit]
+        return [
+            {"name": name, "alias": matched if rank[1] == _MATCH_ALIAS else None}
+            for name, (rank, matched) in ordered
+        ]
+
+
+skill_dictionary = SkillDictionary()
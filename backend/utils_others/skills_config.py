@@ -0,0 +1,170 @@
+# Canonical Skill Dictionary
+
+# "Canonical Name": ["aliases", "and", "common", "spellings"]
+# Matching is case-insensitive and ignores repeated whitespace, so only
+# genuinely different spellings need to be listed.
+SKILLS = {
+    # Languages
+    "JavaScript": ["js", "javascript", "ecmascript", "es6", "es2015", "vanilla js"],
+    "TypeScript": ["ts", "typescript"],
+    "Python": ["python3", "python 3", "py"],
+    "Java": ["java se", "java ee", "j2ee", "core java"],
+    "C": ["c language", "ansi c"],
+    "C++": ["cpp", "c plus plus", "cplusplus"],
+    "C#": ["c sharp", "csharp", "c#.net"],
+    "Go": ["golang", "go lang"],
+    "Rust": ["rust lang", "rustlang"],
+    "Ruby": ["ruby lang"],
+    "PHP": ["php7", "php 7", "php8", "php 8"],
+    "Kotlin": [],
+    "Swift": ["swift ui", "swiftui"],
+    "Objective-C": ["objective c", "objc", "obj-c"],
+    "Scala": [],
+    "R": ["r language", "r programming"],
+    "MATLAB": ["matlab"],
+    "Perl": [],
+    "Dart": [],
+    "Elixir": [],
+    "Haskell": [],
+    "Bash": ["shell", "shell scripting", "bash scripting", "sh"],
+    "PowerShell": ["powershell", "power shell"],
+    "SQL": ["structured query language", "t-sql", "tsql", "pl/sql", "plsql"],
+    "HTML": ["html5", "html 5"],
+    "CSS": ["css3", "css 3"],
+    "Solidity": [],
+
+    # Frontend
+    "React": ["reactjs", "react.js", "react js"],
+    "React Native": ["react-native", "reactnative"],
+    "Angular": ["angularjs", "angular.js", "angular js", "angular 2+"],
+    "Vue.js": ["vue", "vuejs", "vue js"],
+    "Next.js": ["nextjs", "next js"],
+    "Nuxt.js": ["nuxt", "nuxtjs"],
+    "Svelte": ["sveltekit"],
+    "Redux": ["redux toolkit", "rtk"],
+    "jQuery": ["jquery"],
+    "Tailwind CSS": ["tailwind", "tailwindcss"],
+    "Bootstrap": [],
+    "Sass": ["scss"],
+    "Webpack": [],
+    "Figma": [],
+
+    # Backend
+    "Node.js": ["node", "nodejs", "node js"],
+    "Express.js": ["express", "expressjs", "express js"],
+    "NestJS": ["nest.js", "nestjs"],
+    "Django": ["django rest framework", "drf"],
+    "Flask": [],
+    "FastAPI": ["fast api", "fastapi"],
+    "Spring Boot": ["spring", "springboot", "spring framework"],
+    "Ruby on Rails": ["rails", "ror", "ruby on rails"],
+    "Laravel": [],
+    ".NET": ["dotnet", "dot net", ".net core", "asp.net", "asp.net core"],
+    "GraphQL": ["graph ql"],
+    "REST APIs": ["rest", "rest api", "restful", "restful apis", "restful api"],
+    "gRPC": ["grpc"],
+    "Microservices": ["microservice", "micro services", "microservices architecture"],
+
+    # Data stores
+    "PostgreSQL": ["postgres", "postgresql", "psql", "pg"],
+    "MySQL": ["my sql", "mariadb"],
+    "SQLite": [],
+    "Microsoft SQL Server": ["mssql", "ms sql", "sql server"],
+    "Oracle Database": ["oracle", "oracle db"],
+    "MongoDB": ["mongo", "mongo db"],
+    "Redis": [],
+    "Elasticsearch": ["elastic search", "elastic", "opensearch"],
+    "Cassandra": ["apache cassandra"],
+    "DynamoDB": ["dynamo db", "aws dynamodb"],
+    "Firebase": ["firestore"],
+    "Supabase": [],
+    "Snowflake": [],
+    "BigQuery": ["big query", "google bigquery"],
+
+    # Cloud & DevOps
+    "AWS": ["amazon web services", "aws cloud"],
+    "Azure": ["microsoft azure", "ms azure"],
+    "Google Cloud": ["gcp", "google cloud platform"],
+    "Docker": ["docker compose"],
+    "Kubernetes": ["k8s", "kube"],
+    "Terraform": ["hashicorp terraform"],
+    "Ansible": [],
+    "Jenkins": [],
+    "GitHub Actions": ["gh actions", "github actions"],
+    "GitLab CI": ["gitlab ci/cd", "gitlab-ci"],
+    "CI/CD": ["ci cd", "cicd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Linux": ["unix", "ubuntu", "centos", "rhel"],
+    "Git": ["github", "gitlab", "bitbucket", "version control"],
+    "Nginx": [],
+    "Prometheus": [],
+    "Grafana": [],
+
+    # Data & ML
+    "Machine Learning": ["ml", "machine-learning"],
+    "Deep Learning": ["dl", "deep-learning"],
+    "Natural Language Processing": ["nlp"],
+    "Computer Vision": ["opencv"],
+    "Large Language Models": ["llm", "llms", "generative ai", "genai", "gen ai"],
+    "Data Science": [],
+    "Data Analysis": ["data analytics", "analytics"],
+    "Data Engineering": [],
+    "Statistics": ["statistical analysis"],
+    "TensorFlow": ["tensor flow", "tf", "keras"],
+    "PyTorch": ["torch", "py torch"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "Pandas": [],
+    "NumPy": ["numpy"],
+    "Apache Spark": ["spark", "pyspark", "spark sql"],
+    "Apache Kafka": ["kafka"],
+    "Apache Airflow": ["airflow"],
+    "Hadoop": ["apache hadoop", "hdfs", "mapreduce"],
+    "ETL": ["elt", "etl pipelines", "data pipelines"],
+    "Tableau": [],
+    "Power BI": ["powerbi", "power-bi", "microsoft power bi"],
+    "Excel": ["ms excel", "microsoft excel", "advanced excel"],
+
+    # Mobile
+    "Android": ["android development", "android sdk"],
+    "iOS": ["ios development"],
+    "Flutter": [],
+
+    # Testing & quality
+    "Unit Testing": ["unit tests"],
+    "Test Automation": ["automation testing", "qa automation"],
+    "Selenium": ["selenium webdriver"],
+    "Cypress": [],
+    "Jest": [],
+    "pytest": [],
+    "Manual Testing": ["qa", "quality assurance"],
+
+    # Security & networking
+    "Cybersecurity": ["cyber security", "information security", "infosec"],
+    "Penetration Testing": ["pentesting", "pen testing", "ethical hacking"],
+    "Networking": ["tcp/ip", "computer networks"],
+    "OAuth": ["oauth2", "oauth 2.0", "openid connect", "oidc"],
+
+    # Product, design & process
+    "Agile": ["agile methodology", "agile methodologies"],
+    "Scrum": ["scrum master"],
+    "Jira": ["atlassian jira"],
+    "Project Management": ["pmp"],
+    "Product Management": ["product manager"],
+    "UI/UX Design": ["ui", "ux", "ui design", "ux design", "ui/ux", "user experience", "user interface design"],
+    "Adobe Photoshop": ["photoshop"],
+    "Adobe Illustrator": ["illustrator"],
+    "System Design": ["systems design", "software architecture"],
+    "Data Structures and Algorithms": ["dsa", "data structures", "algorithms"],
+    "Object-Oriented Programming": ["oop", "oops", "object oriented programming"],
+
+    # Business
+    "Communication": ["communication skills", "verbal communication", "written communication"],
+    "Leadership": ["team leadership", "people management"],
+    "Sales": ["b2b sales", "inside sales"],
+    "Digital Marketing": ["online marketing", "performance marketing"],
+    "SEO": ["search engine optimization"],
+    "Content Writing": ["copywriting", "content creation"],
+    "Customer Support": ["customer service", "customer success"],
+    "Accounting": ["bookkeeping", "tally"],
+    "Financial Analysis": ["financial modelling", "financial modeling"],
+    "Recruitment": ["recruiting", "talent acquisition", "hiring"],
+}
@@ -0,0 +1,172 @@
+"""
+Incremental CSV / XLSX encoders for StreamingResponse.
+
+Both take an iterable of dict rows and yield bytes as they go, so memory
+stays flat however many rows are exported. The XLSX writer emits a minimal
+single-sheet workbook (inline strings, no shared string table) through a
+streaming zip, without any third-party dependency.
+"""
+
+import csv
+import io
+import zipfile
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+from xml.sax.saxutils import escape
+
+# (row key, column header)
+Columns = List[Tuple[str, str]]
+
+# Leading characters that make spreadsheet apps treat a cell as a formula
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# Rows buffered before bytes are handed to the response
+FLUSH_ROWS = 500
+
+
+def _cell_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+# ---------------------------------------------------------
+# CSV
+# ---------------------------------------------------------
+def _csv_safe(value: Any) -> Any:
+    """Neutralises formula injection in text cells (names, titles, ...)."""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_stream(columns: Columns, rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM so Excel opens UTF-8 names correctly
+    buffer.write("\ufeff")
+    writer.writerow([header for _, header in columns])
+
+    pending = 0
+    for row in rows:
+        writer.writerow([_csv_safe(_cell_text(row.get(key))) for key, _ in columns])
+        pending += 1
+        if pending >= FLUSH_ROWS:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode("utf-8")
+
+
+# ---------------------------------------------------------
+# XLSX
+# ---------------------------------------------------------
+class _Drain(io.RawIOBase):
+    """Write-only, non-seekable sink; zipfile falls back to data descriptors."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+def _xml_text(text: str) -> str:
+    # XML 1.0 forbids most control characters
+    cleaned = "".join(ch for ch in text if ch >= " " or ch in "\t\n")
+    return escape(cleaned)
+
+
+def _xlsx_row(values: List[Any]) -> str:
+    cells = []
+    for value in values:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f"<c><v>{value}</v></c>")
+        elif value is None or value == "":
+            cells.append("<c/>")
+        else:
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{_xml_text(_cell_text(value))}</t></is></c>')
+    return "<row>" + "".join(cells) + "</row>"
+
+
+def xlsx_stream(columns: Columns, rows: Iterable[Dict[str, Any]], sheet_name: str = "Sheet1") -> Iterator[bytes]:
+    sink = _Drain()
+    now = datetime.now(timezone.utc).timetuple()[:6]
+
+    def entry(name: str) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(name, date_time=now)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        return info
+
+    with zipfile.ZipFile(sink, "w") as zf:
+        zf.writestr(entry("[Content_Types].xml"), _CONTENT_TYPES)
+        zf.writestr(entry("_rels/.rels"), _ROOT_RELS)
+        zf.writestr(entry("xl/workbook.xml"), _WORKBOOK.format(name=_xml_text(sheet_name[:31])))
+        zf.writestr(entry("xl/_rels/workbook.xml.rels"), _WORKBOOK_RELS)
+        yield sink.take()
+
+        with zf.open(entry("xl/worksheets/sheet1.xml"), "w", force_zip64=True) as sheet:
+            parts = [_SHEET_HEAD, _xlsx_row([header for _, header in columns])]
+            for row in rows:
+                parts.append(_xlsx_row([row.get(key) for key, _ in columns]))
+                if len(parts) >= FLUSH_ROWS:
+                    sheet.write("".join(parts).encode("utf-8"))
+                    parts = []
+                    chunk = sink.take()
+                    if chunk:
+                        yield chunk
+            parts.append(_SHEET_TAIL)
+            sheet.write("".join(parts).encode("utf-8"))
+    yield sink.take()
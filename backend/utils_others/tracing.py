@@ -0,0 +1,251 @@
+import os
+import sys
+import json
+import time
+import secrets
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from utils_others.logger import request_id_context
+
+
+# ---------------------------------------------------------
+# SPAN
+# ---------------------------------------------------------
+class Span:
+    """
+    A single timed operation inside a trace.
+    Ids follow the W3C Trace Context format (32 / 16 lowercase hex chars).
+    """
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "sampled",
+        "attributes", "status", "start_time", "_start_perf", "duration_ms",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+        sampled: bool = True,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = "ok"
+        self.start_time = time.time()
+        self._start_perf = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status = "error"
+        self.attributes["error.type"] = type(exc).__name__
+        self.attributes["error.message"] = str(exc)
+
+    def end(self) -> None:
+        if self.duration_ms is None:
+            self.duration_ms = round((time.perf_counter() - self._start_perf) * 1000, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Returned when tracing is disabled so callers never need to branch."""
+
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+# ---------------------------------------------------------
+# EXPORTERS
+# ---------------------------------------------------------
+class ConsoleSpanExporter:
+    """Writes one JSON line per finished span to stdout."""
+
+    def export(self, span: Span) -> None:
+        sys.stdout.write(json.dumps({"span": span.to_dict()}, default=str) + "\n")
+
+
+class FileSpanExporter:
+    """Appends one JSON line per finished span to a local file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(line)
+
+
+def _default_trace_file() -> str:
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.abspath(os.path.join(base_dir, "..", "..", "logs", "traces.jsonl"))
+
+
+def _build_exporter():
+    kind = os.getenv("TRACE_EXPORTER", "none").lower()
+    if kind == "console":
+        return ConsoleSpanExporter()
+    if kind == "file":
+        return FileSpanExporter(os.getenv("TRACE_FILE") or _default_trace_file())
+    return None
+
+
+_exporter = _build_exporter()
+
+
+def set_exporter(exporter) -> None:
+    """Replace the active exporter (None disables tracing)."""
+    global _exporter
+    _exporter = exporter
+
+
+def tracing_enabled() -> bool:
+    return _exporter is not None
+
+
+# ---------------------------------------------------------
+# W3C TRACEPARENT
+# ---------------------------------------------------------
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """
+    Parses a W3C 'traceparent' header: 00-<trace_id>-<parent_id>-<flags>.
+    Returns (trace_id, parent_id, sampled) or None when invalid.
+    """
+    if not header:
+        return None
+
+    parts = header.strip().lower().split("-")
+    if len(parts) < 4:
+        return None
+
+    version, trace_id, parent_id, flags = parts[:4]
+    if version == "ff" or len(version) != 2:
+        return None
+    if len(trace_id) != 32 or len(parent_id) != 16 or len(flags) != 2:
+        return None
+
+    try:
+        int(trace_id, 16)
+        int(parent_id, 16)
+        sampled = bool(int(flags, 16) & 0x01)
+    except ValueError:
+        return None
+
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+
+    return trace_id, parent_id, sampled
+
+
+def format_traceparent(span) -> Optional[str]:
+    if not getattr(span, "trace_id", None):
+        return None
+    flags = "01" if span.sampled else "00"
+    return f"00-{span.trace_id}-{span.span_id}-{flags}"
+
+
+# ---------------------------------------------------------
+# SPAN API
+# ---------------------------------------------------------
+@contextmanager
+def start_span(
+    name: str,
+    traceparent: Optional[str] = None,
+    **attributes: Any,
+) -> Iterator[Any]:
+    """
+    Opens a child span of the current span (or a new root span).
+    'traceparent' is only consulted for root spans (incoming HTTP requests).
+    """
+    if _exporter is None:
+        yield NOOP_SPAN
+        return
+
+    parent = current_span.get()
+    if parent is not None:
+        span = Span(name, parent.trace_id, parent.span_id, parent.sampled, attributes)
+    else:
+        remote = parse_traceparent(traceparent)
+        if remote:
+            trace_id, parent_id, sampled = remote
+            span = Span(name, trace_id, parent_id, sampled, attributes)
+        else:
+            span = Span(name, secrets.token_hex(16), None, True, attributes)
+
+    request_id = request_id_context.get()
+    if request_id:
+        span.attributes.setdefault("request_id", request_id)
+
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException as exc:
+        span.record_exception(exc)
+        raise
+    finally:
+        current_span.reset(token)
+        span.end()
+        if span.sampled:
+            _export(span)
+
+
+def _export(span: Span) -> None:
+    exporter = _exporter
+    if exporter is None:
+        return
+    try:
+        exporter.export(span)
+    except Exception:
+        # Tracing must never break a request
+        pass
+
+
+def traced(name: str):
+    """Decorator form of start_span() for plain functions."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with start_span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -9,6 +9,8 @@ if(logoImg) logoImg.src = `${authBase}/assets/images/logo.png`;
 
 // Global state for filtering
 let allApplications = [];
+let nextCursor = null; // keyset cursor for the next page (null = no more)
+const PAGE_SIZE = 50;
 
 document.addEventListener('DOMContentLoaded', () => {
     checkAuth();
@@ -48,25 +50,39 @@ function setupEventListeners() {
     document.getElementById('jobFilter').addEventListener('change', (e) => {
         filterApplications(document.getElementById('appSearch').value, e.target.value);
     });
+
+    // Sorting is done by the server; start again from the first page
+    document.getElementById('sortOrder').addEventListener('change', () => loadApplications());
+
+    document.getElementById('loadMoreBtn').addEventListener('click', () => loadApplications(true));
 }
 
-async function loadApplications() {
+async function loadApplications(append = false) {
     const container = document.getElementById('applicationListContainer');
-    if (container) container.innerHTML = '<div style="padding:2rem; text-align:center;"><i class="fas fa-spinner fa-spin fa-2x"></i></div>';
+    const loadMoreBtn = document.getElementById('loadMoreBtn');
+    if (container && !append) container.innerHTML = '<div style="padding:2rem; text-align:center;"><i class="fas fa-spinner fa-spin fa-2x"></i></div>';
+    if (loadMoreBtn) loadMoreBtn.disabled = true;
 
     try {
         // 1. Fetch Data First
         const urlParams = new URLSearchParams(window.location.search);
         const targetJobId = urlParams.get('job_id');
-        
-        let endpoint = '/recruiter/applications';
-        if (targetJobId) endpoint += `?job_id=${targetJobId}`;
+        const [sort, order] = document.getElementById('sortOrder').value.split(':');
 
-        const res = await backendGet(endpoint);
+        const params = new URLSearchParams({ sort, order, limit: PAGE_SIZE });
+        if (targetJobId) params.set('job_id', targetJobId);
+        if (append && nextCursor) params.set('cursor', nextCursor);
+
+        const res = await backendGet(`/recruiter/applications?${params}`);
         const json = await handleResponse(res);
         
         // 2. Assign to global variable
-        allApplications = json.data || [];
+        allApplications = append ? allApplications.concat(json.data || []) : (json.data || []);
+        nextCursor = json.next_cursor || null;
+        if (loadMoreBtn) {
+            loadMoreBtn.style.display = nextCursor ? 'inline-block' : 'none';
+            loadMoreBtn.disabled = false;
+        }
 
         // 3. Populate the dropdown
         populateJobFilter(allApplications);
@@ -81,8 +97,8 @@ async function loadApplications() {
             if (dropdown) dropdown.value = title;
         }
 
-        // 5. Finally, Render
-        renderList(allApplications);
+        // 5. Finally, Render (keeping any search/job filter the user has set)
+        filterApplications(document.getElementById('appSearch').value, document.getElementById('jobFilter').value);
 
     } catch (err) {
         console.error("Load failed:", err);
@@ -133,6 +149,7 @@ function renderList(apps) {
 function populateJobFilter(apps) {
     const jobTitles = [...new Set(apps.map(a => a.job_title))];
     const select = document.getElementById('jobFilter');
+    const selected = select.value;
     
     // Clear existing (except first)
     select.innerHTML = '<option value="all">All Jobs</option>';
@@ -143,6 +160,9 @@ function populateJobFilter(apps) {
         option.textContent = title;
         select.appendChild(option);
     });
+
+    // Keep the selection when more pages are loaded
+    if (jobTitles.includes(selected)) select.value = selected;
 }
 
 //Manual Filter Function
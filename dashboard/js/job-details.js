@@ -84,13 +84,19 @@ function renderJob(job) {
     if(req) req.innerHTML = (job.requirements || "No specific requirements listed.").replace(/\n/g, "<br>");
 }
 
+// Reused across retries on this page so a resubmit never creates a second application
+const applyIdempotencyKey = crypto.randomUUID();
+
 async function apply() {
     const btn = document.getElementById("applyBtn");
     btn.disabled = true;
     btn.textContent = "Applying...";
     
     try {
-        await backendPost('/applicant/apply', { job_id: jobId });
+        const res = await backendPost('/applicant/apply', { job_id: jobId }, {
+            headers: { "Idempotency-Key": applyIdempotencyKey }
+        });
+        await handleResponse(res);
         alert("Application Sent Successfully!");
         markAsApplied();
     } catch (err) {
@@ -103,8 +103,8 @@ async function loadDashboardData(userId) {
         // B. Fetch Applications
         let appsList = [];
         try {
-            // This endpoint must return ALL applications for the recruiter's jobs
-            const appsRes = await backendGet(`/recruiter/applications`); 
+            // Most recent applications (paged endpoint; the stats cover this window)
+            const appsRes = await backendGet(`/recruiter/applications?limit=100`); 
             const appsData = await handleResponse(appsRes);
             appsList = appsData?.data || appsData || [];
         } catch (e) { console.warn("Apps fetch error", e); }
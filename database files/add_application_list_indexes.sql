@@ -0,0 +1,12 @@
+-- Indexes for the recruiter applications listing
+-- (GET /api/v1/recruiter/applications: keyset pagination on (sort column, id)).
+-- Ownership is joined through jobs.created_by (idx_jobs_created_by), then each
+-- job's applications are read in sort order.
+CREATE INDEX IF NOT EXISTS idx_job_applications_job_applied
+    ON public.job_applications(job_id, applied_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_job_applications_job_score
+    ON public.job_applications(job_id, ai_score DESC NULLS LAST, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_job_applications_job_status
+    ON public.job_applications(job_id, status);
@@ -0,0 +1,8 @@
+-- Application statuses used by the API but missing from the original enum:
+-- 'shortlisted' (recruiter shortlists, incl. bulk updates) and
+-- 'interview_submitted' (set when a candidate finishes the video interview). Both are
+-- hiring funnel stages (services/funnel_service.py).
+-- ADD VALUE cannot run inside a transaction block before PostgreSQL 12;
+-- run this file on its own there.
+ALTER TYPE public.application_status ADD VALUE IF NOT EXISTS 'shortlisted' AFTER 'under_review';
+ALTER TYPE public.application_status ADD VALUE IF NOT EXISTS 'interview_submitted' AFTER 'interview_scheduled';
@@ -0,0 +1,5 @@
+-- Index for reaching candidates by skill when a job is posted or edited
+-- (RecommendationService.job_changed reads candidate_skills by skill_name
+-- instead of building the whole candidate search index).
+CREATE INDEX IF NOT EXISTS idx_candidate_skills_skill_name
+    ON public.candidate_skills(skill_name, candidate_id);
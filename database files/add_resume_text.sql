@@ -0,0 +1,11 @@
+-- Extracted resume text for search and match scoring.
+-- resume_hash is the sha256 of the uploaded file; re-uploads with the same
+-- content are not extracted again.
+ALTER TABLE public.candidate_profiles
+    ADD COLUMN IF NOT EXISTS resume_text TEXT,
+    ADD COLUMN IF NOT EXISTS resume_hash TEXT,
+    ADD COLUMN IF NOT EXISTS resume_extracted_at TIMESTAMP WITH TIME ZONE;
+
+-- Backfill scans profiles with a resume but no extracted text yet
+CREATE INDEX IF NOT EXISTS idx_candidate_profiles_resume_pending
+    ON public.candidate_profiles(id) WHERE resume_hash IS NULL AND resume_url IS NOT NULL;
@@ -0,0 +1,151 @@
+-- Pre-aggregated analytics event counts for charts.
+-- One row per (bucket, user, event type, job); job_id is the nil UUID for
+-- events that are not about a job, so it can be part of the primary key.
+--
+-- The API's ingest buffer calls increment_analytics_rollups once per bulk
+-- insert of analytics_events. compact_analytics_rollups recomputes a time
+-- range from the raw events (after a failed increment, a backfill, or as a
+-- periodic job: `python -m services.analytics_rollups --since ...`).
+CREATE TABLE IF NOT EXISTS public.analytics_rollups_hourly (
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    user_id UUID NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+    event_type TEXT NOT NULL,
+    job_id UUID NOT NULL DEFAULT '00000000-0000-0000-0000-000000000000',
+    count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, user_id, event_type, job_id)
+);
+
+CREATE TABLE IF NOT EXISTS public.analytics_rollups_daily (
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    user_id UUID NOT NULL REFERENCES public.users(id) ON DELETE CASCADE,
+    event_type TEXT NOT NULL,
+    job_id UUID NOT NULL DEFAULT '00000000-0000-0000-0000-000000000000',
+    count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, user_id, event_type, job_id)
+);
+
+-- Time-series reads are per user or per job over a bucket range
+CREATE INDEX IF NOT EXISTS idx_rollups_hourly_user ON public.analytics_rollups_hourly(user_id, bucket);
+CREATE INDEX IF NOT EXISTS idx_rollups_hourly_job ON public.analytics_rollups_hourly(job_id, bucket)
+    WHERE job_id <> '00000000-0000-0000-0000-000000000000';
+CREATE INDEX IF NOT EXISTS idx_rollups_daily_user ON public.analytics_rollups_daily(user_id, bucket);
+CREATE INDEX IF NOT EXISTS idx_rollups_daily_job ON public.analytics_rollups_daily(job_id, bucket)
+    WHERE job_id <> '00000000-0000-0000-0000-000000000000';
+-- Compaction scans raw events by time
+CREATE INDEX IF NOT EXISTS idx_analytics_events_created ON public.analytics_events(created_at);
+
+ALTER TABLE public.analytics_rollups_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.analytics_rollups_daily ENABLE ROW LEVEL SECURITY;
+
+
+-- p_rows: [{"bucket": "<hour>", "user_id": ..., "event_type": ..., "job_id": ..., "count": n}]
+-- with at most one entry per key (the caller pre-aggregates its batch).
+CREATE OR REPLACE FUNCTION public.increment_analytics_rollups(p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    v_rows INTEGER;
+BEGIN
+    CREATE TEMP TABLE incoming ON COMMIT DROP AS
+    SELECT date_trunc('hour', (r->>'bucket')::TIMESTAMPTZ) AS bucket,
+           (r->>'user_id')::UUID AS user_id,
+           r->>'event_type' AS event_type,
+           COALESCE((r->>'job_id')::UUID, '00000000-0000-0000-0000-000000000000'::UUID) AS job_id,
+           (r->>'count')::BIGINT AS count
+    FROM jsonb_array_elements(p_rows) AS r;
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+
+    INSERT INTO public.analytics_rollups_hourly AS h (bucket, user_id, event_type, job_id, count)
+    SELECT bucket, user_id, event_type, job_id, SUM(count) FROM incoming GROUP BY 1, 2, 3, 4
+    ON CONFLICT (bucket, user_id, event_type, job_id) DO UPDATE SET count = h.count + EXCLUDED.count;
+
+    INSERT INTO public.analytics_rollups_daily AS d (bucket, user_id, event_type, job_id, count)
+    SELECT date_trunc('day', bucket AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', user_id, event_type, job_id, SUM(count)
+    FROM incoming GROUP BY 1, 2, 3, 4
+    ON CONFLICT (bucket, user_id, event_type, job_id) DO UPDATE SET count = d.count + EXCLUDED.count;
+
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+
+-- Rebuilds the hourly buckets in [p_from, p_to) from analytics_events, then
+-- the daily buckets of every day those hours touch from the hourly table.
+CREATE OR REPLACE FUNCTION public.compact_analytics_rollups(p_from TIMESTAMPTZ, p_to TIMESTAMPTZ)
+RETURNS JSONB AS $$
+DECLARE
+    v_from TIMESTAMPTZ := date_trunc('hour', p_from);
+    v_to TIMESTAMPTZ := date_trunc('hour', p_to - INTERVAL '1 microsecond') + INTERVAL '1 hour';
+    v_day_from TIMESTAMPTZ := date_trunc('day', v_from AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+    v_day_to TIMESTAMPTZ := (date_trunc('day', (v_to - INTERVAL '1 microsecond') AT TIME ZONE 'UTC') + INTERVAL '1 day') AT TIME ZONE 'UTC';
+    v_hours INTEGER;
+    v_days INTEGER;
+BEGIN
+    DELETE FROM public.analytics_rollups_hourly WHERE bucket >= v_from AND bucket < v_to;
+    INSERT INTO public.analytics_rollups_hourly (bucket, user_id, event_type, job_id, count)
+    SELECT date_trunc('hour', e.created_at),
+           e.user_id,
+           e.event_type,
+           CASE WHEN e.event_data->>'job_id' ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+                THEN (e.event_data->>'job_id')::UUID
+                ELSE '00000000-0000-0000-0000-000000000000'::UUID END,
+           COUNT(*)
+    FROM public.analytics_events e
+    WHERE e.created_at >= v_from AND e.created_at < v_to AND e.user_id IS NOT NULL
+    GROUP BY 1, 2, 3, 4;
+    GET DIAGNOSTICS v_hours = ROW_COUNT;
+
+    DELETE FROM public.analytics_rollups_daily WHERE bucket >= v_day_from AND bucket < v_day_to;
+    INSERT INTO public.analytics_rollups_daily (bucket, user_id, event_type, job_id, count)
+    SELECT date_trunc('day', bucket AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', user_id, event_type, job_id, SUM(count)
+    FROM public.analytics_rollups_hourly
+    WHERE bucket >= v_day_from AND bucket < v_day_to
+    GROUP BY 1, 2, 3, 4;
+    GET DIAGNOSTICS v_days = ROW_COUNT;
+
+    RETURN jsonb_build_object('hourly_rows', v_hours, 'daily_rows', v_days);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+
+-- Summed counts per bucket and event type for one user or one job.
+CREATE OR REPLACE FUNCTION public.analytics_timeseries(
+    p_interval TEXT,
+    p_from TIMESTAMPTZ,
+    p_to TIMESTAMPTZ,
+    p_user_id UUID DEFAULT NULL,
+    p_job_id UUID DEFAULT NULL,
+    p_event_types TEXT[] DEFAULT NULL
+)
+RETURNS TABLE(bucket TIMESTAMPTZ, event_type TEXT, count BIGINT) AS $$
+BEGIN
+    IF p_interval = 'day' THEN
+        RETURN QUERY
+        SELECT r.bucket, r.event_type, SUM(r.count)::BIGINT
+        FROM public.analytics_rollups_daily r
+        WHERE r.bucket >= p_from AND r.bucket < p_to
+          AND (p_user_id IS NULL OR r.user_id = p_user_id)
+          AND (p_job_id IS NULL OR r.job_id = p_job_id)
+          AND (p_event_types IS NULL OR r.event_type = ANY(p_event_types))
+        GROUP BY r.bucket, r.event_type
+        ORDER BY r.bucket;
+    ELSE
+        RETURN QUERY
+        SELECT r.bucket, r.event_type, SUM(r.count)::BIGINT
+        FROM public.analytics_rollups_hourly r
+        WHERE r.bucket >= p_from AND r.bucket < p_to
+          AND (p_user_id IS NULL OR r.user_id = p_user_id)
+          AND (p_job_id IS NULL OR r.job_id = p_job_id)
+          AND (p_event_types IS NULL OR r.event_type = ANY(p_event_types))
+        GROUP BY r.bucket, r.event_type
+        ORDER BY r.bucket;
+    END IF;
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER;
+
+-- Called by the API with the service key only; access checks happen in the API
+REVOKE EXECUTE ON FUNCTION public.increment_analytics_rollups(JSONB) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION public.compact_analytics_rollups(TIMESTAMPTZ, TIMESTAMPTZ) FROM PUBLIC;
+REVOKE EXECUTE ON FUNCTION public.analytics_timeseries(TEXT, TIMESTAMPTZ, TIMESTAMPTZ, UUID, UUID, TEXT[]) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.increment_analytics_rollups(JSONB) TO service_role;
+GRANT EXECUTE ON FUNCTION public.compact_analytics_rollups(TIMESTAMPTZ, TIMESTAMPTZ) TO service_role;
+GRANT EXECUTE ON FUNCTION public.analytics_timeseries(TEXT, TIMESTAMPTZ, TIMESTAMPTZ, UUID, UUID, TEXT[]) TO service_role;
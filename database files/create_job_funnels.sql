@@ -0,0 +1,58 @@
+-- Hiring funnel per job
+--
+-- application_status_history records every status an application takes,
+-- written by a trigger on job_applications so every write path (API,
+-- RPCs, SQL) is covered. job_funnels stores the funnel computed from it
+-- (services/funnel_service.py): one row per job, so the recruiter
+-- dashboard reads all of a recruiter's funnels in one query.
+CREATE TABLE IF NOT EXISTS public.application_status_history (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    application_id UUID NOT NULL REFERENCES public.job_applications(id) ON DELETE CASCADE,
+    job_id UUID NOT NULL REFERENCES public.jobs(id) ON DELETE CASCADE,
+    from_status TEXT, -- NULL for the application itself
+    to_status TEXT NOT NULL,
+    changed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Funnel refreshes read one job's history (keyset on id)
+CREATE INDEX IF NOT EXISTS idx_status_history_job ON public.application_status_history(job_id, id);
+CREATE INDEX IF NOT EXISTS idx_status_history_application ON public.application_status_history(application_id, changed_at);
+
+ALTER TABLE public.application_status_history ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION public.record_application_status()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO public.application_status_history (application_id, job_id, from_status, to_status, changed_at)
+        VALUES (NEW.id, NEW.job_id, NULL, NEW.status::TEXT, COALESCE(NEW.applied_at, NOW()));
+    ELSIF NEW.status IS DISTINCT FROM OLD.status THEN
+        INSERT INTO public.application_status_history (application_id, job_id, from_status, to_status)
+        VALUES (NEW.id, NEW.job_id, OLD.status::TEXT, NEW.status::TEXT);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS record_application_status ON public.job_applications;
+CREATE TRIGGER record_application_status AFTER INSERT OR UPDATE OF status ON public.job_applications
+    FOR EACH ROW EXECUTE FUNCTION public.record_application_status();
+
+-- Backfill: applications from before this migration start with their current status
+INSERT INTO public.application_status_history (application_id, job_id, from_status, to_status, changed_at)
+SELECT a.id, a.job_id, NULL, a.status::TEXT, COALESCE(a.applied_at, NOW())
+FROM public.job_applications a
+WHERE a.job_id IS NOT NULL
+  AND NOT EXISTS (SELECT 1 FROM public.application_status_history h WHERE h.application_id = a.id);
+
+
+-- Computed funnels (stats layout: compute_funnel in services/funnel_service.py)
+CREATE TABLE IF NOT EXISTS public.job_funnels (
+    job_id UUID PRIMARY KEY REFERENCES public.jobs(id) ON DELETE CASCADE,
+    applications INTEGER NOT NULL DEFAULT 0,
+    stats JSONB NOT NULL,
+    computed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Only the backend (service role) touches these tables
+ALTER TABLE public.job_funnels ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,19 @@
+-- Job Recommendations table
+-- Top-K active jobs per candidate, best first. job_ids and scores are
+-- parallel arrays (score 0-100, same formula as job_applications.ai_score),
+-- so serving a candidate's list is one primary-key read.
+CREATE TABLE IF NOT EXISTS public.job_recommendations (
+    candidate_id UUID PRIMARY KEY REFERENCES public.users(id) ON DELETE CASCADE,
+    job_ids UUID[] NOT NULL,
+    scores SMALLINT[] NOT NULL,
+    version INTEGER, -- SCORING_VERSION used to compute the list
+    computed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE public.job_recommendations ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Candidates can view own recommendations" ON public.job_recommendations
+    FOR SELECT USING (auth.uid() = candidate_id);
+
+-- Closing a job removes it from every list that contains it (job_ids @> ARRAY[id])
+CREATE INDEX IF NOT EXISTS idx_job_recommendations_job_ids ON public.job_recommendations USING GIN (job_ids);
@@ -0,0 +1,83 @@
+-- Bulk replace / reorder of a job's interview questions.
+-- p_questions is the complete desired list in display order:
+--   [{"id": "<existing id>", "question_text": "...", "time_limit": 120}, {"question_text": "new"}]
+-- The function applies the minimal diff in one transaction: questions
+-- missing from the list are deleted, existing ones are updated only when
+-- their text, time limit or position changed, and entries without an id
+-- are inserted. Unchanged questions keep their id (and their video
+-- responses, which cascade on delete).
+--
+-- Returns {"questions": [...], "inserted": n, "updated": n, "deleted": n}
+-- or {"error": "job_not_found" | "unknown_question" | "duplicate_question"}
+-- without changing anything. Ids must be UUIDs (the API validates them).
+CREATE OR REPLACE FUNCTION public.replace_interview_questions(
+    p_job_id UUID,
+    p_recruiter_id UUID,
+    p_questions JSONB
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_inserted INTEGER;
+    v_updated INTEGER;
+    v_deleted INTEGER;
+BEGIN
+    -- Serialises concurrent edits of the same job
+    PERFORM 1 FROM public.jobs WHERE id = p_job_id AND created_by = p_recruiter_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('error', 'job_not_found');
+    END IF;
+
+    CREATE TEMP TABLE desired ON COMMIT DROP AS
+    SELECT (q->>'id')::UUID AS id,
+           q->>'question_text' AS question_text,
+           COALESCE((q->>'time_limit')::INTEGER, 120) AS time_limit,
+           ordinality::INTEGER AS question_order
+    FROM jsonb_array_elements(p_questions) WITH ORDINALITY AS q;
+
+    -- The same id twice would update one row twice and lose a position
+    IF EXISTS (SELECT 1 FROM desired WHERE id IS NOT NULL GROUP BY id HAVING COUNT(*) > 1) THEN
+        RETURN jsonb_build_object('error', 'duplicate_question');
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM desired d
+        WHERE d.id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM public.interview_questions iq WHERE iq.id = d.id AND iq.job_id = p_job_id)
+    ) THEN
+        RETURN jsonb_build_object('error', 'unknown_question');
+    END IF;
+
+    DELETE FROM public.interview_questions iq
+    WHERE iq.job_id = p_job_id
+      AND NOT EXISTS (SELECT 1 FROM desired d WHERE d.id = iq.id);
+    GET DIAGNOSTICS v_deleted = ROW_COUNT;
+
+    UPDATE public.interview_questions iq
+    SET question_text = d.question_text, time_limit = d.time_limit, question_order = d.question_order
+    FROM desired d
+    WHERE iq.id = d.id
+      AND (iq.question_text, iq.time_limit, iq.question_order)
+          IS DISTINCT FROM (d.question_text, d.time_limit, d.question_order);
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+
+    INSERT INTO public.interview_questions (job_id, question_text, time_limit, question_order)
+    SELECT p_job_id, d.question_text, d.time_limit, d.question_order FROM desired d WHERE d.id IS NULL;
+    GET DIAGNOSTICS v_inserted = ROW_COUNT;
+
+    RETURN jsonb_build_object(
+        'questions', COALESCE((
+            SELECT jsonb_agg(to_jsonb(iq) ORDER BY iq.question_order)
+            FROM public.interview_questions iq WHERE iq.job_id = p_job_id
+        ), '[]'::JSONB),
+        'inserted', v_inserted,
+        'updated', v_updated,
+        'deleted', v_deleted
+    );
+END;
+$$ LANGUAGE plpgsql SECURITY INVOKER;
+
+GRANT EXECUTE ON FUNCTION public.replace_interview_questions(UUID, UUID, JSONB) TO authenticated;
+
+-- Questions are always read per job in display order
+CREATE INDEX IF NOT EXISTS idx_interview_questions_job_order
+    ON public.interview_questions(job_id, question_order);
@@ -0,0 +1,31 @@
+-- Rescoring Jobs table
+-- Tracks batch rescoring of job_applications.ai_score after a job or its
+-- skills change. last_application_id is the keyset checkpoint, so an
+-- interrupted run resumes where it stopped.
+CREATE TABLE IF NOT EXISTS public.rescoring_jobs (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    job_id UUID REFERENCES public.jobs(id) ON DELETE CASCADE, -- NULL = all applications
+    reason TEXT, -- job_updated, job_skill_added, backfill
+    status TEXT DEFAULT 'pending', -- pending, running, completed, failed
+    total INTEGER,
+    processed INTEGER DEFAULT 0,
+    last_application_id UUID,
+    error TEXT,
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Only the backend (service role) touches this table
+ALTER TABLE public.rescoring_jobs ENABLE ROW LEVEL SECURITY;
+
+-- Create trigger for updated_at
+CREATE TRIGGER update_rescoring_jobs_updated_at BEFORE UPDATE ON public.rescoring_jobs
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Create indexes for better performance
+CREATE INDEX IF NOT EXISTS idx_rescoring_jobs_status ON public.rescoring_jobs(status);
+
+-- Keyset scans of one job's applications (WHERE job_id = ? AND id > ? ORDER BY id)
+CREATE INDEX IF NOT EXISTS idx_job_applications_job_id_id ON public.job_applications(job_id, id);
@@ -0,0 +1,63 @@
+-- Atomic application submission.
+-- One round trip: checks the job is active, inserts the application and
+-- resolves duplicates through the UNIQUE(job_id, candidate_id) constraint,
+-- so concurrent double-submits cannot both succeed.
+--
+-- Clients may send an idempotency key (Idempotency-Key header). A retry with
+-- the same key returns the original application instead of an error.
+ALTER TABLE public.job_applications
+    ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+
+-- NULL keys never conflict, so applications without a key are unaffected
+CREATE UNIQUE INDEX IF NOT EXISTS idx_job_applications_idempotency
+    ON public.job_applications(candidate_id, idempotency_key);
+
+-- Returns {"application": {...}, "created": bool} on success, or
+-- {"error": "job_inactive" | "duplicate" | "idempotency_key_reused"}.
+CREATE OR REPLACE FUNCTION public.submit_job_application(
+    p_job_id UUID,
+    p_candidate_id UUID,
+    p_cover_letter TEXT DEFAULT NULL,
+    p_idempotency_key TEXT DEFAULT NULL
+)
+RETURNS JSONB AS $$
+DECLARE
+    v_app public.job_applications;
+    v_status TEXT;
+BEGIN
+    IF p_idempotency_key IS NOT NULL THEN
+        SELECT * INTO v_app FROM public.job_applications
+        WHERE candidate_id = p_candidate_id AND idempotency_key = p_idempotency_key;
+        IF FOUND THEN
+            IF v_app.job_id <> p_job_id THEN
+                RETURN jsonb_build_object('error', 'idempotency_key_reused');
+            END IF;
+            RETURN jsonb_build_object('application', to_jsonb(v_app), 'created', false);
+        END IF;
+    END IF;
+
+    -- FOR SHARE keeps the job from being closed until this transaction commits
+    SELECT status::TEXT INTO v_status FROM public.jobs WHERE id = p_job_id FOR SHARE;
+    IF v_status IS DISTINCT FROM 'active' THEN
+        RETURN jsonb_build_object('error', 'job_inactive');
+    END IF;
+
+    INSERT INTO public.job_applications (job_id, candidate_id, cover_letter, idempotency_key)
+    VALUES (p_job_id, p_candidate_id, p_cover_letter, p_idempotency_key)
+    ON CONFLICT (job_id, candidate_id) DO NOTHING
+    RETURNING * INTO v_app;
+
+    IF NOT FOUND THEN
+        -- A concurrent retry with the same key may have won the insert
+        SELECT * INTO v_app FROM public.job_applications
+        WHERE job_id = p_job_id AND candidate_id = p_candidate_id;
+        IF p_idempotency_key IS NOT NULL AND v_app.idempotency_key = p_idempotency_key THEN
+            RETURN jsonb_build_object('application', to_jsonb(v_app), 'created', false);
+        END IF;
+        RETURN jsonb_build_object('error', 'duplicate');
+    END IF;
+    RETURN jsonb_build_object('application', to_jsonb(v_app), 'created', true);
+END;
+$$ LANGUAGE plpgsql SECURITY INVOKER;
+
+GRANT EXECUTE ON FUNCTION public.submit_job_application(UUID, UUID, TEXT, TEXT) TO authenticated;
@@ -0,0 +1,24 @@
+-- Bulk ai_score writes for the scoring, rescoring and resume jobs.
+-- One round trip per batch, and it only ever updates: an application that
+-- was deleted while it was being scored is skipped, not re-created.
+--
+-- p_rows: [{"id": "<application id>", "ai_score": 0-100, "ai_analysis": {...}}]
+-- Returns the number of applications updated.
+CREATE OR REPLACE FUNCTION public.update_application_scores(p_rows JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    v_updated INTEGER;
+BEGIN
+    UPDATE public.job_applications a
+    SET ai_score = r.ai_score,
+        ai_analysis = r.ai_analysis
+    FROM jsonb_to_recordset(p_rows) AS r(id UUID, ai_score INTEGER, ai_analysis JSONB)
+    WHERE a.id = r.id;
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Called by the API with the service key only
+REVOKE EXECUTE ON FUNCTION public.update_application_scores(JSONB) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.update_application_scores(JSONB) TO service_role;